@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EddyCurrent_Prescreen.py - 求解前的隔板涡流损耗快速筛选 (纯 NumPy, 不需要 AEDT)
+
+几何与材料直接取自 EddyCurrent_setup.py (母排尺寸、框架尺寸、PLATE_MATERIALS)，
+用 Biot–Savart 入射场 + 平板表面阻抗模型估算 Plate_Frame 损耗，
+材料 × 间距 × 间隙 × 板厚 × 电流 的整张网格一次向量化计算。
+
+用法:
+  python EddyCurrent_Prescreen.py                                # 名义几何, 全部材料
+  python EddyCurrent_Prescreen.py --gap 5:60:20 --frame-th 1:6:10 --current 1000:5000:9
+  python EddyCurrent_Prescreen.py --csv screen.csv               # 整张网格写入 CSV
+  python EddyCurrent_Prescreen.py --compare                      # 与 Maxwell 结果对比误差
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+
+import numpy as np
+
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import EddyCurrent_setup as setup
+from aedt_common.eddy_screen import BusbarFrameGeometry, screen_grid, skin_depth
+
+
+def _values(text: str) -> list:
+    """argparse 类型: "10,20,40" 或 "起:止:个数" (含端点等分)"""
+    try:
+        if ":" in text:
+            start, stop, num = text.split(":")
+            return list(np.linspace(float(start), float(stop), int(num)))
+        return [float(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要逗号分隔的数值或 起:止:个数: {text}")
+
+
+def _geometry() -> BusbarFrameGeometry:
+    return BusbarFrameGeometry(
+        bus_w=setup.bus_w,
+        bus_d=setup.bus_d,
+        bus_h=setup.bus_h,
+        flange=setup.frame_flange,
+        margin=setup.frame_margin,
+    )
+
+
+def _frequency() -> float:
+    return float(str(setup.SETUP_PROPS["Frequency"]).lower().replace("hz", ""))
+
+
+def compare_with_maxwell(material_keys, loss: np.ndarray) -> list:
+    """名义几何的估算值 vs EddyCurrent_Report.get_results 读到的 Maxwell 隔板损耗"""
+    # 报告脚本导入时会创建输出目录, 只在需要对比时导入
+    from EddyCurrent_Report import get_results
+
+    rows = []
+    for i, key in enumerate(material_keys):
+        estimate = float(loss[i])
+        suffix = setup.PLATE_MATERIALS[key]["design_suffix"]
+        result = get_results(suffix)
+        if not result or not result.get("plate_loss"):
+            print(f"  [WARN] {suffix}: 没有 Maxwell 结果，跳过对比")
+            continue
+        maxwell = float(result["plate_loss"])
+        rows.append({
+            "material": key,
+            "estimate_W": estimate,
+            "maxwell_W": maxwell,
+            "error_pct": (estimate - maxwell) / maxwell * 100,
+            # Maxwell / 估算: 后续筛选可乘该系数校准
+            "calibration": maxwell / estimate if estimate else float("nan"),
+        })
+
+    if rows:
+        print("\n" + "-" * 70)
+        print(f"  {'材料':<12}{'估算(W)':>14}{'Maxwell(W)':>14}{'误差':>10}{'校准系数':>12}")
+        for r in rows:
+            print(
+                f"  {r['material']:<12}{r['estimate_W']:>14.4g}{r['maxwell_W']:>14.4g}"
+                f"{r['error_pct']:>9.1f}%{r['calibration']:>12.3f}"
+            )
+        print("-" * 70)
+    return rows
+
+
+def write_csv(path, material_keys, axes, loss):
+    pitch, gap, th, current = axes
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["material", "space_mm", "gap_mm", "frame_th_mm", "current_A", "plate_loss_W"])
+        for idx in np.ndindex(loss.shape):
+            m, p, g, t, c = idx
+            writer.writerow([
+                material_keys[m], f"{pitch[p]:g}", f"{gap[g]:g}", f"{th[t]:g}",
+                f"{current[c]:g}", f"{loss[idx]:.6g}",
+            ])
+    print(f"[INFO] 网格结果: {path} ({loss.size} 行)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="隔板涡流损耗快速筛选 (NumPy, 不需要 AEDT)")
+    parser.add_argument(
+        "--material", "-m", nargs="+", choices=list(setup.PLATE_MATERIALS), default=None,
+        help="隔板材料 (默认全部)",
+    )
+    parser.add_argument("--gap", type=_values, default=[setup.gap], help="铜排-框架间隙 mm")
+    parser.add_argument("--frame-th", type=_values, default=[setup.frame_th], help="框架板厚 mm")
+    parser.add_argument(
+        "--space-pitch", type=_values, default=[setup.space_pitch], help="铜排中心间距 mm"
+    )
+    parser.add_argument(
+        "--current", type=_values,
+        default=[float(setup.CURRENT_AMPLITUDE.rstrip("A"))],
+        help="每相电流峰值 A",
+    )
+    parser.add_argument("--csv", default=None, help="把整张网格写入 CSV")
+    parser.add_argument(
+        "--compare", action="store_true",
+        help="读取 Maxwell 名义设计的隔板损耗 (需要 AEDT)，报告估算误差",
+    )
+    args = parser.parse_args()
+
+    material_keys = args.material or list(setup.PLATE_MATERIALS)
+    mats = [setup.PLATE_MATERIALS[k] for k in material_keys]
+    sigma = [m["conductivity"] for m in mats]
+    mu_r = [m["permeability"] for m in mats]
+    freq = _frequency()
+    axes = (args.space_pitch, args.gap, args.frame_th, args.current)
+
+    print("=" * 70)
+    print("隔板涡流损耗快速筛选 (Biot–Savart + 表面阻抗)")
+    print("=" * 70)
+    for key, m, d in zip(material_keys, mats, skin_depth(freq, sigma, mu_r)):
+        print(f"  {key:<12} σ={m['conductivity']:.4g} S/m, μr={m['permeability']}, δ={d * 1e3:.3g} mm")
+
+    geo = _geometry()
+    t0 = time.perf_counter()
+    loss = screen_grid(geo, sigma, mu_r, *axes, freq=freq)
+    elapsed = time.perf_counter() - t0
+    print(f"[INFO] {loss.size} 个组合, 耗时 {elapsed * 1e3:.1f} ms")
+
+    for i, key in enumerate(material_keys):
+        grid = loss[i]
+        lo = np.unravel_index(np.argmin(grid), grid.shape)
+        hi = np.unravel_index(np.argmax(grid), grid.shape)
+
+        def _at(idx):
+            return ", ".join(
+                f"{name}={axis[j]:g}" for name, axis, j in
+                zip(("Space", "Gap", "Frame_Th", "I"), axes, idx)
+            )
+
+        print(f"  {key}: 最小 {grid[lo]:.4g} W ({_at(lo)}); 最大 {grid[hi]:.4g} W ({_at(hi)})")
+
+    if args.csv:
+        write_csv(args.csv, material_keys, axes, loss)
+
+    if args.compare:
+        nominal = screen_grid(
+            geo, sigma, mu_r, [setup.space_pitch], [setup.gap], [setup.frame_th],
+            [float(setup.CURRENT_AMPLITUDE.rstrip("A"))], freq=freq,
+        ).reshape(len(material_keys))
+        compare_with_maxwell(material_keys, nominal)
+
+
+if __name__ == "__main__":
+    main()
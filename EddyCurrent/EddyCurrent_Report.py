@@ -12,72 +12,31 @@ maxwell_report.py - 开关柜涡流损耗仿真报告生成脚本
 用法:
   python maxwell_report.py                    # 读取所有可用设计
   python maxwell_report.py --design Galvalume # 只读取覆铝锌板设计
+  python maxwell_report.py --spectrum vfd.csv  # 谐波频谱加权损耗 (需 setup --harmonics)
+  python maxwell_report.py --offline          # 只用结果缓存重建报告, 不连接 AEDT
 """
 
 import os
 import sys
-import subprocess
 import argparse
 import platform
 from datetime import datetime
 
-# ======================================================================
-# 跨平台 ANSYS 版本检测 (必须在导入 pyaedt 之前)
-# ======================================================================
-def detect_ansys_installation():
-    """自动检测 ANSYS 安装版本和路径"""
-    system = platform.system()
-    
-    if system == "Windows":
-        # Windows: 检查注册表
-        try:
-            import winreg
-            for ver in ["241", "232", "231", "222", "221"]:
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                        f"SOFTWARE\\Ansoft\\ElectronicsDesktop\\{ver}\\Desktop")
-                    path, _ = winreg.QueryValueEx(key, "InstallDir")
-                    winreg.CloseKey(key)
-                    version = f"20{ver[:2]}.{ver[2]}"
-                    return (version, path)
-                except:
-                    continue
-        except ImportError:
-            pass
-        
-        # 检查常见安装路径
-        for ver in ["241", "232", "231", "222", "221"]:
-            for base in ["E:\\Program Files\\ANSYSMaxwell", "C:\\Program Files\\ANSYS Inc\\v" + ver]:
-                path = os.path.join(base if "ANSYSMaxwell" in base else base, f"v{ver}\\Win64" if "ANSYSMaxwell" not in base else f"v{ver}\\Win64")
-                test_path = f"E:\\Program Files\\ANSYSMaxwell\\v{ver}\\Win64"
-                if os.path.isdir(test_path):
-                    version = f"20{ver[:2]}.{ver[2]}"
-                    return (version, test_path)
-    else:
-        # Linux
-        for ver in ["241", "232"]:
-            path = f"/media/large_disk/ansysLinux/AnsysEM/v{ver}/Linux64"
-            if os.path.isdir(path):
-                version = f"20{ver[:2]}.{ver[2]}"
-                return (version, path)
-    
-    return (None, None)
-
-# 检测版本
-_detected_version, _ansys_path = detect_ansys_installation()
-AEDT_VERSION = _detected_version if _detected_version else "2024.1"
-
-# 根据版本决定是否使用 gRPC
-_use_grpc = tuple(map(int, AEDT_VERSION.split("."))) >= (2022, 2)
-if not _use_grpc:
-    print(f"[INFO] AEDT {AEDT_VERSION} 使用 COM 接口")
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 设置 gRPC 开关 (必须在导入 pyaedt 之前)
-from pyaedt import settings
-settings.use_grpc_api = _use_grpc
+from aedt_common.detection import resolve_aedt
+from aedt_common.harmonics import combine_losses, load_spectrum, write_spectrum_csv
+from aedt_common.impedance import surface_loss_name
+from aedt_common.loss_table import query_losses
+from aedt_common.mesh_planner import parse_frequency
+from aedt_common.plot_export import FieldPlotExporter
+from aedt_common.report_build import build_reports
+from aedt_common.results_cache import ResultsCache, load_cached
+from aedt_common.session_pool import get_pool
 
-# 现在安全导入
-from pyaedt import Maxwell3d
+# AEDT 版本只在读取结果时检测, 生成 Typst 报告不需要 AEDT
+DEFAULT_AEDT_VERSION = "2024.1"
 
 # ======================================================================
 # 配置
@@ -107,9 +66,24 @@ DESIGNS = {
         "description": "不锈钢板(非铁磁材料)",
         "permeability": 1,
         "conductivity": "1.137×10⁶ S/m"
+    },
+    # 隔板阻抗边界模型 (EddyCurrent_setup.py --plate-model impedance)
+    "Galvalume_Imp": {
+        "name": "EddyCurrent_Galvalume_Imp",
+        "description": "覆铝锌板(阻抗边界模型)",
+        "permeability": 4000,
+        "conductivity": "4.032×10⁶ S/m"
     }
 }
 
+# 半模型设计 (EddyCurrent_setup.py --half-model): 名称加 _Half 后缀,
+# 损耗按设计变量 Symmetry_Factor 还原为整模型
+SYMMETRY_FACTOR_VAR = "Symmetry_Factor"
+for _key, _config in list(DESIGNS.items()):
+    DESIGNS[f"{_key}_Half"] = dict(
+        _config, name=f"{_config['name']}_Half", description=f"{_config['description']}(半模型)"
+    )
+
 # 仿真参数 (用于报告)
 SIM_PARAMS = {
     "frequency": "50 Hz",
@@ -123,22 +97,102 @@ SIM_PARAMS = {
 }
 
 
-def get_results(design_key: str) -> dict:
-    """从 Maxwell 获取仿真结果"""
+# 谐波明细 CSV 的列
+HARMONIC_COLUMNS = [
+    "order", "frequency_Hz", "sequence", "amplitude_A", "loss_at_sim_W", "loss_W", "share_pct"
+]
+
+
+def _loss_vs_frequency(m3d, expression: str, solution: str, category: str) -> dict:
+    """读取 Setup 频率扫描各频率点的损耗 -> {频率 Hz: W}; 没有扫描结果时返回空字典"""
+    try:
+        data = m3d.post.get_solution_data(
+            expressions=[expression],
+            setup_sweep_name=solution,
+            report_category=category,
+            primary_sweep_variable="Freq",
+            variations={"Freq": ["All"]},
+        )
+        if not data or not data.data_real():
+            return {}
+        unit = getattr(data, "units_sweeps", {}).get("Freq", "Hz")
+        return {
+            parse_frequency(f"{f}{unit}"): float(v)
+            for f, v in zip(data.primary_sweep_values, data.data_real())
+        }
+    except Exception as e:
+        print(f"  ⚠ 读取 {expression} 频率扫描失败: {e}")
+        return {}
+
+
+def _plate_loss_vs_frequency(m3d, solution: str, factor: float) -> list:
+    """隔板损耗的频率扫描 [[Hz, W], ...] (已乘对称系数); 实体没有结果时用表面损耗"""
+    plate = _loss_vs_frequency(m3d, "SolidLoss(Plate_Frame)", solution, "EddyCurrent")
+    if not any(plate.values()):
+        plate = _loss_vs_frequency(m3d, surface_loss_name("Plate_Frame"), solution, "Fields")
+    return [[f, v * factor] for f, v in sorted(plate.items())]
+
+
+def _harmonic_losses(results: dict, spectrum: dict):
+    """按电流频谱加权隔板损耗的各谐波频率点 (Setup1 需由 setup --harmonics 附加频率点)"""
+    fundamental = parse_frequency(SIM_PARAMS["frequency"].replace(" ", ""))
+    amplitude = float(SIM_PARAMS["current"].split()[0])
+    plate = {f: v for f, v in results.get("plate_loss_vs_freq", [])}
+    if len(plate) < 2:
+        print("  ⚠ Setup1 没有谐波频率点, 请先运行 setup --harmonics")
+        return
+    rows, total = combine_losses(plate, spectrum, fundamental, amplitude)
+    results["harmonics"] = rows
+    results["plate_loss_harmonic"] = total
+    print(f"  ✓ 谐波加权隔板损耗: {total:.4f} W (基波 {results['plate_loss']:.4f} W)")
+    for r in rows:
+        if r["loss_W"] is not None:
+            print(
+                f"    {r['order']:>3}次 {r['frequency_Hz']:>7g}Hz {r['amplitude_A']:>9.1f}A "
+                f"({r['sequence']}) -> {r['loss_W']:.4f} W ({r['share_pct']:.1f}%)"
+            )
+
+
+def get_results(
+    design_key: str,
+    spectrum: dict = None,
+    cache: ResultsCache = None,
+    refresh: bool = False,
+    offline: bool = False,
+) -> dict:
+    """从 Maxwell 获取仿真结果
+
+    spectrum ({谐波次数: 电流峰值 A}) 不为空时, 额外读取 Setup1 各谐波频率点的
+    隔板损耗并按频谱加权 (results["harmonics"] / results["plate_loss_harmonic"])。
+    cache 不为空时先查结果缓存 (见 aedt_common.results_cache)，命中则不连接 AEDT;
+    从 AEDT 读取的结果写回缓存。offline=True 时只用缓存。
+    """
     
     config = DESIGNS[design_key]
     design_name = config["name"]
     
     print(f"\n读取设计: {design_name}")
+
+    cached = load_cached(
+        cache, PROJECT_NAME, design_name, "Setup1", refresh, offline,
+        require=["plate_loss_vs_freq"] if spectrum else [],
+    )
+    if cached:
+        # 描述文字取当前配置, 数值取缓存
+        cached.update({k: config[k] for k in ("description", "permeability", "conductivity")})
+        if spectrum:
+            _harmonic_losses(cached, spectrum)
+        return cached
+    if offline:
+        print("  ✗ 离线模式: 没有可用的缓存结果")
+        return None
     
     try:
-        # PyAEDT 0.8.x API 兼容
-        m3d = Maxwell3d(
-            projectname=PROJECT_NAME,
-            designname=design_name,
-            specified_version=AEDT_VERSION,
-            new_desktop_session=False,
-            non_graphical=False
+        # 跨平台 ANSYS 版本检测 (结果缓存, 安装目录不变时毫秒级返回)
+        aedt_version, _ = resolve_aedt(default_version=DEFAULT_AEDT_VERSION, verbose=False)
+        # 从会话池附着已运行的桌面 (报告只读结果，不启动新桌面)
+        m3d = get_pool(aedt_version).open_design(
+            PROJECT_NAME, design_name, launch=False
         )
     except Exception as e:
         print(f"  ✗ 无法连接设计: {e}")
@@ -155,73 +209,71 @@ def get_results(design_key: str) -> dict:
         "bus_losses": {}
     }
     
-    # 总损耗
+    # 全部对象的损耗一次查询 (对象取自 solid_names, 查询次数与对象数无关)
+    # 阻抗边界隔板的 SolidLoss 为 0, 由 SurfaceLoss_Plate_Frame 补上并计入总损耗
     try:
-        data = m3d.post.get_solution_data(
-            expressions=["SolidLoss"],
-            setup_sweep_name=solution,
-            report_category="EddyCurrent"
-        )
-        if data and data.data_real():
-            results["total_loss"] = data.data_real()[0]
-            print(f"  ✓ 总损耗: {results['total_loss']:.4f} W")
+        table = query_losses(m3d, solution=solution)
+        results["total_loss"] = table.total
+        results["plate_loss"] = table.get("Plate_Frame")
+        results["bus_losses"] = {p: table.get(f"Busbar_{p}") for p in ["A", "B", "C"]}
+        results["object_losses"] = table.as_dict()
+        results["passes"] = table.passes
+        results["energy_error"] = table.energy_error
+        print(f"  ✓ 总损耗: {results['total_loss']:.4f} W ({len(table)} 个对象)")
+        table.print()
+        if "Plate_Frame" not in table:
+            print("  ⚠ 模型中没有 Plate_Frame, 隔板损耗记为 0")
     except Exception as e:
-        print(f"  ✗ 获取总损耗失败: {e}")
+        print(f"  ✗ 获取损耗失败: {e}")
     
-    # 隔板损耗 (对象名: Plate_Frame)
+    # 半模型: 各对象损耗只含一半几何, 乘对称系数还原为整模型
     try:
-        data = m3d.post.get_solution_data(
-            expressions=["SolidLoss(Plate_Frame)"],
-            setup_sweep_name=solution,
-            report_category="EddyCurrent"
-        )
-        if data and data.data_real():
-            results["plate_loss"] = data.data_real()[0]
-            print(f"  ✓ 隔板损耗: {results['plate_loss']:.4f} W")
-    except:
-        pass
-    
-    # 如果无法获取隔板损耗，使用总损耗作为近似值（损耗主要集中在隔板上）
-    if results["plate_loss"] == 0 and results["total_loss"] > 0:
-        results["plate_loss"] = results["total_loss"]
-        print(f"  ⚠ 使用总损耗作为隔板损耗近似值: {results['plate_loss']:.4f} W")
-    
-    # 母排损耗
-    for phase in ["A", "B", "C"]:
+        factor = float(str(m3d[SYMMETRY_FACTOR_VAR]))
+    except Exception:
+        factor = 1.0
+    if factor != 1.0:
+        results["total_loss"] *= factor
+        results["plate_loss"] *= factor
+        results["bus_losses"] = {k: v * factor for k, v in results["bus_losses"].items()}
+        results["object_losses"] = {
+            k: v * factor for k, v in results.get("object_losses", {}).items()
+        }
+        results["symmetry_factor"] = factor
+        print(f"  ✓ 半模型: 损耗 ×{factor:g} -> 隔板 {results['plate_loss']:.4f} W")
+
+    if spectrum:
+        results["plate_loss_vs_freq"] = _plate_loss_vs_frequency(m3d, solution, factor)
+        _harmonic_losses(results, spectrum)
+
+    # 用户手动提供场图截图，不再自动导出
+
+    if cache is not None and results["total_loss"] > 0:
+        # 谐波加权结果与频谱有关, 不写入缓存 (读取时按当次频谱重新计算)
         try:
-            data = m3d.post.get_solution_data(
-                expressions=[f"SolidLoss(Busbar_{phase})"],
-                setup_sweep_name=solution,
-                report_category="EddyCurrent"
+            cache.store(
+                PROJECT_NAME, design_name, "Setup1",
+                {k: v for k, v in results.items() if k not in ("harmonics", "plate_loss_harmonic")},
+                project_file=m3d.project_file,
             )
-            if data and data.data_real():
-                results["bus_losses"][phase] = data.data_real()[0]
-        except:
-            results["bus_losses"][phase] = 0
-    
-    # 用户手动提供场图截图，不再自动导出
+        except Exception as e:
+            print(f"  ⚠ 写入结果缓存失败: {e}")
     
     # 释放但不关闭 Maxwell
-    m3d.release_desktop(close_projects=False, close_desktop=False)
+    get_pool().release(m3d)
     return results
 
 
 def export_field_plots(m3d, design_key: str, results: dict):
-    """导出场图到图片文件 - 增强版
-    
-    改进:
-    1. 增加 Mag_H 和 J 场图导出
-    2. 使用 show=False 参数避免弹出图片窗口
-    3. 多种导出方法回退机制
-    4. 更好的错误处理和日志
+    """导出场图到图片文件
+
+    导出方式按 AEDT 版本/物理量记忆 (aedt_common.plot_export)，AEDT 侧依次
+    创建/导出场图，图片裁剪缩放在线程池中与下一个场图的导出重叠。
     """
     
     print("  正在导出场图（静默模式）...")
     
     # 场图输出目录
     plot_dir = os.path.join(REPORT_DIR, "field_plots", design_key)
-    os.makedirs(plot_dir, exist_ok=True)
-    results["field_plots"] = []
     
     # 分析对象: Plate_Frame(隔板) + Busbar_A/B/C(铜排), 排除Region
     all_objects = m3d.modeler.solid_names
@@ -242,89 +294,12 @@ def export_field_plots(m3d, design_key: str, results: dict):
         ("Mag_J", busbar_objects if busbar_objects else analysis_objects, "电流密度云图", f"Mag_J_{design_key}", None, None),
     ]
     
-    for quantity, objects, title, base_filename, scale_min, scale_max in field_configs:
-        output_file = os.path.join(plot_dir, base_filename + ".png")
-        exported = False
-        
-        try:
-            # 创建场图
-            plot = m3d.post.create_fieldplot_surface(
-                assignment=objects,
-                quantity=quantity,
-                setup=m3d.nominal_adaptive,
-                intrinsics={"Phase": "0deg"}
-            )
-            
-            if plot:
-                # 方法1: plot_field_from_fieldplot (带图例+坐标轴, 不显示窗口)
-                try:
-                    model = m3d.post.plot_field_from_fieldplot(
-                        plot_name=plot.name,
-                        project_path=plot_dir,
-                        image_format="png",
-                        show_legend=True,
-                        show_bounding=True,
-                        show=False  # 关键：不弹出显示窗口
-                    )
-                    # PyAEDT可能自动生成文件名
-                    expected_file = os.path.join(plot_dir, f"{plot.name}.png")
-                    if os.path.exists(expected_file):
-                        if expected_file != output_file:
-                            import shutil
-                            shutil.move(expected_file, output_file)
-                        results["field_plots"].append({"name": title, "path": output_file})
-                        print(f"    ✓ {title}: {base_filename}.png")
-                        exported = True
-                except Exception as e1:
-                    # 静默记录错误，不打印干扰信息
-                    pass
-                
-                # 方法2: export_field_plot (直接导出，无窗口)
-                if not exported:
-                    try:
-                        success = m3d.post.export_field_plot(
-                            plot_name=plot.name,
-                            output_file=output_file
-                        )
-                        if success and os.path.exists(output_file):
-                            results["field_plots"].append({"name": title, "path": output_file})
-                            print(f"    ✓ {title}: {base_filename}.png")
-                            exported = True
-                    except Exception as e2:
-                        pass
-                
-                # 方法3: export_model_picture (4K高清，隐藏Region)
-                if not exported:
-                    try:
-                        m3d.post.export_model_picture(
-                            full_name=output_file,
-                            show_axis=True,
-                            show_grid=False,
-                            show_ruler=True,
-                            show_region=False,
-                            field_selections=[plot.name],
-                            orientation="isometric",
-                            width=3840,
-                            height=2160
-                        )
-                        if os.path.exists(output_file):
-                            results["field_plots"].append({"name": title, "path": output_file})
-                            print(f"    ✓ {title}: {base_filename}.png (4K)")
-                            exported = True
-                    except Exception as e3:
-                        pass
-                
-                # 清理场图对象
-                try:
-                    plot.delete()
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"    ⚠ {title}: 创建失败")
-        
-        if not exported:
-            print(f"    ⚠ {title}: 导出失败（将使用手动截图）")
+    with FieldPlotExporter(m3d, plot_dir) as exporter:
+        for quantity, objects, title, base_filename, scale_min, scale_max in field_configs:
+            exporter.export(quantity, objects, title, base_filename)
+    results["field_plots"] = [
+        {"name": r["name"], "path": r["path"]} for r in exporter.results
+    ]
 
 
 def generate_report(results_list: list):
@@ -528,6 +503,9 @@ $ delta = sqrt(1 / (pi f mu sigma)) = sqrt(1 / (pi f mu_0 mu_r sigma)) $
 
 '''
 
+    # 谐波电流损耗 (--spectrum)
+    content += _harmonic_section(main_result)
+
     # 添加材料对比分析
     if galvalume and stainless:
         content += f'''
@@ -712,48 +690,96 @@ $ delta = sqrt(1 / (pi f mu sigma)) = sqrt(1 / (pi f mu_0 mu_r sigma)) $
         f.write(content)
     print(f"  ✓ Typst: {typst_file}")
     
-    # 编译 PDF
+    # 编译 PDF (内容和引用的图片/模板都未变化时跳过)
     pdf_file = os.path.join(REPORT_DIR, "EddyCurrent_Analysis_Report.pdf")
-    try:
-        result = subprocess.run(
-            ["typst", "compile", typst_file, pdf_file],
-            capture_output=True, text=True, timeout=60
-        )
-        if result.returncode == 0:
-            print(f"  ✓ PDF: {pdf_file}")
-        else:
-            print(f"  ✗ PDF 编译失败: {result.stderr}")
-    except Exception as e:
-        print(f"  ✗ PDF 错误: {e}")
+    build_reports([typst_file])
     
     return pdf_file
 
 
+def _harmonic_section(result: dict) -> str:
+    """谐波损耗小节 (Typst)"""
+    rows = [r for r in result.get("harmonics", []) if r["loss_W"] is not None]
+    if not rows:
+        return ""
+    cells = "\n".join(
+        f"    [{r['order']}], [{r['frequency_Hz']:g}], [{r['sequence']}], "
+        f"[{r['amplitude_A']:.1f}], [{r['loss_W']:.3f}], [{r['share_pct']:.1f}%],"
+        for r in rows
+    )
+    return f'''
+== 谐波电流损耗
+
+变频器负载电流含高次谐波。Setup1 在 {SIM_PARAMS["frequency"]} 自适应剖分后在各谐波频率点复用网格求解，隔板损耗按电流频谱加权：$P = sum_h P_h (I_h / I_1)^2$。
+
+#figure(
+  table(
+    columns: (0.6fr, 0.9fr, 0.6fr, 1fr, 1fr, 0.8fr),
+    stroke: 0.5pt,
+    inset: 8pt,
+    fill: (_, row) => if row == 0 {{ header-blue }} else if calc.odd(row) {{ white }} else {{ alt-gray }},
+    align: center + horizon,
+    [#th[次数]], [#th[频率 (Hz)]], [#th[相序]], [#th[电流 (A)]], [#th[隔板损耗 (W)]], [#th[占比]],
+{cells}
+    [*合计*], [], [], [], [*{result["plate_loss_harmonic"]:.3f}*], [100%],
+  ),
+  caption: [{result["description"]} 谐波损耗分解]
+)
+
+'''
+
+
 def main():
     parser = argparse.ArgumentParser(description="Maxwell 涡流仿真报告生成")
     parser.add_argument(
         "--design", "-d",
-        choices=["Galvalume", "Stainless", "all"],
+        choices=list(DESIGNS) + ["all"],
         default="all",
         help="选择读取的设计"
     )
+    parser.add_argument(
+        "--spectrum",
+        default=None,
+        help="谐波电流频谱 CSV (order + amplitude_a/rms_a/percent 列), 按频谱加权各谐波频率点的损耗",
+    )
+    parser.add_argument(
+        "--spectrum-csv",
+        default=None,
+        help="谐波损耗明细输出 CSV (默认 OUTPUT_DIR/<设计>_harmonics.csv)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="只使用结果缓存 (不连接 AEDT), 缓存已失效时也使用",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="忽略结果缓存, 从 AEDT 重新读取并更新缓存"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="不读写结果缓存")
     
     args = parser.parse_args()
+    spectrum = None
+    if args.spectrum:
+        try:
+            spectrum = load_spectrum(args.spectrum, float(SIM_PARAMS["current"].split()[0]))
+        except (OSError, ValueError) as e:
+            parser.error(f"频谱读取失败: {e}")
     
     print("=" * 70)
     print("开关柜涡流损耗仿真 - 报告生成")
     print("=" * 70)
     
     results_list = []
+    cache = None if args.no_cache else ResultsCache()
     
     if args.design == "all":
         # 尝试读取所有可用设计
         for key in ["Galvalume", "Stainless"]:
-            result = get_results(key)
+            result = get_results(key, spectrum, cache, args.refresh, args.offline)
             if result and result["total_loss"] > 0:
                 results_list.append(result)
     else:
-        result = get_results(args.design)
+        result = get_results(args.design, spectrum, cache, args.refresh, args.offline)
         if result:
             results_list.append(result)
     
@@ -762,6 +788,15 @@ def main():
         print("  请先运行: python maxwell_setup.py --analyze")
         sys.exit(1)
     
+    # 谐波损耗明细
+    for result in results_list:
+        if result.get("harmonics"):
+            csv_file = args.spectrum_csv
+            if not csv_file or len(results_list) > 1:
+                csv_file = os.path.join(OUTPUT_DIR, f"{result['design']}_harmonics.csv")
+            write_spectrum_csv(csv_file, result["harmonics"], HARMONIC_COLUMNS)
+            print(f"  ✓ 谐波损耗明细: {csv_file}")
+
     # 生成报告
     pdf_file = generate_report(results_list)
     
@@ -10,160 +10,75 @@ maxwell_setup.py - 开关柜涡流损耗仿真设置脚本
   python maxwell_setup.py --material steel   # 钢板材料
   python maxwell_setup.py --material alzn    # 铝锌板材料
   python maxwell_setup.py --all              # 两种材料都仿真
+  python maxwell_setup.py --sweep --all --gap 10,20,40 --frame-th 2,3,5
+                                             # 单设计参数化扫描 (材料 × 间隙 × 板厚 × 间距)
+  python maxwell_setup.py --harmonics 1,5,7,11,13
+                                             # Setup1 附加谐波频率点 (也可给频谱 CSV)
+  python maxwell_setup.py --all --analyze --warm-start
+                                             # 第二个材料起导入第一个材料的自适应网格
 """
 
 import os
 import sys
 import time
 import argparse
-import platform
-import subprocess
-import inspect
-from typing import Optional, Tuple
-
-
-# ======================================================================
-# 跨平台 ANSYS 版本和路径自动检测 (必须在导入 pyaedt 之前执行)
-# ======================================================================
-def detect_ansys_installation():
-    """
-    自动检测 ANSYS Electronics Desktop 安装版本和路径 (Windows/Linux)
-    返回: (版本号, 安装路径) 例如 ("2022.1", "C:\\Program Files\\AnsysEM\\v221\\Win64")
-    """
-    _system = platform.system()
-
-    if _system == "Windows":
-        # 明确支持 E 盘自定义安装目录 (你当前机器使用)
-        e_drive = r"E:\Ansys2024R2\v242\Win64"
-        if os.path.exists(e_drive):
-            return ("2024.2", e_drive)
-
-        def _try_registry(base: str) -> Tuple[Optional[str], Optional[str]]:
-            try:
-                import winreg
-
-                base_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, base)
-                versions = []
-                i = 0
-                while True:
-                    try:
-                        ver = winreg.EnumKey(base_key, i)
-                        versions.append(ver)
-                        i += 1
-                    except OSError:
-                        break
-                winreg.CloseKey(base_key)
-
-                if not versions:
-                    return (None, None)
-
-                versions.sort(reverse=True)
-                detected_version = versions[0]
-                try:
-                    key = winreg.OpenKey(
-                        winreg.HKEY_LOCAL_MACHINE,
-                        rf"{base}\{detected_version}",
-                    )
-                    install_path = winreg.QueryValueEx(key, "InstallPath")[0]
-                    winreg.CloseKey(key)
-                    if install_path and os.path.exists(install_path):
-                        return (detected_version, install_path)
-                except Exception:
-                    return (detected_version, None)
-
-                return (detected_version, None)
-            except Exception:
-                return (None, None)
-
-        # 64-bit + 32-bit registry view (很多机器装完会在 WOW6432Node)
-        for base in (
-            r"SOFTWARE\Ansoft\ElectronicsDesktop",
-            r"SOFTWARE\WOW6432Node\Ansoft\ElectronicsDesktop",
-        ):
-            ver, install = _try_registry(base)
-            if ver:
-                if install and os.path.exists(install):
-                    return (ver, install)
-
-                ver_code = ver.replace(".", "")[:3]
-                candidates = [
-                    rf"C:\Program Files\AnsysEM\v{ver_code}\Win64",
-                    rf"C:\Program Files\Ansys Inc\AnsysEM\v{ver_code}\Win64",
-                ]
-                for path in candidates:
-                    if os.path.exists(path):
-                        return (ver, path)
-                return (ver, None)
-
-        # 最后兜底: 扫描常见安装目录
-        candidates = []
-        for base in (
-            r"C:\Program Files\AnsysEM",
-            r"C:\Program Files\Ansys Inc\AnsysEM",
-        ):
-            if os.path.isdir(base):
-                try:
-                    for p in os.listdir(base):
-                        if p.lower().startswith("v"):
-                            win64 = os.path.join(base, p, "Win64")
-                            if os.path.isdir(win64):
-                                candidates.append(win64)
-                except Exception:
-                    pass
-        # 选最新的一个（按文件夹名排序，v241 > v232）
-        candidates.sort(reverse=True)
-        if candidates:
-            # 无法从目录百分百反推版本号，这里只返回路径
-            return (None, candidates[0])
-
-    elif _system == "Linux":
-        linux_configs = [
-            ("2024.1", "/media/large_disk/ansysLinux/AnsysEM/v241/Linux64"),
-            ("2024.1", "/opt/AnsysEM/v241/Linux64"),
-            ("2023.2", "/opt/AnsysEM/v232/Linux64"),
-            ("2022.1", "/opt/AnsysEM/v221/Linux64"),
-        ]
-        for ver, path in linux_configs:
-            if os.path.exists(path):
-                return (ver, path)
-
-    return (None, None)
-
-
-# 检测版本和路径
-_detected_version, _ansys_path = detect_ansys_installation()
-
-if _detected_version:
-    AEDT_VERSION = _detected_version
-    print(f"[INFO] 检测到 ANSYS Electronics Desktop {AEDT_VERSION}")
-else:
-    AEDT_VERSION = "2024.1"
-    print(f"[WARN] 未检测到 ANSYS 版本，使用默认: {AEDT_VERSION}")
-
-if _ansys_path:
-    ver_code = AEDT_VERSION.replace(".", "")[:3]
-    os.environ[f"ANSYSEM_ROOT{ver_code}"] = _ansys_path
-    os.environ["ANSYSEM_DIR"] = _ansys_path
-    print(f"[INFO] ANSYS 安装路径: {_ansys_path}")
-else:
-    print(f"[INFO] 将使用 PyAEDT 默认路径检测")
-
-# 根据版本决定是否使用 gRPC (2022.2 及以上支持)
-_use_grpc = tuple(map(int, AEDT_VERSION.split("."))) >= (2022, 2)
-if not _use_grpc:
-    print(f"[INFO] AEDT {AEDT_VERSION} 不支持 gRPC，使用 COM 接口")
-
-# 必须在导入 PyAEDT/ansys.aedt.core 之前设置 settings
-try:
-    # 新架构 (PyAnsys)
-    from ansys.aedt.core import settings  # type: ignore
-    from ansys.aedt.core import Maxwell3d  # type: ignore
-except Exception:
-    # 旧包名/兼容别名
-    from pyaedt import settings  # type: ignore
-    from pyaedt import Maxwell3d  # type: ignore
-
-settings.use_grpc_api = _use_grpc
+from typing import Optional
+
+
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aedt_common.convergence import read_convergence
+from aedt_common.detection import (
+    apply_environment,
+    detect_ansys_installation,
+    resolve_aedt,
+    version_from_path,
+)
+from aedt_common.distributed import (
+    aedt_executable,
+    analyze_native,
+    merge_results,
+    plan_jobs,
+    run_jobs,
+    verify_merged,
+)
+from aedt_common.face_cache import FaceGeometry
+from aedt_common.harmonics import (
+    add_harmonic_sweep,
+    clear_harmonic_sweep,
+    harmonic_frequencies,
+    load_spectrum,
+    parse_orders,
+)
+from aedt_common.impedance import (
+    PLATE_MODELS,
+    add_surface_loss,
+    assign_impedance,
+    impedance_applies,
+)
+from aedt_common.incremental import BuildState
+from aedt_common.mesh_planner import (
+    LIBRARY_MATERIALS,
+    apply_mesh_plan,
+    fixed_plan,
+    parse_frequency,
+    plan_mesh,
+    print_mesh_plan,
+)
+from aedt_common.modeler_batch import ModelerBatch
+from aedt_common.profiler import note_project, stage, start_profiler
+from aedt_common.session_pool import get_pool
+from aedt_common.warm_start import (
+    WARM_START_PASSES,
+    link_adapted_mesh,
+    print_warm_start_summary,
+    unlink_mesh,
+)
+
+# AEDT 版本在 main() 中按需检测 (--help / --dry-run 不触发检测和 PyAEDT 导入)
+DEFAULT_AEDT_VERSION = "2024.1"
+AEDT_VERSION: Optional[str] = None
 
 
 def _open_maxwell(
@@ -173,69 +88,19 @@ def _open_maxwell(
     specified_version: Optional[str] = None,
     new_desktop_session: bool = True,
 ):
-    """稳健打开 Maxwell 设计。
+    """从会话池获取 Maxwell 设计句柄。
 
     说明:
-    - new_desktop_session=True 更稳: 即使没手动打开 AEDT 也能启动会话
-    - 如果 gRPC/版本不匹配导致连接异常, 自动回退到 COM
+    - 会话池中的桌面存活时直接附着, 否则启动新桌面 (new_desktop_session=False 时只附着)
+    - 如果 gRPC/版本不匹配导致连接异常, 会话池自动回退到 COM
     """
-
-    def _build_kwargs():
-        sig = inspect.signature(Maxwell3d.__init__)
-        if "projectname" in sig.parameters:
-            kw = dict(
-                projectname=projectname,
-                designname=designname,
-                specified_version=specified_version,
-                new_desktop_session=new_desktop_session,
-            )
-        else:
-            kw = dict(
-                project=projectname,
-                design=designname,
-                version=specified_version,
-                new_desktop=new_desktop_session,
-            )
-        if solution_type:
-            kw["solution_type"] = solution_type
-        return kw
-
-    def _try(use_grpc: bool):
-        settings.use_grpc_api = use_grpc
-        m = Maxwell3d(**_build_kwargs())
-        # 强制触发一次 modeler 初始化，避免后续出现 '_modeler' 这种延迟错误
-        _ = m.modeler.object_names
-        return m
-
-    # 首选: 按版本推断的 API
-    try:
-        return _try(_use_grpc)
-    except Exception as e1:
-        # 回退: 反向尝试
-        try:
-            return _try(not _use_grpc)
-        except Exception as e2:
-            raise RuntimeError(
-                "无法启动/连接 Maxwell(AEDT)。\n"
-                f"- 首次尝试(UseGrpc={_use_grpc})失败: {e1}\n"
-                f"- 回退尝试(UseGrpc={not _use_grpc})失败: {e2}\n"
-                "建议: 确认本机已安装 Ansys Electronics Desktop, 并传入正确的 --aedt-version 或设置安装路径环境变量。"
-            )
-
-
-def _launch_aedt_from_bat(bat_path: str, wait_seconds: int = 8) -> None:
-    """启动 AEDT (通常同时启动许可服务)。"""
-    if not os.path.isfile(bat_path):
-        print(f"[WARN] 启动脚本不存在: {bat_path}")
-        return
-
-    print(f"[INFO] 启动 AEDT: {bat_path}")
-    try:
-        comspec = os.environ.get("COMSPEC", r"C:\Windows\System32\cmd.exe")
-        subprocess.Popen([comspec, "/c", bat_path], close_fds=True)
-        time.sleep(max(0, wait_seconds))
-    except Exception as e:
-        print(f"[WARN] 启动 AEDT 失败: {e}")
+    pool = get_pool(specified_version)
+    return pool.open_design(
+        projectname,
+        designname,
+        solution_type=solution_type,
+        launch=new_desktop_session,
+    )
 
 
 # ======================================================================
@@ -279,58 +144,171 @@ frame_width = 540.0  # 框架宽度 (沿 Y 方向，容纳3根铜排)
 frame_flange = 50.0  # 框架翼缘高度 (沿 Z 方向向下)
 frame_th = 3.0  # 框架板厚
 gap = 20.0  # 铜排与框架间隙
+frame_margin = 30.0  # 框架外边界超出铜排/间隙的余量
+region_padding = 50.0  # 求解域在框架外的余量
+
+# 激励 / 网格 / 求解设置 (增量模式按这些参数的哈希决定重建哪一部分)
+CURRENT_AMPLITUDE = "4000A"
+PHASE_ANGLES = {"A": "0deg", "B": "-120deg", "C": "120deg"}
+MESH_LENGTHS = {"Mesh_Busbars": "100mm", "Mesh_Frame": "30mm"}
+# 网格模式: skin = 按趋肤深度自动规划 (见 aedt_common.mesh_planner), fixed = MESH_LENGTHS
+MESH_MODES = ("skin", "fixed")
+# 隔板模型: solid = 实体剖分; impedance = 阻抗边界, 内部不剖分 (见 aedt_common.impedance)
+IMPEDANCE_SUFFIX = "_Imp"
+# 半模型: 几何关于 YZ 平面 (x=0) 镜像对称, 只建 x>=0 一半
+# x=0 面上 B 只有法向分量 (电流沿 Z, Ax 对 x 为偶函数) -> Even Symmetry (Flux Normal)
+HALF_SUFFIX = "_Half"
+SYMMETRY_FACTOR_VAR = "Symmetry_Factor"  # 后处理按该变量把损耗还原为整模型
+SETUP_PROPS = {
+    "Frequency": "50Hz",
+    "PercentError": 2,
+    "MaximumPasses": 6,
+    "PercentRefinement": 30,
+    "BasisOrder": 1,
+}
+# 修改 _build_geometry 的建模逻辑时递增，使已有设计的几何哈希失效
+GEOMETRY_REV = 1
 
+# 参数化扫描: 一个设计 + 一个 Optimetrics 参数化 Setup 覆盖全部组合
+SWEEP_DESIGN = "EddyCurrent_Sweep"
+SWEEP_SETUP = "Sweep_Partition"
+SWEEP_MATERIAL = "Plate_Material"
+# 材料属性只能引用工程变量 ($ 前缀)，按材料序号选择电导率/磁导率
+MATERIAL_INDEX_VAR = "$Plate_Mat"
 
-def create_simulation(material_key: str, *, new_desktop_session: bool = True):
-    """创建指定材料的涡流仿真"""
 
-    mat = PLATE_MATERIALS[material_key]
-    design_name = f"EddyCurrent_{mat['design_suffix']}"
+def _select_expr(index_var: str, values: list) -> str:
+    """按序号选值的 AEDT 表达式: if(i==0, v0, if(i==1, v1, v2))"""
+    expr = str(values[-1])
+    for i in range(len(values) - 2, -1, -1):
+        expr = f"if({index_var}=={i},{values[i]},{expr})"
+    return expr
 
-    print("=" * 70)
-    print(f"创建仿真: {design_name}")
-    print(f"隔板材料: {mat['description']}")
-    print(f"  电导率: {mat['conductivity']} S/m")
-    print(f"  相对磁导率: {mat['permeability']}")
-    print("=" * 70)
 
-    # 简化设计创建流程
-    print("准备设计...")
+def _mm_values(values) -> list:
+    return [f"{v:g}mm" for v in values]
 
-    # 直接创建设计，使用 designname 参数
-    # 如果设计已存在，PyAEDT 会自动激活它
+
+def _sweep_count(sweep: dict) -> int:
+    count = len(sweep["materials"])
+    for var in ("Gap", "Frame_Th", "Space"):
+        count *= len(sweep[var])
+    return count
+
+
+def _float_list(text: str) -> list:
+    """argparse 类型: "10,20,40" -> [10.0, 20.0, 40.0]"""
     try:
-        m3d = _open_maxwell(
-            projectname=PROJECT_NAME,
-            designname=design_name,
-            solution_type=SOLVER_TYPE,
-            specified_version=AEDT_VERSION,
-            # 默认开启新会话, 避免“没开 Maxwell 导致连接失败”
-            new_desktop_session=new_desktop_session,
+        return [float(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要逗号分隔的数值: {text}")
+
+
+def _harmonic_orders(text: str) -> list:
+    """argparse 类型: 谐波次数 "1,5,7,11,13" 或频谱 CSV 路径 (取其中的次数)"""
+    try:
+        if os.path.isfile(text):
+            return sorted(load_spectrum(text, float(CURRENT_AMPLITUDE.rstrip("A"))))
+        return parse_orders(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"需要逗号分隔的谐波次数或频谱 CSV: {text} ({e})")
+
+
+def _mesh_plan(mesh_mode: str, mats: list, frame_ths: list, impedance: bool = False) -> list:
+    """母排/框架的网格操作计划
+
+    扫描模式下框架材料和板厚有多个取值, 按最小趋肤深度和最薄板厚规划
+    (对所有变化都足够细)。阻抗边界模式下框架内部不剖分, 不需要框架网格操作。
+    """
+    copper_sigma, copper_mu = LIBRARY_MATERIALS["copper"]
+    frame = min(mats, key=lambda m: m["conductivity"] * m["permeability"])
+    groups = [
+        {
+            "name": "Mesh_Busbars",
+            "objects": ["Busbar_A", "Busbar_B", "Busbar_C"],
+            "conductivity": copper_sigma,
+            "permeability": copper_mu,
+            "thickness": bus_d,
+            "fixed_length": float(MESH_LENGTHS["Mesh_Busbars"].rstrip("m")),
+        },
+        {
+            "name": "Mesh_Frame",
+            "objects": ["Plate_Frame"],
+            "conductivity": frame["conductivity"],
+            "permeability": frame["permeability"],
+            "thickness": min(frame_ths),
+            "fixed_length": float(MESH_LENGTHS["Mesh_Frame"].rstrip("m")),
+        },
+    ]
+    if impedance:
+        groups = groups[:1]
+    if mesh_mode == "fixed":
+        return fixed_plan(groups)
+    return plan_mesh(groups, SETUP_PROPS["Frequency"])
+
+
+def _impedance_ok(mats: list, frame_ths: list) -> bool:
+    """所有材料在最薄板厚下都满足表面阻抗条件 (板厚 > 2δ)"""
+    thin = [
+        m["name"] for m in mats
+        if not impedance_applies(
+            min(frame_ths), SETUP_PROPS["Frequency"], m["conductivity"], m["permeability"]
         )
-        print(f"  设计 '{design_name}' 已就绪")
+    ]
+    if thin:
+        print(f"  [WARN] {', '.join(thin)} 的趋肤深度与板厚相当, 不适用阻抗边界, 按实体建模")
+    return not thin
 
-        # 如果设计已有对象，询问是否清除
-        existing_objs = m3d.modeler.object_names
-        if existing_objs:
-            print(f"  清除 {len(existing_objs)} 个现有对象...")
-            m3d.modeler.delete(existing_objs)
 
-        # 清除现有 setup
-        for s in list(m3d.setup_names):
-            m3d.delete_setup(s)
+def _add_parametric_sweep(m3d, name: str, variations: dict):
+    """创建 Optimetrics 参数化 Setup，每个变量的取值逐个登记为 SingleValue
 
+    AEDT 对不同变量的取值做全组合，几何/材料/边界只建一次。
+    """
+    import inspect
+
+    parametrics = m3d.parametrics
+    for existing in list(getattr(parametrics, "setups", [])):
+        if existing.name == name:
+            existing.delete()
+    # PyAEDT 新旧版本的名称参数不同 (name / parametricname)
+    params = inspect.signature(parametrics.add).parameters
+    name_kw = "name" if "name" in params else "parametricname"
+
+    sweep = None
+    for var, values in variations.items():
+        for value in values:
+            if sweep is None:
+                sweep = parametrics.add(
+                    var, value, variation_type="SingleValue", **{name_kw: name}
+                )
+            else:
+                sweep.add_variation(var, value, variation_type="SingleValue")
+    try:
+        # 每个变化都保存场数据，供损耗/场图后处理
+        sweep.props["ProdOptiSetupDataV2"]["SaveFields"] = True
+        sweep.update()
     except Exception as e:
-        print(f"  设计创建失败: {e}")
-        print("  请在 Maxwell 中手动删除同名设计后重试")
-        return None
+        print(f"  [WARN] 参数化 Setup 选项设置失败: {e}")
+    return sweep
+
 
+def _build_geometry(
+    m3d, mat: dict, sweep: Optional[dict], impedance: bool = False, half: bool = False
+) -> None:
+    """[1/7]~[4/7] 变量、材料、母排/框架/求解域 (一次 RunScript 下发)
+
+    half=True 时只建 x>=0 的一半, 并在求解域 x=0 面施加对称边界。
+    """
     m3d.modeler.model_units = "mm"
 
+    # 参数/材料/几何先在本地记录, 建模结束后一次 RunScript 下发
+    batch = ModelerBatch(m3d)
+
     # ======================================================================
     # 同步参数到 Maxwell
     # ======================================================================
-    print("  [1/7] 定义参数...")
+    stage("  [1/7] 定义参数...")
     params = {
         "Bus_W": f"{bus_w}mm",  # 铜排宽度 120mm (X)
         "Bus_D": f"{bus_d}mm",  # 铜排厚度 10mm (Y)
@@ -341,60 +319,68 @@ def create_simulation(material_key: str, *, new_desktop_session: bool = True):
         "Frame_F": f"{frame_flange}mm",  # 框架翼缘高度 (Z)
         "Frame_Th": f"{frame_th}mm",  # 框架板厚
         "Gap": f"{gap}mm",
+        # 派生尺寸: 框架外边界 (比铜排范围稍大)，扫描时随 Gap/Space 变化
+        "Frame_XO": f"Bus_W/2+Gap+{frame_margin}mm",
+        "Frame_YO": f"Space+Bus_D/2+{frame_margin}mm",
+        SYMMETRY_FACTOR_VAR: "2" if half else "1",
     }
-    for k, v in params.items():
-        m3d[k] = v
+    if sweep:
+        params = dict({MATERIAL_INDEX_VAR: "0"}, **params)
+    batch.set_variables(params)
 
     # ======================================================================
     # 定义材料
     # ======================================================================
-    print("  [2/7] 定义材料...")
+    stage("  [2/7] 定义材料...")
     mat_name = mat["name"]
-    if mat_name not in m3d.materials.material_keys:
-        m = m3d.materials.add_material(mat_name)
-    else:
-        m = m3d.materials[mat_name]
-
-    m.permeability = mat["permeability"]
-    m.conductivity = mat["conductivity"]
-    m.dielectric_permittivity = 1
+    batch.add_material(
+        mat_name,
+        permeability=mat["permeability"],
+        conductivity=mat["conductivity"],
+        dielectric_permittivity=1,
+    )
 
     # ======================================================================
     # 几何建模 - 参考图结构
     # 铜排垂直 (沿 Z 向上)，L 型框架水平放置在铜排中间
     # ======================================================================
-    print("  [3/7] 创建几何模型...")
+    stage("  [3/7] 创建几何模型...")
 
     # --- 母排 (3-TMY 120×10mm，垂直放置) ---
     # 铜排沿 Z 方向 (高度)，宽度沿 X，厚度沿 Y
     # 使用数值坐标确保兼容性
 
-    # A相母排 (Y = -space_pitch)
-    bus_a = m3d.modeler.create_box(
-        origin=[-bus_w / 2, -bus_d / 2 - space_pitch, -bus_h / 2],
-        sizes=[bus_w, bus_d, bus_h],
+    # 位置/尺寸均为设计变量表达式，参数化扫描时几何随变量更新
+    # 半模型: X 方向从 0 开始, 宽度减半
+    bus_x = "0mm" if half else "-Bus_W/2"
+    bus_size = ["Bus_W/2" if half else "Bus_W", "Bus_D", "Bus_H"]
+
+    # A相母排 (Y = -Space)
+    batch.create_box(
+        origin=[bus_x, "-Bus_D/2-Space", "-Bus_H/2"],
+        sizes=bus_size,
         name="Busbar_A",
         material="copper",
+        color=(255, 0, 0),
     )
-    bus_a.color = (255, 0, 0)
 
     # B相母排 (Y = 0)
-    bus_b = m3d.modeler.create_box(
-        origin=[-bus_w / 2, -bus_d / 2, -bus_h / 2],
-        sizes=[bus_w, bus_d, bus_h],
+    batch.create_box(
+        origin=[bus_x, "-Bus_D/2", "-Bus_H/2"],
+        sizes=bus_size,
         name="Busbar_B",
         material="copper",
+        color=(0, 255, 0),
     )
-    bus_b.color = (0, 255, 0)
 
-    # C相母排 (Y = +space_pitch)
-    bus_c = m3d.modeler.create_box(
-        origin=[-bus_w / 2, -bus_d / 2 + space_pitch, -bus_h / 2],
-        sizes=[bus_w, bus_d, bus_h],
+    # C相母排 (Y = +Space)
+    batch.create_box(
+        origin=[bus_x, "-Bus_D/2+Space", "-Bus_H/2"],
+        sizes=bus_size,
         name="Busbar_C",
         material="copper",
+        color=(255, 255, 0),
     )
-    bus_c.color = (255, 255, 0)
 
     # ======================================================================
     # L 型角钢框架 (两条平行角钢，铜排从中间穿过)
@@ -403,111 +389,115 @@ def create_simulation(material_key: str, *, new_desktop_session: bool = True):
     # - 矩形隔板框架 (口字型，铜排从中间穿过)
     # - 参考原图：四边围成一个矩形框
 
-    # 框架尺寸
-    plate_th = 3.0  # 隔板厚度
-    plate_height = 50.0  # 隔板高度 (Z 方向)
-    plate_z = -plate_height / 2  # 隔板 Z 向居中
-
-    # 框架外边界 (比铜排范围稍大)
-    frame_x_outer = bus_w / 2 + gap + 30  # X 方向外边界
-    frame_y_outer = space_pitch + bus_d / 2 + 30  # Y 方向外边界
+    # 框架尺寸: 板厚 Frame_Th，高度 Frame_F (Z 向居中)
+    # 外边界 Frame_XO / Frame_YO 见 [1/7] 派生变量
+    plate_z = "-Frame_F/2"
+    # 半模型: 前/后边只建 x>=0 部分, 不建左边
+    frame_x0 = "0mm" if half else "-Frame_XO"
+    frame_lx = "Frame_XO" if half else "2*Frame_XO"
 
     # 创建矩形框架 (4 条边)
     # 前边 (+Y 侧)
-    front = m3d.modeler.create_box(
-        origin=[-frame_x_outer, frame_y_outer - plate_th, plate_z],
-        sizes=[2 * frame_x_outer, plate_th, plate_height],
+    front = batch.create_box(
+        origin=[frame_x0, "Frame_YO-Frame_Th", plate_z],
+        sizes=[frame_lx, "Frame_Th", "Frame_F"],
         name="Frame_Front",
     )
     # 后边 (-Y 侧)
-    back = m3d.modeler.create_box(
-        origin=[-frame_x_outer, -frame_y_outer, plate_z],
-        sizes=[2 * frame_x_outer, plate_th, plate_height],
+    back = batch.create_box(
+        origin=[frame_x0, "-Frame_YO", plate_z],
+        sizes=[frame_lx, "Frame_Th", "Frame_F"],
         name="Frame_Back",
     )
+    sides = [front, back]
     # 左边 (-X 侧)
-    left = m3d.modeler.create_box(
-        origin=[-frame_x_outer, -frame_y_outer, plate_z],
-        sizes=[plate_th, 2 * frame_y_outer, plate_height],
-        name="Frame_Left",
-    )
+    if not half:
+        sides.append(batch.create_box(
+            origin=["-Frame_XO", "-Frame_YO", plate_z],
+            sizes=["Frame_Th", "2*Frame_YO", "Frame_F"],
+            name="Frame_Left",
+        ))
     # 右边 (+X 侧)
-    right = m3d.modeler.create_box(
-        origin=[frame_x_outer - plate_th, -frame_y_outer, plate_z],
-        sizes=[plate_th, 2 * frame_y_outer, plate_height],
+    sides.append(batch.create_box(
+        origin=["Frame_XO-Frame_Th", "-Frame_YO", plate_z],
+        sizes=["Frame_Th", "2*Frame_YO", "Frame_F"],
         name="Frame_Right",
+    ))
+
+    # 合并各边为一个整体 (合并后保留第一个对象名)
+    merged_name = batch.unite(sides)
+    batch.set_properties(
+        merged_name,
+        material=mat_name,
+        color=(143, 175, 143),
+        transparency=0.4,
+        new_name="Plate_Frame",
+        # 阻抗边界模式: 内部不求解, 不参与剖分
+        solve_inside=not impedance,
     )
 
-    # 合并四边为一个整体
-    # unite 在不同版本里返回值略有差异，这里取第一条作为合并后的实体
-    united = m3d.modeler.unite([front.name, back.name, left.name, right.name])
-    if isinstance(united, (list, tuple)) and united:
-        merged_name = united[0]
-    else:
-        merged_name = front.name
-
-    frame = m3d.modeler[merged_name]
-    frame.name = "Plate_Frame"
-    frame.material_name = mat_name
-    frame.color = (143, 175, 143)
-    frame.transparency = 0.4
-
     # ======================================================================
     # 仿真区域 (以铜排为中心对称，Z 方向铜排端面正好贴到边界)
     # ======================================================================
-    print("  [4/7] 创建仿真区域...")
+    stage("  [4/7] 创建仿真区域...")
 
     # 计算 Region 边界 (以模型原点为中心)
     # X 方向: 框架外边界 + padding
-    x_half = frame_x_outer + 50  # 额外 50mm padding
+    x_half = f"(Frame_XO+{region_padding}mm)"
     # Y 方向: 加宽至 2 倍
-    y_half = (frame_y_outer + 50) * 2  # 原来的 2 倍
+    y_half = f"(Frame_YO+{region_padding}mm)*2"
     # Z 方向: 铜排端面正好贴到边界
-    z_half = bus_h / 2  # 铜排高度的一半
+    z_half = "Bus_H/2"
 
-    # 创建 Region (手动创建 box 并设为 vacuum)
-    region = m3d.modeler.create_box(
-        origin=[-x_half, -y_half, -z_half],
-        sizes=[2 * x_half, 2 * y_half, 2 * z_half],
+    # 创建 Region (手动创建 box 并设为 vacuum); 半模型从对称面 x=0 开始
+    batch.create_box(
+        origin=["0mm" if half else f"-{x_half}", f"-{y_half}", f"-{z_half}"],
+        sizes=[x_half if half else f"2*{x_half}", f"2*{y_half}", f"2*{z_half}"],
         name="Region",
         material="vacuum",
+        transparency=0.9,
     )
-    region.transparency = 0.9
 
-    # ======================================================================
-    # 电流激励 (使用母排 Z 方向端面)
-    # ======================================================================
-    print("  [5/7] 分配电流激励...")
+    # 一次往返下发以上全部命令, 之后再取 PyAEDT 对象 (激励需要面信息)
+    batch.flush()
 
-    phases = ["A", "B", "C"]
-    phase_angles = {"A": "0deg", "B": "-120deg", "C": "120deg"}
-    y_centers = {"A": -space_pitch, "B": 0.0, "C": space_pitch}
-    bus_objs = {"A": bus_a, "B": bus_b, "C": bus_c}
+    if half:
+        _assign_symmetry_plane(m3d)
 
-    # 铜排垂直放置，端面在 Z 方向
-    def _pick_end_faces(obj):
-        faces = getattr(obj, "faces", [])
-        if not faces:
-            return (None, None)
 
-        z_faces = []
-        for f in faces:
-            try:
-                n = f.normal
-                if n and abs(n[2]) > 0.9:
-                    z_faces.append(f)
-            except Exception:
-                pass
+def _assign_symmetry_plane(m3d) -> None:
+    """求解域 x=0 面施加 Even Symmetry (Flux Normal) 边界
+
+    assign_symmetry 按位置传参: 新旧 PyAEDT 参数名不同，但顺序一致 (面, 名称, is_odd)。
+    """
+    face_id = FaceGeometry.query(m3d, ["Region"], verbose=False).nearest("Region", "x", 0.0)
+    m3d.assign_symmetry([face_id], "Sym_YZ", False)
+    print(f"    对称面: Region 面 {face_id} (x=0), Even Symmetry (Flux Normal)")
 
-        if not z_faces:
-            z_faces = faces
 
-        def _zc(face):
-            return face.center[2]
+def _assign_currents(
+    m3d, bus_objs: dict, replace: bool = False, amplitude: str = CURRENT_AMPLITUDE
+) -> None:
+    """[5/7] 三相电流激励 (母排 Z 向端面)，replace=True 时先删除旧激励
 
-        bottom = min(z_faces, key=_zc)
-        top = max(z_faces, key=_zc)
-        return (bottom.id, top.id)
+    半模型的母排端面只有一半截面, amplitude 传入一半电流。
+    """
+    stage("  [5/7] 分配电流激励...")
+    if replace:
+        for boundary in list(m3d.boundaries):
+            if boundary.name.startswith("Cur_"):
+                boundary.delete()
+
+    phases = ["A", "B", "C"]
+    phase_angles = PHASE_ANGLES
+    y_centers = {"A": -space_pitch, "B": 0.0, "C": space_pitch}
+
+    # 铜排垂直放置，端面在 Z 方向 (法向沿 Z 的面中 z 最小/最大者)
+    # 三根母排的面几何一次批量取回, 选面在本地完成
+    geometry = FaceGeometry.query(m3d, [obj.name for obj in bus_objs.values()])
+
+    def _pick_end_faces(obj):
+        return geometry.end_faces(obj.name, "z", aligned=0.9)
 
     z_bottom = -bus_h / 2.0  # 底端
     z_top = bus_h / 2.0  # 顶端
@@ -523,71 +513,274 @@ def create_simulation(material_key: str, *, new_desktop_session: bool = True):
         if face_bottom_id and face_top_id:
             m3d.assign_current(
                 face_bottom_id,
-                amplitude="4000A",
+                amplitude=amplitude,
                 phase=angle,
                 name=f"Cur_{phase}_In",
                 solid=False,
             )
             m3d.assign_current(
                 face_top_id,
-                amplitude="4000A",
+                amplitude=amplitude,
                 phase=angle,
                 name=f"Cur_{phase}_Out",
                 solid=False,
                 swap_direction=True,
             )
-            print(f"    {phase}相: 4000A @ {angle}")
+            print(f"    {phase}相: {amplitude} @ {angle}")
         else:
             print(f"    ERROR: 无法找到 {phase} 相端面")
 
+
+def create_simulation(
+    material_key: Optional[str],
+    *,
+    new_desktop_session: bool = True,
+    sweep: Optional[dict] = None,
+    incremental: bool = False,
+    mesh_mode: str = "fixed",
+    plate_model: str = "solid",
+    half: bool = False,
+    harmonics: Optional[list] = None,
+    mesh_link: Optional[str] = None,
+    warm_passes: int = WARM_START_PASSES,
+):
+    """创建指定材料的涡流仿真
+
+    mesh_mode="skin" 时按趋肤深度自动生成网格操作, "fixed" 时使用 MESH_LENGTHS。
+    plate_model="impedance" 时隔板用阻抗边界代替实体 (设计名加 _Imp 后缀),
+    隔板损耗由表面损耗表达式 SurfaceLoss_Plate_Frame 给出; 不满足板厚 > 2δ
+    的材料自动按实体建模。
+    half=True 时利用 YZ 平面对称只建半模型 (设计名加 _Half 后缀, 母排端面电流减半),
+    设计变量 Symmetry_Factor=2 供 get_results 把损耗还原为整模型。
+    harmonics 为谐波次数列表时 Setup1 附加这些次数的离散频率点 (见
+    aedt_common.harmonics): 自适应仍在基波频率进行, 各频率点复用自适应网格,
+    EddyCurrent_Report.py --spectrum 按电流频谱加权得到谐波总损耗。
+    mesh_link 为参考设计名时 Setup1 通过 Mesh Link 导入参考设计的最终自适应网格
+    (见 aedt_common.warm_start)，只再做最多 warm_passes 个 pass。
+
+    incremental=True 时比较设计中保存的参数哈希 (见 aedt_common.incremental):
+    几何/材料/网格未变化则保留模型和自适应网格，只重建变化的激励或 Setup。
+
+    sweep 不为空时创建单个参数化设计 (SWEEP_DESIGN):
+      {"materials": [材料键...], "Gap": [mm...], "Frame_Th": [mm...], "Space": [mm...]}
+    隔板材料属性由 $Plate_Mat 选择，几何全部由设计变量驱动，
+    所有组合由一个 Optimetrics 参数化 Setup 求解。
+    """
+
+    if sweep:
+        design_name = SWEEP_DESIGN
+        sweep_mats = [PLATE_MATERIALS[k] for k in sweep["materials"]]
+        mat = {
+            "name": SWEEP_MATERIAL,
+            "conductivity": _select_expr(MATERIAL_INDEX_VAR, [m["conductivity"] for m in sweep_mats]),
+            "permeability": _select_expr(MATERIAL_INDEX_VAR, [m["permeability"] for m in sweep_mats]),
+        }
+    else:
+        mat = PLATE_MATERIALS[material_key]
+        design_name = f"EddyCurrent_{mat['design_suffix']}"
+    plate_mats = sweep_mats if sweep else [mat]
+    plate_ths = sweep["Frame_Th"] if sweep else [frame_th]
+    impedance = plate_model == "impedance" and _impedance_ok(plate_mats, plate_ths)
+    if impedance:
+        design_name += IMPEDANCE_SUFFIX
+    if half:
+        design_name += HALF_SUFFIX
+    amplitude = CURRENT_AMPLITUDE
+    if half:
+        amplitude = f"{float(CURRENT_AMPLITUDE.rstrip('A')) / 2:g}A"
+    mesh_plan = _mesh_plan(mesh_mode, plate_mats, plate_ths, impedance=impedance)
+    if mesh_link and not _can_link(mesh_link, design_name):
+        mesh_link = None
+
+    print("=" * 70)
+    print(f"创建仿真: {design_name}")
+    if sweep:
+        print(f"参数化扫描: {_sweep_count(sweep)} 个变化")
+        for i, m in enumerate(sweep_mats):
+            print(f"  {MATERIAL_INDEX_VAR}={i}: {m['description']}")
+        for var in ("Gap", "Frame_Th", "Space"):
+            print(f"  {var}: {', '.join(_mm_values(sweep[var]))}")
+    else:
+        print(f"隔板材料: {mat['description']}")
+        print(f"  电导率: {mat['conductivity']} S/m")
+        print(f"  相对磁导率: {mat['permeability']}")
+    print("=" * 70)
+
+    # 简化设计创建流程
+    stage(f"准备设计 {design_name}...")
+
+    # 直接创建设计，使用 designname 参数
+    # 如果设计已存在，PyAEDT 会自动激活它
+    try:
+        m3d = _open_maxwell(
+            projectname=PROJECT_NAME,
+            designname=design_name,
+            solution_type=SOLVER_TYPE,
+            specified_version=AEDT_VERSION,
+            # 默认开启新会话, 避免“没开 Maxwell 导致连接失败”
+            new_desktop_session=new_desktop_session,
+        )
+        print(f"  设计 '{design_name}' 已就绪")
+
+        build = BuildState(
+            m3d,
+            {
+                "geometry": {
+                    "rev": GEOMETRY_REV,
+                    "dims": [bus_w, bus_d, bus_h, space_pitch, frame_length, frame_width,
+                             frame_flange, frame_th, gap, frame_margin, region_padding],
+                    "material": mat,
+                    "mesh": mesh_plan,
+                    "plate_model": "impedance" if impedance else "solid",
+                    "half": half,
+                },
+                "excitation": {"amplitude": amplitude, "phases": PHASE_ANGLES},
+                "setup": {
+                    "props": SETUP_PROPS,
+                    "sweep": sweep,
+                    "harmonics": harmonics,
+                    "mesh_link": [mesh_link, warm_passes] if mesh_link else None,
+                },
+            },
+            enabled=incremental,
+        )
+        build.report()
+        existing_objs = m3d.modeler.object_names
+        reuse_geometry = build.unchanged("geometry") and "Plate_Frame" in existing_objs
+
+        if not reuse_geometry:
+            # 如果设计已有对象，询问是否清除
+            if existing_objs:
+                print(f"  清除 {len(existing_objs)} 个现有对象...")
+                m3d.modeler.delete(existing_objs)
+
+            # 清除现有 setup
+            for s in list(m3d.setup_names):
+                m3d.delete_setup(s)
+
+    except Exception as e:
+        print(f"  设计创建失败: {e}")
+        print("  请在 Maxwell 中手动删除同名设计后重试")
+        return None
+
+    if reuse_geometry:
+        stage("  [1/7]~[4/7] 几何/材料未变化, 复用现有模型")
+    else:
+        _build_geometry(m3d, mat, sweep, impedance=impedance, half=half)
+    bus_a = m3d.modeler["Busbar_A"]
+    bus_b = m3d.modeler["Busbar_B"]
+    bus_c = m3d.modeler["Busbar_C"]
+    frame = m3d.modeler["Plate_Frame"]
+
     # ======================================================================
-    # 涡流效应和网格
+    # 电流激励 (使用母排 Z 方向端面)
     # ======================================================================
-    print("  [6/7] 配置涡流效应和网格...")
+    if reuse_geometry and build.unchanged("excitation"):
+        stage("  [5/7] 电流激励未变化, 复用")
+    else:
+        _assign_currents(
+            m3d, {"A": bus_a, "B": bus_b, "C": bus_c},
+            replace=reuse_geometry, amplitude=amplitude,
+        )
 
-    m3d.eddy_effects_on(
-        [frame.name, bus_a.name, bus_b.name, bus_c.name],
-        enable_eddy_effects=True,
-        enable_displacement_current=False,
-    )
+    # ======================================================================
+    # 涡流效应和网格
+    # ======================================================================
+    # 复用几何时保留网格操作, 自适应网格不会失效
+    if not reuse_geometry:
+        stage("  [6/7] 配置涡流效应和网格...")
+
+        conductors = [bus_a.name, bus_b.name, bus_c.name]
+        if impedance:
+            # 隔板表面阻抗: 材料属性同 mat (扫描时为 $Plate_Mat 选择表达式)
+            assign_impedance(
+                m3d, [frame.name], mat["permeability"], mat["conductivity"], "Imp_Plate_Frame"
+            )
+            add_surface_loss(m3d, frame.name)
+            print("  隔板: 阻抗边界 Imp_Plate_Frame, 损耗表达式 SurfaceLoss_Plate_Frame")
+        else:
+            conductors.insert(0, frame.name)
+        m3d.eddy_effects_on(
+            conductors,
+            enable_eddy_effects=True,
+            enable_displacement_current=False,
+        )
 
-    m3d.mesh.assign_length_mesh(
-        [bus_a.name, bus_b.name, bus_c.name],
-        maximum_length="100mm",
-        name="Mesh_Busbars",
-    )
-    m3d.mesh.assign_length_mesh([frame.name], maximum_length="30mm", name="Mesh_Frame")
+        print_mesh_plan(mesh_plan)
+        apply_mesh_plan(m3d, mesh_plan)
 
     # ======================================================================
     # 求解设置和场图
     # ======================================================================
-    print("  [7/7] 配置求解器和场图...")
+    if reuse_geometry and build.unchanged("setup"):
+        stage("  [7/7] 求解设置未变化, 复用")
+    else:
+        stage("  [7/7] 配置求解器和场图...")
 
-    setup = m3d.create_setup(name="Setup1")
-    setup.props["Frequency"] = "50Hz"
-    setup.props["PercentError"] = 2
-    setup.props["MaximumPasses"] = 6
-    setup.props["PercentRefinement"] = 30
-    setup.props["BasisOrder"] = 1
+        # 复用几何时原地修改 Setup1 (删除再建会丢弃自适应网格)
+        if "Setup1" in m3d.setup_names:
+            setup = m3d.get_setup("Setup1")
+        else:
+            setup = m3d.create_setup(name="Setup1")
+        props = dict(SETUP_PROPS)
+        if mesh_link:
+            # 初始网格即参考设计的最终网格, 只需少量 pass 校核
+            props.update({"MaximumPasses": warm_passes, "MinimumPasses": 1})
+        for key, value in props.items():
+            setup.props[key] = value
+        setup.update()
+        if mesh_link:
+            try:
+                link_adapted_mesh(m3d, setup, mesh_link)
+                print(f"  网格热启动: 导入 {mesh_link} 的自适应网格, 最多 {warm_passes} 个 pass")
+            except Exception as e:
+                print(f"  [WARN] Mesh Link 失败, 改为冷启动: {e}")
+                setup.props["MaximumPasses"] = SETUP_PROPS["MaximumPasses"]
+                setup.update()
+        else:
+            unlink_mesh(setup)
+        if harmonics:
+            freqs = harmonic_frequencies(parse_frequency(SETUP_PROPS["Frequency"]), harmonics)
+            # 阻抗边界的隔板损耗是 Fields 表达式, 需要保存每个频率点的场
+            add_harmonic_sweep(setup, freqs, save_fields=impedance)
+            print(f"  谐波频率点: {', '.join(f'{f:g}Hz' for f in freqs)} (复用自适应网格)")
+        else:
+            clear_harmonic_sweep(setup)
 
-    # 场图 (先删除已有的再创建)
-    for plot_name in ["Plot_OhmicLoss", "Plot_J", "Plot_Mag_B"]:
-        try:
-            m3d.post.delete_field_plot(plot_name)
-        except:
-            pass
+        # 场图 (先删除已有的再创建)
+        for plot_name in ["Plot_OhmicLoss", "Plot_J", "Plot_Mag_B"]:
+            try:
+                m3d.post.delete_field_plot(plot_name)
+            except:
+                pass
 
-    m3d.post.create_fieldplot_surface(
-        [frame.name], "Ohmic_Loss", plot_name="Plot_OhmicLoss"
-    )
-    m3d.post.create_fieldplot_surface(
-        [bus_a.name, bus_b.name, bus_c.name], "J", plot_name="Plot_J"
-    )
-    m3d.post.create_fieldplot_surface(
-        [frame.name, bus_a.name, bus_b.name, bus_c.name],
-        "Mag_B",
-        plot_name="Plot_Mag_B",
-    )
+        m3d.post.create_fieldplot_surface(
+            [frame.name],
+            "SurfaceLossDensity" if impedance else "Ohmic_Loss",
+            plot_name="Plot_OhmicLoss",
+        )
+        m3d.post.create_fieldplot_surface(
+            [bus_a.name, bus_b.name, bus_c.name], "J", plot_name="Plot_J"
+        )
+        m3d.post.create_fieldplot_surface(
+            [frame.name, bus_a.name, bus_b.name, bus_c.name],
+            "Mag_B",
+            plot_name="Plot_Mag_B",
+        )
+
+        if sweep:
+            # 材料序号 × 间隙 × 板厚 × 间距，全组合由 AEDT 展开
+            _add_parametric_sweep(
+                m3d,
+                SWEEP_SETUP,
+                {
+                    MATERIAL_INDEX_VAR: [str(i) for i in range(len(sweep_mats))],
+                    "Gap": _mm_values(sweep["Gap"]),
+                    "Frame_Th": _mm_values(sweep["Frame_Th"]),
+                    "Space": _mm_values(sweep["Space"]),
+                },
+            )
+            print(f"  参数化 Setup: {SWEEP_SETUP} ({_sweep_count(sweep)} 个变化)")
 
     # 验证
     is_valid = m3d.validate_simple()
@@ -596,16 +789,113 @@ def create_simulation(material_key: str, *, new_desktop_session: bool = True):
     else:
         print("  WARN: 验证警告，请检查消息")
 
-    # 保存
+    # 保存 (参数哈希随工程一起保存, 供下次增量运行比较)
+    build.commit()
     m3d.save_project()
+    note_project(m3d)
 
-    # 释放但不关闭
-    m3d.release_desktop(close_projects=False, close_desktop=False)
+    # 释放但不关闭, 桌面留在会话池中复用
+    get_pool().release(m3d)
 
     print(f"\nOK: 设计 '{design_name}' 创建完成!")
     return design_name
 
 
+def _can_link(reference: Optional[str], design: str) -> bool:
+    """参考网格能否用于该设计: 同为实体或同为阻抗边界隔板 (Solve Inside 一致)"""
+    if not reference:
+        return False
+    if (IMPEDANCE_SUFFIX in reference) != (IMPEDANCE_SUFFIX in design):
+        print(f"  [WARN] {design} 与参考设计 {reference} 的隔板模型不同, 不使用网格热启动")
+        return False
+    return True
+
+
+def _solve_batch(m3d, targets, args, aedt_root=None):
+    """--solve-mode batch: 每个设计一个 -batchsolve 进程并行求解，结果合并回主工程并校验"""
+    stage(f"\n批量求解: {len(targets)} 个设计")
+    project_file = m3d.project_file
+    m3d.save_project()
+    # 主工程必须在桌面中关闭, 否则 -batchsolve 和结果合并会遇到工程锁
+    get_pool().release(m3d, close_projects=True)
+
+    exe = args.solver_exe or aedt_executable(aedt_root or detect_ansys_installation()[1])
+    if not exe:
+        raise RuntimeError("未找到 ansysedt 可执行文件, 请用 --solver-exe 指定")
+    jobs = plan_jobs(project_file, [(d, s, d.startswith(SWEEP_DESIGN)) for d, s in targets])
+    run_jobs(jobs, exe, cores=args.cores, tasks=args.tasks, max_parallel=args.max_jobs)
+    merged = merge_results(project_file, jobs)
+    if merged < len(jobs):
+        raise RuntimeError(f"{len(jobs) - merged} 个设计求解失败, 见 *_jobs/<设计>/batchsolve.log")
+
+    # 合并只复制了结果文件, 重新打开主工程确认 AEDT 能看到这些解
+    stage("\n校验合并结果")
+    apps = []
+
+    def reopen(design):
+        apps.append(get_pool().open_design(project_file, design, launch=False))
+        return apps[-1]
+
+    missing = verify_merged(reopen, jobs)
+    for app in apps:
+        get_pool().release(app)
+    if missing:
+        print(f"  ⚠ {len(missing)} 个设计需在 AEDT 中重新求解或直接打开对应副本: {', '.join(missing)}")
+
+
+def _print_plan(
+    material_keys, sweep=None, mesh_mode="fixed", plate_model="solid", half=False, harmonics=None,
+    warm_start=False, warm_passes=WARM_START_PASSES,
+):
+    """--dry-run: 打印设计清单和几何参数"""
+    print("\n" + "=" * 70)
+    print("Dry run: 不连接 AEDT")
+    print("=" * 70)
+    print(f"项目: {PROJECT_NAME} ({SOLVER_TYPE})")
+    if sweep:
+        mats = [PLATE_MATERIALS[k] for k in sweep["materials"]]
+        impedance = plate_model == "impedance" and _impedance_ok(mats, sweep["Frame_Th"])
+        suffix = (IMPEDANCE_SUFFIX if impedance else "") + (HALF_SUFFIX if half else "")
+        print(
+            f"  {SWEEP_DESIGN}{suffix}: 参数化 Setup {SWEEP_SETUP}, "
+            f"{_sweep_count(sweep)} 个变化"
+        )
+        for i, key in enumerate(sweep["materials"]):
+            print(f"    {MATERIAL_INDEX_VAR}={i}: {PLATE_MATERIALS[key]['name']}")
+        for var in ("Gap", "Frame_Th", "Space"):
+            print(f"    {var}: {', '.join(_mm_values(sweep[var]))}")
+        print_mesh_plan(_mesh_plan(mesh_mode, mats, sweep["Frame_Th"], impedance), indent="    ")
+        material_keys = []
+    reference = None
+    for key in material_keys:
+        mat = PLATE_MATERIALS[key]
+        impedance = plate_model == "impedance" and _impedance_ok([mat], [frame_th])
+        suffix = (IMPEDANCE_SUFFIX if impedance else "") + (HALF_SUFFIX if half else "")
+        print(
+            f"  EddyCurrent_{mat['design_suffix']}{suffix}: {mat['name']}, "
+            f"σ={mat['conductivity']} S/m, μr={mat['permeability']}"
+            + (", 隔板阻抗边界" if impedance else "")
+            + (", 半模型 (x>=0)" if half else "")
+        )
+        print_mesh_plan(_mesh_plan(mesh_mode, [mat], [frame_th], impedance), indent="    ")
+        design = f"EddyCurrent_{mat['design_suffix']}{suffix}"
+        if warm_start and reference is None:
+            reference = design
+        elif warm_start and _can_link(reference, design):
+            print(f"    网格热启动: 导入 {reference} 的自适应网格, 最多 {warm_passes} 个 pass")
+    print(
+        f"铜排: {bus_w}×{bus_d}×{bus_h} mm, 间距 {space_pitch} mm; "
+        f"框架: {frame_length}×{frame_width} mm, 翼缘 {frame_flange} mm, "
+        f"板厚 {frame_th} mm, 间隙 {gap} mm"
+    )
+    if harmonics:
+        freqs = harmonic_frequencies(parse_frequency(SETUP_PROPS["Frequency"]), harmonics)
+        print(
+            f"谐波频率扫描 (Setup1, 自适应 {SETUP_PROPS['Frequency']}): "
+            + ", ".join(f"{h}次 {f:g}Hz" for h, f in zip(harmonics, freqs))
+        )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Maxwell 涡流仿真设置")
     parser.add_argument(
@@ -616,6 +906,23 @@ def main():
         help="隔板材料: galvalume(覆铝锌板) 或 stainless(不锈钢板)",
     )
     parser.add_argument("--all", "-a", action="store_true", help="仿真所有材料")
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help=f"参数化扫描模式: 单设计 {SWEEP_DESIGN} + 参数化 Setup (材料 × 间隙 × 板厚 × 间距)",
+    )
+    parser.add_argument(
+        "--gap", type=_float_list, default=None,
+        help=f"扫描的铜排-框架间隙 mm, 逗号分隔 (默认 {gap:g})",
+    )
+    parser.add_argument(
+        "--frame-th", type=_float_list, default=None,
+        help=f"扫描的框架板厚 mm, 逗号分隔 (默认 {frame_th:g})",
+    )
+    parser.add_argument(
+        "--space-pitch", type=_float_list, default=None,
+        help=f"扫描的铜排中心间距 mm, 逗号分隔 (默认 {space_pitch:g})",
+    )
     parser.add_argument("--analyze", action="store_true", help="创建后自动运行仿真分析")
     parser.add_argument(
         "--aedt-version",
@@ -640,8 +947,91 @@ def main():
     parser.add_argument(
         "--wait-aedt",
         type=int,
-        default=8,
-        help="启动 AEDT 后等待秒数(默认 8 秒)",
+        default=120,
+        help="启动 AEDT 后最长等待秒数(默认 120 秒, 桌面就绪即继续)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只打印将要创建的设计和几何参数, 不连接 AEDT",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量模式: 几何/材料参数未变化时保留模型和自适应网格, 只更新变化的激励或 Setup",
+    )
+    parser.add_argument(
+        "--mesh",
+        choices=MESH_MODES,
+        default="fixed",
+        help="网格操作: fixed=原固定边长 MESH_LENGTHS (默认); skin=按材料/频率的趋肤深度自动规划",
+    )
+    parser.add_argument(
+        "--plate-model",
+        choices=PLATE_MODELS,
+        default="solid",
+        help=(
+            "隔板模型: solid=实体剖分 (默认); impedance=阻抗边界, 内部不剖分 "
+            "(设计名加 _Imp, 只对板厚 > 2 倍趋肤深度的材料生效)"
+        ),
+    )
+    parser.add_argument(
+        "--half-model",
+        action="store_true",
+        help="利用 YZ 平面对称只建半模型 (设计名加 _Half, 四面体数/内存约减半, 损耗在后处理中 ×2)",
+    )
+    parser.add_argument(
+        "--harmonics",
+        type=_harmonic_orders,
+        default=None,
+        help=(
+            "谐波损耗模式: Setup1 附加谐波次数的离散频率点, 如 1,5,7,11,13, "
+            "或频谱 CSV (order + amplitude_a/rms_a/percent 列, 取其中的次数)"
+        ),
+    )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help=(
+            "材料对比 (--all) 时用第一个材料的最终自适应网格热启动其余材料 (Mesh Link), "
+            "热启动设计只再做 --warm-passes 个 pass"
+        ),
+    )
+    parser.add_argument(
+        "--warm-passes", type=int, default=WARM_START_PASSES,
+        help=f"热启动设计的最大 adaptive pass 数 (默认 {WARM_START_PASSES})",
+    )
+    parser.add_argument(
+        "--solve-mode",
+        choices=["serial", "native", "batch"],
+        default="serial",
+        help=(
+            "--analyze 的求解方式: serial=逐个设计依次求解; "
+            "native=桌面内按 --cores/--tasks 分布式求解参数化变化; "
+            "batch=每个设计一个 -batchsolve 进程并行求解后合并结果"
+        ),
+    )
+    parser.add_argument("--cores", type=int, default=4, help="每个求解任务的核数 (默认 4)")
+    parser.add_argument(
+        "--tasks", type=int, default=1, help="分布式任务数, >1 时并行求解多个变化 (默认 1)"
+    )
+    parser.add_argument(
+        "--max-jobs", type=int, default=None,
+        help="batch 模式同时运行的求解进程数 (默认 CPU 核数 / --cores)",
+    )
+    parser.add_argument(
+        "--solver-exe", default=None,
+        help="batch 模式的求解程序 (默认安装目录下的 ansysedt; 本地测试可用 benchmarks/standin_batchsolve.py)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="记录分阶段耗时 (写入工程目录 *_profile.json; AEDT 调用次数需同时设置 MAXWELL_AEDT_RECORD 录制或回放)",
+    )
+    parser.add_argument(
+        "--chrome-trace",
+        action="store_true",
+        help="同时输出 Chrome trace (chrome://tracing 或 ui.perfetto.dev 打开)",
     )
 
     args = parser.parse_args()
@@ -652,25 +1042,47 @@ def main():
         args.material = "stainless"
         args.analyze = True
 
-    # 如果用户显式指定路径或版本, 覆盖自动检测结果
+    material_keys = list(PLATE_MATERIALS) if args.all else [args.material]
+    sweep = None
+    if args.sweep:
+        sweep = {
+            "materials": material_keys,
+            "Gap": args.gap or [gap],
+            "Frame_Th": args.frame_th or [frame_th],
+            "Space": args.space_pitch or [space_pitch],
+        }
+
+    if args.dry_run:
+        _print_plan(
+            material_keys, sweep=sweep, mesh_mode=args.mesh,
+            plate_model=args.plate_model, half=args.half_model, harmonics=args.harmonics,
+            warm_start=args.warm_start, warm_passes=args.warm_passes,
+        )
+        return
+
+    # 用户显式指定路径或版本时优先使用, 否则自动检测
     global AEDT_VERSION
+    aedt_root = None
     if args.aedt_path:
         if os.path.isdir(args.aedt_path):
             # 依据路径提取版本号 v242 -> 2024.2
             norm = os.path.normpath(args.aedt_path)
-            parent = os.path.basename(os.path.dirname(norm))
-            if parent.lower().startswith("v") and len(parent) >= 4:
-                ver_code = parent[1:4]
-                AEDT_VERSION = f"20{ver_code[0:2]}.{ver_code[2]}"
-                os.environ[f"ANSYSEM_ROOT{ver_code}"] = norm
-            os.environ["ANSYSEM_DIR"] = norm
+            AEDT_VERSION = version_from_path(norm) or args.aedt_version
+            apply_environment(AEDT_VERSION, norm)
+            aedt_root = norm
         else:
             print(f"[WARN] 指定的 AEDT 路径不存在: {args.aedt_path}")
     if args.aedt_version:
         AEDT_VERSION = args.aedt_version
+    if not AEDT_VERSION:
+        # 跨平台 ANSYS 版本和路径自动检测 (结果缓存, 安装目录不变时毫秒级返回)
+        AEDT_VERSION, aedt_root = resolve_aedt(default_version=DEFAULT_AEDT_VERSION)
+
+    profiler = start_profiler("EddyCurrent_setup") if args.profile or args.chrome_trace else None
 
     if args.launch_bat:
-        _launch_aedt_from_bat(args.launch_bat, wait_seconds=args.wait_aedt)
+        pool = get_pool(AEDT_VERSION)
+        pool.launch_from_bat(args.launch_bat, timeout=args.wait_aedt)
         # 已经启动 AEDT，默认使用附着模式
         args.attach = True
 
@@ -678,17 +1090,44 @@ def main():
     print("开关柜金属隔板涡流损耗仿真")
     print("=" * 70)
 
+    if args.warm_start and (sweep or not args.all):
+        print("[WARN] --warm-start 只用于材料对比 (--all, 非 --sweep), 已忽略")
+        args.warm_start = False
+
     designs = []
-    if args.all:
+    if sweep:
+        print(f"模式: 参数化扫描 ({_sweep_count(sweep)} 个变化)")
+        design = create_simulation(
+            None, new_desktop_session=(not args.attach), sweep=sweep,
+            incremental=args.incremental, mesh_mode=args.mesh,
+            plate_model=args.plate_model, half=args.half_model,
+            harmonics=args.harmonics,
+        )
+        if design:
+            designs.append(design)
+    elif args.all:
         print("模式: 材料对比 (钢板 + 铝锌板)")
         for mat_key in PLATE_MATERIALS:
-            design = create_simulation(mat_key, new_desktop_session=(not args.attach))
+            # 热启动: 第一个成功创建的设计为参考, 其余设计导入它的自适应网格
+            reference = next((d for d in designs if d), None) if args.warm_start else None
+            design = create_simulation(
+                mat_key, new_desktop_session=(not args.attach),
+                incremental=args.incremental, mesh_mode=args.mesh,
+                plate_model=args.plate_model, half=args.half_model,
+                harmonics=args.harmonics,
+                mesh_link=reference,
+                warm_passes=args.warm_passes,
+            )
             designs.append(design)
-            time.sleep(2)
         print(f"\n创建的设计: {designs}")
     else:
         print(f"材料: {PLATE_MATERIALS[args.material]['description']}")
-        design = create_simulation(args.material, new_desktop_session=(not args.attach))
+        design = create_simulation(
+            args.material, new_desktop_session=(not args.attach),
+            incremental=args.incremental, mesh_mode=args.mesh,
+            plate_model=args.plate_model, half=args.half_model,
+            harmonics=args.harmonics,
+        )
         if design:
             designs.append(design)
 
@@ -706,22 +1145,48 @@ def main():
                 new_desktop_session=(not args.attach),
             )
 
-            # 运行所有设计的分析
-            for design_name in designs:
-                if design_name:
-                    print(f"\n分析设计: {design_name}")
+            # 扫描设计求解参数化 Setup (包含全部变化)
+            targets = [
+                (d, SWEEP_SETUP if d.startswith(SWEEP_DESIGN) else "Setup1") for d in designs if d
+            ]
+            if args.solve_mode == "batch" and args.warm_start:
+                # 批量模式的工程副本里没有参考设计的解, Mesh Link 无法导入网格
+                print("[WARN] 网格热启动需要参考设计的解在同一工程中, 改为桌面内依次求解")
+            if args.solve_mode == "batch" and not args.warm_start:
+                _solve_batch(m3d, targets, args, aedt_root)
+            else:
+                # 运行所有设计的分析 (热启动时参考设计在最前面, 先求解)
+                solves = []
+                for i, (design_name, setup_name) in enumerate(targets):
+                    stage(f"\n分析设计: {design_name}")
                     m3d.set_active_design(design_name)
-                    m3d.analyze_setup("Setup1")
-                    print(f"  OK: {design_name} 分析完成")
-
-            m3d.save_project()
-            m3d.release_desktop(close_projects=False, close_desktop=False)
+                    t0 = time.perf_counter()
+                    if args.solve_mode == "native":
+                        analyze_native(m3d, setup_name, args.cores, args.tasks)
+                    else:
+                        m3d.analyze_setup(setup_name)
+                    elapsed = time.perf_counter() - t0
+                    print(f"  OK: {design_name} 分析完成 ({elapsed:.1f}s)")
+                    if args.warm_start:
+                        solves.append({
+                            "design": design_name,
+                            "passes": len(read_convergence(m3d, setup_name)),
+                            "elapsed": elapsed,
+                            "warm": i > 0 and _can_link(targets[0][0], design_name),
+                        })
+                print_warm_start_summary(solves)
+
+                m3d.save_project()
+                get_pool().release(m3d)
             print("\nOK: 所有仿真分析完成!")
 
         except Exception as e:
             print(f"\n✗ 仿真运行出错: {e}")
             print("  请在 Maxwell 中手动运行 Analyze All")
 
+    if profiler is not None:
+        profiler.save(chrome=args.chrome_trace)
+
     print("\n" + "=" * 70)
     if args.analyze:
         print("完成! 可运行 maxwell_report.py 生成报告")
@@ -10,63 +10,27 @@ ElectrostaticField_Setup.py - KYN28开关柜静电场仿真分析设置脚本
   - 自动创建仿真区域 (Region)
   - 设置三相电压激励与接地边界
   - 配置自适应网格与求解设置
+  - --superposition: 改为三相单位激励 (三次求解)，任意电压/相位/耐压试验
+    在 KYN28_Electrostatic_Post.py --superposition 中组合，不再重新求解
 """
 
 import os
 import sys
 import argparse
-import platform
 
-# ======================================================================
-# 跨平台 ANSYS 版本检测
-# ======================================================================
-def detect_ansys_installation():
-    """自动检测 ANSYS 安装版本和路径"""
-    system = platform.system()
-    if system == "Windows":
-        try:
-            import winreg
-            for ver in ["242", "241", "232", "231", "222", "221"]:
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                        f"SOFTWARE\\Ansoft\\ElectronicsDesktop\\{ver}\\Desktop")
-                    path, _ = winreg.QueryValueEx(key, "InstallDir")
-                    winreg.CloseKey(key)
-                    # 检查路径是否存在
-                    if os.path.isdir(path):
-                        version = f"20{ver[:2]}.{ver[2]}"
-                        return (version, path)
-                except:
-                    continue
-        except ImportError:
-            pass
-        
-        # 常见安装路径检查
-        for ver in ["242", "241", "222"]:
-            for drive in ["G:", "F:", "E:", "D:", "C:"]:
-                path = os.path.join(drive, f"Ansys{2000+int(ver[:2])}R{ver[2]}", f"v{ver}", "Win64")
-                if os.path.isdir(path):
-                    return (f"20{ver[:2]}.{ver[2]}", path)
-    return (None, None)
-
-_version, _path = detect_ansys_installation()
-AEDT_VERSION = _version if _version else "2024.2"
-
-if _path:
-    v_code = AEDT_VERSION.replace(".", "")[:3]
-    os.environ[f"ANSYSEM_ROOT{v_code}"] = _path
-    print(f"[INFO] 使用 ANSYS Electronics Desktop {AEDT_VERSION}")
-    print(f"[INFO] 路径: {_path}")
-else:
-    print(f"[WARN] 未检测到安装路径，将尝试默认检测")
-
-# PyAEDT 设置
-from pyaedt import settings
-# 如果是较新版本则优先使用 gRPC
-settings.use_grpc_api = tuple(map(int, AEDT_VERSION.split("."))) >= (2022, 2)
-settings.enable_error_handler = False
-
-from pyaedt import Maxwell3d
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aedt_common.cad_cache import import_cad
+from aedt_common.cleanup import cleanup_small_parts, exclude
+from aedt_common.detection import resolve_aedt
+from aedt_common.part_classifier import PartTable, apply_classes, classify
+from aedt_common.profiler import note_project, stage, start_profiler
+from aedt_common.session_pool import defer_settings, get_pool
+from aedt_common.superposition import add_unit_sweep, assign_unit_excitations, phase_nets
+
+# PyAEDT 设置 (首次连接桌面时才导入 PyAEDT)
+defer_settings(enable_error_handler=False)
 
 # ======================================================================
 # 配置参数
@@ -76,31 +40,38 @@ PROJECT_NAME = "KYN28_Electrostatic"
 DESIGN_NAME = "ElectrostaticField"
 # 12kV 系统的峰值电压 (12kV * sqrt(2))
 PEAK_VOLTAGE = 16970 
+# 零件分类: 长宽比 > BUSBAR_ASPECT 且最长边 > 100mm 为母排; 实体体积 > GROUND_VOLUME 的构架接地
+BUSBAR_ASPECT = 6
+GROUND_VOLUME = 1e6  # mm³
 
-def main(voltage=None, analyze=False, non_graphical=False):
+def main(voltage=None, analyze=False, non_graphical=False, busbar_aspect=BUSBAR_ASPECT, cad_cache=True,
+         cleanup=False, cleanup_measure=False, superposition=False):
     if voltage is None:
         voltage = PEAK_VOLTAGE
     
     print("\n" + "="*70)
     print(f"KYN28 开关柜静电场仿真设置")
     print(f"模型: {os.path.basename(MODEL_FILE)}")
-    print(f"激励: ±{voltage/1000:.2f}kV")
+    if superposition:
+        print("激励: 三相单位电压 (A/B/C 各 1V, 后处理叠加)")
+    else:
+        print(f"激励: ±{voltage/1000:.2f}kV")
     print("="*70)
     
     if not os.path.exists(MODEL_FILE):
         print(f"✗ 错误: 模型文件不存在: {MODEL_FILE}")
         return False
 
+    # 跨平台 ANSYS 版本检测 (结果缓存, 安装目录不变时毫秒级返回)
+    aedt_version, _ = resolve_aedt(default_version="2024.2")
+
     # [1] 启动 Maxwell
-    print("\n[1] 启动 Maxwell 设计环境...")
+    stage("\n[1] 启动 Maxwell 设计环境...")
     try:
-        m3d = Maxwell3d(
-            projectname=PROJECT_NAME,
-            designname=DESIGN_NAME,
+        m3d = get_pool(aedt_version, non_graphical=non_graphical).open_design(
+            PROJECT_NAME,
+            DESIGN_NAME,
             solution_type="Electrostatic",
-            specified_version=AEDT_VERSION,
-            new_desktop_session=True,
-            non_graphical=non_graphical
         )
         print(f"  ✓ 已连接: {m3d.project_name}/{m3d.design_name}")
     except Exception as e:
@@ -108,55 +79,46 @@ def main(voltage=None, analyze=False, non_graphical=False):
         return False
 
     # [2] 导入几何模型
-    print("\n[2] 导入三维模型...")
+    stage("\n[2] 导入三维模型...")
     try:
         # 清除现有对象以便重复运行
         if m3d.modeler.object_names:
             m3d.modeler.delete(m3d.modeler.object_names)
             
-        m3d.modeler.import_3d_cad(MODEL_FILE, healing=True)
+        # 修复后的几何按模型内容哈希缓存, 模型未变时直接载入
+        import_cad(m3d, MODEL_FILE, healing=True, use_cache=cad_cache)
         m3d.modeler.refresh_all_ids()
         
         objs = [n for n in m3d.modeler.solid_names if "Region" not in n]
         print(f"  ✓ 成功导入 {len(objs)} 个实体零件")
     except Exception as e:
         print(f"  ✗ 导入失败: {e}")
-        m3d.release_desktop(False, False)
+        get_pool().release(m3d)
         return False
 
     # [3] 自动分类与材质分配
-    print("\n[3] 物理属性配置...")
-    busbars = []
-    frames = []
-    
-    for name in objs:
-        try:
-            obj = m3d.modeler[name]
-            bb = obj.bounding_box # [xmin, ymin, zmin, xmax, ymax, zmax]
-            dx = abs(bb[3]-bb[0])
-            dy = abs(bb[4]-bb[1])
-            dz = abs(bb[5]-bb[2])
-            dims = [dx, dy, dz]
-            
-            # 简单的母排识别逻辑: 细长且体积较小
-            if max(dims)/min(dims) > 6 and max(dims) > 100:
-                busbars.append(name)
-                obj.material_name = "copper"
-                obj.color = (200, 100, 0)
-            else:
-                frames.append(name)
-                # 构架默认为普通钢材或铝锌板基材
-                obj.material_name = "steel_1008" 
-                obj.color = (128, 128, 128)
-                obj.transparency = 0.5
-        except:
-            pass
+    stage("\n[3] 物理属性配置...")
+    # 全部零件的包围盒/体积一次取回, 向量化分类 (简单的母排识别逻辑: 细长)
+    table = PartTable.query(m3d, objs)
+    classes = classify(table, busbar_aspect=busbar_aspect)
+
+    # 删除螺栓/垫圈等小零件 (与高压母排接触的保留)
+    if cleanup:
+        removed = set(cleanup_small_parts(m3d, table, protected=classes["busbar"], measure=cleanup_measure))
+        objs = [o for o in objs if o not in removed]
+        classes = exclude(classes, removed)
+    busbars, frames = classes["busbar"], classes["frame"]
+    apply_classes(m3d, classes, {
+        "busbar": {"material": "copper", "color": (200, 100, 0)},
+        # 构架默认为普通钢材或铝锌板基材
+        "frame": {"material": "steel_1008", "color": (128, 128, 128), "transparency": 0.5},
+    })
 
     print(f"  ✓ 母排识别: {len(busbars)} 个 (铜)")
     print(f"  ✓ 构架识别: {len(frames)} 个 (钢)")
 
     # [4] 创建仿真区域
-    print("\n[4] 创建仿真区域 (Region)...")
+    stage("\n[4] 创建仿真区域 (Region)...")
     try:
         m3d.modeler.create_region(pad_percent=30)
         print("  ✓ 已添加 30% 边界裕量")
@@ -164,27 +126,33 @@ def main(voltage=None, analyze=False, non_graphical=False):
         pass
 
     # [5] 设置激励 (三相电压)
-    print("\n[5] 设置电压激励...")
+    stage("\n[5] 设置电压激励...")
     # 这里根据识别出的母排数量，尝试分配 A(+V), B(0), C(-V)
-    # 也可以根据位置 Y 坐标排序
-    busbars_sorted = sorted(busbars, key=lambda x: m3d.modeler[x].position[1])
+    # 按包围盒中心 Y 坐标排序
+    busbars_sorted = table.sort_by(busbars, axis=1)
     
-    for i, name in enumerate(busbars_sorted):
-        # 简化的分配: 依次为 正、零、负
-        v_val = [voltage, 0, -voltage][i % 3]
-        m3d.assign_voltage([name], v_val, name=f"Voltage_{name}")
-        print(f"  {name:20}: {v_val/1000:+.1f} kV")
+    nets = None
+    if superposition:
+        # 同样的轮换规则分为 A/B/C 三个网络, 电压随 Unit_Case 在 1V/0V 间切换
+        nets = phase_nets(busbars_sorted)
+        assign_unit_excitations(m3d, nets)
+    else:
+        for i, name in enumerate(busbars_sorted):
+            # 简化的分配: 依次为 正、零、负
+            v_val = [voltage, 0, -voltage][i % 3]
+            m3d.assign_voltage([name], v_val, name=f"Voltage_{name}")
+            print(f"  {name:20}: {v_val/1000:+.1f} kV")
 
     # [6] 设置接地
-    print("\n[6] 设置接地边界...")
+    stage("\n[6] 设置接地边界...")
     # 将体积较大的构架选为接地
-    gnd_objs = [n for n in frames if m3d.modeler[n].volume > 1e6]
+    gnd_objs = [n for n, v in zip(frames, table.solid_volume(frames)) if v > GROUND_VOLUME]
     if gnd_objs:
         m3d.assign_voltage(gnd_objs, 0, name="Base_GND")
         print(f"  ✓ 已将 {len(gnd_objs)} 个主要构架零件设为 0V 接地")
 
     # [7] 网格与求解设置
-    print("\n[7] 求解器配置...")
+    stage("\n[7] 求解器配置...")
     try:
         # 细化母排网格
         if busbars:
@@ -196,6 +164,7 @@ def main(voltage=None, analyze=False, non_graphical=False):
         print("  ✓ Setup1: MaxPasses=10, Error=1%")
     except Exception as e:
         print(f"  ⚠ 求解器设置警告: {e}")
+    sweep = add_unit_sweep(m3d, "Setup1", nets) if nets else None
 
     # [8] 保存项目
     try:
@@ -206,15 +175,21 @@ def main(voltage=None, analyze=False, non_graphical=False):
 
     # [9] 自动分析
     if analyze:
-        print("\n[8] 开始执行仿真计算...")
+        stage("\n[8] 开始执行仿真计算...")
         try:
-            m3d.analyze_nominal()
+            if sweep:
+                # 三个单位解; 求解后保存, 后处理据项目文件时间判断单位解缓存是否过期
+                m3d.analyze_setup(sweep)
+                m3d.save_project()
+            else:
+                m3d.analyze_nominal()
             print("  ✓ 仿真完成")
         except Exception as e:
             print(f"  ✗ 仿真运行异常: {e}")
 
     # 释放但不关闭图形界面
-    m3d.release_desktop(close_projects=False, close_desktop=False)
+    note_project(m3d)
+    get_pool().release(m3d)
     return True
 
 if __name__ == "__main__":
@@ -222,11 +197,28 @@ if __name__ == "__main__":
     parser.add_argument("--voltage", "-v", type=float, help="设置测试电压(V)")
     parser.add_argument("--analyze", "-a", action="store_true", help="自动开始分析")
     parser.add_argument("--non-graphical", "-ng", action="store_true", help="静默模式运行")
+    parser.add_argument("--busbar-aspect", type=float, default=BUSBAR_ASPECT,
+                        help=f"母排识别的长宽比阈值 (默认 {BUSBAR_ASPECT})")
+    parser.add_argument("--no-cad-cache", action="store_true", help="不使用修复后几何缓存, 重新导入修复")
+    parser.add_argument("--cleanup", action="store_true",
+                        help="删除螺栓/垫圈等小零件 (会改变几何, 默认不删除)")
+    parser.add_argument("--cleanup-measure", action="store_true",
+                        help="清理前后各生成一次初始网格, 报告四面体数变化")
+    parser.add_argument("--superposition", action="store_true",
+                        help="三相单位激励 (三次求解), 电压/相位在后处理中叠加")
+    parser.add_argument("--profile", action="store_true", help="记录分阶段耗时 (写入 *_profile.json; AEDT 调用次数需同时设置 MAXWELL_AEDT_RECORD 录制)")
+    parser.add_argument("--chrome-trace", action="store_true", help="同时输出 Chrome trace")
     
     args = parser.parse_args()
+    profiler = start_profiler("ElectrostaticField_Setup") if args.profile or args.chrome_trace else None
     
     try:
-        if main(args.voltage, args.analyze, args.non_graphical):
+        ok = main(args.voltage, args.analyze, args.non_graphical, args.busbar_aspect,
+                  cad_cache=not args.no_cad_cache, cleanup=args.cleanup,
+                  cleanup_measure=args.cleanup_measure, superposition=args.superposition)
+        if profiler is not None:
+            profiler.save(chrome=args.chrome_trace)
+        if ok:
             print("\n✅ 环境部署成功！")
         else:
             print("\n❌ 脚本运行中止")
@@ -6,36 +6,49 @@ KYN28_ElectrostaticField_Setup.py - KYN28开关柜静电场分析
 用法:
   python KYN28_ElectrostaticField_Setup.py
   python KYN28_ElectrostaticField_Setup.py --voltage 42000
+  python KYN28_ElectrostaticField_Setup.py --superposition -a   # 三相单位激励, 后处理叠加
 """
 
 import os
 import sys
 import argparse
 
-# 设置 ANSYS 2024R2 路径
-os.environ["ANSYSEM_ROOT242"] = r"G:\Ansys2024R2\v242\Win64"
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# PyAEDT 配置
-from pyaedt import settings
-settings.use_grpc_api = False
-settings.enable_error_handler = False
+from aedt_common.cad_cache import import_cad
+from aedt_common.cleanup import cleanup_small_parts, exclude
+from aedt_common.detection import resolve_aedt
+from aedt_common.part_classifier import PartTable, apply_classes, classify
+from aedt_common.profiler import note_project, stage, start_profiler
+from aedt_common.session_pool import defer_settings, get_pool
+from aedt_common.superposition import add_unit_sweep, assign_unit_excitations, phase_nets
 
-from pyaedt import Maxwell3d
+# PyAEDT 配置 (该脚本使用 COM 接口, 由会话池设置 use_grpc_api)
+defer_settings(enable_error_handler=False)
 
 # 配置
 MODEL_FILE = r"F:\MULTI\drawings\SeismicAnalysis_In.igs"
 PROJECT_NAME = "KYN28_Electrostatic"
 DESIGN_NAME = "ElectrostaticField"
-AEDT_VERSION = "2024.2"
 VOLTAGE = 16970  # 12kV × √2
+BUSBAR_ASPECT = 8     # 母排: 长宽比 > 8 且最长边 > 100mm
+FRAME_VOLUME = 1e8    # 框架: 包围盒体积 > 1e8 mm³
 
-def main(voltage=None, analyze=False, fillet_radius=0):
+def main(voltage=None, analyze=False, fillet_radius=0, busbar_aspect=BUSBAR_ASPECT, cad_cache=True,
+         cleanup=False, cleanup_measure=False, superposition=False):
     if voltage is None:
         voltage = VOLTAGE
     
-    print(f"\n[KYN28 静电场分析] ANSYS 2024R2")
+    # 检测 ANSYS 安装并设置路径 (结果缓存; 默认 2024R2)
+    aedt_version, _ = resolve_aedt(default_version="2024.2", verbose=False)
+
+    print(f"\n[KYN28 静电场分析] ANSYS {aedt_version}")
     print(f"  模型: {os.path.basename(MODEL_FILE)}")
-    print(f"  电压: ±{voltage/1000:.1f}kV")
+    if superposition:
+        print("  电压: 三相单位激励 (后处理叠加)")
+    else:
+        print(f"  电压: ±{voltage/1000:.1f}kV")
     if fillet_radius > 0:
         print(f"  倒角: R={fillet_radius}mm (优化尖峰场强)")
     print("")
@@ -45,14 +58,12 @@ def main(voltage=None, analyze=False, fillet_radius=0):
         return False
     
     # 创建 Maxwell 项目 - 让 PyAEDT 处理一切
-    print("[1] 创建Maxwell项目...")
+    stage("[1] 创建Maxwell项目...")
     try:
-        m3d = Maxwell3d(
-            projectname=PROJECT_NAME,
-            designname=DESIGN_NAME,
+        m3d = get_pool(aedt_version, use_grpc=False).open_design(
+            PROJECT_NAME,
+            DESIGN_NAME,
             solution_type="Electrostatic",
-            specified_version=AEDT_VERSION,
-            new_desktop_session=True
         )
         print(f"  ✓ {m3d.project_name}/{m3d.design_name}")
     except Exception as e:
@@ -61,48 +72,48 @@ def main(voltage=None, analyze=False, fillet_radius=0):
         return False
     
     # 导入模型
-    print("\n[2] 导入模型...")
+    stage("\n[2] 导入模型...")
     try:
-        m3d.modeler.import_3d_cad(MODEL_FILE, healing=True)
+        import_cad(m3d, MODEL_FILE, healing=True, use_cache=cad_cache)
         m3d.modeler.refresh_all_ids()
         objs = [n for n in m3d.modeler.solid_names if "Region" not in n]
         print(f"  ✓ {len(objs)} 个对象")
     except Exception as e:
         print(f"  ✗ 导入失败: {e}")
-        m3d.release_desktop(False, False)
+        get_pool().release(m3d)
         return False
     
     # 分类对象
-    print("\n[3] 分类...")
-    busbars, frames = [], []
-    for n in objs:
-        try:
-            bb = m3d.modeler[n].bounding_box
-            if bb:
-                dims = [abs(bb[i+3]-bb[i]) for i in range(3)]
-                if max(dims)/min(dims) > 8 and max(dims) > 100:
-                    busbars.append(n)
-                elif dims[0]*dims[1]*dims[2] > 1e8:
-                    frames.append(n)
-        except:
-            pass
+    stage("\n[3] 分类...")
+    table = PartTable.query(m3d, objs)
+    classes = classify(table, busbar_aspect=busbar_aspect, frame_volume=FRAME_VOLUME)
+
+    # 删除螺栓/垫圈等小零件 (与高压母排接触的保留)
+    if cleanup:
+        removed = set(cleanup_small_parts(m3d, table, protected=classes["busbar"], measure=cleanup_measure))
+        objs = [o for o in objs if o not in removed]
+        classes = exclude(classes, removed)
+    busbars, frames = classes["busbar"], classes["frame"]
     if not frames:
         frames = objs[:10]
-    print(f"  母排: {len(busbars)} | 框架: {len(frames)}")
+    print(f"  母排: {len(busbars)} | 框架: {len(frames)} | 小零件: {len(classes['small'])}")
     
     # 赋材料
-    print("\n[4] 赋材料...")
-    for n in busbars:
-        try: m3d.modeler[n].material_name = "copper"
-        except: pass
-    for n in frames + [o for o in objs if o not in busbars]:
-        try: m3d.modeler[n].material_name = "steel_1008"
-        except: pass
+    stage("\n[4] 赋材料...")
+    # 母排以外的零件 (框架 + 小零件, 以及包围盒未知的对象) 均为钢
+    busbar_set = set(busbars)
+    apply_classes(m3d, {
+        "busbar": busbars,
+        "steel": [o for o in objs if o not in busbar_set],
+    }, {
+        "busbar": {"material": "copper"},
+        "steel": {"material": "steel_1008"},
+    })
     print("  ✓ copper / steel_1008")
     
     # 几何倒角处理 (解决奇异性)
     if fillet_radius > 0:
-        print(f"\n[4.5] 几何倒角 (R={fillet_radius}mm)...")
+        stage(f"\n[4.5] 几何倒角 (R={fillet_radius}mm)...")
         count = 0
         for n in busbars:
             try:
@@ -116,7 +127,7 @@ def main(voltage=None, analyze=False, fillet_radius=0):
         print(f"  ✓ 已对 {count} 个母排进行倒角优化")
     
     # Region
-    print("\n[5] 创建Region...")
+    stage("\n[5] 创建Region...")
     try:
         if "Region" not in m3d.modeler.solid_names:
             m3d.modeler.create_region(pad_percent=30)
@@ -125,13 +136,18 @@ def main(voltage=None, analyze=False, fillet_radius=0):
         print(f"  ⚠ {e}")
     
     # 边界条件
-    print("\n[6] 边界条件...")
-    for i, n in enumerate(busbars):
-        v = [voltage, 0, -voltage][i % 3]
-        try:
-            m3d.assign_voltage([n], v, name=f"V{i}")
-            print(f"  {n[:20]}: {v/1000:+.0f}kV")
-        except: pass
+    stage("\n[6] 边界条件...")
+    nets = None
+    if superposition:
+        nets = phase_nets(busbars)
+        assign_unit_excitations(m3d, nets)
+    else:
+        for i, n in enumerate(busbars):
+            v = [voltage, 0, -voltage][i % 3]
+            try:
+                m3d.assign_voltage([n], v, name=f"V{i}")
+                print(f"  {n[:20]}: {v/1000:+.0f}kV")
+            except: pass
     
     # 接地处理：除母线外的所有导电部件默认接地
     gnd = [n for n in objs if n not in busbars]
@@ -146,7 +162,7 @@ def main(voltage=None, analyze=False, fillet_radius=0):
         except: pass
     
     # 网格
-    print("\n[7] 网格设置...")
+    stage("\n[7] 网格设置...")
     try:
         # 全局网格
         m3d.mesh.assign_length_mesh(assignment=objs, maximum_length=30, name="Global_Parts")
@@ -160,19 +176,23 @@ def main(voltage=None, analyze=False, fillet_radius=0):
     except: pass
     
     # 分析设置
-    print("\n[8] 分析设置...")
+    stage("\n[8] 分析设置...")
     try:
         setup = m3d.create_setup("Setup1")
         setup.props["MaximumPasses"] = 10
         setup.props["PercentError"] = 1.0
         print("  ✓ MaxPasses=10, Error=1%")
     except: pass
+    sweep = add_unit_sweep(m3d, "Setup1", nets) if nets else None
     
     # 求解
     if analyze:
-        print("\n[求解中...]")
+        stage("\n[求解中...]")
         try:
-            m3d.analyze()
+            if sweep:
+                m3d.analyze_setup(sweep)
+            else:
+                m3d.analyze()
             print("  ✓ 完成")
         except Exception as e:
             print(f"  ✗ {e}")
@@ -183,8 +203,12 @@ def main(voltage=None, analyze=False, fillet_radius=0):
         print(f"\n✓ 项目已保存")
     except: pass
     
-    m3d.release_desktop(False, False)
-    print("\n后续: Maxwell → Analyze All → Field Overlays → Mag_E")
+    note_project(m3d)
+    get_pool().release(m3d)
+    if sweep:
+        print("\n后续: python KYN28_Electrostatic_Post.py --superposition")
+    else:
+        print("\n后续: Maxwell → Analyze All → Field Overlays → Mag_E")
     return True
 
 if __name__ == "__main__":
@@ -192,9 +216,25 @@ if __name__ == "__main__":
     parser.add_argument("--voltage", "-v", type=float)
     parser.add_argument("--analyze", "-a", action="store_true")
     parser.add_argument("--fillet", "-f", type=float, default=0.0, help="Fillet radius in mm for busbars")
+    parser.add_argument("--busbar-aspect", type=float, default=BUSBAR_ASPECT,
+                        help=f"母排识别的长宽比阈值 (默认 {BUSBAR_ASPECT})")
+    parser.add_argument("--no-cad-cache", action="store_true", help="不使用修复后几何缓存, 重新导入修复")
+    parser.add_argument("--cleanup", action="store_true",
+                        help="删除螺栓/垫圈等小零件 (会改变几何, 默认不删除)")
+    parser.add_argument("--cleanup-measure", action="store_true",
+                        help="清理前后各生成一次初始网格, 报告四面体数变化")
+    parser.add_argument("--superposition", action="store_true",
+                        help="三相单位激励 (三次求解), 电压/相位在后处理中叠加")
+    parser.add_argument("--profile", action="store_true", help="记录分阶段耗时 (写入 *_profile.json; AEDT 调用次数需同时设置 MAXWELL_AEDT_RECORD 录制)")
+    parser.add_argument("--chrome-trace", action="store_true", help="同时输出 Chrome trace")
     args = parser.parse_args()
+    profiler = start_profiler("KYN28_ElectrostaticField_Setup") if args.profile or args.chrome_trace else None
     
-    if main(args.voltage, args.analyze, args.fillet):
+    ok = main(args.voltage, args.analyze, args.fillet, args.busbar_aspect, not args.no_cad_cache,
+              args.cleanup, args.cleanup_measure, args.superposition)
+    if profiler is not None:
+        profiler.save(chrome=args.chrome_trace)
+    if ok:
         print("\n✅ 完成")
     else:
         print("\n❌ 失败")
@@ -6,33 +6,72 @@ KYN28_Electrostatic_Post.py
 1. 连接到当前已打开的 Maxwell 会话 (不启动新窗口)。
 2. 创建切面 (CutPlane) 并生成 0-3kV/mm 限制的云图。
 3. 创建 3kV/mm 的等值面 (Iso-Surface) 用于 3D 击穿判定。
+4. --superposition: 组合设置脚本 --superposition 求得的三相单位解
+   (aedt_common.superposition)，不重新求解即可评估任意电压、任意相位
+   (0–360° 扫描最恶劣时刻) 与工频耐压试验电压。
+5. --breakdown: 导出 Mag_E (规则网格或网格节点) 并分块统计超过 3kV/mm 的
+   体积、连通域及最近零件，判定奇异点 / 击穿路径 (aedt_common.breakdown,
+   即体积排除法的自动化)。与 --superposition 同用时分析周期包络。
+
+用法:
+  python KYN28_Electrostatic_Post.py                                # 切面云图 + 等值面
+  python KYN28_Electrostatic_Post.py --superposition                # 额定电压, 0–360° 扫描
+  python KYN28_Electrostatic_Post.py --superposition --phase 30 --voltage 16970
+  python KYN28_Electrostatic_Post.py --superposition --test-kv 42   # 42kV 工频耐压
+  python KYN28_Electrostatic_Post.py --breakdown                    # 当前解的击穿体积
+  python KYN28_Electrostatic_Post.py --superposition --breakdown    # 周期包络的击穿体积
+  python KYN28_Electrostatic_Post.py --breakdown --fld Mag_E.fld    # 分析已有场文件
 """
 import os
 import sys
+import argparse
 
-# 设置 ANSYS 2024R2 路径 (如果需要)
-os.environ["ANSYSEM_ROOT242"] = r"G:\Ansys2024R2\v242\Win64"
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pyaedt import Maxwell3d
-from pyaedt import settings
+from aedt_common.breakdown import (
+    analyze_field_file,
+    export_mag_e,
+    grid_header,
+    load_parts,
+    save_parts,
+    write_components_csv,
+)
+from aedt_common.detection import resolve_aedt
+from aedt_common.field_data import write_field_file
+from aedt_common.part_classifier import PartTable
+from aedt_common.session_pool import defer_settings, get_pool
+from aedt_common import cache_path
+from aedt_common.superposition import (
+    BREAKDOWN_E,
+    GRID_STEP,
+    UnitFields,
+    cached_fields,
+    export_unit_fields,
+    load_nets,
+)
 
-# 禁用 gRPC 以确保能连接到旧的 COM 会话 (视情况而定，但 2024R2 通常支持 gRPC)
-# 如果连接失败，可以尝试注释掉下面这行
-settings.use_grpc_api = False
-settings.enable_error_handler = False
+# 优先使用 COM 以连接到已打开的会话 (会话池会记住实际可用的传输方式)
+defer_settings(enable_error_handler=False)
 
 PROJECT_NAME = "KYN28_Electrostatic"
 DESIGN_NAME = "ElectrostaticField"
+PEAK_VOLTAGE = 16970  # 与设置脚本相同 (12kV × √2)
+SWEEP_STEP = 5.0      # 相位扫描步长 (度)
+BREAKDOWN_STEP = 5.0  # 击穿体积统计的导出网格步长 (mm)
+TOP_COMPONENTS = 10
 
 def main():
+    # 检测 ANSYS 安装并设置路径 (结果缓存; 默认 2024R2)
+    aedt_version, _ = resolve_aedt(default_version="2024.2", verbose=False)
+
     print(f"[KYN28 Post] 正在尝试连接到活动会话...")
     try:
         # 核心修改: new_desktop_session=False
-        m3d = Maxwell3d(
-            projectname=PROJECT_NAME, 
-            designname=DESIGN_NAME, 
-            specified_version="2024.2",
-            new_desktop_session=False # <--- 关键修改：连接现有会话
+        m3d = get_pool(aedt_version, use_grpc=False).open_design(
+            PROJECT_NAME,
+            DESIGN_NAME,
+            launch=False  # <--- 关键修改：连接现有会话
         )
     except Exception as e:
         print(f"✗ 无法连接到活动会话: {e}")
@@ -99,8 +138,179 @@ def main():
         print(f"  ⚠ 绘图过程出错: {e}")
 
     # 不要关闭 Desktop
-    m3d.release_desktop(False, False)
+    get_pool().release(m3d)
     print("\n[完成] 请切换回 Maxwell 窗口查看结果。")
 
+def _describe(label, row):
+    x, y, z = row["location_mm"]
+    flag = "⚠" if row["max"] > BREAKDOWN_E else "✓"
+    print(
+        f"  {flag} {label}: 最大 {row['max'] / 1e6:.2f} kV/mm @ ({x:.0f}, {y:.0f}, {z:.0f}) mm, "
+        f"超过 {BREAKDOWN_E / 1e6:g} kV/mm 的点 {row['above']} 个 (约 {row['above_mm3']:.0f} mm³)"
+    )
+
+
+def superposition_study(voltage=PEAK_VOLTAGE, phase=None, sweep_step=SWEEP_STEP, test_kv=None,
+                        grid_step=GRID_STEP, refresh=False, export=None):
+    """由三相单位解组合任意电压/相位/耐压试验的电场 (单位解导出后不再连接 AEDT)"""
+    directory = None if refresh else cached_fields(PROJECT_NAME, DESIGN_NAME, step_mm=grid_step)
+    if directory:
+        print(f"[叠加] 使用缓存的单位解: {directory}")
+    else:
+        aedt_version, _ = resolve_aedt(default_version="2024.2", verbose=False)
+        print("[叠加] 连接活动会话, 导出单位解...")
+        try:
+            m3d = get_pool(aedt_version, use_grpc=False).open_design(PROJECT_NAME, DESIGN_NAME, launch=False)
+        except Exception as e:
+            print(f"✗ 无法连接到活动会话: {e}")
+            return False
+        try:
+            directory = export_unit_fields(m3d, step_mm=grid_step, refresh=refresh)
+        except Exception as e:
+            print(f"✗ 单位解导出失败: {e}")
+            print("-> 请先运行设置脚本 --superposition 并完成求解")
+            directory = None
+        get_pool().release(m3d)
+        if not directory:
+            return False
+
+    fields = UnitFields.load(directory)
+    print(f"  单位解: {', '.join(fields.nets)} 相, {len(fields)} 个采样点")
+
+    print(f"\n[叠加] 三相对称电压, 相电压峰值 {voltage / 1000:.2f} kV")
+    if phase is not None:
+        volts = fields.instant_voltages(voltage, phase)
+        print("  " + ", ".join(f"{net}={v / 1000:+.2f}kV" for net, v in volts.items()))
+        _describe(f"θ={phase:g}°", fields.summary(fields.instant(voltage, phase)))
+
+    if sweep_step and sweep_step > 0:
+        # |E| 以 180° 为周期, 扫描半个周期即覆盖 0–360°
+        angles = [i * sweep_step for i in range(int(round(180 / sweep_step)))]
+        rows = fields.sweep(voltage, angles)
+        worst = max(rows, key=lambda r: r["max"])
+        print(f"  相位扫描 0–360° (步长 {sweep_step:g}°):")
+        _describe(f"最恶劣时刻 θ={worst['angle']:g}°", worst)
+
+    peak, angle = fields.envelope(voltage)
+    envelope = fields.summary(peak)
+    _describe(f"周期包络 (θ={float(angle[envelope['index']]):.1f}°)", envelope)
+
+    if test_kv:
+        print(f"\n[叠加] 工频耐压 {test_kv:g} kV (有效值), 每相依次加压, 其余相接地")
+        for row in fields.withstand(test_kv * 1000):
+            _describe(f"{row['net']} 相", row)
+
+    if export:
+        header = [grid_header(fields.meta["bounds"], fields.meta["step_mm"]), 'Scalar data "Mag_E"']
+        write_field_file(export, fields.points, peak, "Mag_E", header)
+        print(f"\n✓ 周期包络 |E| 已写出: {export}")
+    return True
+
+
+def breakdown_study(fld=None, threshold=BREAKDOWN_E, grid_step=BREAKDOWN_STEP, mesh=False, cell=None,
+                    path_extent=None, csv_file=None):
+    """超标体积与连通域 (fld 为空时从活动会话导出当前解的 Mag_E)"""
+    nets = load_nets(PROJECT_NAME, DESIGN_NAME)
+    if fld is None:
+        aedt_version, _ = resolve_aedt(default_version="2024.2", verbose=False)
+        print("[击穿] 连接活动会话, 导出 Mag_E...")
+        try:
+            m3d = get_pool(aedt_version, use_grpc=False).open_design(PROJECT_NAME, DESIGN_NAME, launch=False)
+        except Exception as e:
+            print(f"✗ 无法连接到活动会话: {e}")
+            return False
+        fld = cache_path("breakdown", f"{PROJECT_NAME}_{DESIGN_NAME}_Mag_E.fld")
+        try:
+            parts = PartTable.query(m3d, [n for n in m3d.modeler.solid_names if "Region" not in n])
+            save_parts(PROJECT_NAME, DESIGN_NAME, parts, nets)
+            fld = export_mag_e(m3d, fld, step_mm=grid_step, mesh=mesh, table=parts)
+        except Exception as e:
+            print(f"✗ Mag_E 导出失败: {e}")
+            fld = None
+        get_pool().release(m3d)
+        if not fld:
+            return False
+    else:
+        parts, saved_nets = load_parts(PROJECT_NAME, DESIGN_NAME)
+        nets = nets or saved_nets
+        if parts is None:
+            print("  ℹ 没有零件包围盒记录 (先运行一次 --breakdown 导出), 不判定最近零件与跨接")
+
+    options = {"threshold": threshold, "parts": parts, "nets": nets}
+    if cell:
+        options["cell_mm"] = cell
+    if path_extent:
+        options["path_extent"] = path_extent
+    print(f"\n[击穿] 分块扫描 {os.path.basename(fld)} ({os.path.getsize(fld) / 1e6:.1f} MB)...")
+    result = analyze_field_file(fld, **options)
+    print(
+        f"  {result['points']} 个采样点, 最大 {result['peak'] / 1e6:.2f} kV/mm, {result['scan_s']:.1f}s"
+    )
+    print(
+        f"  超过 {threshold / 1e6:g} kV/mm: {result['above_cells']} 个单元, "
+        f"约 {result['above_mm3']:.0f} mm³ ({len(result['components'])} 个连通域)"
+    )
+    if not result["components"]:
+        print("  ✓ 没有超过阈值的区域")
+        return True
+    print(f"  击穿路径 {result['breakdown']} 个, 奇异点 {result['singularity']} 个")
+    for comp in result["components"][:TOP_COMPONENTS]:
+        flag = "✗" if comp["kind"] == "breakdown" else "ℹ"
+        x, y, z = comp["peak_mm"]
+        parts_text = ", ".join(comp["parts"]) or "-"
+        print(
+            f"  {flag} #{comp['id']} {comp['kind']:11} {comp['volume_mm3']:10.0f} mm³ "
+            f"尺寸 {comp['extent_mm']:6.1f} mm  最大 {comp['max_E_kV_mm']:.2f} kV/mm "
+            f"@ ({x:.0f}, {y:.0f}, {z:.0f})  {parts_text}{'  [跨接]' if comp['bridges'] else ''}"
+        )
+    if len(result["components"]) > TOP_COMPONENTS:
+        print(f"  ... 其余 {len(result['components']) - TOP_COMPONENTS} 个见 CSV")
+    csv_file = csv_file or os.path.splitext(fld)[0] + "_components.csv"
+    write_components_csv(csv_file, result["components"])
+    print(f"  ✓ 连通域明细: {csv_file}")
+    if result["breakdown"]:
+        print("  ✗ 存在连通的超标区域, 需要倒角或增加间距")
+    else:
+        print("  ✓ 超标区域均为孤立奇异点, 未形成贯通性击穿通道")
+    return True
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KYN28 静电场后处理")
+    parser.add_argument("--superposition", action="store_true",
+                        help="组合三相单位解 (需设置脚本 --superposition 求解)")
+    parser.add_argument("--voltage", "-v", type=float, default=PEAK_VOLTAGE,
+                        help=f"相电压峰值 V (默认 {PEAK_VOLTAGE})")
+    parser.add_argument("--phase", type=float, help="评估指定相位时刻 (度, A 相余弦参考)")
+    parser.add_argument("--sweep-step", type=float, default=SWEEP_STEP,
+                        help=f"相位扫描步长 (度, 默认 {SWEEP_STEP:g}; 0 不扫描)")
+    parser.add_argument("--test-kv", type=float, help="工频耐压试验电压 kV 有效值 (如 42)")
+    parser.add_argument("--grid-step", type=float,
+                        help=f"导出网格步长 mm (默认: 单位解 {GRID_STEP:g}, 击穿统计 {BREAKDOWN_STEP:g})")
+    parser.add_argument("--refresh", action="store_true", help="忽略缓存, 重新导出单位解")
+    parser.add_argument("--export", help="周期包络 |E| 写出为 .fld")
+    parser.add_argument("--breakdown", action="store_true", help="统计超过阈值的体积与连通域")
+    parser.add_argument("--fld", help="分析已有的 Mag_E / E 场文件 (不连接 AEDT)")
+    parser.add_argument("--threshold", type=float, default=BREAKDOWN_E,
+                        help=f"击穿场强阈值 V/m (默认 {BREAKDOWN_E:g})")
+    parser.add_argument("--mesh", action="store_true", help="在空气域网格节点上导出 (默认规则网格)")
+    parser.add_argument("--cell", type=float, help="网格节点数据的体素边长 mm")
+    parser.add_argument("--path-extent", type=float, help="连通域尺寸不小于此值 (mm) 判为击穿路径")
+    parser.add_argument("--csv", help="连通域明细 CSV")
+    args = parser.parse_args()
+
+    if args.superposition:
+        export = args.export
+        if args.breakdown and not export and not args.fld:
+            export = cache_path("superposition", f"{PROJECT_NAME}_{DESIGN_NAME}", "envelope.fld")
+        ok = superposition_study(args.voltage, args.phase, args.sweep_step, args.test_kv,
+                                 args.grid_step or GRID_STEP, args.refresh, export)
+        if ok and args.breakdown:
+            ok = breakdown_study(args.fld or export, args.threshold, cell=args.cell,
+                                 path_extent=args.path_extent, csv_file=args.csv)
+        sys.exit(0 if ok else 1)
+    if args.breakdown:
+        ok = breakdown_study(args.fld, args.threshold, args.grid_step or BREAKDOWN_STEP, args.mesh,
+                             args.cell, args.path_extent, args.csv)
+        sys.exit(0 if ok else 1)
     main()
@@ -12,72 +12,26 @@ maxwell_report.py - 开关柜涡流损耗仿真报告生成脚本
 用法:
   python maxwell_report.py                    # 读取所有可用设计
   python maxwell_report.py --design Galvalume # 只读取覆铝锌板设计
+  python maxwell_report.py --offline          # 只用结果缓存重建报告, 不连接 AEDT
 """
 
 import os
 import sys
-import subprocess
 import argparse
 import platform
 from datetime import datetime
 
-# ======================================================================
-# 跨平台 ANSYS 版本检测 (必须在导入 pyaedt 之前)
-# ======================================================================
-def detect_ansys_installation():
-    """自动检测 ANSYS 安装版本和路径"""
-    system = platform.system()
-    
-    if system == "Windows":
-        # Windows: 检查注册表
-        try:
-            import winreg
-            for ver in ["241", "232", "231", "222", "221"]:
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                        f"SOFTWARE\\Ansoft\\ElectronicsDesktop\\{ver}\\Desktop")
-                    path, _ = winreg.QueryValueEx(key, "InstallDir")
-                    winreg.CloseKey(key)
-                    version = f"20{ver[:2]}.{ver[2]}"
-                    return (version, path)
-                except:
-                    continue
-        except ImportError:
-            pass
-        
-        # 检查常见安装路径
-        for ver in ["241", "232", "231", "222", "221"]:
-            for base in ["E:\\Program Files\\ANSYSMaxwell", "C:\\Program Files\\ANSYS Inc\\v" + ver]:
-                path = os.path.join(base if "ANSYSMaxwell" in base else base, f"v{ver}\\Win64" if "ANSYSMaxwell" not in base else f"v{ver}\\Win64")
-                test_path = f"E:\\Program Files\\ANSYSMaxwell\\v{ver}\\Win64"
-                if os.path.isdir(test_path):
-                    version = f"20{ver[:2]}.{ver[2]}"
-                    return (version, test_path)
-    else:
-        # Linux
-        for ver in ["241", "232"]:
-            path = f"/media/large_disk/ansysLinux/AnsysEM/v{ver}/Linux64"
-            if os.path.isdir(path):
-                version = f"20{ver[:2]}.{ver[2]}"
-                return (version, path)
-    
-    return (None, None)
-
-# 检测版本
-_detected_version, _ansys_path = detect_ansys_installation()
-AEDT_VERSION = _detected_version if _detected_version else "2024.1"
-
-# 根据版本决定是否使用 gRPC
-_use_grpc = tuple(map(int, AEDT_VERSION.split("."))) >= (2022, 2)
-if not _use_grpc:
-    print(f"[INFO] AEDT {AEDT_VERSION} 使用 COM 接口")
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 设置 gRPC 开关 (必须在导入 pyaedt 之前)
-from pyaedt import settings
-settings.use_grpc_api = _use_grpc
+from aedt_common.detection import resolve_aedt
+from aedt_common.plot_export import FieldPlotExporter
+from aedt_common.report_build import build_reports
+from aedt_common.results_cache import ResultsCache, load_cached
+from aedt_common.session_pool import get_pool
 
-# 现在安全导入
-from pyaedt import Maxwell3d
+# AEDT 版本只在读取结果时检测, 生成 Typst 报告不需要 AEDT
+DEFAULT_AEDT_VERSION = "2024.1"
 
 # ======================================================================
 # 配置
@@ -123,22 +77,35 @@ SIM_PARAMS = {
 }
 
 
-def get_results(design_key: str) -> dict:
-    """从 Maxwell 获取仿真结果"""
+def get_results(
+    design_key: str, cache: ResultsCache = None, refresh: bool = False, offline: bool = False
+) -> dict:
+    """从 Maxwell 获取仿真结果
+
+    cache 不为空时先查结果缓存 (见 aedt_common.results_cache)，命中则不连接 AEDT;
+    从 AEDT 读取的结果写回缓存。offline=True 时只用缓存。
+    """
     
     config = DESIGNS[design_key]
     design_name = config["name"]
     
     print(f"\n读取设计: {design_name}")
+
+    cached = load_cached(cache, PROJECT_NAME, design_name, "Setup1", refresh, offline)
+    if cached:
+        # 描述文字取当前配置, 数值取缓存
+        cached.update({k: config[k] for k in ("description", "permeability", "conductivity")})
+        return cached
+    if offline:
+        print("  ✗ 离线模式: 没有可用的缓存结果")
+        return None
     
     try:
-        # PyAEDT 0.8.x API 兼容
-        m3d = Maxwell3d(
-            projectname=PROJECT_NAME,
-            designname=design_name,
-            specified_version=AEDT_VERSION,
-            new_desktop_session=False,
-            non_graphical=False
+        # 跨平台 ANSYS 版本检测 (结果缓存, 安装目录不变时毫秒级返回)
+        aedt_version, _ = resolve_aedt(default_version=DEFAULT_AEDT_VERSION, verbose=False)
+        # 从会话池附着已运行的桌面 (报告只读结果，不启动新桌面)
+        m3d = get_pool(aedt_version).open_design(
+            PROJECT_NAME, design_name, launch=False
         )
     except Exception as e:
         print(f"  ✗ 无法连接设计: {e}")
@@ -200,28 +167,29 @@ def get_results(design_key: str) -> dict:
             results["bus_losses"][phase] = 0
     
     # 用户手动提供场图截图，不再自动导出
+
+    if cache is not None and results["total_loss"] > 0:
+        try:
+            cache.store(PROJECT_NAME, design_name, "Setup1", results, project_file=m3d.project_file)
+        except Exception as e:
+            print(f"  ⚠ 写入结果缓存失败: {e}")
     
     # 释放但不关闭 Maxwell
-    m3d.release_desktop(close_projects=False, close_desktop=False)
+    get_pool().release(m3d)
     return results
 
 
 def export_field_plots(m3d, design_key: str, results: dict):
-    """导出场图到图片文件 - 增强版
-    
-    改进:
-    1. 增加 Mag_H 和 J 场图导出
-    2. 使用 show=False 参数避免弹出图片窗口
-    3. 多种导出方法回退机制
-    4. 更好的错误处理和日志
+    """导出场图到图片文件
+
+    导出方式按 AEDT 版本/物理量记忆 (aedt_common.plot_export)，AEDT 侧依次
+    创建/导出场图，图片裁剪缩放在线程池中与下一个场图的导出重叠。
     """
     
     print("  正在导出场图（静默模式）...")
     
     # 场图输出目录
     plot_dir = os.path.join(REPORT_DIR, "field_plots", design_key)
-    os.makedirs(plot_dir, exist_ok=True)
-    results["field_plots"] = []
     
     # 分析对象: Plate_Frame(隔板) + Busbar_A/B/C(铜排), 排除Region
     all_objects = m3d.modeler.solid_names
@@ -242,89 +210,12 @@ def export_field_plots(m3d, design_key: str, results: dict):
         ("Mag_J", busbar_objects if busbar_objects else analysis_objects, "电流密度云图", f"Mag_J_{design_key}", None, None),
     ]
     
-    for quantity, objects, title, base_filename, scale_min, scale_max in field_configs:
-        output_file = os.path.join(plot_dir, base_filename + ".png")
-        exported = False
-        
-        try:
-            # 创建场图
-            plot = m3d.post.create_fieldplot_surface(
-                assignment=objects,
-                quantity=quantity,
-                setup=m3d.nominal_adaptive,
-                intrinsics={"Phase": "0deg"}
-            )
-            
-            if plot:
-                # 方法1: plot_field_from_fieldplot (带图例+坐标轴, 不显示窗口)
-                try:
-                    model = m3d.post.plot_field_from_fieldplot(
-                        plot_name=plot.name,
-                        project_path=plot_dir,
-                        image_format="png",
-                        show_legend=True,
-                        show_bounding=True,
-                        show=False  # 关键：不弹出显示窗口
-                    )
-                    # PyAEDT可能自动生成文件名
-                    expected_file = os.path.join(plot_dir, f"{plot.name}.png")
-                    if os.path.exists(expected_file):
-                        if expected_file != output_file:
-                            import shutil
-                            shutil.move(expected_file, output_file)
-                        results["field_plots"].append({"name": title, "path": output_file})
-                        print(f"    ✓ {title}: {base_filename}.png")
-                        exported = True
-                except Exception as e1:
-                    # 静默记录错误，不打印干扰信息
-                    pass
-                
-                # 方法2: export_field_plot (直接导出，无窗口)
-                if not exported:
-                    try:
-                        success = m3d.post.export_field_plot(
-                            plot_name=plot.name,
-                            output_file=output_file
-                        )
-                        if success and os.path.exists(output_file):
-                            results["field_plots"].append({"name": title, "path": output_file})
-                            print(f"    ✓ {title}: {base_filename}.png")
-                            exported = True
-                    except Exception as e2:
-                        pass
-                
-                # 方法3: export_model_picture (4K高清，隐藏Region)
-                if not exported:
-                    try:
-                        m3d.post.export_model_picture(
-                            full_name=output_file,
-                            show_axis=True,
-                            show_grid=False,
-                            show_ruler=True,
-                            show_region=False,
-                            field_selections=[plot.name],
-                            orientation="isometric",
-                            width=3840,
-                            height=2160
-                        )
-                        if os.path.exists(output_file):
-                            results["field_plots"].append({"name": title, "path": output_file})
-                            print(f"    ✓ {title}: {base_filename}.png (4K)")
-                            exported = True
-                    except Exception as e3:
-                        pass
-                
-                # 清理场图对象
-                try:
-                    plot.delete()
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"    ⚠ {title}: 创建失败")
-        
-        if not exported:
-            print(f"    ⚠ {title}: 导出失败（将使用手动截图）")
+    with FieldPlotExporter(m3d, plot_dir) as exporter:
+        for quantity, objects, title, base_filename, scale_min, scale_max in field_configs:
+            exporter.export(quantity, objects, title, base_filename)
+    results["field_plots"] = [
+        {"name": r["name"], "path": r["path"]} for r in exporter.results
+    ]
 
 
 def generate_report(results_list: list):
@@ -712,19 +603,9 @@ $ delta = sqrt(1 / (pi f mu sigma)) = sqrt(1 / (pi f mu_0 mu_r sigma)) $
         f.write(content)
     print(f"  ✓ Typst: {typst_file}")
     
-    # 编译 PDF
+    # 编译 PDF (内容和引用的图片/模板都未变化时跳过)
     pdf_file = os.path.join(REPORT_DIR, "EddyCurrent_Analysis_Report.pdf")
-    try:
-        result = subprocess.run(
-            ["typst", "compile", typst_file, pdf_file],
-            capture_output=True, text=True, timeout=60
-        )
-        if result.returncode == 0:
-            print(f"  ✓ PDF: {pdf_file}")
-        else:
-            print(f"  ✗ PDF 编译失败: {result.stderr}")
-    except Exception as e:
-        print(f"  ✗ PDF 错误: {e}")
+    build_reports([typst_file])
     
     return pdf_file
 
@@ -737,6 +618,15 @@ def main():
         default="all",
         help="选择读取的设计"
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="只使用结果缓存 (不连接 AEDT), 缓存已失效时也使用",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="忽略结果缓存, 从 AEDT 重新读取并更新缓存"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="不读写结果缓存")
     
     args = parser.parse_args()
     
@@ -745,15 +635,16 @@ def main():
     print("=" * 70)
     
     results_list = []
+    cache = None if args.no_cache else ResultsCache()
     
     if args.design == "all":
         # 尝试读取所有可用设计
         for key in ["Galvalume", "Stainless"]:
-            result = get_results(key)
+            result = get_results(key, cache, args.refresh, args.offline)
             if result and result["total_loss"] > 0:
                 results_list.append(result)
     else:
-        result = get_results(args.design)
+        result = get_results(args.design, cache, args.refresh, args.offline)
         if result:
             results_list.append(result)
     
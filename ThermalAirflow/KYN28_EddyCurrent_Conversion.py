@@ -20,43 +20,50 @@ import sys
 import argparse
 import math
 
-# 设置 ANSYS 路径 (如果需要)
-os.environ["ANSYSEM_ROOT242"] = r"G:\Ansys2024R2\v242\Win64"
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# PyAEDT 配置
-from pyaedt import settings
-settings.use_grpc_api = False
-settings.enable_error_handler = False
+from aedt_common.cad_cache import import_cad
+from aedt_common.cleanup import cleanup_small_parts, exclude
+from aedt_common.detection import resolve_aedt
+from aedt_common.face_cache import FaceGeometry
+from aedt_common.impedance import (
+    PLATE_MODELS,
+    add_surface_losses,
+    assign_impedance,
+    impedance_applies,
+)
+from aedt_common.mesh_planner import (
+    LIBRARY_MATERIALS,
+    apply_mesh_plan,
+    fixed_plan,
+    plan_mesh,
+    print_mesh_plan,
+)
+from aedt_common.modeler_batch import ModelerBatch
+from aedt_common.part_classifier import PartTable, apply_classes, classify
+from aedt_common.profiler import note_project, stage, start_profiler
+from aedt_common.session_pool import defer_settings, get_pool
 
-from pyaedt import Maxwell3d
+# PyAEDT 配置 (该脚本使用 COM 接口, 由会话池设置 use_grpc_api)
+defer_settings(enable_error_handler=False)
 
 # 配置
 MODEL_FILE = r"F:\MULTI\drawings\SeismicAnalysis_In.igs"
 PROJECT_NAME = "KYN28_Thermal_Source"
 DESIGN_NAME = "EddyCurrent_Main"
-AEDT_VERSION = "2024.2"
 CURRENT_AMP = 4000  # 额定电流 4000A
+BUSBAR_ASPECT = 5   # 母排: 长宽比 > 5 且长度 > 100mm
 
-def get_face_center(face):
-    """计算面的中心点"""
-    try:
-        # PyAEDT 的 face 对象可能有 center 属性或者 vertices
-        # 这里使用 vertices 计算平均值作为近似中心
-        vertices = face.vertices
-        if not vertices:
-            return None
-        x = sum(v.position[0] for v in vertices) / len(vertices)
-        y = sum(v.position[1] for v in vertices) / len(vertices)
-        z = sum(v.position[2] for v in vertices) / len(vertices)
-        return [x, y, z]
-    except:
-        return None
-
-def main(current=None, analyze=False):
+def main(current=None, analyze=False, mesh_mode="fixed", frame_model="solid", busbar_aspect=BUSBAR_ASPECT,
+         cad_cache=True, cleanup=False, cleanup_measure=False):
     if current is None:
         current = CURRENT_AMP
         
-    print(f"\n[KYN28 涡流场转换] ANSYS {AEDT_VERSION}")
+    # 检测 ANSYS 安装并设置路径 (结果缓存; 默认 2024R2)
+    aedt_version, _ = resolve_aedt(default_version="2024.2", verbose=False)
+
+    print(f"\n[KYN28 涡流场转换] ANSYS {aedt_version}")
     print(f"  目标: 计算发热损耗 (Ohmic Loss)")
     print(f"  电流: {current} A (三相)")
     
@@ -65,14 +72,12 @@ def main(current=None, analyze=False):
         return False
 
     # [1] 创建 Maxwell 项目 (EddyCurrent)
-    print("\n[1] 创建 EddyCurrent 项目...")
+    stage("\n[1] 创建 EddyCurrent 项目...")
     try:
-        m3d = Maxwell3d(
-            projectname=PROJECT_NAME,
-            designname=DESIGN_NAME,
+        m3d = get_pool(aedt_version, use_grpc=False).open_design(
+            PROJECT_NAME,
+            DESIGN_NAME,
             solution_type="EddyCurrent",  # <--- 关键修改：涡流场
-            specified_version=AEDT_VERSION,
-            new_desktop_session=True
         )
         print(f"  ✓ {m3d.project_name}/{m3d.design_name}")
     except Exception as e:
@@ -80,39 +85,34 @@ def main(current=None, analyze=False):
         return False
 
     # [2] 导入几何
-    print("\n[2] 导入模型...")
+    stage("\n[2] 导入模型...")
     try:
-        m3d.modeler.import_3d_cad(MODEL_FILE, healing=True)
+        import_cad(m3d, MODEL_FILE, healing=True, use_cache=cad_cache)
         m3d.modeler.refresh_all_ids()
         objs = [n for n in m3d.modeler.solid_names if "Region" not in n]
         print(f"  ✓ {len(objs)} 个对象")
     except Exception as e:
         print(f"  ✗ 导入失败: {e}")
-        m3d.release_desktop(False, False)
+        get_pool().release(m3d)
         return False
 
     # [3] 分类 (沿用逻辑)
-    print("\n[3] 智能分类部件...")
-    busbars = []
-    frames = []
-    
-    # 临时字典用于存储边界框，避免重复查询
-    obj_bboxes = {} 
+    stage("\n[3] 智能分类部件...")
+    # 全部零件的包围盒一次取回, 向量化判定 (长宽比 > busbar_aspect 且长度 > 100mm 为母排)
+    table = PartTable.query(m3d, objs)
+    classes = classify(table, busbar_aspect=busbar_aspect)
+
+    # 删除螺栓/垫圈等小零件 (与高压母排接触的保留)
+    if cleanup:
+        removed = set(cleanup_small_parts(m3d, table, protected=classes["busbar"], measure=cleanup_measure))
+        objs = [o for o in objs if o not in removed]
+        classes = exclude(classes, removed)
+    busbars, frames = classes["busbar"], classes["frame"]
     
-    for n in objs:
-        try:
-            bb = m3d.modeler[n].bounding_box
-            if bb:
-                dims = [abs(bb[i+3]-bb[i]) for i in range(3)]
-                obj_bboxes[n] = (bb, dims)
-                
-                # 判定逻辑：长宽比 > 5 且 长度 > 100mm 认为是母排
-                if max(dims)/min(dims) > 5 and max(dims) > 100:
-                    busbars.append(n)
-                else:
-                    frames.append(n)
-        except:
-            pass
+    # 边界框字典 (后续端面识别/网格分组使用)
+    obj_bboxes = {
+        n: (table.get_bbox(n), table.get_dims(n)) for n in busbars + frames
+    }
             
     # 如果没识别出母排(可能是模型问题)，取前3个
     if not busbars and len(objs) >= 3:
@@ -123,14 +123,40 @@ def main(current=None, analyze=False):
     print(f"  柜体 (涡流损耗): {len(frames)} 个")
 
     # [4] 赋材料
-    print("\n[4] 赋材料与属性...")
-    # 母排 -> 铜
-    if busbars:
-        m3d.assign_material(busbars, "copper")
-    # 柜体 -> 钢 (注意：涡流场中钢的磁导率和电导率至关重要)
-    if frames:
-        m3d.assign_material(frames, "steel_1008") # 默认 steel_1008 是导磁导电的
+    stage("\n[4] 赋材料与属性...")
+    # 母排 -> 铜; 柜体 -> 钢 (注意：涡流场中钢的磁导率和电导率至关重要,
+    # 默认 steel_1008 是导磁导电的)
+    apply_classes(m3d, {"busbar": busbars, "frame": frames}, {
+        "busbar": {"material": "copper"},
+        "frame": {"material": "steel_1008"},
+    })
         
+    # 阻抗边界模式: 板厚 > 2δ 的钢件不求解内部, 表面施加阻抗边界
+    imp_frames = []
+    if frame_model == "impedance" and frames:
+        sigma, mu = LIBRARY_MATERIALS["steel_1008"]
+        imp_frames = [
+            f for f in frames
+            if f in obj_bboxes and impedance_applies(min(obj_bboxes[f][1]), "50Hz", sigma, mu)
+        ]
+        print(f"  阻抗边界: {len(imp_frames)}/{len(frames)} 个钢件 (其余板厚 ≤ 2δ, 按实体建模)")
+        if imp_frames:
+            batch = ModelerBatch(m3d)
+            batch.set_properties(imp_frames, solve_inside=False)
+            batch.flush()
+            try:
+                assign_impedance(m3d, imp_frames, mu, sigma, "Imp_Frames")
+            except Exception as e:
+                print(f"  ⚠ 阻抗边界设置失败, 按实体建模: {e}")
+                batch = ModelerBatch(m3d)
+                batch.set_properties(imp_frames, solve_inside=True)
+                batch.flush()
+                imp_frames = []
+        if imp_frames:
+            # 逐对象表面损耗表达式 SurfaceLoss_<对象>, 代替 SolidLoss(<对象>)
+            add_surface_losses(m3d, imp_frames)
+        frames = [f for f in frames if f not in imp_frames]
+
     # 开启涡流计算 (Set Eddy Effect)
     # 对于涡流场，必须显式开启 Eddy Effect 才能计算涡流损耗
     print("  开启涡流效应...")
@@ -141,25 +167,20 @@ def main(current=None, analyze=False):
         print(f"  ⚠ 开启涡流效应警告: {e}")
 
     # [5] 自动施加电流激励
-    print("\n[5] 自动识别端面并施加电流...")
+    stage("\n[5] 自动识别端面并施加电流...")
     
     # 将母排按 X 坐标排序，以区分 A(左)/B(中)/C(右) 相
     # 假设母排是并排排列的
-    busbar_centers = []
-    for b in busbars:
-        if b in obj_bboxes:
-            bb = obj_bboxes[b][0]
-            cx = (bb[0] + bb[3]) / 2
-            busbar_centers.append((cx, b))
-    
-    # 排序：X 从小到大 -> A, B, C
-    busbar_centers.sort(key=lambda x: x[0])
-    sorted_busbars = [x[1] for x in busbar_centers]
+    # 排序：包围盒中心 X 从小到大 -> A, B, C
+    sorted_busbars = table.sort_by([b for b in busbars if b in obj_bboxes], axis=0)
     
     phases = ["A", "B", "C"]
     phase_angles = [0, -120, 120]  # deg
     
     assigned_count = 0
+
+    # 全部母排的面中心一次批量取回 (逐面 f.center 每个面一次往返)
+    geometry = FaceGeometry.query(m3d, sorted_busbars)
     
     # 遍历每个母排，寻找长方向的两个端面
     for i, bus_name in enumerate(sorted_busbars):
@@ -175,26 +196,14 @@ def main(current=None, analyze=False):
         long_dim_idx = dims.index(max(dims))
         
         # 寻找该方向上的两个极值面
-        # 策略：遍历该对象的所有 Face，计算 Face Center
-        # 如果 Center 在该维度的 max 或 min 附近，则选中
+        # 策略：面中心在该维度上最接近包围盒 min / max (容差内) 的面
         try:
-            faces = m3d.modeler[bus_name].faces
-            input_face = None
-            output_face = None
-            
             min_val = bb[long_dim_idx]
             max_val = bb[long_dim_idx + 3]
             tol = 5.0 # mm 容差
-            
-            for f in faces:
-                c = f.center
-                if c:
-                    cmd_pos = c[long_dim_idx]
-                    # 检查是否在两端
-                    if abs(cmd_pos - min_val) < tol:
-                        input_face = f.id
-                    elif abs(cmd_pos - max_val) < tol:
-                        output_face = f.id
+
+            input_face = geometry.nearest(bus_name, long_dim_idx, min_val, tol)
+            output_face = geometry.nearest(bus_name, long_dim_idx, max_val, tol)
             
             if input_face and output_face:
                 # 施加电流
@@ -220,29 +229,44 @@ def main(current=None, analyze=False):
         print("  ❌ 严重警告：未成功施加任何电流激励！请手动检查模型。")
 
     # [6] 创建 Region
-    print("\n[6] 创建仿真区域 (Region)...")
+    stage("\n[6] 创建仿真区域 (Region)...")
     if "Region" not in m3d.modeler.solid_names:
         m3d.modeler.create_region(pad_percent=50) # 涡流场建议稍大一点，防止磁力线截断
 
     # [7] 网格设置 (Skin Efffect)
-    print("\n[7] 设置集肤效应网格...")
-    try:
-        # 铜排表面网格加密
-        # 对于 50Hz 铜，集肤深度 ~9.3mm。但这只是穿透深度。
-        # 为了精确计算损耗，表面网格建议 < 1/2 集肤深度 或 简单设为 4-6mm
-        if busbars:
-            m3d.mesh.assign_length_mesh(busbars, maximum_length=8, name="Skin_Mesh_Busbars")
-        
-        # 柜体虽然集肤深度很小（钢），但也需要一定加密
-        if frames:
-            m3d.mesh.assign_length_mesh(frames, maximum_length=25, name="Frame_Mesh")
-            
-        print("  ✓ 已应用 Surface Approximation 策略 (通过 Length Mesh)")
-    except Exception as e:
-        print(f"  ⚠ 网格设置失败: {e}")
+    stage("\n[7] 设置集肤效应网格...")
+    # 按材料趋肤深度规划: 铜 50Hz δ≈9.3mm (长度网格), 钢板 δ≪板厚 (趋肤层网格)
+    # 柜体钣金按厚度分组, 每组一个网格操作
+    groups = []
+    if busbars:
+        sigma, mu = LIBRARY_MATERIALS["copper"]
+        bus_th = [min(obj_bboxes[b][1]) for b in busbars if b in obj_bboxes]
+        groups.append({
+            "name": "Skin_Mesh_Busbars", "objects": busbars,
+            "conductivity": sigma, "permeability": mu,
+            "thickness": min(bus_th) if bus_th else 10.0,  # 3-TMY 母排厚 10mm
+            "fixed_length": 8,
+        })
+    by_thickness = {}
+    for f in frames:
+        if f in obj_bboxes:
+            by_thickness.setdefault(round(min(obj_bboxes[f][1]), 1), []).append(f)
+    sigma, mu = LIBRARY_MATERIALS["steel_1008"]
+    for th, objs_th in sorted(by_thickness.items()):
+        groups.append({
+            "name": "Frame_Mesh" if len(by_thickness) == 1 else f"Frame_Mesh_{th:g}mm".replace(".", "p"),
+            "objects": objs_th,
+            "conductivity": sigma, "permeability": mu,
+            "thickness": th,
+            "fixed_length": 25,
+        })
+    plans = fixed_plan(groups) if mesh_mode == "fixed" else plan_mesh(groups, "50Hz")
+    print_mesh_plan(plans)
+    created = apply_mesh_plan(m3d, plans)
+    print(f"  ✓ 已创建 {len(created)}/{len(plans)} 个网格操作 ({mesh_mode})")
 
     # [8] 求解设置
-    print("\n[8] 求解设置...")
+    stage("\n[8] 求解设置...")
     setup = m3d.create_setup("Setup1")
     setup.props["Frequency"] = "50Hz"
     setup.props["MaximumPasses"] = 6  # 涡流场通常不需要特别多 Pass
@@ -260,13 +284,35 @@ def main(current=None, analyze=False):
     print("2. 求解完成后，右键 Field Overlays -> Fields -> Other -> Ohmic Loss")
     print("3. 这个 Ohmic Loss 分布就是导入 Fluent 的热源")
 
-    m3d.release_desktop(False, False)
+    note_project(m3d)
+    get_pool().release(m3d)
     return True
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--current", "-c", type=float, default=4000, help="Phase Current (RMS)")
     parser.add_argument("--analyze", "-a", action="store_true")
+    parser.add_argument(
+        "--mesh", choices=["skin", "fixed"], default="fixed",
+        help="网格操作: fixed=原固定边长 8mm/25mm (默认); skin=按趋肤深度自动规划",
+    )
+    parser.add_argument(
+        "--frame-model", choices=PLATE_MODELS, default="solid",
+        help="steel_1008 柜体钢件: solid=实体 (默认); impedance=板厚 > 2δ 的钢件用阻抗边界, 内部不剖分",
+    )
+    parser.add_argument("--busbar-aspect", type=float, default=BUSBAR_ASPECT,
+                        help=f"母排识别的长宽比阈值 (默认 {BUSBAR_ASPECT})")
+    parser.add_argument("--no-cad-cache", action="store_true", help="不使用修复后几何缓存, 重新导入修复")
+    parser.add_argument("--cleanup", action="store_true",
+                        help="删除螺栓/垫圈等小零件 (会改变几何, 默认不删除)")
+    parser.add_argument("--cleanup-measure", action="store_true",
+                        help="清理前后各生成一次初始网格, 报告四面体数变化")
+    parser.add_argument("--profile", action="store_true", help="记录分阶段耗时 (写入 *_profile.json; AEDT 调用次数需同时设置 MAXWELL_AEDT_RECORD 录制)")
+    parser.add_argument("--chrome-trace", action="store_true", help="同时输出 Chrome trace")
     args = parser.parse_args()
+    profiler = start_profiler("KYN28_EddyCurrent_Conversion") if args.profile or args.chrome_trace else None
     
-    main(args.current, args.analyze)
+    main(args.current, args.analyze, args.mesh, args.frame_model, args.busbar_aspect, not args.no_cad_cache,
+         args.cleanup, args.cleanup_measure)
+    if profiler is not None:
+        profiler.save(chrome=args.chrome_trace)
@@ -18,7 +18,9 @@ import os
 import sys
 import re
 import math
+import argparse
 import glob
+import inspect
 import subprocess
 
 
@@ -32,6 +34,16 @@ def _force_utf8_stdio():
 
 _force_utf8_stdio()
 
+# 共享模块 (aedt_common) 位于仓库根目录
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aedt_common.detection import (
+    KNOWN_VERSION_CODES,
+    apply_environment,
+    detect_ansys_installation,
+    version_from_path,
+)
+from aedt_common.face_cache import FaceGeometry
 
 # =============================================================================
 # 0. 环境配置 (针对自定义安装路径)
@@ -48,8 +60,8 @@ def _normalize_aedt_root(path):
     return path
 
 
-if len(sys.argv) > 1:
-    arg_path = sys.argv[1]
+def _apply_aedt_path_arg(arg_path):
+    """从 .bat 启动脚本或安装目录中提取 AEDT 路径并设置环境变量"""
     ansys_path = None
 
     print(f"[INFO] 检测到输入参数: {arg_path}")
@@ -80,22 +92,26 @@ if len(sys.argv) > 1:
     if ansys_path:
         ansys_path = _normalize_aedt_root(ansys_path)
     if ansys_path:
-        # 设置环境变量，强制 PyAEDT 使用此路径
-        # 假设是 2024 R2 (v242)
-        os.environ["ANSYSEM_ROOT242"] = ansys_path
-        os.environ["ANSYSEM_ROOT20242"] = ansys_path
-        os.environ["AWP_ROOT242"] = ansys_path
-        print(f"  设置环境变量 ANSYSEM_ROOT242 = {ansys_path}")
-
-existing_root = os.environ.get("ANSYSEM_ROOT242")
-normalized_root = _normalize_aedt_root(existing_root) if existing_root else None
-if normalized_root and normalized_root != existing_root:
-    os.environ["ANSYSEM_ROOT242"] = normalized_root
-    os.environ["AWP_ROOT242"] = normalized_root
-    print(f"  修正环境变量 ANSYSEM_ROOT242 = {normalized_root}")
-
-from ansys.aedt.core import settings, Maxwell3d
-from ansys.aedt.core.internal.aedt_versions import AedtVersions
+        # 设置环境变量，强制 PyAEDT 使用此路径 (版本从 vXXX 目录名推断)
+        arg_version = version_from_path(ansys_path) or "2024.2"
+        apply_environment(arg_version, ansys_path)
+        print(f"  设置 AEDT {arg_version} 安装路径 = {ansys_path}")
+
+
+def _normalize_env_root():
+    existing_root = os.environ.get("ANSYSEM_ROOT242")
+    normalized_root = _normalize_aedt_root(existing_root) if existing_root else None
+    if normalized_root and normalized_root != existing_root:
+        os.environ["ANSYSEM_ROOT242"] = normalized_root
+        os.environ["AWP_ROOT242"] = normalized_root
+        print(f"  修正环境变量 ANSYSEM_ROOT242 = {normalized_root}")
+
+
+from aedt_common.incremental import BuildState, parameter_hash
+from aedt_common.modeler_batch import ModelerBatch
+from aedt_common.profiler import stage, start_profiler
+from aedt_common.recorder import replay_active
+from aedt_common.session_pool import get_pool
 # settings.use_grpc_api = True  # 2026 Best Practice (Disabled to fix AttributeError)
 
 # =============================================================================
@@ -183,6 +199,14 @@ FREQUENCY = 50
 PEAK_TIME = 0.25 / FREQUENCY  # 工频峰值时刻 (s)
 ZERO_TIME = 0.5 / FREQUENCY  # 首个过零点 (s)
 CENTER_POINT = [0.0, 0.0, 0.0]
+MESH_MAX_LENGTH = 20.0  # 全模型最大网格边长 (mm)
+MESH_MAX_ELEMENTS = 200000
+
+# 增量模式: 以下常量只影响激励 / Setup，其余大写常量视为几何参数
+EXCITATION_KEYS = (
+    "EXCITATION_MODE", "RATED_CURRENT", "PEAK_CURRENT", "FREQUENCY", "PEAK_TIME", "ZERO_TIME",
+)
+SETUP_KEYS = ("MOTION_TIME", "TIME_STEP")
 
 
 def _pick_first_matching(values, keywords):
@@ -306,29 +330,14 @@ def _interp_value(data_rows, target_x):
     return None
 
 
-def _find_face_by_extreme_x(m3d, obj_name, pick="max"):
+def _find_face_by_extreme_x(m3d, obj_name, pick="max", geometry=None):
+    """面中心 x 最大/最小的面; geometry 为已包含该对象的 FaceGeometry 时不再访问 AEDT"""
     try:
-        faces = m3d.modeler.get_object_faces(obj_name)
+        if geometry is None or obj_name not in geometry.objects:
+            geometry = FaceGeometry.query(m3d, [obj_name], verbose=False)
     except Exception:
         return None
-    best_face = None
-    best_x = None
-    for fid in faces:
-        center = m3d.modeler.get_face_center(fid)
-        if not center or not isinstance(center, (list, tuple)) or len(center) < 3:
-            continue
-        x = center[0]
-        if best_x is None:
-            best_x = x
-            best_face = fid
-            continue
-        if pick == "max" and x > best_x:
-            best_x = x
-            best_face = fid
-        if pick == "min" and x < best_x:
-            best_x = x
-            best_face = fid
-    return best_face
+    return geometry.extreme(obj_name, "x", pick)
 
 
 def _assign_current_raw(
@@ -439,7 +448,32 @@ def _ensure_terminal_pad(m3d, name, x_pos, half_size, y_offset=0.0, z_offset=0.0
     return name if name in m3d.modeler.object_names else None
 
 
-def _reset_design(m3d, name, solution):
+def _existing_names(post, attribute):
+    try:
+        return list(getattr(post, attribute, None) or [])
+    except Exception:
+        return []
+
+
+def _existing_field_plot(m3d, name, reuse):
+    """增量模式保留的同名场图 (reuse=False 或不存在时返回 None)"""
+    if not reuse or name not in _existing_names(m3d.post, "field_plot_names"):
+        return None
+    try:
+        return m3d.post.field_plots[name]
+    except Exception:
+        return None
+
+
+def _reset_design(m3d, name, solution, incremental=False):
+    """切换到目标设计并清理旧内容，返回 (BuildState, 保留几何, 保留激励, 保留 Setup)
+
+    incremental=True 时按分段哈希决定保留哪些内容 (与 EddyCurrent_setup 相同):
+      - 几何未变化: 保留模型对象和网格
+      - 几何与激励未变化: 另外保留运动设置/激励等边界
+      - 以上及 Setup 都未变化: 另外保留 Setup 与已有的场图/报表
+    其余内容清理后在后续步骤重新创建。
+    """
     try:
         if name not in m3d.design_list:
             m3d.insert_design(name, solution_type=solution)
@@ -455,33 +489,49 @@ def _reset_design(m3d, name, solution):
     except Exception as e:
         print(f"  [警告] 设计切换失败: {e}")
 
+    build = BuildState(m3d, _build_sections(), enabled=incremental)
+    build.report()
+    keep_geometry = False
     try:
-        boundaries = list(m3d.boundaries)
-        for boundary in boundaries:
-            try:
-                boundary.delete()
-            except Exception:
-                pass
-        if boundaries:
-            print(f"  [提示] 清理旧边界/激励: {len(boundaries)}")
+        existing_objects = list(m3d.modeler.object_names)
+        keep_geometry = build.unchanged("geometry") and "Motion_Band" in existing_objects
     except Exception as e:
-        print(f"  [警告] 清理旧边界失败: {e}")
+        print(f"  [警告] 读取模型对象失败: {e}")
+        existing_objects = []
+    keep_excitation = keep_geometry and build.unchanged("excitation")
+    keep_setup = keep_excitation and build.unchanged("setup")
+
+    if not keep_excitation:
+        try:
+            boundaries = list(m3d.boundaries)
+            for boundary in boundaries:
+                try:
+                    boundary.delete()
+                except Exception:
+                    pass
+            if boundaries:
+                print(f"  [提示] 清理旧边界/激励: {len(boundaries)}")
+        except Exception as e:
+            print(f"  [警告] 清理旧边界失败: {e}")
 
     try:
-        existing_objects = list(m3d.modeler.object_names)
-        if existing_objects:
+        if keep_geometry:
+            print(f"  [提示] 保留现有模型对象与网格: {len(existing_objects)}")
+        elif existing_objects:
             m3d.modeler.delete(existing_objects)
             print(f"  [提示] 清理旧模型对象: {len(existing_objects)}")
     except Exception as e:
         print(f"  [警告] 清理旧模型失败: {e}")
 
-    try:
-        for plot_name in list(m3d.post.field_plot_names):
-            m3d.post.delete_field_plot(plot_name)
-        if m3d.post.plots:
-            m3d.post.delete_report()
-    except Exception as e:
-        print(f"  [警告] 清理旧结果失败: {e}")
+    if not keep_setup:
+        try:
+            for plot_name in list(m3d.post.field_plot_names):
+                m3d.post.delete_field_plot(plot_name)
+            if m3d.post.plots:
+                m3d.post.delete_report()
+        except Exception as e:
+            print(f"  [警告] 清理旧结果失败: {e}")
+    return build, keep_geometry, keep_excitation, keep_setup
 
 
 # =============================================================================
@@ -517,7 +567,6 @@ solution_type = "TransientAPhiFormulation"
 project_dir = os.environ.get("VI_PROJECT_DIR", r"D:\AnsysProducts\results")
 project_file = os.path.join(project_dir, f"{project_name}.aedt")
 project_lock = project_file + ".lock"
-os.makedirs(project_dir, exist_ok=True)
 
 
 def _is_ansysedt_running():
@@ -550,137 +599,10 @@ def _cleanup_results_files(base_project_file):
             print(f"  [警告] 无法删除结果文件 {path}: {e}")
 
 
-if os.path.exists(project_lock):
-    try:
-        os.remove(project_lock)
-        print(f"  [提示] 已删除旧项目锁: {project_lock}")
-    except Exception as e:
-        print(f"  [警告] 无法删除项目锁 {project_lock}: {e}")
-
-if _is_ansysedt_running():
-    print("  [警告] 检测到 ansysedt.exe 正在运行，跳过结果文件清理以避免锁冲突")
-else:
-    _cleanup_results_files(project_file)
-
-print("=" * 60)
-print("真空灭弧室瞬态仿真 - 12kV/4000A (v8 - 精确参考图)")
-print("=" * 60)
-print("  建模方向: X轴 (水平)")
-print("  瓷套长度: {:.0f}mm".format(CERAMIC_LENGTH))
-print("  开距: {:.0f}mm".format(CONTACT_GAP))
-
-# =============================================================================
-# 1. 初始化 Maxwell3D
-# =============================================================================
-print("\n[1/10] 初始化 Maxwell3D...")
-
-aedt_versions = AedtVersions()
-installed_versions = aedt_versions.installed_versions
-if not installed_versions:
-    print(
-        "  [ERROR] No AEDT installation detected. Set ANSYSEM_ROOTxxx/AWP_ROOTxxx or install AEDT."
-    )
-    raise SystemExit(1)
-
-aedt_version = "2024.2"
-if aedt_version not in installed_versions:
-    fallback_version = aedt_versions.current_version or aedt_versions.latest_version
-    if fallback_version:
-        print(
-            f"  [INFO] Requested AEDT {aedt_version} not found. Using {fallback_version}."
-        )
-        aedt_version = fallback_version
-    else:
-        print(
-            "  [ERROR] No usable AEDT version detected. Check ANSYSEM_ROOTxxx/AWP_ROOTxxx."
-        )
-        raise SystemExit(1)
-
-
-def _create_maxwell(desktop_new):
-    return Maxwell3d(
-        project=project_name,
-        design=design_name,
-        solution_type=solution_type,
-        version=aedt_version,
-        new_desktop=desktop_new,
-        non_graphical=False,
-    )
-
-
-def _init_maxwell_with_fallback():
-    try:
-        return _create_maxwell(True)
-    except Exception as e:
-        print(f"  [错误] {e}")
-        raise SystemExit(1)
-
-
-m3d = _init_maxwell_with_fallback()
-
-# 避免重复叠加几何，复用同名设计并清理旧模型
-_reset_design(m3d, design_name, solution_type)
-
-if not getattr(m3d, "_odesign", None):
-    print(
-        "  [ERROR] AEDT not detected. Install AEDT and set ANSYSEM_ROOTxxx/AWP_ROOTxxx or adjust 'version'."
-    )
-    raise SystemExit(1)
-
-m3d.modeler.model_units = "mm"
-print(f"  [成功] 项目: {m3d.project_name}")
-
-# =============================================================================
-# 2. 材料定义
-# =============================================================================
-print("\n[2/10] 创建材料...")
-
-if not m3d.materials.exists_material("Al2O3_Ceramic"):
-    mat = m3d.materials.add_material("Al2O3_Ceramic")
-    mat.permittivity = 9.4
-    mat.conductivity = 0
-
-if not m3d.materials.exists_material("CuCr_Alloy"):
-    mat = m3d.materials.add_material("CuCr_Alloy")
-    mat.conductivity = 2.9e7
-    mat.permeability = 1.0
-
-if ARC_ENABLE and not m3d.materials.exists_material("Arc_Column"):
-    mat = m3d.materials.add_material("Arc_Column")
-    mat.permittivity = 1.0
-    mat.conductivity = ARC_CONDUCTIVITY
-
-print("  材料创建完成")
-
-# =============================================================================
-# 3. 瓷套 (陶瓷绝缘管）
-# =============================================================================
-print("\n[3/10] 创建瓷套...")
-
-ceramic_outer = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[CERAMIC_X_START, 0, 0],
-    radius=CERAMIC_OUTER_RADIUS,
-    height=CERAMIC_LENGTH,
-    name="Ceramic_Sleeve",
-    material="Al2O3_Ceramic",
-)
-
-ceramic_void = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[CERAMIC_X_START, 0, 0],
-    radius=CERAMIC_INNER_RADIUS,
-    height=CERAMIC_LENGTH,
-    name="Ceramic_Void_Temp",
-)
-m3d.modeler.subtract(ceramic_outer, [ceramic_void], keep_originals=False)
-print(f"  瓷套: 外径{CERAMIC_OUTER_RADIUS * 2}mm, 长度{CERAMIC_LENGTH}mm")
-
-
 # =============================================================================
 # 4. AMF 触头几何生成函数 (杯状纵磁结构)
 # =============================================================================
-def create_amf_contact(m3d, origin, is_static=True):
+def create_amf_contact(m3d, origin, is_static=True, modeler=None):
     """
     创建一个杯状纵磁(AMF)触头组件。
     包含：触头杯(Cup)、斜槽(Slots)、触头片(Plate)。
@@ -688,7 +610,14 @@ def create_amf_contact(m3d, origin, is_static=True):
     参数:
     - origin: [x, y, z] 触头组件的基准点（杯底与导电杆连接处）
     - is_static: True表示静触头(向+X延伸), False表示动触头(向-X延伸)
+    - modeler: 建模接口, 默认 m3d.modeler; 传入 ModelerBatch 时只记录命令,
+      由调用方统一 flush。螺旋槽无法批处理: 切槽前先 flush 已记录的命令,
+      螺旋槽在 m3d.modeler 上逐条执行, 几何与不批处理时一致; 这些逐条调用
+      通过 note_native 计入批处理统计 (每次一个往返)
     """
+    native = m3d.modeler
+    if modeler is None:
+        modeler = native
 
     # 局部参数定义
     cup_radius = CONTACT_RADIUS
@@ -713,7 +642,7 @@ def create_amf_contact(m3d, origin, is_static=True):
 
     # 1. 创建触头杯 (实心圆柱)
     cup_name = f"{prefix}_Cup"
-    cup = m3d.modeler.create_cylinder(
+    cup = modeler.create_cylinder(
         orientation="X",
         origin=origin,
         radius=cup_radius,
@@ -727,39 +656,46 @@ def create_amf_contact(m3d, origin, is_static=True):
     void_height = cup_height - base_thickness
     void_origin = [origin[0] + base_thickness * direction, origin[1], origin[2]]
 
-    cup_void = m3d.modeler.create_cylinder(
+    cup_void = modeler.create_cylinder(
         orientation="X",
         origin=void_origin,
         radius=cup_radius - wall_thickness,
         height=void_height * direction,
         name=cup_void_name,
     )
-    m3d.modeler.subtract(cup_name, [cup_void_name], keep_originals=False)
+    modeler.subtract(cup_name, [cup_void_name], keep_originals=False)
 
     # 3. 切割斜槽 (关键：产生圆周电流)
     # 优先尝试螺旋槽，不支持时退化为斜槽
+    helix_supported = hasattr(native, "create_helix")
+    if helix_supported and modeler is not native:
+        # 螺旋槽要减在已存在的杯体上: 先提交批处理中的杯体命令
+        modeler.flush()
+    native_calls = 0  # 螺旋槽在 m3d.modeler 上逐条发出的调用
     for i in range(slot_count):
         slot_cutter_name = f"{prefix}_Slot_{i}"
 
-        helix_supported = hasattr(m3d.modeler, "create_helix")
         helix_done = False
         if helix_supported:
             try:
-                helix_path = m3d.modeler.create_helix(
+                native_calls += 1
+                helix_path = native.create_helix(
                     origin=[origin[0] + base_thickness * direction, 0, 0],
                     radius=cup_radius - wall_thickness * 0.6,
                     pitch=slot_pitch * direction,
                     height=(cup_height - base_thickness) * direction,
                     name=f"{slot_cutter_name}_Path",
                 )
-                profile = m3d.modeler.create_rectangle(
+                native_calls += 1
+                profile = native.create_rectangle(
                     position=[origin[0] + base_thickness * direction, 0, 0],
                     dimension_list=[slot_width, wall_thickness * 1.2],
                     name=f"{slot_cutter_name}_Profile",
                     material="vacuum",
                     plane="YZ",
                 )
-                sweep = m3d.modeler.sweep_along_path(
+                native_calls += 1
+                sweep = native.sweep_along_path(
                     profile, helix_path, name=slot_cutter_name
                 )
                 if sweep:
@@ -769,7 +705,7 @@ def create_amf_contact(m3d, origin, is_static=True):
 
         if not helix_done:
             # 退化为斜槽：通过倾斜刀具形成轴向倾角
-            cutter = m3d.modeler.create_box(
+            cutter = modeler.create_box(
                 origin=[
                     origin[0] + base_thickness * direction,
                     -cup_radius * 1.2,
@@ -784,23 +720,28 @@ def create_amf_contact(m3d, origin, is_static=True):
             )
 
             # 绕Y轴倾斜形成轴向倾角
-            m3d.modeler.rotate(slot_cutter_name, axis="Y", angle=slot_angle)
+            modeler.rotate(slot_cutter_name, axis="Y", angle=slot_angle)
 
             # 绕X轴分布 (分布在圆周上)
-            m3d.modeler.rotate(
+            modeler.rotate(
                 slot_cutter_name,
                 axis="X",
                 angle=i * (360.0 / slot_count),
             )
 
-        # 执行减法
-        m3d.modeler.subtract(cup_name, [slot_cutter_name], keep_originals=False)
+        # 执行减法 (螺旋刀具已在 AEDT 中, 直接减; 斜槽刀具随批处理提交)
+        native_calls += helix_done
+        (native if helix_done else modeler).subtract(
+            cup_name, [slot_cutter_name], keep_originals=False
+        )
+    if modeler is not native:
+        modeler.note_native(native_calls, f"{prefix} 螺旋槽")
 
     # 4. 创建触头片 (CuCr合金，焊接在杯口)
     plate_name = f"{prefix}_Contact_Plate"
     plate_origin = [origin[0] + cup_height * direction, origin[1], origin[2]]
 
-    plate = m3d.modeler.create_cylinder(
+    plate = modeler.create_cylinder(
         orientation="X",
         origin=plate_origin,
         radius=cup_radius,
@@ -811,1086 +752,1327 @@ def create_amf_contact(m3d, origin, is_static=True):
 
     # 4.1 触头片中心孔
     hole_name = f"{prefix}_Plate_Center_Hole"
-    hole = m3d.modeler.create_cylinder(
+    hole = modeler.create_cylinder(
         orientation="X",
         origin=plate_origin,
         radius=center_hole_radius,
         height=plate_thickness * direction,
         name=hole_name,
     )
-    m3d.modeler.subtract(plate_name, [hole_name], keep_originals=False)
+    modeler.subtract(plate_name, [hole_name], keep_originals=False)
 
     # 4.2 触头片径向槽
     for i in range(groove_count):
         groove_name = f"{prefix}_Plate_Groove_{i}"
-        groove = m3d.modeler.create_box(
+        groove = modeler.create_box(
             origin=[plate_origin[0], 0, -groove_width / 2],
             sizes=[plate_thickness * direction * 1.2, groove_length, groove_width],
             name=groove_name,
         )
-        m3d.modeler.rotate(groove_name, axis="X", angle=i * (360.0 / groove_count))
-        m3d.modeler.subtract(plate_name, [groove_name], keep_originals=False)
+        modeler.rotate(groove_name, axis="X", angle=i * (360.0 / groove_count))
+        modeler.subtract(plate_name, [groove_name], keep_originals=False)
 
     # 返回最后的接触面X坐标，用于定位下一级
     final_x = origin[0] + (cup_height + plate_thickness) * direction
     return final_x, plate_name, cup_name
 
 
-# =============================================================================
-# 5. 静端组件生成
-# =============================================================================
-print("\n[4/10] 创建静端组件 (AMF)...")
-
-# 静端法兰盘
-static_flange = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[STATIC_FLANGE_X, 0, 0],
-    radius=FLANGE_OUTER_RADIUS,
-    height=FLANGE_THICKNESS,
-    name="Static_Flange",
-    material="steel_stainless",
-)
-static_flange_void = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[STATIC_FLANGE_X, 0, 0],
-    radius=FLANGE_INNER_RADIUS,
-    height=FLANGE_THICKNESS,
-    name="Static_Flange_Void_Temp",
-)
-m3d.modeler.subtract(static_flange, [static_flange_void], keep_originals=False)
-
-# 静端导电杆 (先画导电杆，直至触头杯底)
-# 修正：导电杆终点应为触头杯底位置
-# 假设触头总厚度(含杯+片) 约为 CONTACT_THICKNESS * 2 左右
-# 我们反推基准点: 静触头表面就在 STATIC_CONTACT_X + CONTACT_THICKNESS
-# 此处简化：让 AMF 结构向右(+X)生长，直至接触面
-
-# 计算AMF起始点X (杯底)
-# 目标接触面: STATIC_CONTACT_X
-# AMF总长: cup_h + plate_h
-amf_total_len = AMF_CUP_HEIGHT + AMF_PLATE_THICKNESS
-amf_start_x = STATIC_CONTACT_X - amf_total_len
-
-# 也就是现在的静触头表面在: STATIC_CONTACT_X
-# 我们重新定义:
-#   STATIC_CONTACT_FACE_X = -CONTACT_GAP / 2
-#   AMF_STATIC_ORIGIN = STATIC_CONTACT_FACE_X - amf_total_len
-STATIC_CONTACT_FACE_X = -CONTACT_GAP / 2
-amf_static_origin = [STATIC_CONTACT_FACE_X - amf_total_len, 0, 0]
-
-# 调用函数生成静触头
-_, static_plate, static_cup = create_amf_contact(m3d, amf_static_origin, is_static=True)
-
-# 静端导电杆 (连接法兰与杯底)
-static_rod_end = amf_static_origin[0]
-static_rod = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[STATIC_ROD_X_START, 0, 0],
-    radius=ROD_RADIUS,
-    height=static_rod_end - STATIC_ROD_X_START,
-    name="Static_Rod",
-    material="copper",
-)
+def _print_plan():
+    """--dry-run: 打印关键几何参数, 不检测/连接 AEDT"""
+    print("=" * 60)
+    print("真空灭弧室瞬态仿真 - Dry run (不连接 AEDT)")
+    print("=" * 60)
+    print(f"  项目: {project_name}/{design_name} ({solution_type})")
+    print(f"  项目目录: {project_dir}")
+    print(f"  瓷套: 外径{CERAMIC_OUTER_RADIUS * 2}mm, 内径{CERAMIC_INNER_RADIUS * 2}mm, 长度{CERAMIC_LENGTH}mm")
+    print(f"  触头: 直径{CONTACT_RADIUS * 2}mm, 开距{CONTACT_GAP}mm (最大{CONTACT_GAP_MAX}mm)")
+    print(f"  屏蔽罩: 外径{SHIELD_OUTER_RADIUS * 2}mm, 长度{SHIELD_LENGTH}mm")
+    print(f"  导电杆: 直径{ROD_RADIUS * 2}mm, 静端{STATIC_ROD_LENGTH}mm, 动端{MOVING_ROD_LENGTH}mm")
+    print(f"  激励: {RATED_CURRENT}A/{FREQUENCY}Hz, 模式 {EXCITATION_MODE}")
+    print(f"  仿真时间: {MOTION_TIME * 1000:.1f}ms, 步长 {TIME_STEP * 1000:.3f}ms")
 
-# 组合导体
-m3d.modeler.unite(["Static_Rod", static_cup, static_plate])
-static_conductor_name = "Static_Rod"  # 合并后名称通常为第一个
-print(f"  静触头(AMF)生成完毕")
 
+def _build_model(m3d) -> dict:
+    """[2/10]~[9/10] 材料、几何、求解域与 Motion Band
 
-# =============================================================================
-# 6. 动端组件生成
-# =============================================================================
-print("\n[5/10] 创建动端组件 (AMF)...")
-
-# 动端法兰盘
-moving_flange = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[MOVING_FLANGE_X, 0, 0],
-    radius=FLANGE_OUTER_RADIUS,
-    height=FLANGE_THICKNESS,
-    name="Moving_Flange",
-    material="steel_stainless",
-)
-moving_flange_void = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[MOVING_FLANGE_X, 0, 0],
-    radius=FLANGE_INNER_RADIUS,
-    height=FLANGE_THICKNESS,
-    name="Moving_Flange_Void_Temp",
-)
-m3d.modeler.subtract(moving_flange, [moving_flange_void], keep_originals=False)
-
-# 动触头 (AMF)
-# 动触头接触面: MOVING_CONTACT_X = CONTACT_GAP / 2
-# 动触头向左(-X)生长，杯底在右侧
-# AMF Origin应在: MOVING_CONTACT_X + amf_total_len
-MOVING_CONTACT_FACE_X = CONTACT_GAP / 2
-amf_moving_origin = [MOVING_CONTACT_FACE_X + amf_total_len, 0, 0]
-
-# 调用函数生成动触头 (is_static=False)
-_, moving_plate, moving_cup = create_amf_contact(
-    m3d, amf_moving_origin, is_static=False
-)
+    返回后续激励/运动设置需要的对象名与求解域范围 (几何复用时由
+    _existing_model() 从现有模型恢复同样的字段)。
+    """
+    # =============================================================================
+    # 2. 材料定义
+    # =============================================================================
+    stage("\n[2/10] 创建材料...")
 
-# 动端导电杆 (连接杯底与法兰外)
-moving_rod_start = amf_moving_origin[0]
-moving_rod = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[moving_rod_start, 0, 0],
-    radius=ROD_RADIUS,
-    height=MOVING_ROD_X_END - moving_rod_start,
-    name="Moving_Rod",
-    material="copper",
-)
+    if not m3d.materials.exists_material("Al2O3_Ceramic"):
+        mat = m3d.materials.add_material("Al2O3_Ceramic")
+        mat.permittivity = 9.4
+        mat.conductivity = 0
 
-# 组合导体
-m3d.modeler.unite(["Moving_Rod", moving_cup, moving_plate])
-moving_conductor_name = "Moving_Rod"
-print(f"  动触头(AMF)生成完毕")
+    if not m3d.materials.exists_material("CuCr_Alloy"):
+        mat = m3d.materials.add_material("CuCr_Alloy")
+        mat.conductivity = 2.9e7
+        mat.permeability = 1.0
 
-if ARC_ENABLE and CONTACT_GAP > 0:
-    try:
-        arc_origin_x = STATIC_CONTACT_FACE_X
-        arc = m3d.modeler.create_cylinder(
-            orientation="X",
-            origin=[arc_origin_x, 0, 0],
-            radius=ARC_RADIUS,
-            height=CONTACT_GAP,
-            name="Arc_Column",
-            material="Arc_Column",
-        )
-        if arc:
-            print(f"  [信息] 弧柱已创建: 半径={ARC_RADIUS}mm, 长度={CONTACT_GAP}mm")
-    except Exception as e:
-        print(f"  [警告] 弧柱创建失败: {e}")
+    if ARC_ENABLE and not m3d.materials.exists_material("Arc_Column"):
+        mat = m3d.materials.add_material("Arc_Column")
+        mat.permittivity = 1.0
+        mat.conductivity = ARC_CONDUCTIVITY
 
-# =============================================================================
-# 6. 屏蔽罩 (桶状结构)
-# =============================================================================
-print("\n[6/10] 创建屏蔽罩...")
-
-shield_outer = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[SHIELD_X_START, 0, 0],
-    radius=SHIELD_OUTER_RADIUS,
-    height=SHIELD_LENGTH,
-    name="Main_Shield",
-    material="copper",
-)
+    print("  材料创建完成")
 
-shield_void = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[SHIELD_X_START, 0, 0],
-    radius=SHIELD_INNER_RADIUS,
-    height=SHIELD_LENGTH,
-    name="Shield_Void_Temp",
-)
-m3d.modeler.subtract(shield_outer, [shield_void], keep_originals=False)
-print(f"  屏蔽罩: 外径{SHIELD_OUTER_RADIUS * 2}mm, 长度{SHIELD_LENGTH}mm")
+    # =============================================================================
+    # 3. 瓷套 (陶瓷绝缘管）
+    # =============================================================================
+    stage("\n[3/10] 创建瓷套...")
 
-# =============================================================================
-# 7. 真空区域
-# =============================================================================
-print("\n[7/10] 创建真空区域...")
-
-vacuum = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[CERAMIC_X_START + 1, 0, 0],
-    radius=CERAMIC_INNER_RADIUS - 1,
-    height=CERAMIC_LENGTH - 2,
-    name="Vacuum_Region",
-    material="vacuum",
-)
-all_solid_objects = [
-    obj
-    for obj in m3d.modeler.object_names
-    if obj != "Vacuum_Region" and "Region" not in obj
-]
-try:
-    m3d.modeler.subtract("Vacuum_Region", all_solid_objects, keep_originals=True)
-    print(f"  [成功] 真空域已挖空 {len(all_solid_objects)} 个实体")
-except Exception as e:
-    print(f"  [警告] 真空域挖空失败: {e}")
-print("  真空区域创建完成")
+    # [3/10]~[6/10] 的几何命令先在本地记录, 屏蔽罩完成后一次 RunScript 下发
+    batch = ModelerBatch(m3d)
 
-# =============================================================================
-# 8. Region (求解域)
-# =============================================================================
-print("\n[8/10] 创建求解域...")
+    ceramic_outer = batch.create_cylinder(
+        orientation="X",
+        origin=[CERAMIC_X_START, 0, 0],
+        radius=CERAMIC_OUTER_RADIUS,
+        height=CERAMIC_LENGTH,
+        name="Ceramic_Sleeve",
+        material="Al2O3_Ceramic",
+    )
+
+    ceramic_void = batch.create_cylinder(
+        orientation="X",
+        origin=[CERAMIC_X_START, 0, 0],
+        radius=CERAMIC_INNER_RADIUS,
+        height=CERAMIC_LENGTH,
+        name="Ceramic_Void_Temp",
+    )
+    batch.subtract(ceramic_outer, [ceramic_void], keep_originals=False)
+    print(f"  瓷套: 外径{CERAMIC_OUTER_RADIUS * 2}mm, 长度{CERAMIC_LENGTH}mm")
+
+    # =============================================================================
+    # 5. 静端组件生成
+    # =============================================================================
+    stage("\n[4/10] 创建静端组件 (AMF)...")
+
+    # 静端法兰盘
+    static_flange = batch.create_cylinder(
+        orientation="X",
+        origin=[STATIC_FLANGE_X, 0, 0],
+        radius=FLANGE_OUTER_RADIUS,
+        height=FLANGE_THICKNESS,
+        name="Static_Flange",
+        material="steel_stainless",
+    )
+    static_flange_void = batch.create_cylinder(
+        orientation="X",
+        origin=[STATIC_FLANGE_X, 0, 0],
+        radius=FLANGE_INNER_RADIUS,
+        height=FLANGE_THICKNESS,
+        name="Static_Flange_Void_Temp",
+    )
+    batch.subtract(static_flange, [static_flange_void], keep_originals=False)
+
+    # 静端导电杆 (先画导电杆，直至触头杯底)
+    # 修正：导电杆终点应为触头杯底位置
+    # 假设触头总厚度(含杯+片) 约为 CONTACT_THICKNESS * 2 左右
+    # 我们反推基准点: 静触头表面就在 STATIC_CONTACT_X + CONTACT_THICKNESS
+    # 此处简化：让 AMF 结构向右(+X)生长，直至接触面
+
+    # 计算AMF起始点X (杯底)
+    # 目标接触面: STATIC_CONTACT_X
+    # AMF总长: cup_h + plate_h
+    amf_total_len = AMF_CUP_HEIGHT + AMF_PLATE_THICKNESS
+    amf_start_x = STATIC_CONTACT_X - amf_total_len
+
+    # 也就是现在的静触头表面在: STATIC_CONTACT_X
+    # 我们重新定义:
+    #   STATIC_CONTACT_FACE_X = -CONTACT_GAP / 2
+    #   AMF_STATIC_ORIGIN = STATIC_CONTACT_FACE_X - amf_total_len
+    STATIC_CONTACT_FACE_X = -CONTACT_GAP / 2
+    amf_static_origin = [STATIC_CONTACT_FACE_X - amf_total_len, 0, 0]
+
+    # 调用函数生成静触头
+    _, static_plate, static_cup = create_amf_contact(
+        m3d, amf_static_origin, is_static=True, modeler=batch
+    )
+
+    # 静端导电杆 (连接法兰与杯底)
+    static_rod_end = amf_static_origin[0]
+    static_rod = batch.create_cylinder(
+        orientation="X",
+        origin=[STATIC_ROD_X_START, 0, 0],
+        radius=ROD_RADIUS,
+        height=static_rod_end - STATIC_ROD_X_START,
+        name="Static_Rod",
+        material="copper",
+    )
+
+    # 组合导体
+    batch.unite(["Static_Rod", static_cup, static_plate])
+    static_conductor_name = "Static_Rod"  # 合并后名称通常为第一个
+    print(f"  静触头(AMF)生成完毕")
+
+    # =============================================================================
+    # 6. 动端组件生成
+    # =============================================================================
+    stage("\n[5/10] 创建动端组件 (AMF)...")
+
+    # 动端法兰盘
+    moving_flange = batch.create_cylinder(
+        orientation="X",
+        origin=[MOVING_FLANGE_X, 0, 0],
+        radius=FLANGE_OUTER_RADIUS,
+        height=FLANGE_THICKNESS,
+        name="Moving_Flange",
+        material="steel_stainless",
+    )
+    moving_flange_void = batch.create_cylinder(
+        orientation="X",
+        origin=[MOVING_FLANGE_X, 0, 0],
+        radius=FLANGE_INNER_RADIUS,
+        height=FLANGE_THICKNESS,
+        name="Moving_Flange_Void_Temp",
+    )
+    batch.subtract(moving_flange, [moving_flange_void], keep_originals=False)
+
+    # 动触头 (AMF)
+    # 动触头接触面: MOVING_CONTACT_X = CONTACT_GAP / 2
+    # 动触头向左(-X)生长，杯底在右侧
+    # AMF Origin应在: MOVING_CONTACT_X + amf_total_len
+    MOVING_CONTACT_FACE_X = CONTACT_GAP / 2
+    amf_moving_origin = [MOVING_CONTACT_FACE_X + amf_total_len, 0, 0]
+
+    # 调用函数生成动触头 (is_static=False)
+    _, moving_plate, moving_cup = create_amf_contact(
+        m3d, amf_moving_origin, is_static=False, modeler=batch
+    )
+
+    # 动端导电杆 (连接杯底与法兰外)
+    moving_rod_start = amf_moving_origin[0]
+    moving_rod = batch.create_cylinder(
+        orientation="X",
+        origin=[moving_rod_start, 0, 0],
+        radius=ROD_RADIUS,
+        height=MOVING_ROD_X_END - moving_rod_start,
+        name="Moving_Rod",
+        material="copper",
+    )
+
+    # 组合导体
+    batch.unite(["Moving_Rod", moving_cup, moving_plate])
+    moving_conductor_name = "Moving_Rod"
+    print(f"  动触头(AMF)生成完毕")
+
+    # =============================================================================
+    # 6. 屏蔽罩 (桶状结构)
+    # =============================================================================
+    stage("\n[6/10] 创建屏蔽罩...")
+
+    shield_outer = batch.create_cylinder(
+        orientation="X",
+        origin=[SHIELD_X_START, 0, 0],
+        radius=SHIELD_OUTER_RADIUS,
+        height=SHIELD_LENGTH,
+        name="Main_Shield",
+        material="copper",
+    )
+
+    shield_void = batch.create_cylinder(
+        orientation="X",
+        origin=[SHIELD_X_START, 0, 0],
+        radius=SHIELD_INNER_RADIUS,
+        height=SHIELD_LENGTH,
+        name="Shield_Void_Temp",
+    )
+    batch.subtract(shield_outer, [shield_void], keep_originals=False)
+    print(f"  屏蔽罩: 外径{SHIELD_OUTER_RADIUS * 2}mm, 长度{SHIELD_LENGTH}mm")
+
+    batch.flush()
+    print(f"  [批处理] 几何合计: {batch.summary()}")
+
+    # 弧柱单独创建, 失败不影响主体几何
+    if ARC_ENABLE and CONTACT_GAP > 0:
+        try:
+            arc_origin_x = STATIC_CONTACT_FACE_X
+            arc = m3d.modeler.create_cylinder(
+                orientation="X",
+                origin=[arc_origin_x, 0, 0],
+                radius=ARC_RADIUS,
+                height=CONTACT_GAP,
+                name="Arc_Column",
+                material="Arc_Column",
+            )
+            if arc:
+                print(f"  [信息] 弧柱已创建: 半径={ARC_RADIUS}mm, 长度={CONTACT_GAP}mm")
+        except Exception as e:
+            print(f"  [警告] 弧柱创建失败: {e}")
+
+    # =============================================================================
+    # 7. 真空区域
+    # =============================================================================
+    stage("\n[7/10] 创建真空区域...")
+
+    vacuum = m3d.modeler.create_cylinder(
+        orientation="X",
+        origin=[CERAMIC_X_START + 1, 0, 0],
+        radius=CERAMIC_INNER_RADIUS - 1,
+        height=CERAMIC_LENGTH - 2,
+        name="Vacuum_Region",
+        material="vacuum",
+    )
+    all_solid_objects = [
+        obj
+        for obj in m3d.modeler.object_names
+        if obj != "Vacuum_Region" and "Region" not in obj
+    ]
+    try:
+        m3d.modeler.subtract("Vacuum_Region", all_solid_objects, keep_originals=True)
+        print(f"  [成功] 真空域已挖空 {len(all_solid_objects)} 个实体")
+    except Exception as e:
+        print(f"  [警告] 真空域挖空失败: {e}")
+    print("  真空区域创建完成")
+
+    # =============================================================================
+    # 8. Region (求解域)
+    # =============================================================================
+    stage("\n[8/10] 创建求解域...")
 
-try:
-    if "Region" in m3d.modeler.object_names:
-        print("  Region 已存在，跳过创建")
-    else:
-        region = m3d.modeler.create_air_region(
-            x_pos=max(0.0, REGION_X_POS),
-            x_neg=max(0.0, REGION_X_NEG),
-            y_pos=REGION_YZ_MARGIN,
-            y_neg=REGION_YZ_MARGIN,
-            z_pos=REGION_YZ_MARGIN,
-            z_neg=REGION_YZ_MARGIN,
-            is_percentage=False,
-        )
-        print("  Region 创建完成")
-except Exception:
-    print("  使用默认 Region")
-
-terminal_pad_in = None
-terminal_pad_out = None
-lead_in_name = None
-lead_out_name = None
-region_x_min = None
-region_x_max = None
-use_terminal_pads = LEAD_ENABLE or EXCITATION_MODE in ("winding", "face_current")
-if use_terminal_pads:
     try:
         if "Region" in m3d.modeler.object_names:
-            region_box = m3d.modeler["Region"].bounding_box
-            if region_box and len(region_box) == 6:
-                x_min, y_min, z_min, x_max, y_max, z_max = region_box
-                region_x_min = x_min
-                region_x_max = x_max
-                y_half = max(2.0, min(ROD_RADIUS * 1.5, abs(y_max - y_min) / 2 - 1.0))
-                z_half = max(2.0, min(ROD_RADIUS * 1.5, abs(z_max - z_min) / 2 - 1.0))
-                half_size = min(y_half, z_half)
-                if LEAD_ENABLE:
-                    for obj_name in (
-                        "Terminal_In_Pad",
-                        "Terminal_Out_Pad",
-                        "Terminal_In_Sheet",
-                        "Terminal_Out_Sheet",
-                        "Lead_In",
-                        "Lead_Out",
-                    ):
-                        if obj_name in m3d.modeler.object_names:
-                            try:
-                                m3d.modeler.delete(obj_name)
-                            except Exception:
-                                pass
-                    band_clearance = 2.0
-                    moving_max_x = MOVING_ROD_X_END
-                    if OPEN_DIRECTION == "positive":
-                        band_x_end = moving_max_x + GAP_TRAVEL + band_clearance
+            print("  Region 已存在，跳过创建")
+        else:
+            region = m3d.modeler.create_air_region(
+                x_pos=max(0.0, REGION_X_POS),
+                x_neg=max(0.0, REGION_X_NEG),
+                y_pos=REGION_YZ_MARGIN,
+                y_neg=REGION_YZ_MARGIN,
+                z_pos=REGION_YZ_MARGIN,
+                z_neg=REGION_YZ_MARGIN,
+                is_percentage=False,
+            )
+            print("  Region 创建完成")
+    except Exception:
+        print("  使用默认 Region")
+
+    terminal_pad_in = None
+    terminal_pad_out = None
+    lead_in_name = None
+    lead_out_name = None
+    region_x_min = None
+    region_x_max = None
+    use_terminal_pads = LEAD_ENABLE or EXCITATION_MODE in ("winding", "face_current")
+    if use_terminal_pads:
+        try:
+            if "Region" in m3d.modeler.object_names:
+                region_box = m3d.modeler["Region"].bounding_box
+                if region_box and len(region_box) == 6:
+                    x_min, y_min, z_min, x_max, y_max, z_max = region_box
+                    region_x_min = x_min
+                    region_x_max = x_max
+                    y_half = max(2.0, min(ROD_RADIUS * 1.5, abs(y_max - y_min) / 2 - 1.0))
+                    z_half = max(2.0, min(ROD_RADIUS * 1.5, abs(z_max - z_min) / 2 - 1.0))
+                    half_size = min(y_half, z_half)
+                    if LEAD_ENABLE:
+                        for obj_name in (
+                            "Terminal_In_Pad",
+                            "Terminal_Out_Pad",
+                            "Terminal_In_Sheet",
+                            "Terminal_Out_Sheet",
+                            "Lead_In",
+                            "Lead_Out",
+                        ):
+                            if obj_name in m3d.modeler.object_names:
+                                try:
+                                    m3d.modeler.delete(obj_name)
+                                except Exception:
+                                    pass
+                        band_clearance = 2.0
+                        moving_max_x = MOVING_ROD_X_END
+                        if OPEN_DIRECTION == "positive":
+                            band_x_end = moving_max_x + GAP_TRAVEL + band_clearance
+                        else:
+                            band_x_end = moving_max_x + band_clearance
+                        lead_len_in = min(LEAD_LENGTH_DEFAULT, x_max - x_min - 2.0)
+                        lead_in_start = x_min
+                        lead_in_len = max(0.0, lead_len_in)
+                        if lead_in_len >= 0.5:
+                            lead_in = m3d.modeler.create_cylinder(
+                                orientation="X",
+                                origin=[lead_in_start, 0, 0],
+                                radius=LEAD_RADIUS,
+                                height=lead_in_len,
+                                name="Lead_In",
+                                material="copper",
+                            )
+                            if lead_in:
+                                lead_in_name = "Lead_In"
+                        lead_out_start = max(
+                            x_max - LEAD_LENGTH_DEFAULT, band_x_end + LEAD_CLEARANCE
+                        )
+                        lead_out_len = x_max - lead_out_start
+                        if lead_out_len >= 0.5:
+                            lead_out = m3d.modeler.create_cylinder(
+                                orientation="X",
+                                origin=[lead_out_start, 0, 0],
+                                radius=LEAD_RADIUS,
+                                height=lead_out_len,
+                                name="Lead_Out",
+                                material="copper",
+                            )
+                            if lead_out:
+                                lead_out_name = "Lead_Out"
+                        terminal_pad_in = None
+                        terminal_pad_out = None
+                        print(f"  [信息] 引线体: In={lead_in_name}, Out={lead_out_name}")
                     else:
-                        band_x_end = moving_max_x + band_clearance
-                    lead_len_in = min(LEAD_LENGTH_DEFAULT, x_max - x_min - 2.0)
-                    lead_in_start = x_min
-                    lead_in_len = max(0.0, lead_len_in)
-                    if lead_in_len >= 0.5:
-                        lead_in = m3d.modeler.create_cylinder(
-                            orientation="X",
-                            origin=[lead_in_start, 0, 0],
-                            radius=LEAD_RADIUS,
-                            height=lead_in_len,
-                            name="Lead_In",
-                            material="copper",
+                        terminal_pad_in = _ensure_terminal_pad(
+                            m3d,
+                            "Terminal_In_Pad",
+                            x_min,
+                            half_size,
                         )
-                        if lead_in:
-                            lead_in_name = "Lead_In"
-                    lead_out_start = max(
-                        x_max - LEAD_LENGTH_DEFAULT, band_x_end + LEAD_CLEARANCE
-                    )
-                    lead_out_len = x_max - lead_out_start
-                    if lead_out_len >= 0.5:
-                        lead_out = m3d.modeler.create_cylinder(
-                            orientation="X",
-                            origin=[lead_out_start, 0, 0],
-                            radius=LEAD_RADIUS,
-                            height=lead_out_len,
-                            name="Lead_Out",
-                            material="copper",
+                        terminal_pad_out = _ensure_terminal_pad(
+                            m3d,
+                            "Terminal_Out_Pad",
+                            x_max,
+                            half_size,
                         )
-                        if lead_out:
-                            lead_out_name = "Lead_Out"
-                    terminal_pad_in = None
-                    terminal_pad_out = None
-                    print(f"  [信息] 引线体: In={lead_in_name}, Out={lead_out_name}")
-                else:
-                    terminal_pad_in = _ensure_terminal_pad(
-                        m3d,
-                        "Terminal_In_Pad",
-                        x_min,
-                        half_size,
-                    )
-                    terminal_pad_out = _ensure_terminal_pad(
-                        m3d,
-                        "Terminal_Out_Pad",
-                        x_max,
-                        half_size,
-                    )
-                    print(
-                        f"  [测试] 端子片: {terminal_pad_in} @ X={x_min:.2f}, {terminal_pad_out} @ X={x_max:.2f}"
-                    )
+                        print(
+                            f"  [测试] 端子片: {terminal_pad_in} @ X={x_min:.2f}, {terminal_pad_out} @ X={x_max:.2f}"
+                        )
+        except Exception as e:
+            print(f"  [警告] 端子片创建失败: {e}")
+
+    # 8.1 基础几何校验
+    print("  [测试] 几何校验与验证...")
+    try:
+        validation_dir = os.path.join(os.getcwd(), "VacuumInterrupter", "post")
+        os.makedirs(validation_dir, exist_ok=True)
+        validation_log = os.path.join(validation_dir, "model_validation.log")
+        m3d.change_validation_settings(
+            entity_check_level="Basic",
+            ignore_unclassified=True,
+            skip_intersections=False,
+        )
+        validation_result = m3d.validate_simple(validation_log)
+        print(f"  [测试] ValidateDesign = {validation_result}, log: {validation_log}")
     except Exception as e:
-        print(f"  [警告] 端子片创建失败: {e}")
-
-# 8.1 基础几何校验
-print("  [测试] 几何校验与验证...")
-try:
-    validation_dir = os.path.join(os.getcwd(), "VacuumInterrupter", "post")
-    os.makedirs(validation_dir, exist_ok=True)
-    validation_log = os.path.join(validation_dir, "model_validation.log")
-    m3d.change_validation_settings(
-        entity_check_level="Basic",
-        ignore_unclassified=True,
-        skip_intersections=False,
-    )
-    validation_result = m3d.validate_simple(validation_log)
-    print(f"  [测试] ValidateDesign = {validation_result}, log: {validation_log}")
-except Exception as e:
-    print(f"  [警告] 几何验证失败: {e}")
+        print(f"  [警告] 几何验证失败: {e}")
+
+    def _log_object_volume(obj_name):
+        try:
+            if obj_name in m3d.modeler.object_names:
+                obj = m3d.modeler[obj_name]
+                volume = getattr(obj, "volume", None)
+                print(f"  [测试] {obj_name} volume = {volume}")
+            else:
+                print(f"  [测试] {obj_name} 不存在")
+        except Exception as e:
+            print(f"  [警告] 读取 {obj_name} 体积失败: {e}")
+
+    _log_object_volume("Vacuum_Region")
+    _log_object_volume("Region")
+
+    # =============================================================================
+    # 9. Motion Band (只包围动端组件)
+    # =============================================================================
+    stage("\n[9/10] 创建 Motion Band...")
 
+    # Band 范围：只包围动端组件 (Moving_Rod)
+    # 以当前几何为基准，按行程扩展，避免与静触头与屏蔽罩干涉
+    band_clearance = 2.0
+    moving_min_x = MOVING_CONTACT_FACE_X
+    moving_max_x = MOVING_ROD_X_END
+    if OPEN_DIRECTION == "positive":
+        band_x_start = moving_min_x - band_clearance
+        band_x_end = moving_max_x + GAP_TRAVEL + band_clearance
+    else:
+        band_x_start = moving_min_x - GAP_TRAVEL - band_clearance
+        band_x_end = moving_max_x + band_clearance
 
-def _log_object_volume(obj_name):
+    static_safe_x = STATIC_CONTACT_FACE_X + band_clearance
+    if band_x_start < static_safe_x:
+        print(
+            f"  [警告] Motion Band 左端接近静触头: {band_x_start:.2f}mm < {static_safe_x:.2f}mm"
+        )
+        band_x_start = static_safe_x
+
+    band_length = band_x_end - band_x_start
+    if band_length <= 0:
+        raise ValueError("Motion Band 长度无效，请检查开距与行程设置")
+
+    max_band_radius = SHIELD_INNER_RADIUS - 0.3
+    band_radius = min(CONTACT_RADIUS + 0.5, max_band_radius)
+
+    motion_band = m3d.modeler.create_cylinder(
+        orientation="X",
+        origin=[band_x_start, 0, 0],
+        radius=band_radius,
+        height=band_length,
+        name="Motion_Band",
+        material="vacuum",
+    )
+
+    # 避免 Motion_Band 与 Vacuum_Region 发生几何重叠
     try:
-        if obj_name in m3d.modeler.object_names:
-            obj = m3d.modeler[obj_name]
-            volume = getattr(obj, "volume", None)
-            print(f"  [测试] {obj_name} volume = {volume}")
-        else:
-            print(f"  [测试] {obj_name} 不存在")
+        m3d.modeler.subtract("Vacuum_Region", ["Motion_Band"], keep_originals=True)
     except Exception as e:
-        print(f"  [警告] 读取 {obj_name} 体积失败: {e}")
+        print(f"  [警告] Vacuum_Region 减去 Motion_Band 失败: {e}")
 
+    # 避免 Motion_Band 与移动部件相交
+    try:
+        band_cut_targets = [moving_conductor_name]
+        if ARC_ENABLE and "Arc_Column" in m3d.modeler.object_names:
+            band_cut_targets.append("Arc_Column")
+        m3d.modeler.subtract("Motion_Band", band_cut_targets, keep_originals=True)
+    except Exception as e:
+        print(f"  [警告] Motion_Band 挖空失败: {e}")
+
+    print(f"  X范围: {band_x_start:.1f}mm ~ {band_x_end:.1f}mm")
+    print(f"  静触头右端面: X={STATIC_CONTACT_X + CONTACT_THICKNESS:.1f}mm")
+    print(f"  Band 不与静触头重叠: CHECKED")
+    _log_object_volume("Motion_Band")
+
+    return {
+        "static_conductor_name": static_conductor_name,
+        "moving_conductor_name": moving_conductor_name,
+        "terminal_pad_in": terminal_pad_in,
+        "terminal_pad_out": terminal_pad_out,
+        "lead_in_name": lead_in_name,
+        "lead_out_name": lead_out_name,
+        "region_x_min": region_x_min,
+        "region_x_max": region_x_max,
+    }
+
+
+def _existing_model(m3d) -> dict:
+    """几何复用时恢复 _build_model() 的返回值"""
+    names = set(m3d.modeler.object_names)
+    model = {
+        "static_conductor_name": "Static_Rod",
+        "moving_conductor_name": "Moving_Rod",
+        "terminal_pad_in": "Terminal_In_Pad" if "Terminal_In_Pad" in names else None,
+        "terminal_pad_out": "Terminal_Out_Pad" if "Terminal_Out_Pad" in names else None,
+        "lead_in_name": "Lead_In" if "Lead_In" in names else None,
+        "lead_out_name": "Lead_Out" if "Lead_Out" in names else None,
+        "region_x_min": None,
+        "region_x_max": None,
+    }
+    use_terminal_pads = LEAD_ENABLE or EXCITATION_MODE in ("winding", "face_current")
+    if use_terminal_pads and "Region" in names:
+        try:
+            region_box = m3d.modeler["Region"].bounding_box
+            if region_box and len(region_box) == 6:
+                model["region_x_min"], model["region_x_max"] = region_box[0], region_box[3]
+        except Exception as e:
+            print(f"  [警告] 读取 Region 范围失败: {e}")
+    return model
+
+
+def _build_sections() -> dict:
+    """增量模式的分段参数: 几何 (常量 + 建模代码) / 激励 / Setup"""
+    consts = {
+        k: v for k, v in globals().items()
+        if k.isupper() and isinstance(v, (int, float, str, bool, list, tuple))
+    }
+    excitation = {k: consts.pop(k) for k in EXCITATION_KEYS}
+    setup = {k: consts.pop(k) for k in SETUP_KEYS}
+    # 建模代码本身变化也要重建几何
+    consts["_code"] = parameter_hash(
+        inspect.getsource(_build_model) + inspect.getsource(create_amf_contact)
+    )
+    return {"geometry": consts, "excitation": excitation, "setup": setup}
 
-_log_object_volume("Vacuum_Region")
-_log_object_volume("Region")
 
-# =============================================================================
-# 9. Motion Band (只包围动端组件)
-# =============================================================================
-print("\n[9/10] 创建 Motion Band...")
-
-# Band 范围：只包围动端组件 (Moving_Rod)
-# 以当前几何为基准，按行程扩展，避免与静触头与屏蔽罩干涉
-band_clearance = 2.0
-moving_min_x = MOVING_CONTACT_FACE_X
-moving_max_x = MOVING_ROD_X_END
-if OPEN_DIRECTION == "positive":
-    band_x_start = moving_min_x - band_clearance
-    band_x_end = moving_max_x + GAP_TRAVEL + band_clearance
-else:
-    band_x_start = moving_min_x - GAP_TRAVEL - band_clearance
-    band_x_end = moving_max_x + band_clearance
-
-static_safe_x = STATIC_CONTACT_FACE_X + band_clearance
-if band_x_start < static_safe_x:
-    print(
-        f"  [警告] Motion Band 左端接近静触头: {band_x_start:.2f}mm < {static_safe_x:.2f}mm"
+def main():
+    parser = argparse.ArgumentParser(description="真空灭弧室瞬态电磁仿真 (12kV/4000A)")
+    parser.add_argument(
+        "aedt_path",
+        nargs="?",
+        default=None,
+        help="AEDT 启动脚本(.bat)或安装目录 (可选, 用于自定义安装路径)",
     )
-    band_x_start = static_safe_x
-
-band_length = band_x_end - band_x_start
-if band_length <= 0:
-    raise ValueError("Motion Band 长度无效，请检查开距与行程设置")
-
-max_band_radius = SHIELD_INNER_RADIUS - 0.3
-band_radius = min(CONTACT_RADIUS + 0.5, max_band_radius)
-
-motion_band = m3d.modeler.create_cylinder(
-    orientation="X",
-    origin=[band_x_start, 0, 0],
-    radius=band_radius,
-    height=band_length,
-    name="Motion_Band",
-    material="vacuum",
-)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只打印几何参数, 不检测/连接 AEDT",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量模式: 几何参数未变化时保留模型与网格, 只重建激励/运动/Setup",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="记录分阶段耗时 (写入工程目录 *_profile.json; AEDT 调用次数需同时设置 MAXWELL_AEDT_RECORD 录制或回放)",
+    )
+    parser.add_argument(
+        "--chrome-trace",
+        action="store_true",
+        help="同时输出 Chrome trace (chrome://tracing 或 ui.perfetto.dev 打开)",
+    )
+    args = parser.parse_args()
 
-# 避免 Motion_Band 与 Vacuum_Region 发生几何重叠
-try:
-    m3d.modeler.subtract("Vacuum_Region", ["Motion_Band"], keep_originals=True)
-except Exception as e:
-    print(f"  [警告] Vacuum_Region 减去 Motion_Band 失败: {e}")
-
-# 避免 Motion_Band 与移动部件相交
-try:
-    band_cut_targets = [moving_conductor_name]
-    if ARC_ENABLE and "Arc_Column" in m3d.modeler.object_names:
-        band_cut_targets.append("Arc_Column")
-    m3d.modeler.subtract("Motion_Band", band_cut_targets, keep_originals=True)
-except Exception as e:
-    print(f"  [警告] Motion_Band 挖空失败: {e}")
-
-print(f"  X范围: {band_x_start:.1f}mm ~ {band_x_end:.1f}mm")
-print(f"  静触头右端面: X={STATIC_CONTACT_X + CONTACT_THICKNESS:.1f}mm")
-print(f"  Band 不与静触头重叠: CHECKED")
-_log_object_volume("Motion_Band")
+    if args.dry_run:
+        _print_plan()
+        return
 
-# =============================================================================
-# 9.5 创建速度时程曲线 Dataset
-# =============================================================================
-print("\n[9.5/10] 创建速度时程曲线 Dataset...")
-
-# 时间-速度数据点 (指数衰减模型)
-velocity_data_x = [0.0, 0.001, 0.002, 0.003, 0.005, 0.008, 0.010, 0.015]
-velocity_data_y = [1.25, 1.2, 1.1, 1.05, 1.0, 1.0, 1.0, 1.0]
-
-dataset_name = "Velocity_Profile"
-try:
-    dataset_created = False
-    if dataset_name not in m3d.project_datasets:
-        created = m3d.create_dataset1d_design(
-            dataset_name,
-            velocity_data_x,
-            velocity_data_y,
-            x_unit="s",
-            y_unit="m_per_sec",
-        )
-        print(f"  [成功] 创建 Dataset: {dataset_name}")
-        dataset_created = bool(created) or True
+    profiler = start_profiler("VacuumInterrupter_Generator") if args.profile or args.chrome_trace else None
+
+    # 环境配置 (针对自定义安装路径)
+    if args.aedt_path:
+        _apply_aedt_path_arg(args.aedt_path)
+    _normalize_env_root()
+
+    os.makedirs(project_dir, exist_ok=True)
+
+    if os.path.exists(project_lock):
+        try:
+            os.remove(project_lock)
+            print(f"  [提示] 已删除旧项目锁: {project_lock}")
+        except Exception as e:
+            print(f"  [警告] 无法删除项目锁 {project_lock}: {e}")
+
+    if _is_ansysedt_running():
+        print("  [警告] 检测到 ansysedt.exe 正在运行，跳过结果文件清理以避免锁冲突")
     else:
-        print(f"  [信息] Dataset {dataset_name} 已存在")
-    # 部分版本不会立即刷新 project_datasets，这里不做硬性判定
-    if velocity_data_x[-1] < MOTION_TIME:
-        print("  [警告] 速度曲线末时刻小于仿真 StopTime，末段将保持常值")
-except Exception as e:
-    print(f"  [警告] 创建 Dataset 失败: {e}")
+        _cleanup_results_files(project_file)
+
+    print("=" * 60)
+    print("真空灭弧室瞬态仿真 - 12kV/4000A (v8 - 精确参考图)")
+    print("=" * 60)
+    print("  建模方向: X轴 (水平)")
+    print("  瓷套长度: {:.0f}mm".format(CERAMIC_LENGTH))
+    print("  开距: {:.0f}mm".format(CONTACT_GAP))
+
+    # =============================================================================
+    # 1. 初始化 Maxwell3D
+    # =============================================================================
+    stage("\n[1/10] 初始化 Maxwell3D...")
+
+    # 安装检测结果带缓存 (安装目录未变化时不再枚举注册表/扫描磁盘)
+    aedt_version, _ansys_path = detect_ansys_installation()
+    # 回放录制轨迹时不需要本机安装 AEDT
+    if not _ansys_path and not replay_active() and not any(
+        os.environ.get(f"ANSYSEM_ROOT{code}") for code in KNOWN_VERSION_CODES
+    ):
+        print(
+            "  [ERROR] No AEDT installation detected. Set ANSYSEM_ROOTxxx/AWP_ROOTxxx or install AEDT."
+        )
+        raise SystemExit(1)
+    if _ansys_path:
+        apply_environment(aedt_version, _ansys_path)
+    aedt_version = aedt_version or "2024.2"
+    print(f"  [INFO] Using AEDT {aedt_version}")
+
+    def _create_maxwell():
+        # 会话池中已有桌面时直接附着，否则启动新桌面
+        return get_pool(aedt_version).open_design(
+            project_name,
+            design_name,
+            solution_type=solution_type,
+        )
 
-# =============================================================================
-# 9.8 Mesh - 最细划分
-# =============================================================================
-print("  设置最细网格...")
-try:
-    m3d.mesh.delete_mesh_operations()
-    all_objects = list(m3d.modeler.object_names)
-    if all_objects:
-        m3d.mesh.assign_length_mesh(
-            all_objects,
-            inside_selection=True,
-            maximum_length=20.0,
-            maximum_elements=200000,
-            name="FineMesh",
+    def _init_maxwell_with_fallback():
+        try:
+            return _create_maxwell()
+        except Exception as e:
+            print(f"  [错误] {e}")
+            raise SystemExit(1)
+
+    m3d = _init_maxwell_with_fallback()
+
+    # 避免重复叠加几何，复用同名设计并清理旧模型
+    build, reuse_geometry, reuse_excitation, reuse_setup = _reset_design(
+        m3d, design_name, solution_type, incremental=args.incremental
+    )
+
+    if not getattr(m3d, "_odesign", None):
+        print(
+            "  [ERROR] AEDT not detected. Install AEDT and set ANSYSEM_ROOTxxx/AWP_ROOTxxx or adjust 'version'."
         )
-        print("  [成功] 已设置最细网格")
-    else:
-        print("  [警告] 未找到对象，跳过网格设置")
-except Exception as e:
-    print(f"  [警告] 网格设置失败: {e}")
+        raise SystemExit(1)
 
-# =============================================================================
-# 10. 分析设置 (Motion & Setup)
-# =============================================================================
-print("\n[10/10] 创建分析设置与激励...")
-
-# 10.1 Motion Setup
-print("  配置运动设置...")
-try:
-    # 定义运动部件
-    moving_parts = [moving_conductor_name]
-    if ARC_ENABLE and "Arc_Column" in m3d.modeler.object_names:
-        moving_parts.append("Arc_Column")
-
-    # 分配运动带 (Motion Band)
-    # PyAEDT method to assign translation motion
-    if OPEN_DIRECTION == "positive":
-        positive_limit = GAP_TRAVEL
-        negative_limit = 0
-        velocity_profile = f"pwl({dataset_name}, Time)"
+    m3d.modeler.model_units = "mm"
+    print(f"  [成功] 项目: {m3d.project_name}")
+
+    if reuse_geometry:
+        stage("\n[2/10]~[9/10] 几何/材料未变化, 复用现有模型...")
+        model = _existing_model(m3d)
     else:
-        positive_limit = 0
-        negative_limit = GAP_TRAVEL
-        velocity_profile = f"-pwl({dataset_name}, Time)"
-
-    motion_setup = m3d.assign_translate_motion(
-        band_object="Motion_Band",
-        moving_objects=moving_parts,
-        velocity_profile=velocity_profile,
-        axis="X",
-        mechanic_mass=1.0,  # 这里的质量不影响速度驱动的运动，给个默认值
-        positive_limit=positive_limit,
-        negative_limit=negative_limit,
-        motion_name="MovingMotion",
-    )
-    print("  [成功] 设置运动 (Translational)")
-    motion_enabled = True
+        model = _build_model(m3d)
+    static_conductor_name = model["static_conductor_name"]
+    moving_conductor_name = model["moving_conductor_name"]
+    terminal_pad_in = model["terminal_pad_in"]
+    terminal_pad_out = model["terminal_pad_out"]
+    lead_in_name = model["lead_in_name"]
+    lead_out_name = model["lead_out_name"]
+    region_x_min = model["region_x_min"]
+    region_x_max = model["region_x_max"]
+
+    # =============================================================================
+    # 9.5 创建速度时程曲线 Dataset
+    # =============================================================================
+    stage("\n[9.5/10] 创建速度时程曲线 Dataset...")
+
+    # 时间-速度数据点 (指数衰减模型)
+    velocity_data_x = [0.0, 0.001, 0.002, 0.003, 0.005, 0.008, 0.010, 0.015]
+    velocity_data_y = [1.25, 1.2, 1.1, 1.05, 1.0, 1.0, 1.0, 1.0]
+
+    dataset_name = "Velocity_Profile"
     try:
-        props = getattr(motion_setup, "props", {}) or {}
-        props_text = " ".join([str(v) for v in props.values()])
-        if abs(positive_limit - GAP_TRAVEL) > 1e-6 or abs(negative_limit) > 1e-6:
-            print("  [警告] 运动行程与 GAP_TRAVEL 不一致")
-        if "Motion_Band" not in m3d.modeler.object_names:
-            print("  [警告] Motion_Band 未找到")
-        print(f"  [信息] 速度配置: {velocity_profile}")
+        dataset_created = False
+        if dataset_name not in m3d.project_datasets:
+            created = m3d.create_dataset1d_design(
+                dataset_name,
+                velocity_data_x,
+                velocity_data_y,
+                x_unit="s",
+                y_unit="m_per_sec",
+            )
+            print(f"  [成功] 创建 Dataset: {dataset_name}")
+            dataset_created = bool(created) or True
+        else:
+            print(f"  [信息] Dataset {dataset_name} 已存在")
+        # 部分版本不会立即刷新 project_datasets，这里不做硬性判定
+        if velocity_data_x[-1] < MOTION_TIME:
+            print("  [警告] 速度曲线末时刻小于仿真 StopTime，末段将保持常值")
     except Exception as e:
-        print(f"  [警告] 运动设置校验失败: {e}")
-except Exception as e:
-    print(f"  [警告] 设置运动失败: {e}")
-    motion_enabled = False
-
-# 10.2 Excitations
-print("  配置电流激励...")
-assigned_excitations = []
-try:
-    try:
-        m3d.modeler.refresh()
-        for conductor_name in [static_conductor_name, moving_conductor_name]:
-            if conductor_name in m3d.modeler.object_names:
-                obj = m3d.modeler[conductor_name]
-                faces = m3d.modeler.get_object_faces(conductor_name)
-                print(
-                    f"  [测试] {conductor_name}: material={obj.material_name}, "
-                    f"type={obj.object_type}, faces={len(faces)}"
+        print(f"  [警告] 创建 Dataset 失败: {e}")
+
+    # =============================================================================
+    # 9.8 Mesh - 最细划分
+    # =============================================================================
+    if reuse_geometry:
+        # 几何与网格参数未变化: 保留网格操作, 避免初始网格失效
+        print("  [提示] 复用现有网格设置")
+    else:
+        stage("  设置最细网格...")
+        try:
+            m3d.mesh.delete_mesh_operations()
+            all_objects = list(m3d.modeler.object_names)
+            if all_objects:
+                m3d.mesh.assign_length_mesh(
+                    all_objects,
+                    inside_selection=True,
+                    maximum_length=MESH_MAX_LENGTH,
+                    maximum_elements=MESH_MAX_ELEMENTS,
+                    name="FineMesh",
                 )
+                print("  [成功] 已设置最细网格")
             else:
-                print(f"  [测试] {conductor_name} 不存在")
-    except Exception as e:
-        print(f"  [警告] 导体信息读取失败: {e}")
-    excitation_mode = EXCITATION_MODE
-    excitation_done = False
-    if motion_enabled and excitation_mode == "winding":
-        print("  [信息] 使用边界端子片创建 Coil/Winding 激励")
-    try:
-        m3d.modeler.refresh()
-        for conductor_name in [static_conductor_name, moving_conductor_name]:
-            if conductor_name in m3d.modeler.object_names:
-                obj = m3d.modeler[conductor_name]
-                if hasattr(obj, "solve_inside"):
-                    obj.solve_inside = True
-    except Exception as e:
-        print(f"  [警告] 导体求解设置失败: {e}")
-    # 这里的电流是正弦波: 4000*1.414 * sin(2*pi*50*Time)
-    current_expression = f"{PEAK_CURRENT:.2f}*sin(2*pi*{FREQUENCY}*Time)A"
-
-    def _assign_face_current(use_pads=False):
-        if use_pads and terminal_pad_in and terminal_pad_out:
-            in_obj = lead_in_name or terminal_pad_in
-            out_obj = lead_out_name or terminal_pad_out
-            static_in_face = None
-            moving_out_face = None
+                print("  [警告] 未找到对象，跳过网格设置")
+        except Exception as e:
+            print(f"  [警告] 网格设置失败: {e}")
+
+    # =============================================================================
+    # 10. 分析设置 (Motion & Setup)
+    # =============================================================================
+    stage("\n[10/10] 创建分析设置与激励...")
+
+    if reuse_excitation:
+        # 激励参数未变化: 保留运动设置与激励 (_reset_design 未删除边界)
+        stage("  运动设置/电流激励未变化, 复用")
+        motion_enabled = True
+        assigned_excitations = []
+    else:
+        # 10.1 Motion Setup
+        stage("  配置运动设置...")
+        try:
+            # 定义运动部件
+            moving_parts = [moving_conductor_name]
+            if ARC_ENABLE and "Arc_Column" in m3d.modeler.object_names:
+                moving_parts.append("Arc_Column")
+
+            # 分配运动带 (Motion Band)
+            # PyAEDT method to assign translation motion
+            if OPEN_DIRECTION == "positive":
+                positive_limit = GAP_TRAVEL
+                negative_limit = 0
+                velocity_profile = f"pwl({dataset_name}, Time)"
+            else:
+                positive_limit = 0
+                negative_limit = GAP_TRAVEL
+                velocity_profile = f"-pwl({dataset_name}, Time)"
+
+            motion_setup = m3d.assign_translate_motion(
+                band_object="Motion_Band",
+                moving_objects=moving_parts,
+                velocity_profile=velocity_profile,
+                axis="X",
+                mechanic_mass=1.0,  # 这里的质量不影响速度驱动的运动，给个默认值
+                positive_limit=positive_limit,
+                negative_limit=negative_limit,
+                motion_name="MovingMotion",
+            )
+            print("  [成功] 设置运动 (Translational)")
+            motion_enabled = True
             try:
-                if in_obj in m3d.modeler.object_names:
-                    in_type = m3d.modeler[in_obj].object_type
-                    if in_type == "Sheet":
-                        static_in_face = in_obj
-            except Exception:
-                pass
-            if static_in_face is None:
-                if lead_in_name and region_x_min is not None:
+                props = getattr(motion_setup, "props", {}) or {}
+                props_text = " ".join([str(v) for v in props.values()])
+                if abs(positive_limit - GAP_TRAVEL) > 1e-6 or abs(negative_limit) > 1e-6:
+                    print("  [警告] 运动行程与 GAP_TRAVEL 不一致")
+                if "Motion_Band" not in m3d.modeler.object_names:
+                    print("  [警告] Motion_Band 未找到")
+                print(f"  [信息] 速度配置: {velocity_profile}")
+            except Exception as e:
+                print(f"  [警告] 运动设置校验失败: {e}")
+        except Exception as e:
+            print(f"  [警告] 设置运动失败: {e}")
+            motion_enabled = False
+
+        # 10.2 Excitations
+        stage("  配置电流激励...")
+        assigned_excitations = []
+        try:
+            try:
+                m3d.modeler.refresh()
+                for conductor_name in [static_conductor_name, moving_conductor_name]:
+                    if conductor_name in m3d.modeler.object_names:
+                        obj = m3d.modeler[conductor_name]
+                        faces = m3d.modeler.get_object_faces(conductor_name)
+                        print(
+                            f"  [测试] {conductor_name}: material={obj.material_name}, "
+                            f"type={obj.object_type}, faces={len(faces)}"
+                        )
+                    else:
+                        print(f"  [测试] {conductor_name} 不存在")
+            except Exception as e:
+                print(f"  [警告] 导体信息读取失败: {e}")
+            excitation_mode = EXCITATION_MODE
+            excitation_done = False
+            if motion_enabled and excitation_mode == "winding":
+                print("  [信息] 使用边界端子片创建 Coil/Winding 激励")
+            try:
+                m3d.modeler.refresh()
+                for conductor_name in [static_conductor_name, moving_conductor_name]:
+                    if conductor_name in m3d.modeler.object_names:
+                        obj = m3d.modeler[conductor_name]
+                        if hasattr(obj, "solve_inside"):
+                            obj.solve_inside = True
+            except Exception as e:
+                print(f"  [警告] 导体求解设置失败: {e}")
+            # 这里的电流是正弦波: 4000*1.414 * sin(2*pi*50*Time)
+            current_expression = f"{PEAK_CURRENT:.2f}*sin(2*pi*{FREQUENCY}*Time)A"
+
+            def _assign_face_current(use_pads=False):
+                if use_pads and terminal_pad_in and terminal_pad_out:
+                    in_obj = lead_in_name or terminal_pad_in
+                    out_obj = lead_out_name or terminal_pad_out
+                    static_in_face = None
+                    moving_out_face = None
+                    try:
+                        if in_obj in m3d.modeler.object_names:
+                            in_type = m3d.modeler[in_obj].object_type
+                            if in_type == "Sheet":
+                                static_in_face = in_obj
+                    except Exception:
+                        pass
+                    if static_in_face is None:
+                        if lead_in_name and region_x_min is not None:
+                            static_in_face = m3d.modeler.get_faceid_from_position(
+                                [region_x_min, 0, 0], obj_name=in_obj
+                            )
+                        else:
+                            static_in_face = _find_face_by_extreme_x(m3d, in_obj, pick="min")
+                    try:
+                        if out_obj in m3d.modeler.object_names:
+                            out_type = m3d.modeler[out_obj].object_type
+                            if out_type == "Sheet":
+                                moving_out_face = out_obj
+                    except Exception:
+                        pass
+                    if moving_out_face is None:
+                        if lead_out_name and region_x_max is not None:
+                            moving_out_face = m3d.modeler.get_faceid_from_position(
+                                [region_x_max, 0, 0], obj_name=out_obj
+                            )
+                        else:
+                            moving_out_face = _find_face_by_extreme_x(m3d, out_obj, pick="max")
+                else:
                     static_in_face = m3d.modeler.get_faceid_from_position(
-                        [region_x_min, 0, 0], obj_name=in_obj
+                        [STATIC_ROD_X_START, 0, 0], obj_name=static_conductor_name
                     )
-                else:
-                    static_in_face = _find_face_by_extreme_x(m3d, in_obj, pick="min")
-            try:
-                if out_obj in m3d.modeler.object_names:
-                    out_type = m3d.modeler[out_obj].object_type
-                    if out_type == "Sheet":
-                        moving_out_face = out_obj
-            except Exception:
-                pass
-            if moving_out_face is None:
-                if lead_out_name and region_x_max is not None:
                     moving_out_face = m3d.modeler.get_faceid_from_position(
-                        [region_x_max, 0, 0], obj_name=out_obj
+                        [MOVING_ROD_X_END, 0, 0], obj_name=moving_conductor_name
+                    )
+
+                # 两个导体的面中心一次批量取回, 按 x 选面在本地完成
+                conductor_faces = {}
+
+                def _conductor_geometry():
+                    if "geometry" not in conductor_faces:
+                        conductor_faces["geometry"] = FaceGeometry.query(
+                            m3d, [static_conductor_name, moving_conductor_name]
+                        )
+                    return conductor_faces["geometry"]
+
+                def find_face_by_x(obj_name, target_x):
+                    return _conductor_geometry().nearest(obj_name, "x", target_x)
+
+                if not static_in_face:
+                    static_in_face = find_face_by_x(static_conductor_name, STATIC_ROD_X_START)
+                if not moving_out_face:
+                    moving_out_face = find_face_by_x(moving_conductor_name, MOVING_ROD_X_END)
+                if not static_in_face:
+                    static_in_face = _find_face_by_extreme_x(
+                        m3d, static_conductor_name, pick="min", geometry=_conductor_geometry()
+                    )
+                if not moving_out_face:
+                    moving_out_face = _find_face_by_extreme_x(
+                        m3d, moving_conductor_name, pick="max", geometry=_conductor_geometry()
+                    )
+
+                if static_in_face and moving_out_face:
+                    pre_boundaries = set(_get_boundary_names(m3d))
+                    print(f"  [测试] Pre-boundaries: {sorted(pre_boundaries)}")
+                    ex_in = m3d.assign_current(
+                        assignment=[static_in_face],
+                        amplitude=current_expression,
+                        solid=False,
+                        name="Phase_A_In",
                     )
+                    ex_out = m3d.assign_current(
+                        assignment=[moving_out_face],
+                        amplitude=current_expression,
+                        solid=False,
+                        swap_direction=True,
+                        name="Phase_A_Out",
+                    )
+                    if ex_in is not False:
+                        assigned_excitations.append(ex_in)
+                    if ex_out is not False:
+                        assigned_excitations.append(ex_out)
+                    post_boundaries = set(_get_boundary_names(m3d))
+                    print(f"  [测试] Post-boundaries: {sorted(post_boundaries)}")
+                    if ex_in is False or ex_out is False:
+                        print("  [警告] Face Current 创建失败")
+                        return False
+                    print(f"  [成功] 设置电流激励 (Face In/Out): {current_expression}")
+                    return True
                 else:
-                    moving_out_face = _find_face_by_extreme_x(m3d, out_obj, pick="max")
-        else:
-            static_in_face = m3d.modeler.get_faceid_from_position(
-                [STATIC_ROD_X_START, 0, 0], obj_name=static_conductor_name
-            )
-            moving_out_face = m3d.modeler.get_faceid_from_position(
-                [MOVING_ROD_X_END, 0, 0], obj_name=moving_conductor_name
-            )
+                    print("  [警告] 未找到合适的端面，跳过电流激励")
+                return False
 
-        def find_face_by_x(obj_name, target_x, tol=0.2):
-            faces = m3d.modeler.get_object_faces(obj_name)
-            best_face = None
-            best_dx = None
-            for fid in faces:
-                center = m3d.modeler.get_face_center(fid)
+            if excitation_mode == "winding":
+                if terminal_pad_in and terminal_pad_out:
+                    pad_in_assignment = [terminal_pad_in]
+                    pad_out_assignment = [terminal_pad_out]
+                    try:
+                        pad_in_obj = m3d.modeler[terminal_pad_in]
+                        pad_out_obj = m3d.modeler[terminal_pad_out]
+                        print(
+                            f"  [测试] 端子片类型: In={pad_in_obj.object_type}, Out={pad_out_obj.object_type}"
+                        )
+                        if pad_in_obj.object_type != "Sheet":
+                            pad_in_face = _find_face_by_extreme_x(
+                                m3d, terminal_pad_in, pick="min"
+                            )
+                            if pad_in_face:
+                                pad_in_assignment = [pad_in_face]
+                        if pad_out_obj.object_type != "Sheet":
+                            pad_out_face = _find_face_by_extreme_x(
+                                m3d, terminal_pad_out, pick="max"
+                            )
+                            if pad_out_face:
+                                pad_out_assignment = [pad_out_face]
+                    except Exception as e:
+                        print(f"  [警告] 端子片类型读取失败: {e}")
+                    try:
+                        coil_in = m3d.assign_coil(
+                            assignment=pad_in_assignment,
+                            conductors_number=1,
+                            polarity="Positive",
+                            name="PhaseA_Coil_In",
+                        )
+                        coil_out = m3d.assign_coil(
+                            assignment=pad_out_assignment,
+                            conductors_number=1,
+                            polarity="Negative",
+                            name="PhaseA_Coil_Out",
+                        )
+                    except Exception as e:
+                        coil_in = coil_out = None
+                        print(f"  [警告] 绕组端子创建失败: {e}")
+                    if coil_in and coil_out:
+                        print(f"  [测试] Coil terminals: {coil_in.name}, {coil_out.name}")
+                        try:
+                            winding = m3d.assign_winding(
+                                winding_type="Current",
+                                is_solid=True,
+                                current=current_expression,
+                                name="PhaseA_Winding",
+                                coil_terminals=[coil_in.name, coil_out.name],
+                            )
+                        except TypeError:
+                            winding = m3d.assign_winding(
+                                winding_type="Current",
+                                is_solid=True,
+                                current=current_expression,
+                                name="PhaseA_Winding",
+                            )
+                        if winding:
+                            try:
+                                if m3d.oboundary:
+                                    m3d.oboundary.AddWindingTerminals(
+                                        winding.name, [coil_in.name, coil_out.name]
+                                    )
+                                m3d.add_winding_coils(
+                                    winding.name, [coil_in.name, coil_out.name]
+                                )
+                                ordered = _set_winding_terminal_order(
+                                    m3d, winding.name, [coil_in.name, coil_out.name]
+                                )
+                                if not ordered:
+                                    print("  [警告] 绕组端子顺序设置失败")
+                            except Exception as e:
+                                print(f"  [警告] 绕组端子绑定失败: {e}")
+                            print("  [成功] 设置绕组电流激励 (Coil/Winding)")
+                            excitation_done = True
+                        else:
+                            print("  [警告] 绕组激励创建失败，未生成 Winding")
+                    else:
+                        print("  [警告] 绕组激励创建失败，未生成线圈端子")
+                else:
+                    print("  [警告] 端子片未创建，无法设置绕组激励")
+                if not excitation_done:
+                    print("  [错误] 绕组激励失败，终止求解")
+                    raise SystemExit(1)
+
+            if excitation_mode == "current_density":
+                rod_area_m2 = math.pi * (ROD_RADIUS / 1000.0) ** 2
+                current_density_x = f"({current_expression}) / ({rod_area_m2})"
+                current_density_x_neg = f"-({current_expression}) / ({rod_area_m2})"
+                target_in = lead_in_name or static_conductor_name
+                target_out = lead_out_name or moving_conductor_name
                 if (
-                    not center
-                    or not isinstance(center, (list, tuple))
-                    or len(center) < 3
+                    target_in in m3d.modeler.object_names
+                    and target_out in m3d.modeler.object_names
                 ):
-                    continue
-                dx = abs(center[0] - target_x)
-                if dx < tol:
-                    return fid
-                if best_dx is None or dx < best_dx:
-                    best_dx = dx
-                    best_face = fid
-            return best_face
-
-        if not static_in_face:
-            static_in_face = find_face_by_x(static_conductor_name, STATIC_ROD_X_START)
-        if not moving_out_face:
-            moving_out_face = find_face_by_x(moving_conductor_name, MOVING_ROD_X_END)
-        if not static_in_face:
-            static_in_face = _find_face_by_extreme_x(
-                m3d, static_conductor_name, pick="min"
-            )
-        if not moving_out_face:
-            moving_out_face = _find_face_by_extreme_x(
-                m3d, moving_conductor_name, pick="max"
-            )
+                    ex_j1 = m3d.assign_current_density(
+                        assignment=[target_in],
+                        current_density_x=current_density_x,
+                        current_density_y="0",
+                        current_density_z="0",
+                        current_density_name="Phase_A_J_In",
+                    )
+                    ex_j2 = m3d.assign_current_density(
+                        assignment=[target_out],
+                        current_density_x=current_density_x_neg,
+                        current_density_y="0",
+                        current_density_z="0",
+                        current_density_name="Phase_A_J_Out",
+                    )
+                    if ex_j1:
+                        assigned_excitations.append(ex_j1)
+                    if ex_j2:
+                        assigned_excitations.append(ex_j2)
+                    excitation_done = bool(ex_j1 or ex_j2)
+                    if excitation_done:
+                        print(
+                            "  [成功] 设置电流密度激励: Jx=+{0}, Jx=-{0}".format(
+                                current_density_x
+                            )
+                        )
+                    else:
+                        print("  [警告] 电流密度激励创建失败")
+                elif target_in in m3d.modeler.object_names:
+                    ex_j = m3d.assign_current_density(
+                        assignment=[target_in],
+                        current_density_x=current_density_x,
+                        current_density_y="0",
+                        current_density_z="0",
+                        current_density_name="Phase_A_J",
+                    )
+                    if ex_j:
+                        assigned_excitations.append(ex_j)
+                    excitation_done = bool(ex_j)
+                    if excitation_done:
+                        print(f"  [成功] 设置电流密度激励: Jx={current_density_x}")
+                    else:
+                        print("  [警告] 电流密度激励创建失败")
+                else:
+                    print("  [警告] 未找到导体对象，跳过电流激励")
+                    excitation_done = False
+            elif excitation_mode == "face_current":
+                excitation_done = _assign_face_current(use_pads=True)
+            elif excitation_mode == "solid_current":
+                target_in = lead_in_name or static_conductor_name
+                target_out = lead_out_name or moving_conductor_name
+                if (
+                    target_in in m3d.modeler.object_names
+                    and target_out in m3d.modeler.object_names
+                ):
+                    pre_boundaries = set(_get_boundary_names(m3d))
+                    ex_in = m3d.assign_current(
+                        assignment=[target_in],
+                        amplitude=current_expression,
+                        solid=True,
+                        name="Phase_A_In",
+                    )
+                    ex_out = m3d.assign_current(
+                        assignment=[target_out],
+                        amplitude=current_expression,
+                        solid=True,
+                        swap_direction=True,
+                        name="Phase_A_Out",
+                    )
+                    post_boundaries = set(_get_boundary_names(m3d))
+                    if (
+                        ex_in is not False
+                        and ex_out is not False
+                        and pre_boundaries != post_boundaries
+                    ):
+                        assigned_excitations.extend([ex_in, ex_out])
+                        print(f"  [成功] 设置电流激励 (Solid): {current_expression}")
+                        excitation_done = True
+                    else:
+                        print("  [警告] Current 激励创建失败 (Solid)")
+                        excitation_done = False
+                else:
+                    print(
+                        "  [警告] 未找到导体对象，跳过电流激励: "
+                        f"in={target_in in m3d.modeler.object_names}, "
+                        f"out={target_out in m3d.modeler.object_names}"
+                    )
+                    excitation_done = False
 
-        if static_in_face and moving_out_face:
-            pre_boundaries = set(_get_boundary_names(m3d))
-            print(f"  [测试] Pre-boundaries: {sorted(pre_boundaries)}")
-            ex_in = m3d.assign_current(
-                assignment=[static_in_face],
-                amplitude=current_expression,
-                solid=False,
-                name="Phase_A_In",
-            )
-            ex_out = m3d.assign_current(
-                assignment=[moving_out_face],
-                amplitude=current_expression,
-                solid=False,
-                swap_direction=True,
-                name="Phase_A_Out",
+            if not excitation_done and excitation_mode == "face_current":
+                print("  [信息] 尝试使用端子片 Face Current 兜底")
+                excitation_done = _assign_face_current(use_pads=True)
+
+        except Exception as e:
+            print(f"  [警告] 设置激励失败: {e}")
+
+    excitation_names = []
+    exc_list = []
+    # 激励校验
+    try:
+        excitation_names = [b.name for b in m3d.boundaries] if m3d.boundaries else []
+        if not excitation_names and not assigned_excitations:
+            print("  [警告] 未检测到任何激励/边界，请在 AEDT 中确认电流激励是否生效")
+        if assigned_excitations:
+            print(
+                "  [信息] 已创建激励: "
+                + ", ".join([ex.name for ex in assigned_excitations])
             )
-            if ex_in is not False:
-                assigned_excitations.append(ex_in)
-            if ex_out is not False:
-                assigned_excitations.append(ex_out)
-            post_boundaries = set(_get_boundary_names(m3d))
-            print(f"  [测试] Post-boundaries: {sorted(post_boundaries)}")
-            if ex_in is False or ex_out is False:
-                print("  [警告] Face Current 创建失败")
-                return False
-            print(f"  [成功] 设置电流激励 (Face In/Out): {current_expression}")
-            return True
-        else:
-            print("  [警告] 未找到合适的端面，跳过电流激励")
-        return False
+        elif excitation_names:
+            print(f"  [信息] 边界列表: {excitation_names}")
+        try:
+            if m3d.oboundary and "GetExcitations" in m3d.oboundary.__dir__():
+                exc_list = list(m3d.oboundary.GetExcitations())
+                if exc_list:
+                    print(f"  [信息] Excitations: {exc_list}")
+        except Exception as e:
+            print(f"  [警告] Excitation 列表读取失败: {e}")
+    except Exception as e:
+        print(f"  [警告] 激励校验失败: {e}")
 
-    if excitation_mode == "winding":
-        if terminal_pad_in and terminal_pad_out:
-            pad_in_assignment = [terminal_pad_in]
-            pad_out_assignment = [terminal_pad_out]
-            try:
-                pad_in_obj = m3d.modeler[terminal_pad_in]
-                pad_out_obj = m3d.modeler[terminal_pad_out]
-                print(
-                    f"  [测试] 端子片类型: In={pad_in_obj.object_type}, Out={pad_out_obj.object_type}"
-                )
-                if pad_in_obj.object_type != "Sheet":
-                    pad_in_face = _find_face_by_extreme_x(
-                        m3d, terminal_pad_in, pick="min"
-                    )
-                    if pad_in_face:
-                        pad_in_assignment = [pad_in_face]
-                if pad_out_obj.object_type != "Sheet":
-                    pad_out_face = _find_face_by_extreme_x(
-                        m3d, terminal_pad_out, pick="max"
-                    )
-                    if pad_out_face:
-                        pad_out_assignment = [pad_out_face]
-            except Exception as e:
-                print(f"  [警告] 端子片类型读取失败: {e}")
-            try:
+    has_excitation = False
+    if exc_list:
+        has_excitation = True
+    else:
+        has_excitation = bool(assigned_excitations) or bool(excitation_names)
+
+    if not has_excitation:
+        print("  [错误] 未创建任何激励，终止求解以避免 Validation Error")
+        raise SystemExit(1)
+
+    # 激励兜底：使用 Coil/Winding 方式
+    if (
+        not reuse_excitation
+        and not assigned_excitations
+        and EXCITATION_MODE not in ("current_density", "winding")
+    ):
+        try:
+            if (
+                static_conductor_name in m3d.modeler.object_names
+                and moving_conductor_name in m3d.modeler.object_names
+            ):
                 coil_in = m3d.assign_coil(
-                    assignment=pad_in_assignment,
+                    assignment=[static_conductor_name],
                     conductors_number=1,
                     polarity="Positive",
                     name="PhaseA_Coil_In",
                 )
                 coil_out = m3d.assign_coil(
-                    assignment=pad_out_assignment,
+                    assignment=[moving_conductor_name],
                     conductors_number=1,
                     polarity="Negative",
                     name="PhaseA_Coil_Out",
                 )
-            except Exception as e:
-                coil_in = coil_out = None
-                print(f"  [警告] 绕组端子创建失败: {e}")
-            if coil_in and coil_out:
-                print(f"  [测试] Coil terminals: {coil_in.name}, {coil_out.name}")
-                try:
-                    winding = m3d.assign_winding(
+                if coil_in and coil_out:
+                    m3d.assign_winding(
                         winding_type="Current",
                         is_solid=True,
                         current=current_expression,
                         name="PhaseA_Winding",
-                        coil_terminals=[coil_in.name, coil_out.name],
                     )
-                except TypeError:
-                    winding = m3d.assign_winding(
-                        winding_type="Current",
-                        is_solid=True,
-                        current=current_expression,
-                        name="PhaseA_Winding",
-                    )
-                if winding:
-                    try:
-                        if m3d.oboundary:
-                            m3d.oboundary.AddWindingTerminals(
-                                winding.name, [coil_in.name, coil_out.name]
-                            )
-                        m3d.add_winding_coils(
-                            winding.name, [coil_in.name, coil_out.name]
-                        )
-                        ordered = _set_winding_terminal_order(
-                            m3d, winding.name, [coil_in.name, coil_out.name]
-                        )
-                        if not ordered:
-                            print("  [警告] 绕组端子顺序设置失败")
-                    except Exception as e:
-                        print(f"  [警告] 绕组端子绑定失败: {e}")
-                    print("  [成功] 设置绕组电流激励 (Coil/Winding)")
-                    excitation_done = True
-                else:
-                    print("  [警告] 绕组激励创建失败，未生成 Winding")
-            else:
-                print("  [警告] 绕组激励创建失败，未生成线圈端子")
-        else:
-            print("  [警告] 端子片未创建，无法设置绕组激励")
-        if not excitation_done:
-            print("  [错误] 绕组激励失败，终止求解")
-            raise SystemExit(1)
+                    print("  [信息] 已创建绕组电流激励 (Coil/Winding)")
+        except Exception as e:
+            print(f"  [警告] 绕组电流激励创建失败: {e}")
 
-    if excitation_mode == "current_density":
-        rod_area_m2 = math.pi * (ROD_RADIUS / 1000.0) ** 2
-        current_density_x = f"({current_expression}) / ({rod_area_m2})"
-        current_density_x_neg = f"-({current_expression}) / ({rod_area_m2})"
-        target_in = lead_in_name or static_conductor_name
-        target_out = lead_out_name or moving_conductor_name
-        if (
-            target_in in m3d.modeler.object_names
-            and target_out in m3d.modeler.object_names
-        ):
-            ex_j1 = m3d.assign_current_density(
-                assignment=[target_in],
-                current_density_x=current_density_x,
-                current_density_y="0",
-                current_density_z="0",
-                current_density_name="Phase_A_J_In",
-            )
-            ex_j2 = m3d.assign_current_density(
-                assignment=[target_out],
-                current_density_x=current_density_x_neg,
-                current_density_y="0",
-                current_density_z="0",
-                current_density_name="Phase_A_J_Out",
-            )
-            if ex_j1:
-                assigned_excitations.append(ex_j1)
-            if ex_j2:
-                assigned_excitations.append(ex_j2)
-            excitation_done = bool(ex_j1 or ex_j2)
-            if excitation_done:
-                print(
-                    "  [成功] 设置电流密度激励: Jx=+{0}, Jx=-{0}".format(
-                        current_density_x
-                    )
-                )
-            else:
-                print("  [警告] 电流密度激励创建失败")
-        elif target_in in m3d.modeler.object_names:
-            ex_j = m3d.assign_current_density(
-                assignment=[target_in],
-                current_density_x=current_density_x,
-                current_density_y="0",
-                current_density_z="0",
-                current_density_name="Phase_A_J",
-            )
-            if ex_j:
-                assigned_excitations.append(ex_j)
-            excitation_done = bool(ex_j)
-            if excitation_done:
-                print(f"  [成功] 设置电流密度激励: Jx={current_density_x}")
-            else:
-                print("  [警告] 电流密度激励创建失败")
+    # 10.3 Analysis Setup
+    stage("  创建求解 Setup...")
+    try:
+        if "Transient_Analysis" in m3d.setup_names:
+            setup = m3d.get_setup("Transient_Analysis")
         else:
-            print("  [警告] 未找到导体对象，跳过电流激励")
-            excitation_done = False
-    elif excitation_mode == "face_current":
-        excitation_done = _assign_face_current(use_pads=True)
-    elif excitation_mode == "solid_current":
-        target_in = lead_in_name or static_conductor_name
-        target_out = lead_out_name or moving_conductor_name
-        if (
-            target_in in m3d.modeler.object_names
-            and target_out in m3d.modeler.object_names
-        ):
-            pre_boundaries = set(_get_boundary_names(m3d))
-            ex_in = m3d.assign_current(
-                assignment=[target_in],
-                amplitude=current_expression,
-                solid=True,
-                name="Phase_A_In",
-            )
-            ex_out = m3d.assign_current(
-                assignment=[target_out],
-                amplitude=current_expression,
-                solid=True,
-                swap_direction=True,
-                name="Phase_A_Out",
-            )
-            post_boundaries = set(_get_boundary_names(m3d))
-            if (
-                ex_in is not False
-                and ex_out is not False
-                and pre_boundaries != post_boundaries
-            ):
-                assigned_excitations.extend([ex_in, ex_out])
-                print(f"  [成功] 设置电流激励 (Solid): {current_expression}")
-                excitation_done = True
-            else:
-                print("  [警告] Current 激励创建失败 (Solid)")
-                excitation_done = False
+            setup = m3d.create_setup(name="Transient_Analysis")
+            reuse_setup = False
+        if reuse_setup:
+            print("  [提示] 求解设置未变化, 复用 Transient_Analysis")
         else:
-            print(
-                "  [警告] 未找到导体对象，跳过电流激励: "
-                f"in={target_in in m3d.modeler.object_names}, "
-                f"out={target_out in m3d.modeler.object_names}"
-            )
-            excitation_done = False
+            setup.props["StopTime"] = f"{MOTION_TIME}s"
+            setup.props["TimeStep"] = f"{TIME_STEP}s"
+            setup.props["MaxTimeStep"] = f"{TIME_STEP}s"
+            setup.props["MinTimeStep"] = f"{TIME_STEP / 5.0}s"
+            # 确保保存场数据
+            setup.props["SaveFieldsType"] = "Every step"
+            setup.update()
+            print(f"  [测试] Setup 列表: {m3d.setup_names}")
+            print(f"  仿真时间: {MOTION_TIME * 1000:.0f}ms,步长 0.5ms")
+    except Exception as e:
+        print(f"  [警告] Setup 设置失败: {e}")
 
-    if not excitation_done and excitation_mode == "face_current":
-        print("  [信息] 尝试使用端子片 Face Current 兜底")
-        excitation_done = _assign_face_current(use_pads=True)
-
-except Exception as e:
-    print(f"  [警告] 设置激励失败: {e}")
-
-excitation_names = []
-exc_list = []
-# 激励校验
-try:
-    excitation_names = [b.name for b in m3d.boundaries] if m3d.boundaries else []
-    if not excitation_names and not assigned_excitations:
-        print("  [警告] 未检测到任何激励/边界，请在 AEDT 中确认电流激励是否生效")
-    if assigned_excitations:
-        print(
-            "  [信息] 已创建激励: "
-            + ", ".join([ex.name for ex in assigned_excitations])
-        )
-    elif excitation_names:
-        print(f"  [信息] 边界列表: {excitation_names}")
+    # 10.4 求解
+    stage("  启动求解...")
     try:
-        if m3d.oboundary and "GetExcitations" in m3d.oboundary.__dir__():
-            exc_list = list(m3d.oboundary.GetExcitations())
-            if exc_list:
-                print(f"  [信息] Excitations: {exc_list}")
+        success = m3d.analyze(setup.name)
+        solved_ok = bool(success)
+        if solved_ok:
+            print("  [成功] 求解完成")
+        else:
+            print("  [错误] 求解返回失败状态")
+        try:
+            try:
+                messages = m3d.odesktop.GetMessages(project_name, m3d.design_name, 2)
+            except Exception:
+                messages = m3d.odesktop.GetMessages("", "", 2)
+            if messages:
+                print("  [信息] Message Manager 错误:")
+                for msg in messages:
+                    print(f"    {msg}")
+        except Exception as e:
+            print(f"  [警告] 无法读取 Message Manager: {e}")
     except Exception as e:
-        print(f"  [警告] Excitation 列表读取失败: {e}")
-except Exception as e:
-    print(f"  [警告] 激励校验失败: {e}")
-
-has_excitation = False
-if exc_list:
-    has_excitation = True
-else:
-    has_excitation = bool(assigned_excitations) or bool(excitation_names)
-
-if not has_excitation:
-    print("  [错误] 未创建任何激励，终止求解以避免 Validation Error")
-    raise SystemExit(1)
-
-# 激励兜底：使用 Coil/Winding 方式
-if not assigned_excitations and EXCITATION_MODE not in ("current_density", "winding"):
+        print(f"  [错误] 求解失败: {e}")
+        solved_ok = False
+
+    # 10.5 Results & Field Overlays
+    stage("  创建 Results/Field Overlays 输出...")
     try:
-        if (
-            static_conductor_name in m3d.modeler.object_names
-            and moving_conductor_name in m3d.modeler.object_names
-        ):
-            coil_in = m3d.assign_coil(
-                assignment=[static_conductor_name],
-                conductors_number=1,
-                polarity="Positive",
-                name="PhaseA_Coil_In",
-            )
-            coil_out = m3d.assign_coil(
-                assignment=[moving_conductor_name],
-                conductors_number=1,
-                polarity="Negative",
-                name="PhaseA_Coil_Out",
-            )
-            if coil_in and coil_out:
-                m3d.assign_winding(
-                    winding_type="Current",
-                    is_solid=True,
-                    current=current_expression,
-                    name="PhaseA_Winding",
+        if not solved_ok:
+            print("  [提示] 求解失败，跳过 Results/Field Overlays 创建")
+            raise RuntimeError("Solve failed")
+        export_dir = os.path.join(os.getcwd(), "VacuumInterrupter", "post")
+        os.makedirs(export_dir, exist_ok=True)
+
+        setup_sweep = _safe_setup_sweep_name(m3d, setup)
+        report_category = _pick_report_category(
+            m3d.post, ["Transient", "Fields", "Standard"]
+        )
+        display_type = "Rectangular Plot"
+        report_targets = [
+            ("Time_Current", ["Current", "InputCurrent", "WindingCurrent"]),
+            ("Time_Force", ["Force", "LorentzForce"]),
+            ("Time_Torque", ["Torque"]),
+            ("Time_Loss", ["Loss", "EddyCurrentLoss", "TotalLoss", "OhmicLoss"]),
+        ]
+        created_reports = 0
+        used_quantities = set()
+        existing_reports = set(_existing_names(m3d.post, "all_report_names")) if reuse_setup else set()
+        if report_category and setup_sweep:
+            for report_name, keywords in report_targets:
+                report_quantity = _select_report_quantity(
+                    m3d.post,
+                    setup_sweep,
+                    report_category,
+                    display_type,
+                    keywords,
                 )
-                print("  [信息] 已创建绕组电流激励 (Coil/Winding)")
-    except Exception as e:
-        print(f"  [警告] 绕组电流激励创建失败: {e}")
+                if not report_quantity or report_quantity in used_quantities:
+                    continue
+                plot_name = f"{report_name}_{report_quantity}"
+                if plot_name in existing_reports:
+                    # 增量模式: 求解未变化, 保留已有报表
+                    created_reports += 1
+                    used_quantities.add(report_quantity)
+                    print(f"  [提示] Results 已存在: {plot_name}")
+                    continue
+                report = m3d.post.create_report(
+                    expressions=report_quantity,
+                    setup_sweep_name=setup_sweep,
+                    domain="Time",
+                    primary_sweep_variable="Time",
+                    variations={"Time": ["All"]},
+                    report_category=report_category,
+                    plot_name=plot_name,
+                )
+                if report:
+                    created_reports += 1
+                    used_quantities.add(report_quantity)
+                    print(f"  [成功] Results 已创建: {report.plot_name}")
+        if not created_reports:
+            print("  [警告] 未找到可用的 Results 报表量")
 
-# 10.3 Analysis Setup
-print("  创建求解 Setup...")
-try:
-    if "Transient_Analysis" in m3d.setup_names:
-        setup = m3d.get_setup("Transient_Analysis")
-    else:
-        setup = m3d.create_setup(name="Transient_Analysis")
-
-    setup.props["StopTime"] = f"{MOTION_TIME}s"
-    setup.props["TimeStep"] = f"{TIME_STEP}s"
-    setup.props["MaxTimeStep"] = f"{TIME_STEP}s"
-    setup.props["MinTimeStep"] = f"{TIME_STEP / 5.0}s"
-    # 确保保存场数据
-    setup.props["SaveFieldsType"] = "Every step"
-    setup.update()
-    print(f"  [测试] Setup 列表: {m3d.setup_names}")
-    print(f"  仿真时间: {MOTION_TIME * 1000:.0f}ms,步长 0.5ms")
-except Exception as e:
-    print(f"  [警告] Setup 设置失败: {e}")
-
-# 10.4 求解
-print("  启动求解...")
-try:
-    success = m3d.analyze(setup.name)
-    solved_ok = bool(success)
-    if solved_ok:
-        print("  [成功] 求解完成")
-    else:
-        print("  [错误] 求解返回失败状态")
-    try:
-        try:
-            messages = m3d.odesktop.GetMessages(project_name, m3d.design_name, 2)
-        except Exception:
-            messages = m3d.odesktop.GetMessages("", "", 2)
-        if messages:
-            print("  [信息] Message Manager 错误:")
-            for msg in messages:
-                print(f"    {msg}")
-    except Exception as e:
-        print(f"  [警告] 无法读取 Message Manager: {e}")
-except Exception as e:
-    print(f"  [错误] 求解失败: {e}")
-    solved_ok = False
-
-# 10.5 Results & Field Overlays
-print("  创建 Results/Field Overlays 输出...")
-try:
-    if not solved_ok:
-        print("  [提示] 求解失败，跳过 Results/Field Overlays 创建")
-        raise RuntimeError("Solve failed")
-    export_dir = os.path.join(os.getcwd(), "VacuumInterrupter", "post")
-    os.makedirs(export_dir, exist_ok=True)
-
-    setup_sweep = _safe_setup_sweep_name(m3d, setup)
-    report_category = _pick_report_category(
-        m3d.post, ["Transient", "Fields", "Standard"]
-    )
-    display_type = "Rectangular Plot"
-    report_targets = [
-        ("Time_Current", ["Current", "InputCurrent", "WindingCurrent"]),
-        ("Time_Force", ["Force", "LorentzForce"]),
-        ("Time_Torque", ["Torque"]),
-        ("Time_Loss", ["Loss", "EddyCurrentLoss", "TotalLoss", "OhmicLoss"]),
-    ]
-    created_reports = 0
-    used_quantities = set()
-    if report_category and setup_sweep:
-        for report_name, keywords in report_targets:
-            report_quantity = _select_report_quantity(
+        field_category = _pick_report_category(
+            m3d.post, ["Fields", "DC R/L Fields", "AC R/L Fields"]
+        )
+        field_quantity = None
+        if field_category and setup_sweep:
+            field_quantity = _select_report_quantity(
                 m3d.post,
                 setup_sweep,
-                report_category,
+                field_category,
                 display_type,
-                keywords,
-            )
-            if not report_quantity or report_quantity in used_quantities:
-                continue
-            report = m3d.post.create_report(
-                expressions=report_quantity,
-                setup_sweep_name=setup_sweep,
-                domain="Time",
-                primary_sweep_variable="Time",
-                variations={"Time": ["All"]},
-                report_category=report_category,
-                plot_name=f"{report_name}_{report_quantity}",
+                ["Mag_B", "B", "Mag_H", "H", "J", "E"],
             )
-            if report:
-                created_reports += 1
-                used_quantities.add(report_quantity)
-                print(f"  [成功] Results 已创建: {report.plot_name}")
-    if not created_reports:
-        print("  [警告] 未找到可用的 Results 报表量")
-
-    field_category = _pick_report_category(
-        m3d.post, ["Fields", "DC R/L Fields", "AC R/L Fields"]
-    )
-    field_quantity = None
-    if field_category and setup_sweep:
-        field_quantity = _select_report_quantity(
-            m3d.post,
-            setup_sweep,
-            field_category,
-            display_type,
-            ["Mag_B", "B", "Mag_H", "H", "J", "E"],
-        )
-    field_target = None
-    if "Vacuum_Region" in m3d.modeler.object_names:
-        field_target = "Vacuum_Region"
-    elif "Region" in m3d.modeler.object_names:
-        field_target = "Region"
-
-    if field_quantity and field_target:
-        field_times = [
-            ("Peak", PEAK_TIME),
-            ("Zero", ZERO_TIME),
-            ("End", MOTION_TIME),
-        ]
-
-        cut_plane_name = "Field_Cutplane_Y"
-        if cut_plane_name in m3d.modeler.object_names:
-            cut_plane = m3d.modeler[cut_plane_name]
-        else:
-            cut_plane = m3d.modeler.create_plane(
-                name=cut_plane_name,
-                plane_base_x="0mm",
-                plane_base_y="0mm",
-                plane_base_z="0mm",
-                plane_normal_x="0mm",
-                plane_normal_y="1mm",
-                plane_normal_z="0mm",
-            )
-
-        for label, time_value in field_times:
-            time_str = f"{time_value}s"
-            plot = m3d.post.create_fieldplot_surface(
-                field_target,
-                field_quantity,
-                setup=setup_sweep,
-                intrinsics={"Time": time_str},
-                plot_name=f"Field_{field_quantity}_{field_target}_{label}",
-            )
-            if plot:
-                m3d.post.export_field_plot(
-                    plot.name, export_dir, file_name=plot.name, file_format="aedtplt"
-                )
-                m3d.post.export_field_jpg(
-                    os.path.join(export_dir, f"{plot.name}.jpg"),
-                    plot.name,
-                    plot.plot_folder,
-                    orientation="isometric",
-                    width=1920,
-                    height=1080,
-                    display_wireframe=False,
-                    show_axis=True,
-                    show_grid=True,
-                    show_ruler=False,
-                    show_region=False,
+        field_target = None
+        if "Vacuum_Region" in m3d.modeler.object_names:
+            field_target = "Vacuum_Region"
+        elif "Region" in m3d.modeler.object_names:
+            field_target = "Region"
+
+        if field_quantity and field_target:
+            field_times = [
+                ("Peak", PEAK_TIME),
+                ("Zero", ZERO_TIME),
+                ("End", MOTION_TIME),
+            ]
+
+            cut_plane_name = "Field_Cutplane_Y"
+            if cut_plane_name in m3d.modeler.object_names:
+                cut_plane = m3d.modeler[cut_plane_name]
+            else:
+                cut_plane = m3d.modeler.create_plane(
+                    name=cut_plane_name,
+                    plane_base_x="0mm",
+                    plane_base_y="0mm",
+                    plane_base_z="0mm",
+                    plane_normal_x="0mm",
+                    plane_normal_y="1mm",
+                    plane_normal_z="0mm",
                 )
-                print(f"  [成功] Field Overlays 已创建: {plot.name}")
 
-            if cut_plane:
-                cut_plot = m3d.post.create_fieldplot_cutplane(
-                    [cut_plane.name],
+            for label, time_value in field_times:
+                time_str = f"{time_value}s"
+                plot = _existing_field_plot(
+                    m3d, f"Field_{field_quantity}_{field_target}_{label}", reuse_setup
+                ) or m3d.post.create_fieldplot_surface(
+                    field_target,
                     field_quantity,
                     setup=setup_sweep,
                     intrinsics={"Time": time_str},
-                    plot_name=f"Field_{field_quantity}_Cutplane_{label}",
+                    plot_name=f"Field_{field_quantity}_{field_target}_{label}",
                 )
-                if cut_plot:
+                if plot:
                     m3d.post.export_field_plot(
-                        cut_plot.name,
-                        export_dir,
-                        file_name=cut_plot.name,
-                        file_format="aedtplt",
+                        plot.name, export_dir, file_name=plot.name, file_format="aedtplt"
                     )
                     m3d.post.export_field_jpg(
-                        os.path.join(export_dir, f"{cut_plot.name}.jpg"),
-                        cut_plot.name,
-                        cut_plot.plot_folder,
+                        os.path.join(export_dir, f"{plot.name}.jpg"),
+                        plot.name,
+                        plot.plot_folder,
                         orientation="isometric",
                         width=1920,
                         height=1080,
@@ -1900,180 +2082,221 @@ try:
                         show_ruler=False,
                         show_region=False,
                     )
-                    print(f"  [成功] Field Overlays 已创建: {cut_plot.name}")
-    else:
-        print("  [警告] Field Overlays 创建失败")
-except Exception as e:
-    print(f"  [警告] Results/Field Overlays 输出失败: {e}")
-
-# 10.6 Post-Processing Exports
-print("  导出后处理数据...")
-try:
-    export_dir = os.path.join(os.getcwd(), "VacuumInterrupter", "post")
-    os.makedirs(export_dir, exist_ok=True)
-
-    # 以输入时程作为开闸运动后处理导出
-    dt = 0.0005
-    steps = int(MOTION_TIME / dt) + 1
-    times = [i * dt for i in range(steps)]
-
-    # 速度插值
-    def interp_velocity(t):
-        if t <= velocity_data_x[0]:
-            return velocity_data_y[0]
-        if t >= velocity_data_x[-1]:
-            return velocity_data_y[-1]
-        for i in range(len(velocity_data_x) - 1):
-            t0 = velocity_data_x[i]
-            t1 = velocity_data_x[i + 1]
-            if t0 <= t <= t1:
-                v0 = velocity_data_y[i]
-                v1 = velocity_data_y[i + 1]
-                if t1 == t0:
-                    return v0
-                return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
-        return velocity_data_y[-1]
-
-    sign = 1.0 if OPEN_DIRECTION == "positive" else -1.0
-    velocities = [sign * interp_velocity(t) for t in times]
-
-    # 位置积分
-    positions = [0.0]
-    for i in range(1, len(times)):
-        positions.append(positions[-1] + 0.5 * (velocities[i - 1] + velocities[i]) * dt)
-
-    # 电流波形
-    currents = [PEAK_CURRENT * math.sin(2.0 * math.pi * FREQUENCY * t) for t in times]
-
-    motion_csv = os.path.join(export_dir, "motion_profile.csv")
-    with open(motion_csv, "w", encoding="utf-8") as f:
-        f.write("Time(s),Velocity(m/s),Position(m)\n")
-        for t, v, p in zip(times, velocities, positions):
-            f.write(f"{t},{v},{p}\n")
-    print(f"  [成功] 导出运动时程 -> {motion_csv}")
-
-    current_csv = os.path.join(export_dir, "current_waveform.csv")
-    with open(current_csv, "w", encoding="utf-8") as f:
-        f.write("Time(s),Current(A)\n")
-        for t, i in zip(times, currents):
-            f.write(f"{t},{i}\n")
-    print(f"  [成功] 导出电流时程 -> {current_csv}")
-
-    # AMF 中心点磁场时程与关键指标
-    try:
-        setup_sweep = _safe_setup_sweep_name(m3d, setup)
-        field_category = _pick_report_category(
-            m3d.post, ["Fields", "Transient", "Standard"]
-        )
-        if setup_sweep and field_category:
-            axial_quantity = _select_report_quantity(
-                m3d.post,
-                setup_sweep,
-                field_category,
-                "Rectangular Plot",
-                ["Bx", "B_x", "Mag_B", "B"],
-            )
+                    print(f"  [成功] Field Overlays 已创建: {plot.name}")
+
+                if cut_plane:
+                    cut_plot = _existing_field_plot(
+                        m3d, f"Field_{field_quantity}_Cutplane_{label}", reuse_setup
+                    ) or m3d.post.create_fieldplot_cutplane(
+                        [cut_plane.name],
+                        field_quantity,
+                        setup=setup_sweep,
+                        intrinsics={"Time": time_str},
+                        plot_name=f"Field_{field_quantity}_Cutplane_{label}",
+                    )
+                    if cut_plot:
+                        m3d.post.export_field_plot(
+                            cut_plot.name,
+                            export_dir,
+                            file_name=cut_plot.name,
+                            file_format="aedtplt",
+                        )
+                        m3d.post.export_field_jpg(
+                            os.path.join(export_dir, f"{cut_plot.name}.jpg"),
+                            cut_plot.name,
+                            cut_plot.plot_folder,
+                            orientation="isometric",
+                            width=1920,
+                            height=1080,
+                            display_wireframe=False,
+                            show_axis=True,
+                            show_grid=True,
+                            show_ruler=False,
+                            show_region=False,
+                        )
+                        print(f"  [成功] Field Overlays 已创建: {cut_plot.name}")
         else:
-            axial_quantity = None
-
-        if setup_sweep and field_category and axial_quantity:
-            center_context = {"Context": "Point", "Point": CENTER_POINT}
-            solution_data = m3d.post.get_solution_data(
-                expressions=[axial_quantity],
-                setup_sweep_name=setup_sweep,
-                domain="Time",
-                primary_sweep_variable="Time",
-                variations={"Time": ["All"]},
-                report_category=field_category,
-                context=center_context,
+            print("  [警告] Field Overlays 创建失败")
+    except Exception as e:
+        print(f"  [警告] Results/Field Overlays 输出失败: {e}")
+
+    # 10.6 Post-Processing Exports
+    stage("  导出后处理数据...")
+    try:
+        export_dir = os.path.join(os.getcwd(), "VacuumInterrupter", "post")
+        os.makedirs(export_dir, exist_ok=True)
+
+        # 以输入时程作为开闸运动后处理导出
+        dt = 0.0005
+        steps = int(MOTION_TIME / dt) + 1
+        times = [i * dt for i in range(steps)]
+
+        # 速度插值
+        def interp_velocity(t):
+            if t <= velocity_data_x[0]:
+                return velocity_data_y[0]
+            if t >= velocity_data_x[-1]:
+                return velocity_data_y[-1]
+            for i in range(len(velocity_data_x) - 1):
+                t0 = velocity_data_x[i]
+                t1 = velocity_data_x[i + 1]
+                if t0 <= t <= t1:
+                    v0 = velocity_data_y[i]
+                    v1 = velocity_data_y[i + 1]
+                    if t1 == t0:
+                        return v0
+                    return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+            return velocity_data_y[-1]
+
+        sign = 1.0 if OPEN_DIRECTION == "positive" else -1.0
+        velocities = [sign * interp_velocity(t) for t in times]
+
+        # 位置积分
+        positions = [0.0]
+        for i in range(1, len(times)):
+            positions.append(positions[-1] + 0.5 * (velocities[i - 1] + velocities[i]) * dt)
+
+        # 电流波形
+        currents = [PEAK_CURRENT * math.sin(2.0 * math.pi * FREQUENCY * t) for t in times]
+
+        motion_csv = os.path.join(export_dir, "motion_profile.csv")
+        with open(motion_csv, "w", encoding="utf-8") as f:
+            f.write("Time(s),Velocity(m/s),Position(m)\n")
+            for t, v, p in zip(times, velocities, positions):
+                f.write(f"{t},{v},{p}\n")
+        print(f"  [成功] 导出运动时程 -> {motion_csv}")
+
+        current_csv = os.path.join(export_dir, "current_waveform.csv")
+        with open(current_csv, "w", encoding="utf-8") as f:
+            f.write("Time(s),Current(A)\n")
+            for t, i in zip(times, currents):
+                f.write(f"{t},{i}\n")
+        print(f"  [成功] 导出电流时程 -> {current_csv}")
+
+        # AMF 中心点磁场时程与关键指标
+        try:
+            setup_sweep = _safe_setup_sweep_name(m3d, setup)
+            field_category = _pick_report_category(
+                m3d.post, ["Fields", "Transient", "Standard"]
             )
-            center_bx_csv = os.path.join(export_dir, "center_bx_vs_time.csv")
-            if _export_solution_data_csv(solution_data, center_bx_csv):
-                print(f"  [成功] 导出中心点磁场 -> {center_bx_csv}")
-                data_rows = _parse_two_columns(center_bx_csv)
-                if data_rows:
-                    peak_time, peak_value = max(
-                        data_rows, key=lambda item: abs(item[1])
-                    )
-                    residual_value = _interp_value(data_rows, ZERO_TIME)
-                    lag_time = peak_time - PEAK_TIME
-                    phase_deg = lag_time * 360.0 * FREQUENCY
-
-                    peak_current_ka = PEAK_CURRENT / 1000.0
-                    peak_b_mT = abs(peak_value) * 1000.0
-                    residual_b_mT = (
-                        abs(residual_value) * 1000.0
-                        if residual_value is not None
-                        else None
-                    )
-                    peak_b_per_ka = (
-                        peak_b_mT / peak_current_ka if peak_current_ka else None
-                    )
+            if setup_sweep and field_category:
+                axial_quantity = _select_report_quantity(
+                    m3d.post,
+                    setup_sweep,
+                    field_category,
+                    "Rectangular Plot",
+                    ["Bx", "B_x", "Mag_B", "B"],
+                )
+            else:
+                axial_quantity = None
+
+            if setup_sweep and field_category and axial_quantity:
+                center_context = {"Context": "Point", "Point": CENTER_POINT}
+                solution_data = m3d.post.get_solution_data(
+                    expressions=[axial_quantity],
+                    setup_sweep_name=setup_sweep,
+                    domain="Time",
+                    primary_sweep_variable="Time",
+                    variations={"Time": ["All"]},
+                    report_category=field_category,
+                    context=center_context,
+                )
+                center_bx_csv = os.path.join(export_dir, "center_bx_vs_time.csv")
+                if _export_solution_data_csv(solution_data, center_bx_csv):
+                    print(f"  [成功] 导出中心点磁场 -> {center_bx_csv}")
+                    data_rows = _parse_two_columns(center_bx_csv)
+                    if data_rows:
+                        peak_time, peak_value = max(
+                            data_rows, key=lambda item: abs(item[1])
+                        )
+                        residual_value = _interp_value(data_rows, ZERO_TIME)
+                        lag_time = peak_time - PEAK_TIME
+                        phase_deg = lag_time * 360.0 * FREQUENCY
+
+                        peak_current_ka = PEAK_CURRENT / 1000.0
+                        peak_b_mT = abs(peak_value) * 1000.0
+                        residual_b_mT = (
+                            abs(residual_value) * 1000.0
+                            if residual_value is not None
+                            else None
+                        )
+                        peak_b_per_ka = (
+                            peak_b_mT / peak_current_ka if peak_current_ka else None
+                        )
 
-                    metrics_csv = os.path.join(export_dir, "amf_metrics.csv")
-                    with open(metrics_csv, "w", encoding="utf-8") as f:
-                        f.write("Metric,Value,Unit\n")
-                        f.write(f"Bx_Peak_Time,{peak_time},s\n")
-                        f.write(f"Bx_Peak_Value,{peak_value},T\n")
-                        if residual_value is not None:
-                            f.write(f"Bx_Residual_At_Zero,{residual_value},T\n")
-                        f.write(f"Lag_Time,{lag_time},s\n")
-                        f.write(f"Lag_Phase,{phase_deg},deg\n")
-                        f.write(f"Bx_Peak_mT,{peak_b_mT},mT\n")
-                        if residual_b_mT is not None:
-                            f.write(f"Bx_Residual_mT,{residual_b_mT},mT\n")
-                    if peak_b_per_ka is not None:
-                        f.write(f"Bx_Peak_per_kA,{peak_b_per_ka},mT/kA\n")
-                    print(f"  [成功] 导出 AMF 指标 -> {metrics_csv}")
-
-                # 触头表面径向分布 (可选)
-                try:
-                    if hasattr(m3d.modeler, "create_polyline"):
-                        radial_name = "AMF_Radial_Line"
-                        if radial_name not in m3d.modeler.object_names:
-                            m3d.modeler.create_polyline(
-                                [[0, 0, 0], [0, CONTACT_RADIUS, 0]],
-                                name=radial_name,
-                                non_model=True,
+                        metrics_csv = os.path.join(export_dir, "amf_metrics.csv")
+                        with open(metrics_csv, "w", encoding="utf-8") as f:
+                            f.write("Metric,Value,Unit\n")
+                            f.write(f"Bx_Peak_Time,{peak_time},s\n")
+                            f.write(f"Bx_Peak_Value,{peak_value},T\n")
+                            if residual_value is not None:
+                                f.write(f"Bx_Residual_At_Zero,{residual_value},T\n")
+                            f.write(f"Lag_Time,{lag_time},s\n")
+                            f.write(f"Lag_Phase,{phase_deg},deg\n")
+                            f.write(f"Bx_Peak_mT,{peak_b_mT},mT\n")
+                            if residual_b_mT is not None:
+                                f.write(f"Bx_Residual_mT,{residual_b_mT},mT\n")
+                        if peak_b_per_ka is not None:
+                            f.write(f"Bx_Peak_per_kA,{peak_b_per_ka},mT/kA\n")
+                        print(f"  [成功] 导出 AMF 指标 -> {metrics_csv}")
+
+                    # 触头表面径向分布 (可选)
+                    try:
+                        if hasattr(m3d.modeler, "create_polyline"):
+                            radial_name = "AMF_Radial_Line"
+                            if radial_name not in m3d.modeler.object_names:
+                                m3d.modeler.create_polyline(
+                                    [[0, 0, 0], [0, CONTACT_RADIUS, 0]],
+                                    name=radial_name,
+                                    non_model=True,
+                                )
+                            radial_context = {
+                                "Context": "Polyline",
+                                "Polyline": radial_name,
+                            }
+                            radial_data = m3d.post.get_solution_data(
+                                expressions=[axial_quantity],
+                                setup_sweep_name=setup_sweep,
+                                domain="Distance",
+                                primary_sweep_variable="Distance",
+                                variations={"Time": [f"{PEAK_TIME}s"]},
+                                report_category=field_category,
+                                context=radial_context,
                             )
-                        radial_context = {
-                            "Context": "Polyline",
-                            "Polyline": radial_name,
-                        }
-                        radial_data = m3d.post.get_solution_data(
-                            expressions=[axial_quantity],
-                            setup_sweep_name=setup_sweep,
-                            domain="Distance",
-                            primary_sweep_variable="Distance",
-                            variations={"Time": [f"{PEAK_TIME}s"]},
-                            report_category=field_category,
-                            context=radial_context,
-                        )
-                        radial_csv = os.path.join(export_dir, "amf_radial_bx_peak.csv")
-                        if _export_solution_data_csv(radial_data, radial_csv):
-                            print(f"  [成功] 导出 AMF 径向曲线 -> {radial_csv}")
-                except Exception as e:
-                    print(f"  [警告] AMF 径向曲线导出失败: {e}")
+                            radial_csv = os.path.join(export_dir, "amf_radial_bx_peak.csv")
+                            if _export_solution_data_csv(radial_data, radial_csv):
+                                print(f"  [成功] 导出 AMF 径向曲线 -> {radial_csv}")
+                    except Exception as e:
+                        print(f"  [警告] AMF 径向曲线导出失败: {e}")
+                else:
+                    print("  [警告] 中心点磁场导出失败")
             else:
-                print("  [警告] 中心点磁场导出失败")
-        else:
-            print("  [警告] 未找到可用的轴向磁场量，跳过 AMF 指标导出")
+                print("  [警告] 未找到可用的轴向磁场量，跳过 AMF 指标导出")
+        except Exception as e:
+            print(f"  [警告] AMF 指标导出失败: {e}")
     except Exception as e:
-        print(f"  [警告] AMF 指标导出失败: {e}")
-except Exception as e:
-    print(f"  [警告] 后处理导出失败: {e}")
-
-# =============================================================================
-# 保存
-# =============================================================================
-print("\n" + "=" * 60)
-m3d.save_project()
-print(f"项目保存: {m3d.project_path}")
-
-print("\n" + "=" * 60)
-print("模型创建与设置完成!")
-print("=" * 60)
-print("提示: 如果 Dataset 或 运动设置有误，请按以下步骤手动检查:")
-print(f"1. Project > Datasets: 检查 '{dataset_name}' 是否存在")
-print("2. Model > Motion Setup: 检查是否为 Translational, 速度是否引用 Dataset")
-print("3. Excitations: 检查是否有 Current 激励")
+        print(f"  [警告] 后处理导出失败: {e}")
+
+    # =============================================================================
+    # 保存
+    # =============================================================================
+    print("\n" + "=" * 60)
+    if profiler is not None:
+        profiler.stage("保存工程")
+    build.commit()
+    m3d.save_project()
+    print(f"项目保存: {m3d.project_path}")
+    if profiler is not None:
+        profiler.save(project_dir, chrome=args.chrome_trace)
+
+    print("\n" + "=" * 60)
+    print("模型创建与设置完成!")
+    print("=" * 60)
+    print("提示: 如果 Dataset 或 运动设置有误，请按以下步骤手动检查:")
+    print(f"1. Project > Datasets: 检查 '{dataset_name}' 是否存在")
+    print("2. Model > Motion Setup: 检查是否为 Translational, 速度是否引用 Dataset")
+    print("3. Excitations: 检查是否有 Current 激励")
+
+
+if __name__ == "__main__":
+    main()
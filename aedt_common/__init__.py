@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+aedt_common - 各仿真脚本共享的 AEDT 工具模块
+
+脚本位于各自的子目录 (EddyCurrent/, ElectrostaticField/ ...)，运行前会把
+仓库根目录加入 sys.path，然后按需导入子模块:
+
+    from aedt_common.session_pool import get_pool
+"""
+
+import os
+
+# 缓存/状态文件统一放在用户目录下，可通过环境变量 MAXWELL_AEDT_CACHE 覆盖
+CACHE_DIR = os.environ.get(
+    "MAXWELL_AEDT_CACHE", os.path.join(os.path.expanduser("~"), ".maxwell_aedt")
+)
+
+
+def cache_path(*parts: str) -> str:
+    """返回缓存目录下的路径 (自动创建父目录)"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+breakdown.py - 由导出的电场数据定量判定击穿区域 (体积排除法的自动化)
+
+Readme 的"体积排除法"是在 GUI 中把云图上限设为 3e6 V/m，目测超标区域是
+孤立红点 (数值奇异点) 还是大片连通区域 (真实击穿风险)。这里按同一思路
+对导出的 Mag_E (或 E 矢量) 数据做定量统计:
+
+  - 分块读取 .fld (field_data.iter_field_file)，每块只保留 |E| > 阈值的点
+    并映射到体素 (规则网格导出: 网格单元; 网格节点导出: 边长 cell 的体素)，
+    内存只与超标体素数有关，数 GB 的场文件也能处理
+  - 超标体素的 26 邻域连通域 (稀疏编码 + searchsorted 查邻居，
+    最小标号传播合并)，每个连通域统计体积、最大场强及位置、包围盒
+  - 最近零件: 按到零件包围盒 (PartTable) 表面的距离排序
+  - 分类: 连通域两端靠近不同网络 (不同相母排 / 接地构架) 的零件
+    (跨接)，或最大尺寸 ≥ path_extent，判为击穿路径 (breakdown)；
+    其余为奇异点 (singularity)
+
+导出: export_mag_e 在规则网格 (默认) 或空气域网格节点 (mesh=True) 上导出
+Mag_E; 零件包围盒与网络随导出保存到缓存目录，之后分析已有场文件
+(如 superposition 写出的周期包络) 不必连接 AEDT。
+
+用法:
+    from aedt_common.breakdown import analyze_field_file, export_mag_e
+
+    export_mag_e(m3d, "Mag_E.fld", step_mm=5)
+    result = analyze_field_file("Mag_E.fld", threshold=3e6, parts=parts, nets=nets)
+    for comp in result["components"]:
+        print(comp["kind"], comp["volume_mm3"], comp["parts"])
+"""
+
+import os
+import re
+import csv
+import json
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from aedt_common import cache_path
+from aedt_common.field_data import CHUNK_ROWS, iter_field_file, read_header
+from aedt_common.part_classifier import PartTable
+
+BREAKDOWN_E = 3.0e6   # V/m, 空气击穿场强 (3 kV/mm)
+PATH_EXTENT = 10.0    # mm, 连通域最大尺寸不小于此值判为击穿路径
+CELL = 2.0            # mm, 网格节点导出时的体素边长
+GRID_STEP = 5.0       # mm, 规则网格导出步长
+AIR_REGION = "Region"
+NEAREST_PARTS = 3
+MAX_END_DISTANCE = 2.0  # mm, 连通域端点距零件包围盒不超过 (此值 + 一个体素) 视为接触
+
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+COMPONENT_COLUMNS = (
+    "id", "kind", "volume_mm3", "cells", "max_E_kV_mm", "peak_mm",
+    "extent_mm", "parts", "bridges",
+)
+
+
+def parse_grid(header: Iterable[str]) -> Optional[dict]:
+    """表头 "Grid Output Min: [..] Max: [..] Grid Size: [..]" -> {"origin", "step"} (m)"""
+    for line in header:
+        if "Min:" in line and "Grid Size:" in line:
+            values = [float(v) for v in _NUMBER.findall(line)]
+            if len(values) >= 9:
+                return {"origin": np.array(values[:3]), "step": np.array(values[6:9])}
+    return None
+
+
+def grid_header(bounds_mm, step_mm) -> str:
+    """规则网格表头 (与 AEDT 导出格式一致, SI 单位)"""
+    lo = " ".join(f"{v / 1000:g}" for v in bounds_mm[:3])
+    hi = " ".join(f"{v / 1000:g}" for v in bounds_mm[3:])
+    step = " ".join(f"{step_mm / 1000:g}" for _ in range(3))
+    return f"Grid Output Min: [{lo}] Max: [{hi}] Grid Size: [{step}]"
+
+
+# ----------------------------------------------------------------------
+# 导出 (AEDT)
+# ----------------------------------------------------------------------
+def parts_file(project: str, design: str) -> str:
+    return cache_path("breakdown", f"{project}_{design}_parts.json")
+
+
+def save_parts(project: str, design: str, table, nets: Optional[Dict[str, List[str]]] = None) -> str:
+    path = parts_file(project, design)
+    boxes = {n: [float(v) for v in bb] for n, bb in zip(table.names, table.bbox) if not np.isnan(bb).any()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"parts": boxes, "nets": nets}, f, ensure_ascii=False)
+    return path
+
+
+def load_parts(project: str, design: str):
+    """-> (零件包围盒 {名称: bbox}, 网络) ; 没有记录时 (None, None)"""
+    try:
+        with open(parts_file(project, design), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    return data.get("parts") or None, data.get("nets") or None
+
+
+def export_mag_e(
+    app,
+    path: str,
+    setup: str = "Setup1",
+    step_mm: float = GRID_STEP,
+    mesh: bool = False,
+    table=None,
+    variations: Optional[dict] = None,
+) -> Optional[str]:
+    """导出 Mag_E: 规则网格 (零件总包围盒, 步长 step_mm) 或空气域网格节点
+
+    export_field_file(_on_grid) 新旧 PyAEDT 参数名不同，按位置传参。
+    """
+    solution = f"{setup} : LastAdaptive"
+    t0 = time.perf_counter()
+    if mesh:
+        # (物理量, 解, 变化, 文件, 对象, 对象类型)
+        app.post.export_field_file("Mag_E", solution, variations, path, AIR_REGION, "Vol")
+    else:
+        if table is None:
+            table = PartTable.query(app, [n for n in app.modeler.solid_names if AIR_REGION not in n], verbose=False)
+        bounds = table.extent()
+        start, stop = bounds[:3], bounds[3:]
+        center = [(a + b) / 2 for a, b in zip(start, stop)]
+        # (物理量, 解, 变化, 文件, 网格类型, 中心, 起点, 终点, 步长, 矢量)
+        app.post.export_field_file_on_grid(
+            "Mag_E", solution, variations, path, "Cartesian", center, start, stop, [step_mm] * 3, False,
+        )
+    if not os.path.exists(path):
+        return None
+    size = os.path.getsize(path)
+    print(f"  ✓ Mag_E 已导出 ({'网格节点' if mesh else f'网格 {step_mm:g}mm'}): "
+          f"{size / 1e6:.1f} MB, {time.perf_counter() - t0:.1f}s")
+    return path
+
+
+# ----------------------------------------------------------------------
+# 流式扫描
+# ----------------------------------------------------------------------
+def scan_field_file(
+    path: str,
+    threshold: float = BREAKDOWN_E,
+    cell_mm: float = CELL,
+    chunk_rows: int = CHUNK_ROWS,
+) -> dict:
+    """分块读取场文件，返回超标体素 {"voxels": (n, 3) int, "values": (n,), ...}"""
+    grid = parse_grid(read_header(path))
+    if grid is not None:
+        origin, step = grid["origin"], grid["step"]
+    else:
+        origin, step = np.zeros(3), np.full(3, cell_mm / 1000)
+
+    t0 = time.perf_counter()
+    keys, values = [], []
+    total, peak = 0, 0.0
+    for block in iter_field_file(path, chunk_rows):
+        total += len(block)
+        if block.shape[1] >= 6:
+            mag = np.linalg.norm(block[:, 3:6], axis=1)
+        else:
+            mag = block[:, 3]
+        with np.errstate(invalid="ignore"):
+            hit = mag > threshold
+        if len(mag):
+            peak = max(peak, float(np.nanmax(mag)) if not np.isnan(mag).all() else 0.0)
+        if not hit.any():
+            continue
+        scaled = (block[hit, :3] - origin) / step
+        keys.append((np.rint(scaled) if grid is not None else np.floor(scaled)).astype(np.int64))
+        values.append(mag[hit])
+
+    voxels = np.vstack(keys) if keys else np.empty((0, 3), dtype=np.int64)
+    vals = np.concatenate(values) if values else np.empty(0)
+    if len(voxels):
+        # 网格节点导出时同一体素可能有多个节点: 合并, 取最大值
+        voxels, inverse = np.unique(voxels, axis=0, return_inverse=True)
+        merged = np.zeros(len(voxels))
+        np.maximum.at(merged, inverse.reshape(-1), vals)
+        vals = merged
+    return {
+        "voxels": voxels,
+        "values": vals,
+        "origin": origin,
+        "step": step,
+        "grid": grid is not None,
+        "points": total,
+        "peak": peak,
+        "scan_s": time.perf_counter() - t0,
+    }
+
+
+# ----------------------------------------------------------------------
+# 连通域
+# ----------------------------------------------------------------------
+_OFFSETS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+def connected_components(voxels) -> np.ndarray:
+    """整数体素坐标 (n, 3) 的 26 邻域连通域标号 (0..k-1)"""
+    voxels = np.asarray(voxels, dtype=np.int64).reshape(-1, 3)
+    n = len(voxels)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    lo = voxels.min(axis=0) - 1
+    dims = voxels.max(axis=0) - lo + 2
+    rel = voxels - lo
+    code = (rel[:, 0] * dims[1] + rel[:, 1]) * dims[2] + rel[:, 2]
+    order = np.argsort(code, kind="stable")
+    sorted_code = code[order]
+
+    src, dst = [], []
+    for dx, dy, dz in _OFFSETS:
+        target = sorted_code + (dx * dims[1] + dy) * dims[2] + dz
+        pos = np.searchsorted(sorted_code, target)
+        pos_ok = np.minimum(pos, n - 1)
+        hit = (pos < n) & (sorted_code[pos_ok] == target)
+        src.append(np.flatnonzero(hit))
+        dst.append(pos[hit])
+    src = np.concatenate(src)
+    dst = np.concatenate(dst)
+
+    # 最小标号传播: 把边两端的根挂到较小的根上, 再路径压缩, 直到每条边两端同根
+    labels = np.arange(n)
+    while len(src):
+        a, b = labels[src], labels[dst]
+        if np.array_equal(a, b):
+            break
+        m = np.minimum(a, b)
+        np.minimum.at(labels, a, m)
+        np.minimum.at(labels, b, m)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    _, sorted_labels = np.unique(labels, return_inverse=True)
+    out = np.empty(n, dtype=np.int64)
+    out[order] = sorted_labels.reshape(-1)
+    return out
+
+
+# ----------------------------------------------------------------------
+# 零件与分类
+# ----------------------------------------------------------------------
+def surface_distance(points, boxes) -> np.ndarray:
+    """点 (p, 3) 到包围盒 (m, 6) 表面的距离 (p, m)
+
+    盒外为到盒的距离; 盒内为到最近盒面的深度。空气中的点落在零件包围盒
+    深处 (柜体外壳、L 形构架) 时说明离零件实际表面较远，不应算作接触。
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 1, 3)
+    lo, hi = boxes[None, :, :3], boxes[None, :, 3:]
+    gap = np.maximum(np.maximum(lo - points, points - hi), 0.0)
+    outside = np.sqrt((gap ** 2).sum(axis=2))
+    depth = np.minimum(points - lo, hi - points).min(axis=2)
+    return np.where(outside > 0, outside, np.maximum(depth, 0.0))
+
+
+def nearest_parts(points, parts, count: int = NEAREST_PARTS):
+    """每个点表面距离最近的 count 个零件序号与距离"""
+    _, boxes = parts
+    dist = surface_distance(points, boxes)
+    ranked = np.argsort(dist, axis=1, kind="stable")[:, :count]
+    return ranked, np.take_along_axis(dist, ranked, axis=1)
+
+
+def _part_boxes(parts) -> Optional[tuple]:
+    """PartTable 或 {名称: bbox} -> (名称, (m, 6) mm)"""
+    if parts is None:
+        return None
+    if hasattr(parts, "bbox"):
+        valid = ~np.isnan(parts.bbox).any(axis=1)
+        names = [n for n, ok in zip(parts.names, valid) if ok]
+        boxes = parts.bbox[valid]
+    else:
+        names = list(parts)
+        boxes = np.array([parts[n] for n in names], dtype=float).reshape(-1, 6)
+    if not names:
+        return None
+    # 包围盒两角统一为 (min, max)
+    boxes = np.hstack([np.minimum(boxes[:, :3], boxes[:, 3:]), np.maximum(boxes[:, :3], boxes[:, 3:])])
+    return names, boxes
+
+
+def analyze_field_file(
+    path: str,
+    threshold: float = BREAKDOWN_E,
+    cell_mm: float = CELL,
+    parts=None,
+    nets: Optional[Dict[str, List[str]]] = None,
+    path_extent: float = PATH_EXTENT,
+    chunk_rows: int = CHUNK_ROWS,
+) -> dict:
+    """超标体积、连通域及分类
+
+    parts: PartTable 或 {零件名: [xmin, ymin, zmin, xmax, ymax, zmax] (mm)}，
+    nets: {网络名: [零件名]} (不在任何网络中的零件视为接地网络 "GND")；
+    未给 nets 时每个零件各自为一个网络。连通域端点距零件包围盒表面
+    不超过 MAX_END_DISTANCE + 一个体素视为接触。
+    """
+    scan = scan_field_file(path, threshold, cell_mm, chunk_rows)
+    voxels, values = scan["voxels"], scan["values"]
+    step_mm = scan["step"] * 1000
+    cell_volume = float(np.prod(step_mm))
+    result = {
+        "file": path,
+        "threshold": threshold,
+        "points": scan["points"],
+        "peak": scan["peak"],
+        "grid": scan["grid"],
+        "cell_mm": [float(v) for v in step_mm],
+        "above_cells": int(len(voxels)),
+        "above_mm3": len(voxels) * cell_volume,
+        "scan_s": scan["scan_s"],
+        "components": [],
+    }
+    if not len(voxels):
+        return result
+
+    labels = connected_components(voxels)
+    coords = (voxels * scan["step"] + scan["origin"]) * 1000  # 体素中心 mm
+    boxes = _part_boxes(parts)
+    net_of = {}
+    for net, names in (nets or {}).items():
+        for name in names:
+            net_of[name] = net
+    if boxes is not None:
+        part_net = np.array([net_of.get(n, "GND") if nets else n for n in boxes[0]], dtype=object)
+    contact = MAX_END_DISTANCE + float(step_mm.max())
+
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    for members in np.split(order, bounds):
+        pts = coords[members]
+        vals = values[members]
+        peak_i = int(np.argmax(vals))
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        extent = hi - lo + step_mm
+        comp = {
+            "cells": int(len(members)),
+            "volume_mm3": len(members) * cell_volume,
+            "max_E": float(vals[peak_i]),
+            "max_E_kV_mm": float(vals[peak_i]) / 1e6,
+            "peak_mm": [round(float(v), 1) for v in pts[peak_i]],
+            "bbox_mm": [float(v) for v in np.concatenate([lo, hi])],
+            "extent_mm": round(float(extent.max()), 1),
+            "parts": [],
+            "bridges": False,
+        }
+        if boxes is not None:
+            ranked, _ = nearest_parts(pts[peak_i], boxes)
+            comp["parts"] = [boxes[0][i] for i in ranked[0]]
+            # 沿最长方向的两端各自接触的网络; 两端都有接触且没有共同网络即为跨接
+            axis = int(np.argmax(extent))
+            ends = pts[[int(np.argmin(pts[:, axis])), int(np.argmax(pts[:, axis]))]]
+            touch = surface_distance(ends, boxes[1]) <= contact
+            first, second = set(part_net[touch[0]]), set(part_net[touch[1]])
+            comp["bridges"] = bool(first and second and not first & second)
+        comp["kind"] = "breakdown" if comp["bridges"] or comp["extent_mm"] >= path_extent else "singularity"
+        result["components"].append(comp)
+
+    result["components"].sort(key=lambda c: (c["kind"] != "breakdown", -c["volume_mm3"], -c["max_E"]))
+    for i, comp in enumerate(result["components"], 1):
+        comp["id"] = i
+    result["breakdown"] = sum(c["kind"] == "breakdown" for c in result["components"])
+    result["singularity"] = len(result["components"]) - result["breakdown"]
+    return result
+
+
+def write_components_csv(path: str, components: List[dict], columns: Iterable[str] = COMPONENT_COLUMNS) -> None:
+    """连通域明细写入 CSV"""
+    columns = list(columns)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for comp in components:
+            row = dict(comp)
+            row["peak_mm"] = " ".join(f"{v:g}" for v in comp["peak_mm"])
+            row["parts"] = " ".join(comp["parts"])
+            writer.writerow(row)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+cad_cache.py - 修复后 CAD 几何的内容寻址缓存 (导入一次修复, 之后直接载入)
+
+各 KYN28 脚本每次运行都对同一个 .igs 执行 import_3d_cad(healing=True)，
+几何修复是建模阶段最慢的步骤之一。import_cad 以
+
+    (源文件内容 SHA-256, 导入/修复选项, AEDT 版本)
+
+为键，第一次导入修复后把全部实体导出为 ACIS (.sab, AEDT 原生几何格式，
+保留对象名)，之后的运行直接导入该 .sab (不再修复)。
+
+  - 缓存目录: <缓存目录>/cad/<键>/model.sab + meta.json
+  - 源文件哈希按 (路径, 修改时间, 大小) 记忆，大文件不必每次重算
+  - 载入的实体数与缓存记录不一致时丢弃该条缓存，重新导入修复
+    (设计中已有同名对象时 AEDT 会给载入的对象加后缀, 所以不比较名称)
+  - 总大小超过 max_bytes 时按最近使用时间 (LRU) 删除旧条目
+
+用法:
+    from aedt_common.cad_cache import import_cad
+
+    import_cad(m3d, MODEL_FILE, healing=True)      # 代替 m3d.modeler.import_3d_cad
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+from typing import List, Optional
+
+from aedt_common import cache_path
+
+CAD_DIR = os.path.dirname(cache_path("cad", "index.json"))
+INDEX_FILE = os.path.join(CAD_DIR, "index.json")
+MAX_CACHE_BYTES = 2 * 1024 ** 3  # 2 GB
+NATIVE_FORMAT = ".sab"
+MODEL_NAME = "model"
+
+
+def _load_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json(path: str, data: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def file_sha256(path: str) -> str:
+    """源文件内容哈希; 路径/修改时间/大小未变时沿用记录的结果"""
+    st = os.stat(path)
+    stamp = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    index = _load_json(INDEX_FILE)
+    if index.get(stamp):
+        return index[stamp]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    index = {k: v for k, v in index.items() if not k.startswith(os.path.abspath(path) + "|")}
+    index[stamp] = digest.hexdigest()
+    _save_json(INDEX_FILE, index)
+    return index[stamp]
+
+
+def cache_key(model_file: str, options: dict, aedt_version: str = "") -> str:
+    text = json.dumps(
+        {"sha256": file_sha256(model_file), "options": options, "aedt": aedt_version},
+        sort_keys=True,
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+
+def _entry_size(entry_dir: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(entry_dir):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def _entries() -> List[dict]:
+    entries = []
+    if not os.path.isdir(CAD_DIR):
+        return entries
+    for key in os.listdir(CAD_DIR):
+        entry_dir = os.path.join(CAD_DIR, key)
+        if not os.path.isdir(entry_dir):
+            continue
+        meta = _load_json(os.path.join(entry_dir, "meta.json"))
+        entries.append({
+            "key": key,
+            "dir": entry_dir,
+            "size": _entry_size(entry_dir),
+            "last_used": meta.get("last_used", 0.0),
+            "source": meta.get("source", "?"),
+        })
+    return entries
+
+
+def evict(max_bytes: int = MAX_CACHE_BYTES, keep: Optional[str] = None) -> int:
+    """按最近使用时间删除旧条目直到总大小 ≤ max_bytes，返回删除的条目数"""
+    entries = sorted(_entries(), key=lambda e: e["last_used"])
+    total = sum(e["size"] for e in entries)
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if entry["key"] == keep:
+            continue
+        shutil.rmtree(entry["dir"], ignore_errors=True)
+        total -= entry["size"]
+        removed += 1
+        print(f"  [CAD缓存] 淘汰 {os.path.basename(entry['source'])} ({entry['size'] / 1e6:.1f} MB)")
+    return removed
+
+
+def _import_native(app, model_file: str, healing: bool) -> bool:
+    return app.modeler.import_3d_cad(model_file, healing=healing)
+
+
+def _export_native(app, objects: List[str], entry_dir: str) -> Optional[str]:
+    """导出为 .sab; export_3d_model 新旧 PyAEDT 参数名不同，按位置传参
+    (文件名, 目录, 格式, 导出对象)"""
+    app.export_3d_model(MODEL_NAME, entry_dir, NATIVE_FORMAT, objects)
+    path = os.path.join(entry_dir, MODEL_NAME + NATIVE_FORMAT)
+    return path if os.path.exists(path) else None
+
+
+def import_cad(
+    app,
+    model_file: str,
+    healing: bool = True,
+    use_cache: bool = True,
+    max_bytes: int = MAX_CACHE_BYTES,
+) -> bool:
+    """导入 CAD (代替 app.modeler.import_3d_cad)，修复后的几何走缓存"""
+    if not use_cache:
+        return _import_native(app, model_file, healing)
+
+    t0 = time.perf_counter()
+    options = {"healing": bool(healing), "format": NATIVE_FORMAT}
+    version = str(getattr(app, "aedt_version_id", "") or "")
+    try:
+        key = cache_key(model_file, options, version)
+    except OSError as e:
+        print(f"  [WARN] 无法计算模型哈希, 不使用 CAD 缓存: {e}")
+        return _import_native(app, model_file, healing)
+    entry_dir = os.path.join(CAD_DIR, key)
+    meta_file = os.path.join(entry_dir, "meta.json")
+    meta = _load_json(meta_file)
+    cached = os.path.join(entry_dir, MODEL_NAME + NATIVE_FORMAT)
+
+    if meta and os.path.exists(cached):
+        before = set(app.modeler.object_names)
+        try:
+            app.modeler.import_3d_cad(cached, healing=False)
+            app.modeler.refresh_all_ids()
+            loaded = set(app.modeler.solid_names) - before
+            if len(loaded) == len(meta.get("objects", [])):
+                meta["last_used"] = time.time()
+                meta["hits"] = meta.get("hits", 0) + 1
+                _save_json(meta_file, meta)
+                print(
+                    f"  [CAD缓存] 命中: 载入已修复几何 {len(loaded)} 个对象 "
+                    f"({time.perf_counter() - t0:.1f}s, 首次导入修复 {meta.get('import_s', 0):.1f}s)"
+                )
+                return True
+            print(f"  [WARN] 缓存几何的对象与记录不一致 ({len(loaded)}/{len(meta.get('objects', []))})，重新导入")
+            if loaded:
+                app.modeler.delete(list(loaded))
+        except Exception as e:
+            print(f"  [WARN] 载入 CAD 缓存失败，重新导入: {e}")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+
+    # 未命中: 导入修复，然后导出到缓存
+    before = set(app.modeler.object_names)
+    result = _import_native(app, model_file, healing)
+    import_s = time.perf_counter() - t0
+    try:
+        app.modeler.refresh_all_ids()
+        objects = sorted(set(app.modeler.solid_names) - before)
+        if objects:
+            os.makedirs(entry_dir, exist_ok=True)
+            if _export_native(app, objects, entry_dir):
+                _save_json(meta_file, {
+                    "source": os.path.abspath(model_file),
+                    "options": options,
+                    "aedt": version,
+                    "objects": objects,
+                    "import_s": import_s,
+                    "created": time.time(),
+                    "last_used": time.time(),
+                    "hits": 0,
+                })
+                size = _entry_size(entry_dir)
+                print(f"  [CAD缓存] 已保存修复后几何 ({len(objects)} 个对象, {size / 1e6:.1f} MB)")
+                evict(max_bytes, keep=key)
+            else:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                print("  [WARN] 导出修复后几何失败, 未缓存")
+    except Exception as e:
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        print(f"  [WARN] 保存 CAD 缓存失败: {e}")
+    return result
+
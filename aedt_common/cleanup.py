@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+cleanup.py - 导入模型的小零件 (螺栓/垫圈/螺母) 清理
+
+ScriptsVBS/CleanUp_Geometry.vbs 逐个零件 FitAll + GetObjectBoundingBox，
+再逐个删除包围盒体积 < 5000 mm³ 的零件; Python 设置脚本没有清理，紧固件
+直接进入剖分，小特征尺寸使四面体数成倍增加。cleanup_small_parts 使用
+PartTable (part_classifier) 已批量取回的包围盒:
+
+  - 体积过滤: 包围盒体积 < max_volume (与 VBS 脚本相同的判据)
+  - 特征尺寸过滤: 包围盒最长边 < max_size (紧固件)
+  - 与受保护导体 (高压母排) 包围盒接触 (间隙 ≤ clearance) 的零件保留:
+    受保护导体建均匀网格索引，每个候选零件只与所在网格单元中的导体比较
+  - 全部待删零件一条 Delete 命令 (ModelerBatch, 一次 RunScript)
+  - measure=True 时删除前后各生成一次初始网格，报告四面体数变化
+    (需要额外两次剖分)
+
+删除零件会改变几何 (接地构架上的螺栓头等)，设置脚本中默认不清理，
+需以 --cleanup 显式启用。
+
+用法:
+    from aedt_common.cleanup import cleanup_small_parts, exclude
+
+    removed = cleanup_small_parts(m3d, table, protected=busbars)
+    classes = exclude(classes, removed)
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from aedt_common.convergence import read_mesh_stats
+from aedt_common.modeler_batch import ModelerBatch
+
+SMALL_VOLUME = 5000.0  # mm³, 与 CleanUp_Geometry.vbs 相同
+SMALL_SIZE = 25.0      # mm, 最长边小于此值视为紧固件
+CLEARANCE = 1.0        # mm, 与受保护导体的接触判定间隙
+PROBE_SETUP = "CleanupProbe"
+
+
+class GridIndex:
+    """轴对齐包围盒的均匀网格索引 (boxes: (M, 6) [xmin, ymin, zmin, xmax, ymax, zmax])"""
+
+    def __init__(self, boxes, cell: Optional[float] = None):
+        self.boxes = np.asarray(boxes, dtype=float).reshape(-1, 6)
+        if cell is None:
+            # 单元尺寸取包围盒最短边的中位数 (细长母排跨越多个单元)，
+            # 并限制每个方向最多 64 个单元
+            sizes = self.boxes[:, 3:] - self.boxes[:, :3]
+            cell = max(float(np.median(sizes.min(axis=1))), float(sizes.max()) / 64) if len(sizes) else 1.0
+        self.cell = max(cell, 1e-6)
+        self.cells: Dict[tuple, List[int]] = defaultdict(list)
+        for i, box in enumerate(self.boxes):
+            for key in self._keys(box):
+                self.cells[key].append(i)
+
+    def _keys(self, box):
+        lo = np.floor(box[:3] / self.cell).astype(int)
+        hi = np.floor(box[3:] / self.cell).astype(int)
+        for x in range(lo[0], hi[0] + 1):
+            for y in range(lo[1], hi[1] + 1):
+                for z in range(lo[2], hi[2] + 1):
+                    yield (x, y, z)
+
+    def overlaps(self, box, margin: float = 0.0) -> List[int]:
+        """与 box (各方向扩大 margin) 相交的包围盒序号"""
+        box = np.asarray(box, dtype=float).copy()
+        box[:3] -= margin
+        box[3:] += margin
+        near = {i for key in self._keys(box) for i in self.cells.get(key, ())}
+        if not near:
+            return []
+        idx = np.fromiter(near, dtype=np.int64)
+        other = self.boxes[idx]
+        hit = np.all(other[:, :3] <= box[3:], axis=1) & np.all(other[:, 3:] >= box[:3], axis=1)
+        return sorted(idx[hit].tolist())
+
+
+def find_small_parts(
+    table,
+    protected: Iterable[str] = (),
+    max_volume: float = SMALL_VOLUME,
+    max_size: Optional[float] = SMALL_SIZE,
+    clearance: float = CLEARANCE,
+) -> Dict[str, List[str]]:
+    """-> {"remove": 待删零件, "kept": 因接触受保护导体而保留的小零件}"""
+    protected = [n for n in protected if n in table]
+    valid = ~np.isnan(table.bbox).any(axis=1)
+    with np.errstate(invalid="ignore"):
+        small = valid & (table.box_volume < max_volume)
+        if max_size is not None:
+            small |= valid & (table.longest < max_size)
+    if protected:
+        small[table.indices(protected)] = False
+    candidates = np.flatnonzero(small)
+
+    remove, kept = [], []
+    index = GridIndex(table.bbox[table.indices(protected)]) if protected else None
+    for i in candidates:
+        if index is not None and index.overlaps(table.bbox[i], clearance):
+            kept.append(table.names[i])
+        else:
+            remove.append(table.names[i])
+    return {"remove": remove, "kept": kept}
+
+
+def exclude(classes: Dict[str, List[str]], names: Iterable[str]) -> Dict[str, List[str]]:
+    """从分类结果中去掉已删除的零件"""
+    names = set(names)
+    return {cls: [n for n in members if n not in names] for cls, members in classes.items()}
+
+
+def count_tetrahedra(app) -> Optional[int]:
+    """生成临时 Setup 的初始网格并读取四面体总数 (没有 Region 时临时创建)"""
+    region = None
+    try:
+        if "Region" not in app.modeler.solid_names:
+            region = app.modeler.create_region(pad_percent=30)
+        app.create_setup(PROBE_SETUP)
+        app.odesign.GenerateMesh(PROBE_SETUP)
+        return read_mesh_stats(app, PROBE_SETUP)["total"]
+    except Exception as e:
+        print(f"  [WARN] 初始网格生成失败: {e}")
+        return None
+    finally:
+        try:
+            app.delete_setup(PROBE_SETUP)
+        except Exception:
+            pass
+        if region:
+            try:
+                app.modeler.delete(getattr(region, "name", region))
+            except Exception:
+                pass
+
+
+def cleanup_small_parts(
+    app,
+    table,
+    protected: Iterable[str] = (),
+    max_volume: float = SMALL_VOLUME,
+    max_size: Optional[float] = SMALL_SIZE,
+    clearance: float = CLEARANCE,
+    measure: bool = False,
+) -> List[str]:
+    """删除小零件 (与受保护导体接触的保留)，返回删除的对象名"""
+    t0 = time.perf_counter()
+    found = find_small_parts(table, protected, max_volume, max_size, clearance)
+    remove = found["remove"]
+    # 已知实体体积 (脚本未取到的用包围盒体积，不再逐个读取)
+    idx = table.indices(remove)
+    volume = float(np.where(np.isnan(table.volume[idx]), table.box_volume[idx], table.volume[idx]).sum())
+    rule = f"包围盒体积 < {max_volume:g} mm³" + (f" 或最长边 < {max_size:g} mm" if max_size else "")
+    print(
+        f"  [清理] 小零件 {len(remove) + len(found['kept'])} 个 ({rule}), "
+        f"与高压导体接触保留 {len(found['kept'])} 个, {time.perf_counter() - t0:.2f}s"
+    )
+    if not remove:
+        return []
+
+    before = count_tetrahedra(app) if measure else None
+    batch = ModelerBatch(app, verbose=False)
+    batch.delete(remove)
+    stats = batch.flush()
+    print(
+        f"  ✓ 删除 {len(remove)} 个零件 (体积合计 {volume:.0f} mm³), "
+        f"{stats['round_trips']} 次往返"
+    )
+    if measure:
+        after = count_tetrahedra(app)
+        if before and after is not None:
+            drop = before - after
+            print(f"  ✓ 初始网格四面体: {before} -> {after} (减少 {drop}, {drop / before * 100:.1f}%)")
+    return remove
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+convergence.py - 读取自适应求解的收敛信息 (pass 数 / 网格量 / 能量误差)
+
+通过 export_convergence 导出 Setup 的收敛表 (.prop 文本)，解析出每个
+adaptive pass 的四面体数和误差。
+
+用法:
+    from aedt_common.convergence import read_convergence
+
+    passes = read_convergence(m3d, "Setup1")
+    # [{"pass": 1, "tetrahedra": 12034, "energy_error": 8.1, "delta_energy": None}, ...]
+
+当前网格的四面体数 (总数及每个对象) 由 read_mesh_stats 从网格统计文件读取。
+"""
+
+import os
+import re
+import tempfile
+from typing import List, Optional
+
+_NUMBER = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+
+
+def _number(text: str) -> Optional[float]:
+    text = text.strip().rstrip("%")
+    return float(text) if _NUMBER.match(text) else None
+
+
+def parse_convergence(text: str) -> List[dict]:
+    """解析收敛表: 表头含 "Pass" 的行之后，每行 pass 号、四面体数、其余数值列
+
+    列名随求解器类型不同 (Energy Error / Delta Energy / Delta Mag ...)，
+    按表头名称识别误差列，识别不到的保留在 values 中。
+    """
+    rows = []
+    header = None
+    for line in text.splitlines():
+        cells = [c.strip() for c in re.split(r"\t|\s{2,}|\|", line.strip()) if c.strip()]
+        if not cells:
+            continue
+        if cells[0].lower().startswith("pass"):
+            header = [c.lower() for c in cells]
+            continue
+        if header is None:
+            continue
+        values = [_number(c) for c in cells]
+        if values[0] is None or len(values) < 2 or values[1] is None:
+            continue
+        row = {"pass": int(values[0]), "tetrahedra": int(values[1]),
+               "energy_error": None, "delta_energy": None, "values": values[2:]}
+        for name, value in zip(header[2:], values[2:]):
+            if "energy error" in name:
+                row["energy_error"] = value
+            elif "delta" in name:
+                row["delta_energy"] = value
+        rows.append(row)
+    return rows
+
+
+def read_convergence(app, setup: str, variation: str = "") -> List[dict]:
+    """导出并解析 Setup 的收敛表; 失败时返回空列表
+
+    export_convergence 按位置传参: 新旧 PyAEDT 参数名不同，但顺序一致
+    (Setup 名, 变化字符串, 输出文件)。
+    """
+    fd, path = tempfile.mkstemp(suffix=".prop")
+    os.close(fd)
+    try:
+        out = app.export_convergence(setup, variation, path)
+        out = out if isinstance(out, str) and os.path.exists(out) else path
+        with open(out, "r", encoding="utf-8", errors="ignore") as f:
+            return parse_convergence(f.read())
+    except Exception as e:
+        print(f"  [WARN] 无法读取 {setup} 的收敛信息: {e}")
+        return []
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+_TOTAL_ELEMENTS = re.compile(r"total number of mesh elements\s*[:=]?\s*(\d+)", re.I)
+
+
+def parse_mesh_stats(text: str) -> dict:
+    """解析网格统计 (ExportMeshStats): {"total": 四面体总数, "objects": {对象: 四面体数}}
+
+    每个对象一行 (表头含 "Num Tets")；没有总数行时取各对象之和。
+    """
+    objects = {}
+    in_table = False
+    for line in text.splitlines():
+        if "num tets" in line.lower():
+            in_table = True
+            continue
+        if not in_table:
+            continue
+        cells = [c for c in re.split(r"\t|\s{2,}|\|", line.strip()) if c.strip()]
+        if len(cells) < 2:
+            continue
+        count = _number(cells[1])
+        if count is None:
+            in_table = False
+            continue
+        objects[cells[0].strip()] = int(count)
+    match = _TOTAL_ELEMENTS.search(text)
+    total = int(match.group(1)) if match else (sum(objects.values()) if objects else None)
+    return {"total": total, "objects": objects}
+
+
+def read_mesh_stats(app, setup: str, variation: str = "") -> dict:
+    """导出并解析 Setup 当前网格的统计; 失败时 total 为 None"""
+    fd, path = tempfile.mkstemp(suffix=".ms")
+    os.close(fd)
+    try:
+        app.odesign.ExportMeshStats(setup, variation, path)
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return parse_mesh_stats(f.read())
+    except Exception as e:
+        print(f"  [WARN] 无法读取 {setup} 的网格统计: {e}")
+        return {"total": None, "objects": {}}
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+detection.py - ANSYS Electronics Desktop 安装检测 (带缓存)
+
+合并了各脚本中原有的 detect_ansys_installation() 逻辑:
+  - Windows: 自定义盘符目录、注册表 (含 WOW6432Node)、Program Files 常见目录
+  - Linux:   /media/large_disk/ansysLinux、/opt/AnsysEM
+
+检测结果 (版本、路径、可用的传输方式 gRPC/COM) 写入缓存文件，
+安装目录 mtime 不变时直接读取缓存，脚本冷启动只需毫秒级。
+"""
+
+import os
+import json
+import glob
+import platform
+from typing import Optional, Tuple
+
+from aedt_common import cache_path
+
+CACHE_FILE = cache_path("aedt_detection.json")
+
+# 按版本从新到旧排列的版本代码
+KNOWN_VERSION_CODES = ["252", "251", "242", "241", "232", "231", "222", "221"]
+
+LINUX_CANDIDATES = [
+    "/media/large_disk/ansysLinux/AnsysEM/v{code}/Linux64",
+    "/opt/AnsysEM/v{code}/Linux64",
+]
+
+
+def code_to_version(code: str) -> str:
+    """版本代码转版本号: 242 -> 2024.2"""
+    return f"20{code[0:2]}.{code[2]}"
+
+
+def version_to_code(version: str) -> str:
+    """版本号转版本代码: 2024.2 -> 242"""
+    return version.replace(".", "")[2:5]
+
+
+def version_from_path(path: str) -> Optional[str]:
+    """从安装路径反推版本号: ...\\v242\\Win64 -> 2024.2"""
+    norm = os.path.normpath(path)
+    for part in (os.path.basename(norm), os.path.basename(os.path.dirname(norm))):
+        if part.lower().startswith("v") and len(part) >= 4 and part[1:4].isdigit():
+            return code_to_version(part[1:4])
+    return None
+
+
+# ======================================================================
+# 原始检测 (较慢: 注册表枚举 + 文件系统扫描)
+# ======================================================================
+def _registry_candidates():
+    """枚举注册表中的 ElectronicsDesktop 版本 -> (版本号, 安装路径)"""
+    try:
+        import winreg
+    except ImportError:
+        return []
+
+    found = []
+    for base in (
+        r"SOFTWARE\Ansoft\ElectronicsDesktop",
+        r"SOFTWARE\WOW6432Node\Ansoft\ElectronicsDesktop",
+    ):
+        try:
+            base_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, base)
+        except OSError:
+            continue
+        subkeys = []
+        i = 0
+        while True:
+            try:
+                subkeys.append(winreg.EnumKey(base_key, i))
+                i += 1
+            except OSError:
+                break
+        winreg.CloseKey(base_key)
+
+        for sub in sorted(subkeys, reverse=True):
+            version = sub if "." in sub else code_to_version(sub[:3])
+            # 两种布局: <ver>\InstallPath 或 <ver>\Desktop\InstallDir
+            for key_path, value_name in (
+                (rf"{base}\{sub}", "InstallPath"),
+                (rf"{base}\{sub}\Desktop", "InstallDir"),
+            ):
+                try:
+                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path)
+                    path = winreg.QueryValueEx(key, value_name)[0]
+                    winreg.CloseKey(key)
+                except OSError:
+                    continue
+                found.append((version, path))
+    return found
+
+
+def _windows_path_candidates():
+    """常见安装目录 (含 E:/G: 等自定义盘符)"""
+    candidates = []
+    for code in KNOWN_VERSION_CODES:
+        year = 2000 + int(code[:2])
+        for drive in ("G:", "F:", "E:", "D:", "C:"):
+            candidates.append(rf"{drive}\Ansys{year}R{code[2]}\v{code}\Win64")
+        candidates.append(rf"E:\Program Files\ANSYSMaxwell\v{code}\Win64")
+        candidates.append(rf"C:\Program Files\AnsysEM\v{code}\Win64")
+        candidates.append(rf"C:\Program Files\Ansys Inc\AnsysEM\v{code}\Win64")
+    return candidates
+
+
+def _scan_installation() -> Tuple[Optional[str], Optional[str]]:
+    # 已设置的环境变量优先 (例如用户手动指定的 ANSYSEM_ROOT242)
+    for code in KNOWN_VERSION_CODES:
+        path = os.environ.get(f"ANSYSEM_ROOT{code}")
+        if path and os.path.isdir(path):
+            return (code_to_version(code), path)
+
+    system = platform.system()
+    if system == "Windows":
+        for version, path in _registry_candidates():
+            if path and os.path.isdir(path):
+                return (version, path)
+        for path in _windows_path_candidates():
+            if os.path.isdir(path):
+                return (version_from_path(path), path)
+        # 兜底: 扫描 Program Files 下的 vXXX 目录
+        for base in (r"C:\Program Files\AnsysEM", r"C:\Program Files\Ansys Inc\AnsysEM"):
+            hits = sorted(glob.glob(os.path.join(base, "v*", "Win64")), reverse=True)
+            if hits:
+                return (version_from_path(hits[0]), hits[0])
+    elif system == "Linux":
+        for code in KNOWN_VERSION_CODES:
+            for pattern in LINUX_CANDIDATES:
+                path = pattern.format(code=code)
+                if os.path.isdir(path):
+                    return (code_to_version(code), path)
+
+    return (None, None)
+
+
+# ======================================================================
+# 缓存
+# ======================================================================
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(data: dict) -> None:
+    try:
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print(f"[WARN] 无法写入检测缓存 {CACHE_FILE}: {e}")
+
+
+def _path_mtime(path: Optional[str]) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime if path else None
+    except OSError:
+        return None
+
+
+def detect_ansys_installation(use_cache: bool = True) -> Tuple[Optional[str], Optional[str]]:
+    """
+    检测 ANSYS Electronics Desktop 安装版本和路径 (Windows/Linux)
+    返回: (版本号, 安装路径) 例如 ("2024.2", "E:\\Ansys2024R2\\v242\\Win64")
+
+    安装目录 mtime 与缓存一致时直接返回缓存结果; 未检测到安装时不写缓存。
+    """
+    if use_cache:
+        cache = _load_cache()
+        path = cache.get("path")
+        if path and cache.get("path_mtime") == _path_mtime(path):
+            return (cache.get("version"), path)
+
+    version, path = _scan_installation()
+    if path:
+        if not version:
+            version = version_from_path(path)
+        cache = _load_cache()
+        # 安装变化时丢弃旧的传输方式记录
+        transport = cache.get("transport") if cache.get("path") == path else None
+        _save_cache(
+            {
+                "version": version,
+                "path": path,
+                "path_mtime": _path_mtime(path),
+                "transport": transport,
+            }
+        )
+    return (version, path)
+
+
+def apply_environment(version: Optional[str], path: Optional[str]) -> None:
+    """设置 PyAEDT 查找安装目录所用的环境变量"""
+    if not (version and path):
+        return
+    code = version_to_code(version)
+    os.environ[f"ANSYSEM_ROOT{code}"] = path
+    os.environ[f"AWP_ROOT{code}"] = path
+    os.environ["ANSYSEM_DIR"] = path
+
+
+def resolve_aedt(default_version: str, verbose: bool = True) -> Tuple[str, Optional[str]]:
+    """检测安装并设置环境变量，返回 (版本号, 安装路径)，版本缺省时使用 default_version"""
+    version, path = detect_ansys_installation()
+    if version:
+        if verbose:
+            print(f"[INFO] 检测到 ANSYS Electronics Desktop {version}")
+    else:
+        version = default_version
+        if verbose:
+            print(f"[WARN] 未检测到 ANSYS 版本，使用默认: {version}")
+    if path:
+        apply_environment(version, path)
+        if verbose:
+            print(f"[INFO] ANSYS 安装路径: {path}")
+    elif verbose:
+        print("[INFO] 将使用 PyAEDT 默认路径检测")
+    return (version, path)
+
+
+def cached_transport(version: Optional[str] = None) -> Optional[bool]:
+    """缓存中记录的可用传输方式: True=gRPC, False=COM, None=未知"""
+    cache = _load_cache()
+    if version and cache.get("version") and cache.get("version") != version:
+        return None
+    transport = cache.get("transport")
+    if transport is None:
+        return None
+    return transport == "grpc"
+
+
+def record_transport(version: Optional[str], use_grpc: bool) -> None:
+    """记录实际连接成功的传输方式，下次直接使用，避免重复付出失败尝试的代价"""
+    cache = _load_cache()
+    if version and cache.get("version") and cache.get("version") != version:
+        return
+    transport = "grpc" if use_grpc else "com"
+    if cache.get("transport") == transport:
+        return
+    cache["transport"] = transport
+    _save_cache(cache)
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+distributed.py - 多设计 / 多变化并行求解
+
+两种方式:
+  - native: 在当前桌面内调用 analyze_setup(cores=, tasks=)，由 AEDT 把
+    参数化 Setup 的各个变化分发到多个任务 (distributed variations)
+  - batch:  每个设计复制一份工程，同时启动多个 `ansysedt -batchsolve`
+    进程 (每个进程 -distributed + -machinelist 指定任务数/核数)，
+    求解结束后把各副本中对应设计的结果合并回主工程，并重新打开主工程
+    确认 AEDT 能看到这些解
+
+本机没有 AEDT 时可用 --solver-exe 指定替身程序 (如
+benchmarks/standin_batchsolve.py)，它接受相同的命令行参数并写出假结果，
+用来验证调度和合并流程。
+
+用法:
+    from aedt_common.distributed import (
+        analyze_native, merge_results, plan_jobs, run_jobs, verify_merged,
+    )
+
+    jobs = plan_jobs(project_file, [("EddyCurrent_Sweep", "Sweep_Partition", True)])
+    run_jobs(jobs, exe, cores=8, tasks=4, max_parallel=4)
+    merge_results(project_file, jobs)
+    verify_merged(lambda d: pool.open_design(project_file, d, launch=False), jobs)
+"""
+
+import os
+import sys
+import time
+import shutil
+import fnmatch
+import inspect
+import platform
+import subprocess
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+def aedt_executable(install_dir: Optional[str]) -> Optional[str]:
+    """安装目录 -> ansysedt 可执行文件路径"""
+    if not install_dir:
+        return None
+    name = "ansysedt.exe" if platform.system() == "Windows" else "ansysedt"
+    path = os.path.join(install_dir, name)
+    return path if os.path.isfile(path) else None
+
+
+def default_parallel_jobs(cores: int) -> int:
+    """按每个任务的核数估算可同时运行的进程数"""
+    return max(1, (os.cpu_count() or 1) // max(1, cores))
+
+
+# ======================================================================
+# native: 桌面内分布式变化求解
+# ======================================================================
+def analyze_native(app, setup_name: str, cores: int, tasks: int) -> bool:
+    """analyze_setup 并指定核数/任务数 (兼容 PyAEDT 新旧参数名)"""
+    params = inspect.signature(app.analyze_setup).parameters
+    if "cores" in params:
+        kwargs = {"cores": cores, "tasks": tasks}
+    else:
+        kwargs = {"num_cores": cores, "num_tasks": tasks}
+    if "use_auto_settings" in params:
+        # 关闭自动设置，任务数才会用于分发变化
+        kwargs["use_auto_settings"] = tasks <= 1
+    return app.analyze_setup(setup_name, **kwargs)
+
+
+# ======================================================================
+# batch: 多个 -batchsolve 进程
+# ======================================================================
+def batchsolve_command(
+    exe: str,
+    project_file: str,
+    design: str,
+    setup: str,
+    cores: int,
+    tasks: int,
+    parametric: bool = False,
+) -> List[str]:
+    """构造 ansysedt -batchsolve 命令行"""
+    target = f"{design}:{'Optimetrics' if parametric else 'Nominal'}:{setup}"
+    cmd = [exe] if not exe.endswith(".py") else [sys.executable, exe]
+    cmd += ["-ng", "-monitor", "-waitforlicense"]
+    if tasks > 1:
+        cmd += ["-distributed", "-machinelist", f"list=localhost:{tasks}:{cores}:90%:1"]
+    else:
+        cmd += ["-machinelist", f"num={cores}"]
+    cmd += ["-batchsolve", target, project_file]
+    return cmd
+
+
+def plan_jobs(
+    project_file: str,
+    targets: Sequence[Tuple[str, str, bool]],
+    work_dir: Optional[str] = None,
+) -> List[dict]:
+    """每个 (设计, Setup, 是否参数化) 复制一份工程，避免多个进程争用工程锁"""
+    project_file = os.path.abspath(project_file)
+    base = os.path.basename(project_file)
+    work_dir = work_dir or os.path.splitext(project_file)[0] + "_jobs"
+    jobs = []
+    for design, setup, parametric in targets:
+        job_dir = os.path.join(work_dir, design)
+        if os.path.isdir(job_dir):
+            shutil.rmtree(job_dir, ignore_errors=True)
+        os.makedirs(job_dir, exist_ok=True)
+        copy = os.path.join(job_dir, base)
+        shutil.copy2(project_file, copy)
+        jobs.append({
+            "design": design,
+            "setup": setup,
+            "parametric": parametric,
+            "project": copy,
+            "log": os.path.join(job_dir, "batchsolve.log"),
+        })
+    return jobs
+
+
+def run_jobs(
+    jobs: List[dict],
+    exe: str,
+    cores: int = 4,
+    tasks: int = 1,
+    max_parallel: Optional[int] = None,
+    timeout: Optional[float] = None,
+    poll: float = 1.0,
+) -> List[dict]:
+    """同时最多运行 max_parallel 个 -batchsolve 进程，返回带 returncode/elapsed 的 jobs"""
+    max_parallel = max_parallel or default_parallel_jobs(cores)
+    pending = list(jobs)
+    running = []
+    t0 = time.monotonic()
+    print(
+        f"[INFO] 批量求解: {len(jobs)} 个任务, 并行 {max_parallel}, "
+        f"每个 {tasks} 任务 x {cores} 核"
+    )
+    while pending or running:
+        while pending and len(running) < max_parallel:
+            job = pending.pop(0)
+            job["cmd"] = batchsolve_command(
+                exe, job["project"], job["design"], job["setup"], cores, tasks, job["parametric"]
+            )
+            log = open(job["log"], "w", encoding="utf-8", errors="ignore")
+            try:
+                job["proc"] = subprocess.Popen(
+                    job["cmd"], stdout=log, stderr=subprocess.STDOUT,
+                    cwd=os.path.dirname(job["project"]),
+                )
+            except OSError as e:
+                log.close()
+                print(f"  [错误] 无法启动求解进程 {job['design']}: {e}")
+                job["returncode"], job["elapsed"] = -1, 0.0
+                continue
+            job["_log"], job["_start"] = log, time.monotonic()
+            running.append(job)
+            print(f"  启动 {job['design']}:{job['setup']} (PID {job['proc'].pid})")
+
+        time.sleep(poll)
+        for job in list(running):
+            code = job["proc"].poll()
+            elapsed = time.monotonic() - job["_start"]
+            if code is None and timeout and elapsed > timeout:
+                job["proc"].kill()
+                code = job["proc"].wait()
+                print(f"  [警告] {job['design']} 超时 ({timeout:.0f}s)，已终止")
+            if code is None:
+                continue
+            job["_log"].close()
+            job["returncode"], job["elapsed"] = code, elapsed
+            running.remove(job)
+            status = "完成" if code == 0 else f"失败 (退出码 {code}, 日志 {job['log']})"
+            print(f"  {job['design']}:{job['setup']} {status} ({elapsed:.1f}s)")
+
+    for job in jobs:
+        for key in ("proc", "_log", "_start"):
+            job.pop(key, None)
+    serial = sum(j.get("elapsed", 0.0) for j in jobs)
+    print(f"[INFO] 批量求解结束: 墙钟 {time.monotonic() - t0:.1f}s, 串行合计 {serial:.1f}s")
+    return jobs
+
+
+# 结果目录中不能带回主工程的文件: 工程锁、求解临时文件
+SCRATCH_PATTERNS = ("*.lock", "*.lck", "*.semaphore", "*.tmp", "*.swp")
+
+
+def _is_scratch(name: str) -> bool:
+    return any(fnmatch.fnmatch(name.lower(), pattern) for pattern in SCRATCH_PATTERNS)
+
+
+def _copy_design_results(source: str, target: str) -> int:
+    """复制 source 目录 (跳过锁/临时文件)，返回复制的文件数"""
+    copied = 0
+    for dirpath, dirnames, filenames in os.walk(source):
+        dirnames[:] = [d for d in dirnames if not _is_scratch(d)]
+        dest = os.path.join(target, os.path.relpath(dirpath, source))
+        os.makedirs(dest, exist_ok=True)
+        for name in filenames:
+            if _is_scratch(name):
+                continue
+            shutil.copy2(os.path.join(dirpath, name), os.path.join(dest, name))
+            copied += 1
+    return copied
+
+
+def merge_results(project_file: str, jobs: List[dict]) -> int:
+    """把成功任务副本中该设计的结果复制回主工程，返回合并的任务数
+
+    每个副本只求解了 job["design"]，只带回 <设计>.results (以及同名前缀的
+    <设计>.* 结果文件)，跳过工程锁和临时文件，也不碰其他设计的结果目录。
+    主工程 .aedt 不会因此更新，合并后需用 verify_merged 重新打开主工程，
+    确认 AEDT 能看到这些解。调用前主工程需已在桌面中关闭。
+    """
+    results_dir = os.path.splitext(os.path.abspath(project_file))[0] + ".aedtresults"
+    merged = 0
+    for job in jobs:
+        if job.get("returncode") != 0:
+            continue
+        src = os.path.splitext(job["project"])[0] + ".aedtresults"
+        entries = [
+            e for e in (os.listdir(src) if os.path.isdir(src) else [])
+            if e.startswith(f"{job['design']}.") and not _is_scratch(e)
+        ]
+        if not entries:
+            print(f"  [警告] {job['design']} 没有结果: {src}")
+            continue
+        os.makedirs(results_dir, exist_ok=True)
+        copied = 0
+        for entry in entries:
+            source = os.path.join(src, entry)
+            target = os.path.join(results_dir, entry)
+            if os.path.isdir(source):
+                copied += _copy_design_results(source, target)
+            else:
+                shutil.copy2(source, target)
+                copied += 1
+        job["merged_files"] = copied
+        merged += 1
+    print(f"[INFO] 已合并 {merged}/{len(jobs)} 个任务的结果 -> {results_dir}")
+    return merged
+
+
+def solved_variations(app, setup: str) -> List[str]:
+    """AEDT 中该设计 setup 已有解的变化 (读取失败时返回空列表)"""
+    design = app.odesign
+    for sweep in (f"{setup} : LastAdaptive", setup):
+        try:
+            variations = list(design.ListVariations(sweep) or [])
+        except Exception:
+            continue
+        if variations:
+            return variations
+    return []
+
+
+def verify_merged(open_design: Callable, jobs: List[dict]) -> List[str]:
+    """重新打开主工程中已合并的设计，返回 AEDT 看不到解的设计名
+
+    open_design(design) -> 设计句柄 (调用方负责释放)，通常为
+    lambda d: get_pool().open_design(project_file, d, launch=False)。
+    """
+    missing = []
+    for job in jobs:
+        if "merged_files" not in job:
+            continue
+        try:
+            app = open_design(job["design"])
+            variations = solved_variations(app, job["setup"])
+        except Exception as e:
+            print(f"  [警告] 无法重新打开 {job['design']} 校验结果: {e}")
+            variations = []
+        job["solved_variations"] = len(variations)
+        if variations:
+            print(f"  ✓ {job['design']}:{job['setup']} 主工程可见 {len(variations)} 个已求解变化")
+        else:
+            missing.append(job["design"])
+            print(
+                f"  ⚠ {job['design']}:{job['setup']} 结果已复制但主工程中看不到解; "
+                f"完整结果见副本 {job['project']}"
+            )
+    return missing
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+eddy_screen.py - 隔板涡流损耗的 NumPy 快速估算 (求解前筛选)
+
+模型 (与 EddyCurrent_setup.py 的几何一致):
+  - 三根垂直母排 (X 宽 × Y 厚 × Z 高)，中心位于 Y = -Space / 0 / +Space，
+    每根母排截面离散为 nx × ny 根有限长直导线，电流按相位 0/-120/120° 分配
+  - 口字型框架: 四面立壁 (板厚 th, 高度 F, Z 向居中)，外边界
+    XO = Bus_W/2 + Gap + margin, YO = Space + Bus_D/2 + margin
+  - 入射场: 有限长直导线 Biot–Savart 公式，在立壁中面的面元上求和
+  - 损耗: 一维平板表面阻抗模型，Φ(ν) = (sinh ν - sin ν)/(cosh ν + cos ν)
+      切向场 H_t (沿壁长方向): 每单位面积 |H_t|²/(σδ) · Φ(th/δ)
+      法向场 B_n (垂直于壁面): 在板厚截面内形成环流，等效为厚度 F 的平板，
+        每单位长度 th · |B_n/μ|²/(σδ) · Φ(F/δ)
+    厚板 (th ≫ δ) 时退化为表面阻抗 Rs = 1/(σδ)，薄板时退化为 σω²B²d²/24
+
+入射场 (忽略框架自身的反作用) 只与几何 (间距/间隙/板厚) 有关，电流幅值按 I² 缩放，
+材料参数逐面元广播，所以 材料 × 间距 × 间隙 × 板厚 × 电流 的整张网格只需对
+每种几何做一次 Biot–Savart 求和。
+
+精度 (名义几何 Space=160/Gap=20/Frame_Th=3 mm, 4000 A, 50 Hz，与
+EddyCurrent_Analysis_Report.md 的 Maxwell 结果对比):
+  - 覆铝锌板 (μr=4000): 估算 685.5 W，Maxwell ~163 W，偏高约 4 倍。入射场
+    忽略了高磁导率框架自身对磁场的分流和屏蔽，μr 按线性常数处理，也没有
+    隔板孔洞
+  - 不锈钢 (μr=1): 估算 0.066 W，Maxwell ~0.1 W，偏低约 35%
+绝对值只能给出量级，可靠的是同一材料内 间距/间隙/板厚/电流 的相对趋势
+和排序; 需要绝对值时用 EddyCurrent_Prescreen.py --compare 得到的校准系数换算。
+tests/test_eddy_screen.py 固定了上述两个名义估算值，模型改动导致其变化时需同步更新本说明。
+
+用法:
+    from aedt_common.eddy_screen import BusbarFrameGeometry, screen_grid
+
+    geo = BusbarFrameGeometry(bus_w=120, bus_d=10, bus_h=600, flange=50, margin=30)
+    loss = screen_grid(geo, sigma=[4.032e6, 1.137e6], mu_r=[4000, 1],
+                       pitch=[160], gap=[10, 20, 40], th=[2, 3, 5], current=[4000])
+    # loss.shape == (材料, 间距, 间隙, 板厚, 电流), 单位 W
+"""
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+MU0 = 4e-7 * np.pi
+PHASES_DEG = (0.0, -120.0, 120.0)
+
+# 每批 Biot–Savart 的 (几何 × 面元 × 导线) 元素数上限, 控制临时数组内存
+CHUNK_ELEMENTS = 2_000_000
+
+
+@dataclass
+class BusbarFrameGeometry:
+    """母排/框架固定尺寸 (mm)，扫描的 间距/间隙/板厚 另外给出"""
+
+    bus_w: float
+    bus_d: float
+    bus_h: float
+    flange: float
+    margin: float
+    # 离散: 每根母排截面 nx × ny 根导线, 每面立壁沿长度 n_len × 沿高度 n_h 个面元
+    # (默认值与 4 倍细分相比误差 < 0.1%)
+    nx: int = 8
+    ny: int = 1
+    n_len: int = 30
+    n_h: int = 2
+
+
+def skin_depth(freq, sigma, mu_r):
+    """趋肤深度 δ = sqrt(2 / (ω μ σ))，单位 m (支持广播)"""
+    omega = 2 * np.pi * np.asarray(freq, dtype=float)
+    mu = MU0 * np.asarray(mu_r, dtype=float)
+    return np.sqrt(2.0 / (omega * mu * np.asarray(sigma, dtype=float)))
+
+
+def slab_factor(nu):
+    """Φ(ν) = (sinh ν - sin ν)/(cosh ν + cos ν)，ν 大时趋于 1 (截断避免溢出)"""
+    nu = np.minimum(np.asarray(nu, dtype=float), 40.0)
+    return (np.sinh(nu) - np.sin(nu)) / (np.cosh(nu) + np.cos(nu))
+
+
+def _filaments(geo: BusbarFrameGeometry, pitch: np.ndarray):
+    """(间距数, 导线数, 2) 导线坐标 (m) 和 (导线数,) 单位电流相量"""
+    fx = (np.arange(geo.nx) + 0.5) / geo.nx * geo.bus_w - geo.bus_w / 2
+    fy = (np.arange(geo.ny) + 0.5) / geo.ny * geo.bus_d - geo.bus_d / 2
+    gx, gy = np.meshgrid(fx, fy, indexing="ij")
+    gx, gy = gx.ravel(), gy.ravel()
+    per_bar = gx.size
+
+    offsets = np.array([-1.0, 0.0, 1.0])  # A/B/C 相位于 -Space / 0 / +Space
+    xs = np.tile(gx, 3)
+    ys = np.tile(gy, 3)[None, :] + np.repeat(offsets, per_bar)[None, :] * pitch[:, None]
+    pos = np.stack(np.broadcast_arrays(xs[None, :], ys), axis=-1) * 1e-3
+
+    phasor = np.exp(1j * np.deg2rad(np.repeat(PHASES_DEG, per_bar))) / per_bar
+    return pos, phasor
+
+
+def _panels(geo: BusbarFrameGeometry, xo: np.ndarray, yo: np.ndarray, th: np.ndarray):
+    """四面立壁中面的面元 -> (G, P, 2) 坐标, (G, P) 沿壁长度, (P,) 法向是否为 Y, (P,) Z
+
+    单位 m。面元顺序: 前 (+Y) / 后 (-Y) / 左 (-X) / 右 (+X)，每面 n_len × n_h。
+    """
+    t = (np.arange(geo.n_len) + 0.5) / geo.n_len * 2 - 1  # [-1, 1] 归一化位置
+    z = ((np.arange(geo.n_h) + 0.5) / geo.n_h - 0.5) * geo.flange
+    t, z = np.repeat(t, geo.n_h), np.tile(z, geo.n_len)
+
+    xm = (xo - th / 2)[:, None]  # 立壁中面
+    ym = (yo - th / 2)[:, None]
+    along_x = t[None, :] * xo[:, None]
+    along_y = t[None, :] * yo[:, None]
+    px = np.concatenate([along_x, along_x, -xm + 0 * t, xm + 0 * t], axis=1)
+    py = np.concatenate([ym + 0 * t, -ym + 0 * t, along_y, along_y], axis=1)
+    seg = np.concatenate([
+        np.repeat(2 * xo[:, None] / geo.n_len, 2 * t.size, axis=1),
+        np.repeat(2 * yo[:, None] / geo.n_len, 2 * t.size, axis=1),
+    ], axis=1)
+    normal_y = np.repeat([True, True, False, False], t.size)
+    return np.stack([px, py], axis=-1) * 1e-3, seg * 1e-3, normal_y, np.tile(z, 4) * 1e-3
+
+
+def incident_field(geo: BusbarFrameGeometry, pitch, xo, yo, th, pitch_index):
+    """每种几何在各面元处的入射场相量 (1 A 峰值) -> (G, P, 2) complex, 单位 T
+
+    pitch: (Np,) 间距; xo/yo/th: (G,) 框架尺寸; pitch_index: (G,) 对应的间距下标
+    """
+    fil, phasor = _filaments(geo, np.asarray(pitch, dtype=float))
+    pts, _, _, z = _panels(geo, xo, yo, th)
+    z1, z2 = -geo.bus_h / 2 * 1e-3, geo.bus_h / 2 * 1e-3
+    a = (z2 - z)[None, :, None]
+    b = (z1 - z)[None, :, None]
+
+    n_geo, n_pan, n_fil = pts.shape[0], pts.shape[1], fil.shape[1]
+    out = np.empty((n_geo, n_pan, 2), dtype=complex)
+    step = max(1, CHUNK_ELEMENTS // (n_pan * n_fil))
+    for s in range(0, n_geo, step):
+        p = pts[s:s + step]
+        f = fil[pitch_index[s:s + step]]
+        dx = p[:, :, None, 0] - f[:, None, :, 0]
+        dy = p[:, :, None, 1] - f[:, None, :, 1]
+        rho2 = dx * dx + dy * dy
+        # 有限长直导线: |B| = μ0 I / (4π ρ) · [a/√(ρ²+a²) - b/√(ρ²+b²)]，方向 ẑ × ρ
+        k = MU0 / (4 * np.pi) / rho2 * (a / np.sqrt(rho2 + a * a) - b / np.sqrt(rho2 + b * b))
+        out[s:s + step, :, 0] = (-dy * k) @ phasor
+        out[s:s + step, :, 1] = (dx * k) @ phasor
+    return out
+
+
+def screen_grid(
+    geo: BusbarFrameGeometry,
+    sigma: Sequence[float],
+    mu_r: Sequence[float],
+    pitch: Sequence[float],
+    gap: Sequence[float],
+    th: Sequence[float],
+    current: Sequence[float],
+    freq: float = 50.0,
+) -> np.ndarray:
+    """隔板损耗估算网格 (W)，形状 (材料, 间距, 间隙, 板厚, 电流)
+
+    sigma/mu_r 逐材料对应；电流为每相峰值 (与 Maxwell 涡流激励一致)。
+    """
+    sigma = np.asarray(sigma, dtype=float)
+    mu_r = np.asarray(mu_r, dtype=float)
+    pitch = np.asarray(pitch, dtype=float)
+    gap = np.asarray(gap, dtype=float)
+    th = np.asarray(th, dtype=float)
+    current = np.asarray(current, dtype=float)
+
+    # 几何组合 (间距, 间隙, 板厚) 展平为 G
+    ip, ig, it = (a.ravel() for a in np.meshgrid(
+        np.arange(pitch.size), np.arange(gap.size), np.arange(th.size), indexing="ij"))
+    xo = geo.bus_w / 2 + gap[ig] + geo.margin
+    yo = pitch[ip] + geo.bus_d / 2 + geo.margin
+    thg = th[it]
+
+    field = incident_field(geo, pitch, xo, yo, thg, ip)
+    _, seg, normal_y, _ = _panels(geo, xo, yo, thg)
+    # 法向 Y 的立壁 (前/后): 切向 = Bx, 法向 = By；左/右 相反
+    b_t2 = np.where(normal_y, np.abs(field[..., 0]) ** 2, np.abs(field[..., 1]) ** 2)
+    b_n2 = np.where(normal_y, np.abs(field[..., 1]) ** 2, np.abs(field[..., 0]) ** 2)
+    dz = geo.flange / geo.n_h * 1e-3
+    height = geo.flange * 1e-3
+
+    # 每种几何: Σ|B_t|²·面积 与 Σ|B_n|²·长度 (沿高度平均), 形状 (G,)
+    bt_area = (b_t2 * seg * dz).sum(axis=1)
+    bn_len = (b_n2 * seg).sum(axis=1) / geo.n_h
+
+    delta = skin_depth(freq, sigma, mu_r)[:, None]  # (M, 1)
+    sig = sigma[:, None]
+    thm = (thg * 1e-3)[None, :]
+    # 切向 H 连续: H_t = B_t/μ0；法向 B 连续: 板内 H_n = B_n/(μ0 μr)
+    p_t = bt_area[None, :] / MU0 ** 2 / (sig * delta) * slab_factor(thm / delta)
+    p_n = (
+        thm * bn_len[None, :] / (MU0 * mu_r[:, None]) ** 2
+        / (sig * delta) * slab_factor(height / delta)
+    )
+    per_amp2 = (p_t + p_n).reshape(sigma.size, pitch.size, gap.size, th.size)
+    return per_amp2[..., None] * current ** 2
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+face_cache.py - 面几何批量查询缓存 (一次 RunScript 取回全部面的中心/法向/面积)
+
+PyAEDT 的 obj.faces / f.center / f.normal / get_face_center 每个面、每个
+顶点都是一次独立的 gRPC/COM 往返，导入的开关柜模型有数百个母排面时，
+端面识别要几分钟。FaceGeometry 在桌面进程内用一个 IronPython 脚本遍历
+指定对象的全部面，结果写入一个文本文件，本地保存为 NumPy 数组:
+
+    ids      (N,)   面 ID
+    owner    (N,)   所属对象序号 (对应 objects)
+    centers  (N, 3) 面中心 (模型单位)
+    normals  (N, 3) 单位法向 (由面顶点求得, 只表示方向不区分正反;
+                    顶点不足 3 个的面, 如圆面/曲面, 为 NaN)
+    areas    (N,)   面积
+
+之后按坐标轴极值、目标坐标等选面都是数组运算，不再访问 AEDT。
+几何修改后需重新 query。RunScript 失败时退化为逐个面调用原生接口，结果一致。
+
+用法:
+    from aedt_common.face_cache import FaceGeometry
+
+    geo = FaceGeometry.query(m3d, ["Busbar_A", "Busbar_B"])
+    bottom, top = geo.end_faces("Busbar_A", axis="z")
+    fid = geo.nearest("Region", axis="x", value=0.0)
+"""
+
+import os
+import time
+import tempfile
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from aedt_common import CACHE_DIR
+
+Axis = Union[int, str]
+_AXES = {"x": 0, "y": 1, "z": 2}
+
+# 桌面内执行的查询脚本 (IronPython 2.7): 每个面一行, 制表符分隔
+_QUERY_FUNCS = '''
+def _vec(values):
+    return [float(v) for v in values]
+
+def _normal(fid):
+    try:
+        pts = [_vec(oEditor.GetVertexPosition(v)) for v in oEditor.GetVertexIDsFromFace(fid)]
+    except Exception:
+        return None
+    best, best_len = None, 0.0
+    p0 = pts[0] if pts else None
+    for i in range(1, len(pts)):
+        for j in range(i + 1, len(pts)):
+            a = [pts[i][k] - p0[k] for k in range(3)]
+            b = [pts[j][k] - p0[k] for k in range(3)]
+            n = [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+            length = (n[0] ** 2 + n[1] ** 2 + n[2] ** 2) ** 0.5
+            if length > best_len:
+                best, best_len = n, length
+    if best is None or best_len == 0.0:
+        return None
+    return [c / best_len for c in best]
+
+def _face_rows(obj):
+    rows = []
+    for fid in oEditor.GetFaceIDs(obj):
+        fid = int(fid)
+        center = _vec(oEditor.GetFaceCenter(fid))
+        try:
+            area = float(oEditor.GetFaceArea(fid))
+        except Exception:
+            area = float("nan")
+        normal = _normal(fid) or [float("nan")] * 3
+        rows.append([obj, fid] + center + [area] + normal)
+    return rows
+'''
+
+
+def _axis(axis: Axis) -> int:
+    return _AXES[axis.lower()] if isinstance(axis, str) else int(axis)
+
+
+class FaceGeometry:
+    """一组对象全部面的中心/法向/面积 (NumPy 数组)，按对象名选面"""
+
+    def __init__(self, objects: List[str], rows: Iterable[list]):
+        self.objects = list(objects)
+        index = {name: i for i, name in enumerate(self.objects)}
+        rows = [r for r in rows if r[0] in index]
+        self.ids = np.array([int(r[1]) for r in rows], dtype=np.int64)
+        self.owner = np.array([index[r[0]] for r in rows], dtype=np.int64)
+        data = np.array([r[2:9] for r in rows], dtype=float).reshape(len(rows), 7)
+        self.centers = data[:, 0:3]
+        self.areas = data[:, 3]
+        self.normals = data[:, 4:7]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    @classmethod
+    def query(cls, app, objects: Iterable, verbose: bool = True) -> "FaceGeometry":
+        """一次往返取回 objects (名称或对象) 全部面的几何"""
+        names = [getattr(o, "name", o) for o in objects]
+        t0 = time.perf_counter()
+        round_trips = 1
+        rows = cls._query_script(app, names)
+        if rows is None:
+            rows = cls._query_native(app, names)
+            round_trips = None
+        geo = cls(names, rows)
+        if verbose:
+            trips = "1 次往返" if round_trips else "逐面调用 (RunScript 不可用)"
+            print(
+                f"  [面缓存] {len(names)} 个对象 {len(geo)} 个面, {trips}, "
+                f"{time.perf_counter() - t0:.2f}s"
+            )
+        return geo
+
+    @staticmethod
+    def _query_script(app, names: List[str]) -> Optional[list]:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, script_path = tempfile.mkstemp(prefix="face_cache_", suffix=".py", dir=CACHE_DIR)
+        os.close(fd)
+        out_path = script_path[:-3] + ".tsv"
+        lines = [
+            "# -*- coding: utf-8 -*-",
+            "# 由 aedt_common.face_cache 生成",
+            "import ScriptEnv",
+            'ScriptEnv.Initialize("Ansoft.ElectronicsDesktop")',
+            f"oProject = oDesktop.SetActiveProject({app.project_name!r})",
+            f"oDesign = oProject.SetActiveDesign({app.design_name!r})",
+            'oEditor = oDesign.SetActiveEditor("3D Modeler")',
+            _QUERY_FUNCS,
+            f"f = open({out_path!r}, 'w')",
+            f"for obj in {names!r}:",
+            "    for row in _face_rows(obj):",
+            "        f.write('\\t'.join([str(v) for v in row]) + '\\n')",
+            "f.close()",
+        ]
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        try:
+            app.odesktop.RunScript(script_path)
+            with open(out_path, "r", encoding="utf-8", errors="ignore") as f:
+                rows = [line.rstrip("\n").split("\t") for line in f if line.strip()]
+            return [[r[0], int(r[1])] + [float(v) for v in r[2:9]] for r in rows]
+        except Exception as e:
+            print(f"  [WARN] 面几何批量查询失败, 改为逐面调用: {e}")
+            return None
+        finally:
+            for path in (script_path, out_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _query_native(app, names: List[str]) -> list:
+        """逐面调用原生接口 (与脚本相同的计算)"""
+        namespace = {"oEditor": app.modeler.oeditor}
+        exec(_QUERY_FUNCS, namespace)
+        rows = []
+        for name in names:
+            try:
+                rows.extend(namespace["_face_rows"](name))
+            except Exception as e:
+                print(f"  [WARN] 读取 {name} 的面失败: {e}")
+        return rows
+
+    # ------------------------------------------------------------------
+    # 选面 (数组运算)
+    # ------------------------------------------------------------------
+    def _mask(self, obj) -> np.ndarray:
+        name = getattr(obj, "name", obj)
+        if name not in self.objects:
+            return np.zeros(len(self.ids), dtype=bool)
+        return self.owner == self.objects.index(name)
+
+    def faces(self, obj) -> np.ndarray:
+        return self.ids[self._mask(obj)]
+
+    def center(self, face_id: int) -> Optional[np.ndarray]:
+        hit = np.flatnonzero(self.ids == int(face_id))
+        return self.centers[hit[0]] if hit.size else None
+
+    def aligned(self, obj, axis: Axis, tol: float = 0.9) -> np.ndarray:
+        """法向与坐标轴夹角 cos > tol 的面掩码 (只在 obj 的面中)"""
+        with np.errstate(invalid="ignore"):
+            return self._mask(obj) & (np.abs(self.normals[:, _axis(axis)]) > tol)
+
+    def extreme(self, obj, axis: Axis, pick: str = "max", aligned: Optional[float] = None) -> Optional[int]:
+        """obj 的面中心在 axis 方向最大 (pick="max") / 最小的面 ID
+
+        aligned 不为 None 时优先在法向与 axis 对齐的面中选，没有对齐面时退回全部面。
+        """
+        mask = self._mask(obj)
+        if aligned is not None:
+            near = self.aligned(obj, axis, aligned)
+            mask = near if near.any() else mask
+        idx = np.flatnonzero(mask)
+        if not idx.size:
+            return None
+        values = self.centers[idx, _axis(axis)]
+        best = idx[np.argmax(values) if pick == "max" else np.argmin(values)]
+        return int(self.ids[best])
+
+    def end_faces(self, obj, axis: Axis, aligned: float = 0.9) -> Tuple[Optional[int], Optional[int]]:
+        """沿 axis 两端的面 (最小, 最大)，优先法向对齐的面"""
+        return (
+            self.extreme(obj, axis, "min", aligned=aligned),
+            self.extreme(obj, axis, "max", aligned=aligned),
+        )
+
+    def nearest(self, obj, axis: Axis, value: float, tol: Optional[float] = None) -> Optional[int]:
+        """面中心 axis 坐标最接近 value 的面 ID; 给定 tol 时超出容差返回 None"""
+        idx = np.flatnonzero(self._mask(obj))
+        if not idx.size:
+            return None
+        dist = np.abs(self.centers[idx, _axis(axis)] - value)
+        best = int(np.argmin(dist))
+        if tol is not None and dist[best] > tol:
+            return None
+        return int(self.ids[idx[best]])
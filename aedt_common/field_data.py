@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+field_data.py - AEDT 场数据文本文件 (.fld) 的分块读取与写出
+
+export_field_file_on_grid / export_field_file 导出的 .fld 开头是若干行表头
+(Grid Output Min/Max/Size、物理量名等)，之后每个采样点一行:
+
+    x y z v              标量
+    x y z vx vy vz       矢量
+
+坐标为 SI 单位 (m)。全柜体细网格的场文件可达数 GB，iter_field_file 按块
+(默认 50 万行) 返回 NumPy 数组，内存占用与文件大小无关。
+
+用法:
+    from aedt_common.field_data import iter_field_file, write_field_file
+
+    for block in iter_field_file("Mag_E.fld"):     # (rows, 4) / (rows, 6)
+        ...
+"""
+
+import itertools
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+CHUNK_ROWS = 500_000
+HEADER_PROBE = 20  # 表头最多行数
+
+
+def _is_data(line: str) -> bool:
+    tokens = line.split()
+    if not tokens:
+        return False
+    try:
+        [float(t) for t in tokens]
+    except ValueError:
+        return False
+    return True
+
+
+def read_header(path: str) -> List[str]:
+    """文件开头的非数据行"""
+    header = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in itertools.islice(f, HEADER_PROBE):
+            if _is_data(line):
+                break
+            header.append(line.rstrip("\n"))
+    return header
+
+
+def iter_field_file(path: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[np.ndarray]:
+    """逐块读取数据行 -> (rows, 列数) float64 数组"""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        first = None
+        for line in itertools.islice(f, HEADER_PROBE):
+            if _is_data(line):
+                first = line
+                break
+        if first is None:
+            raise ValueError(f"{path}: 前 {HEADER_PROBE} 行内没有数据")
+        lines = itertools.chain([first], f)
+        while True:
+            chunk = list(itertools.islice(lines, chunk_rows))
+            if not chunk:
+                return
+            block = np.loadtxt(chunk, dtype=float, ndmin=2)
+            if block.size:
+                yield block
+
+
+def read_field_file(path: str, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    """读取整个文件 (小文件; 大文件请用 iter_field_file)"""
+    blocks = list(iter_field_file(path, chunk_rows))
+    return np.vstack(blocks) if blocks else np.empty((0, 0))
+
+
+def write_field_file(
+    path: str,
+    points,
+    values,
+    quantity: str = "Mag_E",
+    header: Optional[List[str]] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> str:
+    """按 .fld 的列格式写出 (points: (N, 3) m; values: (N,) 或 (N, 3))"""
+    points = np.asarray(points)
+    values = np.asarray(values)
+    values = values.reshape(len(points), -1)
+    kind = "Scalar" if values.shape[1] == 1 else "Vector"
+    with open(path, "w", encoding="utf-8") as f:
+        for line in header or [f'{kind} data "{quantity}"']:
+            f.write(line + "\n")
+        for start in range(0, len(points), chunk_rows):
+            stop = start + chunk_rows
+            np.savetxt(f, np.hstack([points[start:stop], values[start:stop]]), fmt="%.9g")
+    return path
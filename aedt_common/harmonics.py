@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+harmonics.py - 谐波电流下的涡流损耗 (单 Setup 离散频率扫描 + 频谱加权)
+
+变频器馈线电流含 5/7/11/13 次等谐波。涡流场是线性问题 (μr 取等效常数)，
+各次谐波的损耗可以分别求解再叠加:
+
+    P = Σ_h  P_sim(h·f1) · (I_h / I_sim)²
+
+P_sim(f) 为激励幅值 I_sim 时频率 f 下的 SolidLoss。Setup1 在基波频率做
+自适应剖分，附加的离散频率点直接复用自适应网格求解 (不再加密)，
+一个 Setup 即可得到全部谐波的 P_sim。
+
+三相平衡谐波的相序: h ≡ 1 (mod 3) 正序, h ≡ 2 (mod 3) 负序, 3 的倍数为零序。
+正/负序互为复共轭激励, 时间平均损耗相同; 零序 (三相同相) 的磁场分布不同,
+用正序激励求得的损耗只能作为估计, 读取时会给出警告。
+
+频谱 CSV (表头必需, 列名不区分大小写):
+    order,amplitude_a        # 各次谐波电流峰值 A
+    order,rms_a              # 有效值 A (×√2 换算为峰值)
+    order,percent            # 基波的百分比 (基波幅值取仿真激励幅值)
+
+用法:
+    from aedt_common.harmonics import add_harmonic_sweep, combine_losses, load_spectrum
+
+    add_harmonic_sweep(setup, harmonic_frequencies(50, [1, 5, 7, 11, 13]))
+    spectrum = load_spectrum("vfd_spectrum.csv", fundamental_a=4000)
+    rows, total = combine_losses({50: 685.0, 250: 90.1}, spectrum, 50, 4000)
+"""
+
+import csv
+import math
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_ORDERS = (1, 5, 7, 11, 13)
+# 损耗按频率匹配谐波次数时的相对容差
+FREQUENCY_TOLERANCE = 1e-3
+
+
+def parse_orders(text: str) -> List[int]:
+    """ "1,5,7,11,13" -> [1, 5, 7, 11, 13] (去重排序, 总是包含基波)"""
+    orders = {int(v) for v in str(text).split(",") if v.strip()}
+    if any(h < 1 for h in orders):
+        raise ValueError(f"谐波次数必须为正整数: {text}")
+    return sorted(orders | {1})
+
+
+def sequence(order: int) -> str:
+    """三相平衡谐波的相序: "+" 正序, "-" 负序, "0" 零序"""
+    return {1: "+", 2: "-", 0: "0"}[order % 3]
+
+
+def harmonic_frequencies(fundamental_hz: float, orders: Iterable[int]) -> List[float]:
+    return [fundamental_hz * h for h in sorted(set(orders))]
+
+
+def load_spectrum(path: str, fundamental_a: float) -> Dict[int, float]:
+    """读取谐波频谱 CSV -> {次数: 电流峰值 A}
+
+    percent 列以 fundamental_a (仿真激励幅值) 为基波; 缺少基波行时补
+    fundamental_a (百分比格式) 或报错 (绝对值格式)。
+    """
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        if "order" not in fields:
+            raise ValueError(f"{path}: 缺少 order 列")
+        for column, scale in (("amplitude_a", 1.0), ("rms_a", math.sqrt(2)), ("percent", None)):
+            if column in fields:
+                break
+        else:
+            raise ValueError(f"{path}: 需要 amplitude_a / rms_a / percent 列之一")
+
+        spectrum = {}
+        for row in reader:
+            order_text = (row.get(fields["order"]) or "").strip()
+            value_text = (row.get(fields[column]) or "").strip()
+            if not order_text or not value_text:
+                continue
+            value = float(value_text)
+            order = int(float(order_text))
+            spectrum[order] = value * scale if scale else value / 100.0 * fundamental_a
+
+    if 1 not in spectrum:
+        if column != "percent":
+            raise ValueError(f"{path}: 绝对幅值频谱缺少基波 (order=1) 行")
+        spectrum[1] = fundamental_a
+    return dict(sorted(spectrum.items()))
+
+
+def add_harmonic_sweep(setup, frequencies_hz: Iterable[float], save_fields: bool = False):
+    """在涡流 Setup 上追加离散频率点 (SinglePoints)，自适应仍在 Setup 频率进行
+
+    直接写 Setup props: 各版本 PyAEDT 的 add_eddy_current_sweep 对单点扫描
+    支持不一, props 结构 (HasSweepSetup / SweepRanges.Subrange) 在各版本一致。
+    save_fields=True 时保存每个频率点的场 (表面损耗等 Fields 表达式需要)。
+    """
+    subranges = [
+        {
+            "RangeType": "SinglePoints",
+            "RangeStart": f"{f:g}Hz",
+            "RangeEnd": f"{f:g}Hz",
+            "SaveSingleField": bool(save_fields),
+        }
+        for f in sorted(set(frequencies_hz))
+    ]
+    setup.props["HasSweepSetup"] = True
+    setup.props["SweepRanges"] = {"Subrange": subranges}
+    setup.props["SaveAllFields"] = bool(save_fields)
+    return setup.update()
+
+
+def clear_harmonic_sweep(setup):
+    """关闭频率扫描 (恢复单频求解)"""
+    if setup.props.get("HasSweepSetup"):
+        setup.props["HasSweepSetup"] = False
+        return setup.update()
+    return True
+
+
+def combine_losses(
+    losses_by_freq: Dict[float, float],
+    spectrum: Dict[int, float],
+    fundamental_hz: float,
+    sim_amplitude_a: float,
+) -> Tuple[List[dict], float]:
+    """按频谱加权各频率点的损耗 -> (逐次谐波明细, 总损耗 W)
+
+    losses_by_freq 为激励幅值 sim_amplitude_a 下各频率的损耗;
+    频谱中没有对应频率解的谐波记为 loss_W=None 并跳过 (打印警告)。
+    """
+    freqs = sorted(losses_by_freq)
+    rows = []
+    total = 0.0
+    for order, amplitude in sorted(spectrum.items()):
+        target = order * fundamental_hz
+        match = next(
+            (f for f in freqs if abs(f - target) <= FREQUENCY_TOLERANCE * target), None
+        )
+        row = {
+            "order": order,
+            "frequency_Hz": target,
+            "sequence": sequence(order),
+            "amplitude_A": amplitude,
+            "loss_at_sim_W": None,
+            "loss_W": None,
+        }
+        if match is None:
+            print(f"  [WARN] {order} 次谐波 ({target:g}Hz) 没有频率扫描结果, 未计入")
+        else:
+            sim_loss = float(losses_by_freq[match])
+            row["loss_at_sim_W"] = sim_loss
+            row["loss_W"] = sim_loss * (amplitude / sim_amplitude_a) ** 2
+            total += row["loss_W"]
+            if row["sequence"] == "0":
+                print(f"  [WARN] {order} 次谐波为零序, 按正序激励的损耗估计")
+        rows.append(row)
+    for row in rows:
+        row["share_pct"] = row["loss_W"] / total * 100 if total and row["loss_W"] is not None else None
+    return rows, total
+
+
+def write_spectrum_csv(path: str, rows: List[dict], columns: Iterable[str] = None) -> None:
+    """逐次谐波损耗明细写入 CSV"""
+    columns = list(columns or rows[0].keys()) if rows else []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ("" if row.get(k) is None else row.get(k)) for k in columns})
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+impedance.py - 高磁导率钢板的阻抗边界 (表面阻抗) 模型
+
+趋肤深度远小于板厚时，涡流只存在于表层，把钢板当实体剖分会让表层网格
+成为整个模型的主要网格量。阻抗边界模式:
+
+  - 对象设为不求解内部 (Solve Inside = False)，内部不参与剖分
+  - 对象表面施加 Impedance 边界 (电导率 / 相对磁导率)
+  - 损耗由表面损耗密度在对象表面积分，定义为命名表达式
+    SurfaceLoss_<对象名> (Fields 报告类别)，代替实体的 SolidLoss(<对象名>)
+
+只在 板厚 / δ > SKIN_RATIO 时适用 (与 mesh_planner 的趋肤层网格判据相同)，
+场穿透整个板厚的材料 (如不锈钢) 仍按实体建模。
+
+用法:
+    from aedt_common.impedance import assign_impedance, impedance_applies, add_surface_loss
+
+    if impedance_applies(3.0, "50Hz", 4.032e6, 4000):
+        assign_impedance(m3d, ["Plate_Frame"], 4000, 4.032e6, "Imp_Plate_Frame")
+        add_surface_loss(m3d, "Plate_Frame")
+"""
+
+from typing import Iterable
+
+from aedt_common.mesh_planner import SKIN_RATIO, skin_depth_mm
+
+PLATE_MODELS = ("solid", "impedance")
+SURFACE_LOSS_PREFIX = "SurfaceLoss_"
+
+
+def impedance_applies(thickness_mm: float, frequency, conductivity: float, permeability: float) -> bool:
+    """板厚是否足以把该材料当作表面阻抗 (厚度 > SKIN_RATIO·δ)"""
+    return thickness_mm > SKIN_RATIO * skin_depth_mm(frequency, conductivity, permeability)
+
+
+def surface_loss_name(obj: str) -> str:
+    return SURFACE_LOSS_PREFIX + obj
+
+
+def assign_impedance(app, objects, permeability, conductivity, name: str):
+    """在对象全部表面施加 Impedance 边界
+
+    按位置传参: 新旧 PyAEDT 参数名不同，但顺序一致
+    (对象, 材料名, 相对磁导率, 电导率, 非线性磁导率, 名称)。
+    permeability/conductivity 可以是数值或变量表达式。
+    """
+    return app.assign_impedance(list(objects), None, permeability, conductivity, False, name)
+
+
+def add_surface_loss(app, obj: str) -> str:
+    """定义命名表达式 SurfaceLoss_<对象> = ∫ SurfaceLossDensity dS (W)，返回表达式名"""
+    name = surface_loss_name(obj)
+    fields = app.ofieldsreporter
+    try:
+        if fields.DoesNamedExpressionExists(name):
+            fields.DeleteNamedExpr(name)
+    except Exception:
+        pass
+    fields.CalcStack("clear")
+    fields.EnterQty("SurfaceLossDensity")
+    fields.EnterSurf(obj)
+    fields.CalcOp("Integrate")
+    fields.AddNamedExpression(name, "Fields")
+    return name
+
+
+def add_surface_losses(app, objects: Iterable[str]) -> list:
+    """逐个对象定义表面损耗表达式，失败的对象打印警告并跳过"""
+    names = []
+    for obj in objects:
+        try:
+            names.append(add_surface_loss(app, obj))
+        except Exception as e:
+            print(f"  [WARN] {obj} 表面损耗表达式定义失败: {e}")
+    return names
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+incremental.py - 按参数哈希增量重建设计
+
+脚本把建模输入分成几段 (几何+材料+网格 / 激励 / Setup)，每段算一个
+哈希，按 (工程文件, 设计) 保存在缓存目录的 build_state.json 中。再次运行时:
+
+  - 几何哈希未变: 保留现有对象、网格操作和自适应网格，跳过建模
+  - 只有激励或 Setup 变化: 只重建对应部分
+  - 几何变化 (或没有记录): 与原来一样全部重建
+
+哈希不能存成设计变量: 设计变量属于变化 (variation) 的键，哈希一变就会
+产生新的名义变化，原有的自适应网格和解随之失效。
+
+用法:
+    from aedt_common.incremental import BuildState
+
+    build = BuildState(m3d, {"geometry": {...}, "excitation": {...}, "setup": {...}})
+    if not build.unchanged("geometry"):
+        ...  # 清空并重建几何
+    ...
+    build.commit()   # 全部完成后写回哈希
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, List
+
+from aedt_common import CACHE_DIR
+
+STATE_FILE = os.path.join(CACHE_DIR, "build_state.json")
+
+
+def parameter_hash(data) -> str:
+    """参数 (dict/list/数值) 的稳定哈希"""
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def design_key(app) -> str:
+    """记录的键: 工程文件绝对路径 (未保存时为工程名) + 设计名"""
+    project = getattr(app, "project_file", None) or getattr(app, "project_name", "")
+    if project and os.path.isabs(str(project)):
+        project = os.path.normcase(os.path.normpath(project))
+    return f"{project}::{getattr(app, 'design_name', '')}"
+
+
+def _load_state(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class BuildState:
+    """(工程, 设计) 记录的分段参数哈希"""
+
+    def __init__(self, app, sections: Dict[str, object], enabled: bool = True, path: str = STATE_FILE):
+        self.app = app
+        self.enabled = enabled
+        self.path = path
+        self.key = design_key(app)
+        self.hashes = {name: parameter_hash(data) for name, data in sections.items()}
+        self.stored = self._read() if enabled else {}
+
+    def _read(self) -> Dict[str, str]:
+        entry = _load_state(self.path).get(self.key, {})
+        return {name: entry[name] for name in self.hashes if isinstance(entry.get(name), str)}
+
+    def unchanged(self, section: str) -> bool:
+        """该段参数与记录的相同 (未启用增量模式时总是 False)"""
+        return self.enabled and self.stored.get(section) == self.hashes[section]
+
+    def changed(self) -> List[str]:
+        return [name for name in self.hashes if not self.unchanged(name)]
+
+    def report(self) -> None:
+        if not self.enabled:
+            return
+        if not self.stored:
+            print("  [增量] 没有该设计的参数哈希记录，完整重建")
+            return
+        for name, value in self.hashes.items():
+            status = "未变化, 复用" if self.unchanged(name) else "已变化, 重建"
+            print(f"  [增量] {name}: {status} ({value})")
+
+    def commit(self) -> None:
+        """把当前哈希写回记录文件 (不修改设计)"""
+        if self.stored == self.hashes:
+            return
+        state = _load_state(self.path)
+        state[self.key] = dict(self.hashes)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=1, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"  [WARN] 无法保存参数哈希 {self.path}: {e}")
+            return
+        self.stored = dict(self.hashes)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+loss_table.py - 一次查询读取全部对象的损耗 (SolidLoss) 及收敛信息
+
+逐个对象调用 get_solution_data 时，每个表达式都是一次报告求值往返，
+报告生成时间随模型对象数线性增长。query_losses 从 solid_names 得到对象
+列表，把 SolidLoss 与全部 SolidLoss(<对象>) 放进同一次 get_solution_data，
+结果保存为 NumPy 数组:
+
+    table = query_losses(m3d)
+    table.total                  # SolidLoss (W)
+    table["Plate_Frame"]         # 单个对象
+    table.sum(prefix="Busbar_")  # 按名称前缀求和
+    table.convergence            # read_convergence 的逐 pass 信息
+
+不求解内部的对象 (阻抗边界) 的 SolidLoss 为 0，若定义了表面损耗表达式
+SurfaceLoss_<对象> (见 aedt_common.impedance)，再用一次 Fields 类别查询
+补上这些对象，并计入总损耗。
+
+用法:
+    from aedt_common.loss_table import query_losses
+
+    table = query_losses(m3d, solution="Setup1 : LastAdaptive")
+    table.print()
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from aedt_common.convergence import read_convergence
+from aedt_common.impedance import surface_loss_name
+
+TOTAL_EXPRESSION = "SolidLoss"
+EXCLUDED_OBJECTS = ("Region",)
+
+
+def solid_loss_name(obj: str) -> str:
+    return f"{TOTAL_EXPRESSION}({obj})"
+
+
+class LossTable:
+    """对象名 -> 损耗 (W) 的数组表, 附总损耗/表面损耗标记/收敛信息"""
+
+    def __init__(
+        self,
+        names: List[str],
+        losses,
+        total: float,
+        surface=None,
+        solution: str = "",
+        convergence: Optional[List[dict]] = None,
+    ):
+        self.names = list(names)
+        self.losses = np.asarray(losses, dtype=float).reshape(len(self.names))
+        self.surface = (
+            np.zeros(len(self.names), dtype=bool) if surface is None
+            else np.asarray(surface, dtype=bool)
+        )
+        self.total = float(total)
+        self.solution = solution
+        self.convergence = convergence or []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def __getitem__(self, name: str) -> float:
+        return float(self.losses[self.names.index(name)])
+
+    def get(self, name: str, default: float = 0.0) -> float:
+        return self[name] if name in self.names else default
+
+    def sum(self, prefix: str = "") -> float:
+        mask = np.array([n.startswith(prefix) for n in self.names], dtype=bool)
+        return float(self.losses[mask].sum()) if mask.size else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {n: float(v) for n, v in zip(self.names, self.losses)}
+
+    @property
+    def passes(self) -> int:
+        return len(self.convergence)
+
+    @property
+    def energy_error(self) -> Optional[float]:
+        return self.convergence[-1]["energy_error"] if self.convergence else None
+
+    def print(self, indent: str = "    ") -> None:
+        order = np.argsort(-self.losses)
+        for i in order:
+            share = self.losses[i] / self.total * 100 if self.total else 0.0
+            tag = " (表面损耗)" if self.surface[i] else ""
+            print(f"{indent}{self.names[i]:<24}{self.losses[i]:>14.4f} W {share:>6.1f}%{tag}")
+        if self.convergence:
+            error = self.energy_error
+            print(
+                f"{indent}收敛: {self.passes} 个 pass, "
+                f"四面体 {self.convergence[-1]['tetrahedra']}"
+                + (f", 能量误差 {error:g}%" if error is not None else "")
+            )
+
+
+def _values(data, expressions: List[str]) -> np.ndarray:
+    """每个表达式取第一个扫描点 (有频率扫描时为基波)"""
+    values = []
+    for expr in expressions:
+        try:
+            series = data.data_real(expr)
+            values.append(float(series[0]) if len(series) else np.nan)
+        except Exception:
+            values.append(np.nan)
+    return np.array(values, dtype=float)
+
+
+def _query(app, expressions: List[str], solution: str, category: str) -> np.ndarray:
+    data = app.post.get_solution_data(
+        expressions=expressions,
+        setup_sweep_name=solution,
+        report_category=category,
+    )
+    if not data:
+        raise RuntimeError(f"{solution} 没有 {category} 结果")
+    return _values(data, expressions)
+
+
+def _surface_losses(app, objects: List[str], solution: str) -> np.ndarray:
+    """objects 的表面损耗表达式 (未定义的为 NaN)
+
+    先整体查询一次; 有对象没有定义表达式导致查询失败时，只查询已定义的。
+    """
+    expressions = [surface_loss_name(n) for n in objects]
+    try:
+        return _query(app, expressions, solution, "Fields")
+    except Exception:
+        pass
+    values = np.full(len(objects), np.nan)
+    try:
+        fields = app.ofieldsreporter
+        defined = [i for i, e in enumerate(expressions) if fields.DoesNamedExpressionExists(e)]
+        if defined:
+            values[defined] = _query(app, [expressions[i] for i in defined], solution, "Fields")
+    except Exception:
+        pass  # 没有表面损耗表达式
+    return values
+
+
+def query_losses(
+    app,
+    objects: Optional[Iterable[str]] = None,
+    solution: str = "Setup1 : LastAdaptive",
+    category: str = "EddyCurrent",
+    convergence: bool = True,
+) -> LossTable:
+    """一次查询读取总损耗和每个对象的 SolidLoss
+
+    objects 默认取 solid_names 中除 Region 外的全部实体。
+    """
+    if objects is None:
+        objects = [n for n in app.modeler.solid_names if n not in EXCLUDED_OBJECTS]
+    names = list(objects)
+    values = _query(app, [TOTAL_EXPRESSION] + [solid_loss_name(n) for n in names], solution, category)
+    total, losses = values[0], values[1:]
+    if np.isnan(total):
+        raise RuntimeError(f"{solution} 没有 {TOTAL_EXPRESSION} 结果")
+
+    # 损耗为 0 的对象可能是阻抗边界 (不求解内部): 一次 Fields 查询补表面损耗
+    surface = np.zeros(len(names), dtype=bool)
+    zero = np.flatnonzero(~(losses > 0))
+    if zero.size:
+        extra = _surface_losses(app, [names[i] for i in zero], solution)
+        found = ~np.isnan(extra)
+        losses[zero[found]] = extra[found]
+        surface[zero[found]] = True
+        total += float(extra[found].sum())
+    losses = np.nan_to_num(losses)
+
+    setup = solution.split(":")[0].strip()
+    return LossTable(
+        names, losses, total, surface, solution,
+        read_convergence(app, setup) if convergence else None,
+    )
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+mesh_planner.py - 按趋肤深度自动规划涡流场网格操作
+
+固定长度网格 (如 Mesh_Frame 30mm) 对铁磁钢板 (δ≈0.56mm @50Hz) 远大于
+趋肤深度，自适应加密要花好几个 pass 才能重新找到表面电流层。规划器按每组
+导体的材料与频率计算 δ，与导体特征厚度比较后决定:
+
+  - 厚度 / δ > SKIN_RATIO (场只存在于表层): 趋肤深度层网格
+      层深 = min(LAYER_DEPTH_FACTOR·δ, 厚度/2)，层数使每层约 δ/2，
+      表面三角形边长 = max(SURFACE_DELTA_FACTOR·δ, 厚度)，不超过固定长度
+  - 否则 (场穿透整个截面): 长度网格，边长 = min(δ, 固定长度)，不小于厚度
+
+用法:
+    from aedt_common.mesh_planner import apply_mesh_plan, plan_mesh, print_mesh_plan
+
+    plans = plan_mesh(
+        [{"name": "Mesh_Frame", "objects": ["Plate_Frame"], "conductivity": 4.032e6,
+          "permeability": 4000, "thickness": 3.0, "fixed_length": 30.0}],
+        frequency="50Hz",
+    )
+    print_mesh_plan(plans)
+    apply_mesh_plan(m3d, plans)
+"""
+
+import math
+from typing import List
+
+MU0 = 4e-7 * math.pi
+
+SKIN_RATIO = 2.0  # 厚度超过 2δ 才使用趋肤层网格
+LAYER_DEPTH_FACTOR = 2.0  # 层网格覆盖 2δ (约 86% 的电流)
+MAX_LAYERS = 4
+SURFACE_DELTA_FACTOR = 4.0
+DEFAULT_MAX_ELEMENTS = 100000  # 每个趋肤层网格操作的单元上限, 防止大面积钢板网格爆炸
+
+# 材料库中常用导体的 (电导率 S/m, 相对磁导率)；非线性钢材取 50Hz 下的等效 μr
+LIBRARY_MATERIALS = {
+    "copper": (5.8e7, 1.0),
+    "aluminum": (3.8e7, 1.0),
+    "steel_1008": (2.0e6, 1000.0),
+    "steel_stainless": (1.1e6, 1.0),
+}
+
+
+def parse_frequency(frequency) -> float:
+    """ "50Hz" / "1kHz" / 50 -> Hz"""
+    if isinstance(frequency, (int, float)):
+        return float(frequency)
+    text = str(frequency).strip().lower()
+    for suffix, scale in (("ghz", 1e9), ("mhz", 1e6), ("khz", 1e3), ("hz", 1.0)):
+        if text.endswith(suffix):
+            return float(text[: -len(suffix)]) * scale
+    return float(text)
+
+
+def skin_depth_mm(frequency, conductivity: float, permeability: float) -> float:
+    """δ = sqrt(2 / (ω μ0 μr σ))，单位 mm"""
+    omega = 2 * math.pi * parse_frequency(frequency)
+    return math.sqrt(2.0 / (omega * MU0 * permeability * conductivity)) * 1e3
+
+
+def plan_mesh(groups: List[dict], frequency, max_elements: int = DEFAULT_MAX_ELEMENTS) -> List[dict]:
+    """每组导体 -> 一个网格操作计划
+
+    groups 中每项: name, objects, conductivity, permeability,
+    thickness (特征厚度 mm, 板厚/母排厚度), fixed_length (原固定边长 mm)。
+    """
+    plans = []
+    for g in groups:
+        delta = skin_depth_mm(frequency, g["conductivity"], g["permeability"])
+        thickness = float(g["thickness"])
+        fixed = float(g["fixed_length"])
+        plan = {
+            "name": g["name"],
+            "objects": list(g["objects"]),
+            "delta_mm": round(delta, 4),
+            "thickness_mm": thickness,
+        }
+        if thickness / delta > SKIN_RATIO:
+            depth = min(LAYER_DEPTH_FACTOR * delta, thickness / 2)
+            plan.update({
+                "kind": "skin",
+                "skin_depth_mm": round(depth, 4),
+                "layers": max(1, min(MAX_LAYERS, math.ceil(depth / (delta / 2)))),
+                "triangle_mm": round(min(fixed, max(SURFACE_DELTA_FACTOR * delta, thickness)), 4),
+                "max_elements": max_elements,
+            })
+        else:
+            plan.update({
+                "kind": "length",
+                "max_length_mm": round(max(thickness, min(delta, fixed)), 4),
+            })
+        plans.append(plan)
+    return plans
+
+
+def fixed_plan(groups: List[dict]) -> List[dict]:
+    """原固定长度设置 (对比基准)"""
+    return [
+        {
+            "name": g["name"],
+            "objects": list(g["objects"]),
+            "kind": "length",
+            "max_length_mm": float(g["fixed_length"]),
+        }
+        for g in groups
+    ]
+
+
+def print_mesh_plan(plans: List[dict], indent: str = "  ") -> None:
+    for p in plans:
+        objs = ", ".join(p["objects"][:3]) + (" ..." if len(p["objects"]) > 3 else "")
+        delta = f"δ={p['delta_mm']:.3g}mm, " if "delta_mm" in p else ""
+        if p["kind"] == "skin":
+            print(
+                f"{indent}{p['name']}: {delta}趋肤层 {p['layers']} 层 / {p['skin_depth_mm']:.3g}mm, "
+                f"表面边长 {p['triangle_mm']:.3g}mm ({objs})"
+            )
+        else:
+            print(f"{indent}{p['name']}: {delta}长度网格 {p['max_length_mm']:.3g}mm ({objs})")
+
+
+def apply_mesh_plan(app, plans: List[dict]) -> List[str]:
+    """按计划创建网格操作，返回成功创建的操作名
+
+    assign_skin_depth 按位置传参: 新旧 PyAEDT 的参数名不同，但顺序一致
+    (对象, 层深, 最大单元数, 表面三角形边长, 层数, 名称)。
+    """
+    created = []
+    for p in plans:
+        try:
+            if p["kind"] == "skin":
+                app.mesh.assign_skin_depth(
+                    p["objects"],
+                    f"{p['skin_depth_mm']}mm",
+                    p["max_elements"],
+                    f"{p['triangle_mm']}mm",
+                    str(p["layers"]),
+                    p["name"],
+                )
+            else:
+                app.mesh.assign_length_mesh(
+                    p["objects"], maximum_length=f"{p['max_length_mm']}mm", name=p["name"]
+                )
+            created.append(p["name"])
+        except Exception as e:
+            print(f"  [WARN] 网格操作 {p['name']} 创建失败: {e}")
+    return created
+
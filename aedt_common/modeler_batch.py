@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+"""
+modeler_batch.py - 建模命令批处理 (一次 RunScript 完成整段几何)
+
+PyAEDT 的每个 create_box / rotate / subtract / .color= / m3d[k]=v 都是一次
+独立的 gRPC/COM 往返。ModelerBatch 提供与 PyAEDT modeler 同名的常用方法，
+只在本地记录对应的 oEditor 原生数组命令，flush() 时生成一个 IronPython
+脚本，通过 oDesktop.RunScript 在桌面进程内一次执行完。
+
+用法:
+    from aedt_common.modeler_batch import ModelerBatch
+
+    batch = ModelerBatch(m3d)
+    batch.set_variables({"Bus_W": "120mm"})
+    bus = batch.create_box([0, 0, 0], [120, 10, 600], name="Busbar_A", material="copper")
+    batch.set_properties(bus, color=(255, 0, 0))
+    batch.flush()           # 1 次往返; 之后 m3d.modeler["Busbar_A"] 可用
+
+RunScript 失败时 (例如桌面不允许运行脚本)，从脚本中断处开始逐条调用
+同样的原生命令，几何结果一致，只是退化为逐条往返。
+"""
+
+import os
+import time
+import tempfile
+from typing import Dict, List, Optional, Sequence, Union
+
+from aedt_common import CACHE_DIR
+
+Number = Union[int, float]
+
+# PyAEDT Material 属性名 -> AddMaterial/EditMaterial 原生键
+MATERIAL_KEYS = {
+    "permittivity": "permittivity",
+    "dielectric_permittivity": "permittivity",
+    "permeability": "permeability",
+    "conductivity": "conductivity",
+    "dielectric_loss_tangent": "dielectric_loss_tangent",
+    "magnetic_loss_tangent": "magnetic_loss_tangent",
+    "mass_density": "mass_density",
+    "thermal_conductivity": "thermal_conductivity",
+    "specific_heat": "specific_heat",
+    "youngs_modulus": "youngs_modulus",
+    "poissons_ratio": "poissons_ratio",
+    "thermal_expansion_coefficient": "thermal_expansion_coefficient",
+}
+
+
+def _names(assignment) -> List[str]:
+    """对象/名称/列表统一转为名称列表"""
+    if isinstance(assignment, (list, tuple)):
+        items = assignment
+    else:
+        items = [assignment]
+    return [getattr(item, "name", item) for item in items]
+
+
+class _Op:
+    """一条原生命令: target.method(*args)，calls 为其替代的 PyAEDT 调用次数"""
+
+    __slots__ = ("target", "method", "args", "calls")
+
+    def __init__(self, target: str, method: str, args: list, calls: int = 1):
+        self.target = target
+        self.method = method
+        self.args = args
+        self.calls = calls
+
+    def script_line(self) -> str:
+        return f"{self.target}.{self.method}({', '.join(repr(a) for a in self.args)})"
+
+
+class ModelerBatch:
+    """记录建模/材料/变量操作，flush() 时合并为一次 RunScript"""
+
+    def __init__(self, app, units: str = "mm", verbose: bool = True):
+        self.app = app
+        self.units = units
+        self.verbose = verbose
+        self._ops: List[_Op] = []
+        self.stats = {"ops": 0, "calls": 0, "round_trips": 0, "elapsed": 0.0}
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    # ------------------------------------------------------------------
+    # 格式化
+    # ------------------------------------------------------------------
+    def _dim(self, value) -> str:
+        """数值补单位，字符串 (表达式/变量) 原样保留"""
+        if isinstance(value, str):
+            return value
+        return f"{value}{self.units}"
+
+    @staticmethod
+    def _material_value(material: Optional[str]) -> str:
+        return f'"{material}"' if material else '""'
+
+    def _attributes(self, name, material=None, color=None, transparency=None):
+        # 与 PyAEDT 默认值一致: 材料缺省为 vacuum，除 PEC 外均求解内部
+        material = material or "vacuum"
+        return [
+            "NAME:Attributes",
+            "Name:=", name,
+            "Flags:=", "",
+            "Color:=", "({} {} {})".format(*(color or (143, 175, 143))),
+            "Transparency:=", float(transparency or 0),
+            "PartCoordinateSystem:=", "Global",
+            "UDMId:=", "",
+            "MaterialValue:=", self._material_value(material),
+            "SurfaceMaterialValue:=", '""',
+            "SolveInside:=", material.lower() != "pec",
+            "IsMaterialEditable:=", True,
+            "UseMaterialAppearance:=", False,
+            "IsLightweight:=", False,
+        ]
+
+    def _add(self, target: str, method: str, args: list, calls: int = 1) -> None:
+        self._ops.append(_Op(target, method, args, calls))
+
+    # ------------------------------------------------------------------
+    # 与 PyAEDT modeler 同名的方法 (返回对象名)
+    # ------------------------------------------------------------------
+    def create_box(
+        self,
+        origin: Sequence,
+        sizes: Sequence,
+        name: str,
+        material: Optional[str] = None,
+        color=None,
+        transparency=None,
+    ) -> str:
+        params = [
+            "NAME:BoxParameters",
+            "XPosition:=", self._dim(origin[0]),
+            "YPosition:=", self._dim(origin[1]),
+            "ZPosition:=", self._dim(origin[2]),
+            "XSize:=", self._dim(sizes[0]),
+            "YSize:=", self._dim(sizes[1]),
+            "ZSize:=", self._dim(sizes[2]),
+        ]
+        calls = 1 + (color is not None) + (transparency is not None)
+        self._add(
+            "oEditor", "CreateBox",
+            [params, self._attributes(name, material, color, transparency)],
+            calls,
+        )
+        return name
+
+    def create_cylinder(
+        self,
+        orientation: str,
+        origin: Sequence,
+        radius,
+        height,
+        name: str,
+        material: Optional[str] = None,
+        num_sides: int = 0,
+        color=None,
+        transparency=None,
+    ) -> str:
+        params = [
+            "NAME:CylinderParameters",
+            "XCenter:=", self._dim(origin[0]),
+            "YCenter:=", self._dim(origin[1]),
+            "ZCenter:=", self._dim(origin[2]),
+            "Radius:=", self._dim(radius),
+            "Height:=", self._dim(height),
+            "WhichAxis:=", orientation,
+            "NumSides:=", str(num_sides),
+        ]
+        calls = 1 + (color is not None) + (transparency is not None)
+        self._add(
+            "oEditor", "CreateCylinder",
+            [params, self._attributes(name, material, color, transparency)],
+            calls,
+        )
+        return name
+
+    def rotate(self, assignment, axis: str, angle: Number = 90.0) -> bool:
+        self._add(
+            "oEditor", "Rotate",
+            [
+                ["NAME:Selections", "Selections:=", ",".join(_names(assignment)),
+                 "NewPartsModelFlag:=", "Model"],
+                ["NAME:RotateParameters", "RotateAxis:=", axis,
+                 "RotateAngle:=", f"{angle}deg"],
+            ],
+        )
+        return True
+
+    def subtract(self, blank_list, tool_list, keep_originals: bool = True) -> bool:
+        self._add(
+            "oEditor", "Subtract",
+            [
+                ["NAME:Selections",
+                 "Blank Parts:=", ",".join(_names(blank_list)),
+                 "Tool Parts:=", ",".join(_names(tool_list))],
+                ["NAME:SubtractParameters", "KeepOriginals:=", bool(keep_originals)],
+            ],
+        )
+        return True
+
+    def unite(self, assignment) -> str:
+        """合并后保留第一个对象的名称 (与 AEDT 行为一致)"""
+        names = _names(assignment)
+        self._add(
+            "oEditor", "Unite",
+            [
+                ["NAME:Selections", "Selections:=", ",".join(names)],
+                ["NAME:UniteParameters", "KeepOriginals:=", False],
+            ],
+        )
+        return names[0]
+
+    def delete(self, assignment) -> bool:
+        """对应逐个删除对象 (一条 Delete 命令删除全部)"""
+        names = _names(assignment)
+        if not names:
+            return False
+        self._add(
+            "oEditor", "Delete",
+            [["NAME:Selections", "Selections:=", ",".join(names)]],
+            calls=len(names),
+        )
+        return True
+
+    # ------------------------------------------------------------------
+    # 属性 / 材料 / 变量
+    # ------------------------------------------------------------------
+    def set_properties(
+        self,
+        assignment,
+        color=None,
+        transparency=None,
+        material: Optional[str] = None,
+        new_name: Optional[str] = None,
+        solve_inside: Optional[bool] = None,
+    ) -> None:
+        """对应 obj.color= / obj.transparency= / obj.material_name= / obj.name= / obj.solve_inside="""
+        changed = []
+        if material is not None:
+            changed.append(["NAME:Material", "Value:=", self._material_value(material)])
+        if solve_inside is not None:
+            changed.append(["NAME:Solve Inside", "Value:=", bool(solve_inside)])
+        if color is not None:
+            r, g, b = color
+            changed.append(["NAME:Color", "R:=", r, "G:=", g, "B:=", b])
+        if transparency is not None:
+            changed.append(["NAME:Transparent", "Value:=", float(transparency)])
+        if new_name is not None:
+            changed.append(["NAME:Name", "Value:=", new_name])
+        if not changed:
+            return
+        self._add(
+            "oEditor", "ChangeProperty",
+            [[
+                "NAME:AllTabs",
+                ["NAME:Geometry3DAttributeTab",
+                 ["NAME:PropServers"] + _names(assignment),
+                 ["NAME:ChangedProps"] + changed],
+            ]],
+            calls=len(changed),
+        )
+
+    def set_variables(self, variables: Dict[str, str]) -> None:
+        """对应逐个 m3d[k] = v，已存在的变量改为修改值
+
+        以 $ 开头的名称为工程变量 (材料属性只能引用工程变量)。
+        """
+        for name, value in variables.items():
+            prop = [f"NAME:{name}", "PropType:=", "VariableProp", "UserDef:=", True, "Value:=", value]
+            self._add("_set_variable", "", [prop])
+
+    def add_material(self, name: str, **props) -> None:
+        """对应 add_material + 逐个属性赋值 (permeability=..., conductivity=...)
+
+        属性名按 PyAEDT Material 的写法，转换为原生键; 不认识的属性名直接报错，
+        避免写入 AEDT 不识别的键而被静默忽略。
+        """
+        unknown = sorted(set(props) - set(MATERIAL_KEYS))
+        if unknown:
+            raise ValueError(
+                f"add_material({name!r}) 不支持的属性: {', '.join(unknown)} "
+                f"(可用: {', '.join(sorted(MATERIAL_KEYS))})"
+            )
+        definition = [
+            f"NAME:{name}",
+            "CoordinateSystemType:=", "Cartesian",
+            "BulkOrSurfaceType:=", 1,
+            ["NAME:PhysicsTypes", "set:=", ["Electromagnetic"]],
+        ]
+        for key, value in props.items():
+            definition += [f"{MATERIAL_KEYS[key]}:=", str(value)]
+        self._add("_set_material", "", [name, definition], calls=1 + len(props))
+
+    def note_native(self, calls: int, label: str = "") -> None:
+        """记录绕过批处理、直接在 m3d.modeler 上逐条执行的调用 (每次一个往返)
+
+        批处理不支持的命令 (如螺旋槽) 仍要计入 stats，总往返数才是真实值。
+        """
+        if calls <= 0:
+            return
+        self.stats["calls"] += calls
+        self.stats["round_trips"] += calls
+        if self.verbose:
+            print(f"  [批处理] {label or '未批处理命令'}: {calls} 次逐条调用 -> {calls} 次往返")
+
+    def summary(self) -> str:
+        """累计统计 (含 note_native 记录的逐条调用)"""
+        s = self.stats
+        return (
+            f"{s['calls']} 次 PyAEDT 调用 -> {s['round_trips']} 次往返, "
+            f"节省 {s['calls'] - s['round_trips']} 次"
+        )
+
+    # ------------------------------------------------------------------
+    # 执行
+    # ------------------------------------------------------------------
+    def _script(self, status_file: str) -> str:
+        project = self.app.project_name
+        design = self.app.design_name
+        lines = [
+            "# -*- coding: utf-8 -*-",
+            "# 由 aedt_common.modeler_batch 生成",
+            "import ScriptEnv",
+            'ScriptEnv.Initialize("Ansoft.ElectronicsDesktop")',
+            f"oProject = oDesktop.SetActiveProject({project!r})",
+            f"oDesign = oProject.SetActiveDesign({design!r})",
+            'oEditor = oDesign.SetActiveEditor("3D Modeler")',
+            "oDefinitionManager = oProject.GetDefinitionManager()",
+            "",
+            "def _done(i):",
+            f"    f = open({status_file!r}, 'w')",
+            "    f.write(str(i))",
+            "    f.close()",
+            "",
+            "def _set_variable(prop):",
+            "    if prop[0].startswith('NAME:$'):",
+            "        owner, tab, server = oProject, 'NAME:ProjectVariableTab', 'ProjectVariables'",
+            "    else:",
+            "        owner, tab, server = oDesign, 'NAME:LocalVariableTab', 'LocalVariables'",
+            "    try:",
+            "        owner.ChangeProperty(['NAME:AllTabs', [tab,",
+            "            ['NAME:PropServers', server], ['NAME:NewProps', prop]]])",
+            "    except Exception:",
+            "        owner.ChangeProperty(['NAME:AllTabs', [tab,",
+            "            ['NAME:PropServers', server],",
+            "            ['NAME:ChangedProps', [prop[0], 'Value:=', prop[-1]]]]])",
+            "",
+            "def _set_material(name, definition):",
+            "    if oDefinitionManager.DoesMaterialExist(name):",
+            "        oDefinitionManager.EditMaterial(name, definition)",
+            "    else:",
+            "        oDefinitionManager.AddMaterial(definition)",
+            "",
+        ]
+        for i, op in enumerate(self._ops, 1):
+            if op.target.startswith("_"):
+                lines.append(f"{op.target}({', '.join(repr(a) for a in op.args)})")
+            else:
+                lines.append(op.script_line())
+            lines.append(f"_done({i})")
+        return "\n".join(lines) + "\n"
+
+    def _run_native(self, op: _Op) -> None:
+        """逐条执行 (RunScript 失败时的退化路径)"""
+        if op.target == "_set_variable":
+            prop = op.args[0]
+            self.app[prop[0][len("NAME:"):]] = prop[-1]
+        elif op.target == "_set_material":
+            name, definition = op.args
+            manager = self.app.odefinition_manager
+            if manager.DoesMaterialExist(name):
+                manager.EditMaterial(name, definition)
+            else:
+                manager.AddMaterial(definition)
+        else:
+            getattr(self.app.modeler.oeditor, op.method)(*op.args)
+
+    def _refresh(self) -> None:
+        """让 PyAEDT 重新读取对象/材料列表"""
+        try:
+            self.app.modeler.refresh_all_ids()
+        except Exception as e:
+            print(f"  [WARN] 刷新对象列表失败: {e}")
+        loader = getattr(self.app.materials, "_load_from_project", None)
+        if loader:
+            try:
+                loader()
+            except Exception:
+                pass
+
+    def flush(self) -> dict:
+        """执行已记录的命令，返回本次统计"""
+        if not self._ops:
+            return {"ops": 0, "calls": 0, "round_trips": 0, "elapsed": 0.0}
+
+        ops = self._ops
+        self._ops = []
+        calls = sum(op.calls for op in ops)
+        t0 = time.perf_counter()
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, script_path = tempfile.mkstemp(prefix="modeler_batch_", suffix=".py", dir=CACHE_DIR)
+        os.close(fd)
+        status_path = script_path[:-3] + ".status"
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write(self._script(status_path))
+
+        done = 0
+        round_trips = 1
+        error = None
+        try:
+            self.app.odesktop.RunScript(script_path)
+        except Exception as e:
+            error = e
+        try:
+            with open(status_path, "r") as f:
+                done = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            done = 0 if error else len(ops)
+
+        if done < len(ops):
+            # 从中断处逐条执行，真实错误在这里抛出
+            print(
+                f"  [WARN] RunScript 在第 {done + 1}/{len(ops)} 条命令处中断"
+                f"{f' ({error})' if error else ''}，改为逐条执行"
+            )
+            for op in ops[done:]:
+                self._run_native(op)
+                round_trips += 1
+        else:
+            for path in (script_path, status_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        self._refresh()
+        elapsed = time.perf_counter() - t0
+        result = {
+            "ops": len(ops),
+            "calls": calls,
+            "round_trips": round_trips,
+            "elapsed": elapsed,
+        }
+        for key in ("ops", "calls", "round_trips"):
+            self.stats[key] += result[key]
+        self.stats["elapsed"] += elapsed
+        if self.verbose:
+            print(
+                f"  [批处理] {len(ops)} 条原生命令 (替代 {calls} 次 PyAEDT 调用) "
+                f"-> {round_trips} 次往返, 节省 {calls - round_trips} 次, {elapsed:.2f}s"
+            )
+        return result
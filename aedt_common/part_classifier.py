@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+part_classifier.py - 导入柜体模型的批量分类 + 按类统一赋材料/颜色
+
+各脚本原来逐个对象读取 bounding_box / position / volume，再逐个设置
+material_name / color / transparency，导入的开关柜装配体有上千个零件时
+约 N×5 次往返。这里:
+
+  - PartTable.query: 一个 RunScript 在桌面进程内取回全部对象的包围盒
+    (由对象顶点求得) 和体积，本地保存为 NumPy 数组; RunScript 不可用时
+    退化为逐对象读取 PyAEDT 属性
+  - classify: 长宽比 / 最长边 / 包围盒体积的向量化规则，把零件分成
+    母排 (busbar)、构架 (frame)、小零件 (small)
+  - apply_classes: 每类一次 assign_material，颜色/透明度合并为一次
+    ModelerBatch (一个 RunScript)
+
+各脚本原有的判定阈值 (母排长宽比 5 / 6 / 8) 作为参数传入，可由命令行修改。
+
+用法:
+    from aedt_common.part_classifier import PartTable, apply_classes, classify
+
+    table = PartTable.query(m3d, objs)
+    classes = classify(table, busbar_aspect=6, min_length=100)
+    apply_classes(m3d, classes, {
+        "busbar": {"material": "copper", "color": (200, 100, 0)},
+        "frame": {"material": "steel_1008", "color": (128, 128, 128), "transparency": 0.5},
+    })
+"""
+
+import os
+import time
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from aedt_common import CACHE_DIR
+from aedt_common.modeler_batch import ModelerBatch
+
+CLASSES = ("busbar", "frame", "small")
+DEFAULT_MIN_LENGTH = 100.0  # mm, 母排最长边下限
+
+# 桌面内执行的查询脚本 (IronPython 2.7): 每个对象一行, 制表符分隔
+# 包围盒取对象全部顶点坐标的极值 (导入的柜体零件均为棱柱/板件);
+# 没有顶点的对象 (球面等) 及取不到体积的对象写 nan, 由本地逐个补读
+_QUERY_FUNCS = '''
+def _part_row(obj):
+    xs, ys, zs = [], [], []
+    try:
+        for v in oEditor.GetVertexIDsFromObject(obj):
+            p = oEditor.GetVertexPosition(v)
+            xs.append(float(p[0]))
+            ys.append(float(p[1]))
+            zs.append(float(p[2]))
+    except Exception:
+        pass
+    if xs:
+        bbox = [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)]
+    else:
+        bbox = [float("nan")] * 6
+    try:
+        volume = float(oEditor.GetObjectVolume(obj))
+    except Exception:
+        volume = float("nan")
+    return [obj] + bbox + [volume]
+'''
+
+
+class PartTable:
+    """一组对象的包围盒 (N, 6) 与体积 (N,)"""
+
+    def __init__(self, names: List[str], bbox, volume, app=None):
+        self.names = list(names)
+        self.bbox = np.asarray(bbox, dtype=float).reshape(len(self.names), 6)
+        self.volume = np.asarray(volume, dtype=float).reshape(len(self.names))
+        self._app = app
+        self._index = {n: i for i, n in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    @classmethod
+    def query(cls, app, objects: Iterable, verbose: bool = True) -> "PartTable":
+        """一次往返取回 objects (名称或对象) 的包围盒和体积"""
+        names = [getattr(o, "name", o) for o in objects]
+        t0 = time.perf_counter()
+        rows = cls._query_script(app, names)
+        via = "1 次往返"
+        if rows is None:
+            rows = {}
+            via = "逐对象读取 (RunScript 不可用)"
+        bbox = np.full((len(names), 6), np.nan)
+        volume = np.full(len(names), np.nan)
+        for i, name in enumerate(names):
+            if name in rows:
+                bbox[i], volume[i] = rows[name][:6], rows[name][6]
+        table = cls(names, bbox, volume, app)
+        # 脚本没取到包围盒的对象逐个补读
+        missing = np.flatnonzero(np.isnan(table.bbox).any(axis=1))
+        for i in missing:
+            try:
+                bb = app.modeler[names[i]].bounding_box
+                if bb:
+                    table.bbox[i] = [float(v) for v in bb]
+            except Exception as e:
+                print(f"  [WARN] 读取 {names[i]} 的包围盒失败: {e}")
+        if verbose:
+            extra = f", 补读 {len(missing)} 个" if len(missing) and via == "1 次往返" else ""
+            print(f"  [零件表] {len(names)} 个对象, {via}{extra}, {time.perf_counter() - t0:.2f}s")
+        return table
+
+    @staticmethod
+    def _query_script(app, names: List[str]) -> Optional[Dict[str, list]]:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, script_path = tempfile.mkstemp(prefix="part_table_", suffix=".py", dir=CACHE_DIR)
+        os.close(fd)
+        out_path = script_path[:-3] + ".tsv"
+        lines = [
+            "# -*- coding: utf-8 -*-",
+            "# 由 aedt_common.part_classifier 生成",
+            "import ScriptEnv",
+            'ScriptEnv.Initialize("Ansoft.ElectronicsDesktop")',
+            f"oProject = oDesktop.SetActiveProject({app.project_name!r})",
+            f"oDesign = oProject.SetActiveDesign({app.design_name!r})",
+            'oEditor = oDesign.SetActiveEditor("3D Modeler")',
+            _QUERY_FUNCS,
+            f"f = open({out_path!r}, 'w')",
+            f"for obj in {names!r}:",
+            "    f.write('\\t'.join([str(v) for v in _part_row(obj)]) + '\\n')",
+            "f.close()",
+        ]
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        try:
+            app.odesktop.RunScript(script_path)
+            rows = {}
+            with open(out_path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 8:
+                        rows[parts[0]] = [float(v) for v in parts[1:]]
+            return rows
+        except Exception as e:
+            print(f"  [WARN] 零件批量查询失败, 改为逐对象读取: {e}")
+            return None
+        finally:
+            for path in (script_path, out_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # 派生量 (数组运算)
+    # ------------------------------------------------------------------
+    @property
+    def dims(self) -> np.ndarray:
+        """(N, 3) 包围盒边长"""
+        return np.abs(self.bbox[:, 3:] - self.bbox[:, :3])
+
+    @property
+    def centers(self) -> np.ndarray:
+        return (self.bbox[:, 3:] + self.bbox[:, :3]) / 2
+
+    @property
+    def longest(self) -> np.ndarray:
+        return self.dims.max(axis=1)
+
+    @property
+    def aspect(self) -> np.ndarray:
+        """最长边 / 最短边 (最短边为 0 时为 inf)"""
+        dims = self.dims
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return dims.max(axis=1) / dims.min(axis=1)
+
+    @property
+    def box_volume(self) -> np.ndarray:
+        return self.dims.prod(axis=1)
+
+    def indices(self, names: Iterable[str]) -> np.ndarray:
+        return np.array([self._index[n] for n in names], dtype=np.int64)
+
+    def extent(self) -> List[float]:
+        """全部对象的总包围盒 [xmin, ymin, zmin, xmax, ymax, zmax]"""
+        return ([float(v) for v in np.nanmin(self.bbox[:, :3], axis=0)]
+                + [float(v) for v in np.nanmax(self.bbox[:, 3:], axis=0)])
+
+    def get_bbox(self, name: str) -> List[float]:
+        return [float(v) for v in self.bbox[self._index[name]]]
+
+    def get_dims(self, name: str) -> List[float]:
+        return [float(v) for v in self.dims[self._index[name]]]
+
+    def solid_volume(self, names: Iterable[str]) -> np.ndarray:
+        """names 的实体体积; 脚本没取到的 (NaN) 逐个读取 obj.volume 补上"""
+        idx = self.indices(names)
+        for i in idx[np.isnan(self.volume[idx])]:
+            try:
+                self.volume[i] = float(self._app.modeler[self.names[i]].volume)
+            except Exception:
+                self.volume[i] = self.box_volume[i]
+        return self.volume[idx]
+
+    def sort_by(self, names: Iterable[str], axis: int) -> List[str]:
+        """按包围盒中心坐标排序 (axis: 0=X, 1=Y, 2=Z)"""
+        names = list(names)
+        if not names:
+            return []
+        order = np.argsort(self.centers[self.indices(names), axis], kind="stable")
+        return [names[i] for i in order]
+
+
+def classify(
+    table: PartTable,
+    busbar_aspect: float,
+    min_length: float = DEFAULT_MIN_LENGTH,
+    frame_volume: Optional[float] = None,
+) -> Dict[str, List[str]]:
+    """母排: 长宽比 > busbar_aspect 且最长边 > min_length
+    构架: 其余零件中包围盒体积 > frame_volume (frame_volume 为 None 时其余全部)
+    小零件: 剩下的零件
+
+    包围盒未知的对象不参与分类。
+    """
+    valid = ~np.isnan(table.bbox).any(axis=1)
+    with np.errstate(invalid="ignore"):
+        busbar = valid & (table.aspect > busbar_aspect) & (table.longest > min_length)
+        rest = valid & ~busbar
+        if frame_volume is None:
+            frame = rest
+        else:
+            frame = rest & (table.box_volume > frame_volume)
+    small = rest & ~frame
+    names = np.array(table.names, dtype=object)
+    return {
+        "busbar": list(names[busbar]),
+        "frame": list(names[frame]),
+        "small": list(names[small]),
+    }
+
+
+def apply_classes(app, classes: Dict[str, List[str]], styles: Dict[str, dict]) -> None:
+    """按类统一赋材料 (每类一次 assign_material)，颜色/透明度合并为一次 RunScript
+
+    styles: {类名: {"material": ..., "color": (r, g, b), "transparency": ...}}
+    """
+    batch = ModelerBatch(app)
+    for cls, style in styles.items():
+        names = classes.get(cls) or []
+        if not names:
+            continue
+        material = style.get("material")
+        if material:
+            try:
+                app.assign_material(names, material)
+            except Exception as e:
+                print(f"  ⚠ {cls} 赋材料 {material} 失败: {e}")
+        if style.get("color") is not None or style.get("transparency") is not None:
+            batch.set_properties(names, color=style.get("color"), transparency=style.get("transparency"))
+    batch.flush()
+
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+plot_export.py - 场图导出流水线 (导出方式记忆 + 图片后处理线程池)
+
+PyAEDT 各版本导出场图图片的可用方式不同，原来每个场图依次尝试三种方式，
+失败被静默吞掉，每次运行都要重复付出失败方式的耗时 (4K 模型截图尤其慢)。
+FieldPlotExporter:
+
+  - 按 (AEDT 版本, 物理量) 记住成功的导出方式和各方式的失败次数/时间
+    (缓存目录 plot_export_methods.json)，下次直接用成功的方式；连续失败
+    MAX_FAILURES 次的方式在 FAILURE_TTL 内不再尝试，过期后重新尝试，
+    成功一次即清除失败记录 (偶发的 AEDT 错误不会永久降级最快的方式)
+  - AEDT 侧 (创建场图 / 导出) 在主线程依次执行，Python 侧的图片后处理
+    (裁掉背景边框、缩小到 MAX_WIDTH) 提交到线程池，与下一个场图的
+    AEDT 操作重叠
+  - 记录每个场图的导出方式、AEDT 耗时、后处理耗时
+
+图片后处理需要 Pillow，未安装时只把导出文件移动到目标位置。
+
+用法:
+    from aedt_common.plot_export import FieldPlotExporter
+
+    with FieldPlotExporter(m3d, plot_dir) as exporter:
+        exporter.export("Mag_B", objects, "磁通密度模云图", "Mag_B_Galvalume")
+    for item in exporter.results:     # 成功导出的 {"name", "path", "method", ...}
+        ...
+"""
+
+import os
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from aedt_common import cache_path
+
+MEMO_FILE = cache_path("plot_export_methods.json")
+METHODS = ("plot_field_from_fieldplot", "export_field_plot", "export_model_picture")
+MAX_WIDTH = 2000  # 后处理后的图片最大宽度 (px)
+CROP_MARGIN = 20  # 裁剪背景时保留的边距 (px)
+DEFAULT_WORKERS = 2
+MAX_FAILURES = 2             # 连续失败次数达到此值才跳过该方式
+FAILURE_TTL = 7 * 24 * 3600  # 秒, 失败记录的有效期
+
+_MEMO_LOCK = threading.Lock()
+
+
+def _load_memo(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def postprocess_image(src: str, dst: str, max_width: int = MAX_WIDTH) -> str:
+    """裁掉与左上角颜色相同的背景边框并缩小到 max_width，写入 dst
+
+    没有 Pillow 时只移动文件。
+    """
+    try:
+        from PIL import Image, ImageChops
+    except ImportError:
+        if os.path.abspath(src) != os.path.abspath(dst):
+            shutil.move(src, dst)
+        return dst
+
+    with Image.open(src) as opened:
+        img = opened.convert("RGB")
+    background = Image.new("RGB", img.size, img.getpixel((0, 0)))
+    bbox = ImageChops.difference(img, background).getbbox()
+    if bbox:
+        left, top, right, bottom = bbox
+        img = img.crop((
+            max(0, left - CROP_MARGIN), max(0, top - CROP_MARGIN),
+            min(img.width, right + CROP_MARGIN), min(img.height, bottom + CROP_MARGIN),
+        ))
+    if img.width > max_width:
+        height = round(img.height * max_width / img.width)
+        img = img.resize((max_width, height), Image.LANCZOS)
+    img.save(dst, optimize=True)
+    if os.path.abspath(src) != os.path.abspath(dst):
+        os.remove(src)
+    return dst
+
+
+class FieldPlotExporter:
+    """场图导出: AEDT 侧串行, 图片后处理并行, 导出方式按版本/物理量记忆"""
+
+    def __init__(
+        self,
+        app,
+        out_dir: str,
+        version: Optional[str] = None,
+        workers: int = DEFAULT_WORKERS,
+        max_width: int = MAX_WIDTH,
+        memo_file: str = MEMO_FILE,
+    ):
+        self.app = app
+        self.out_dir = out_dir
+        self.version = version or str(getattr(app, "aedt_version_id", None) or "unknown")
+        self.max_width = max_width
+        self.memo_file = memo_file
+        self.memo = _load_memo(memo_file)
+        self.results: List[dict] = []
+        self._pending = []
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 导出方式 (AEDT 侧)，成功时返回导出的原始图片路径
+    # ------------------------------------------------------------------
+    def _plot_field_from_fieldplot(self, plot, raw: str) -> Optional[str]:
+        self.app.post.plot_field_from_fieldplot(
+            plot_name=plot.name,
+            project_path=os.path.dirname(raw),
+            image_format="png",
+            show_legend=True,
+            show_bounding=True,
+            show=False,  # 不弹出显示窗口
+        )
+        # PyAEDT 按场图名生成文件
+        produced = os.path.join(os.path.dirname(raw), f"{plot.name}.png")
+        return produced if os.path.exists(produced) else None
+
+    def _export_field_plot(self, plot, raw: str) -> Optional[str]:
+        ok = self.app.post.export_field_plot(plot_name=plot.name, output_file=raw)
+        return raw if ok and os.path.exists(raw) else None
+
+    def _export_model_picture(self, plot, raw: str) -> Optional[str]:
+        # 4K 截图, 隐藏 Region
+        self.app.post.export_model_picture(
+            full_name=raw,
+            show_axis=True,
+            show_grid=False,
+            show_ruler=True,
+            show_region=False,
+            field_selections=[plot.name],
+            orientation="isometric",
+            width=3840,
+            height=2160,
+        )
+        return raw if os.path.exists(raw) else None
+
+    @staticmethod
+    def _failures(entry: dict) -> Dict[str, dict]:
+        """{方式: {"count", "last"}} (兼容旧格式: 失败方式列表)"""
+        failed = entry.get("failed", {})
+        if isinstance(failed, list):
+            return {m: {"count": MAX_FAILURES, "last": 0.0} for m in failed}
+        return dict(failed)
+
+    def _order(self, quantity: str, now: Optional[float] = None) -> List[str]:
+        """先用记住的成功方式，跳过近期反复失败的方式 (全部被跳过时重新全部尝试)"""
+        entry = self.memo.get(self.version, {}).get(quantity, {})
+        now = time.time() if now is None else now
+        skipped = {
+            m for m, f in self._failures(entry).items()
+            if f.get("count", 0) >= MAX_FAILURES and now - f.get("last", 0.0) < FAILURE_TTL
+        }
+        order = [m for m in METHODS if m not in skipped]
+        if entry.get("method") in order:
+            order.remove(entry["method"])
+            order.insert(0, entry["method"])
+        return order or list(METHODS)
+
+    def _remember(
+        self, quantity: str, method: Optional[str], failed: List[str], now: Optional[float] = None
+    ) -> None:
+        now = time.time() if now is None else now
+        with _MEMO_LOCK:
+            entry = self.memo.setdefault(self.version, {}).setdefault(quantity, {})
+            failures = self._failures(entry)
+            for name in failed:
+                previous = failures.get(name, {})
+                # 过期的失败记录重新计数
+                count = previous.get("count", 0) if now - previous.get("last", 0.0) < FAILURE_TTL else 0
+                failures[name] = {"count": count + 1, "last": now}
+            failures.pop(method, None)
+            entry["failed"] = failures
+            if method:
+                entry["method"] = method
+            try:
+                with open(self.memo_file, "w", encoding="utf-8") as f:
+                    json.dump(self.memo, f, indent=2, ensure_ascii=False)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # 流水线
+    # ------------------------------------------------------------------
+    def export(
+        self,
+        quantity: str,
+        objects: List[str],
+        title: str,
+        filename: str,
+        intrinsics: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """创建并导出一个场图; 图片后处理在线程池中进行。返回 AEDT 侧是否导出成功"""
+        output = os.path.join(self.out_dir, filename + ".png")
+        raw_dir = os.path.join(self.out_dir, "_raw")
+        os.makedirs(raw_dir, exist_ok=True)
+        raw = os.path.join(raw_dir, filename + ".png")
+        t0 = time.perf_counter()
+        try:
+            plot = self.app.post.create_fieldplot_surface(
+                assignment=objects,
+                quantity=quantity,
+                setup=self.app.nominal_adaptive,
+                intrinsics=intrinsics or {"Phase": "0deg"},
+            )
+        except Exception as e:
+            print(f"    ⚠ {title}: 场图创建失败 ({e})")
+            return False
+        if not plot:
+            print(f"    ⚠ {title}: 场图创建失败")
+            return False
+
+        produced, method, failed = None, None, []
+        for name in self._order(quantity):
+            try:
+                produced = getattr(self, f"_{name}")(plot, raw)
+            except Exception as e:
+                print(f"    ⚠ {title}: {name} 不可用 ({self.version}, {e})")
+                produced = None
+            if produced:
+                method = name
+                break
+            failed.append(name)
+        try:
+            plot.delete()
+        except Exception:
+            pass
+        self._remember(quantity, method, failed)
+        aedt_s = time.perf_counter() - t0
+
+        if not produced:
+            print(f"    ⚠ {title}: 导出失败 ({aedt_s:.1f}s, 将使用手动截图)")
+            return False
+        record = {"name": title, "path": output, "method": method, "aedt_s": aedt_s}
+        self._pending.append((record, self._pool.submit(self._finish, produced, output)))
+        return True
+
+    def _finish(self, produced: str, output: str) -> float:
+        t0 = time.perf_counter()
+        postprocess_image(produced, output, self.max_width)
+        return time.perf_counter() - t0
+
+    def close(self) -> List[dict]:
+        """等待全部后处理完成，打印每个场图的耗时，返回成功导出的记录"""
+        for record, future in self._pending:
+            try:
+                record["post_s"] = future.result()
+            except Exception as e:
+                print(f"    ⚠ {record['name']}: 图片后处理失败 ({e})")
+                continue
+            self.results.append(record)
+            print(
+                f"    ✓ {record['name']}: {os.path.basename(record['path'])} "
+                f"[{record['method']}] AEDT {record['aedt_s']:.1f}s, 后处理 {record['post_s']:.2f}s"
+            )
+        self._pending = []
+        self._pool.shutdown(wait=True)
+        shutil.rmtree(os.path.join(self.out_dir, "_raw"), ignore_errors=True)
+        return self.results
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+profiler.py - setup 脚本的分阶段计时与 AEDT 调用统计
+
+每个阶段 (几何 / 材料 / 边界 / 网格 / 求解 ...) 记录:
+  - 墙钟时间与 Python 进程 CPU 时间
+  - 录制 (MAXWELL_AEDT_RECORD) 或回放时: AEDT 调用次数、累计耗时与最慢的
+    几次调用 (recorder 的监听者统计每次 RPC)
+
+分析器本身不包装 AEDT 对象 (代理会改变返回值的语义)，普通运行只有阶段计时:
+统计文件中 aedt_calls_counted 为 false 并附说明，打印时调用列显示 "-"。
+需要调用统计时同时设置 MAXWELL_AEDT_RECORD。脚本以 --profile 开启。
+
+脚本结束时写入工程目录下的 <脚本名>_profile.json，可选输出 Chrome
+trace (chrome://tracing 或 https://ui.perfetto.dev 打开)。
+
+用法:
+    from aedt_common.profiler import note_project, start_profiler, stage
+
+    profiler = start_profiler("EddyCurrent_setup")
+    stage("  [1/7] 定义参数...")      # 打印原有提示并开始新阶段
+    ...
+    note_project(m3d)                  # 统计文件写到工程目录
+    profiler.save(chrome=True)
+"""
+
+import os
+import json
+import time
+import heapq
+from typing import Optional
+
+from aedt_common import cache_path
+from aedt_common.recorder import RECORD_ENV, add_listener, replay_active
+
+SLOWEST_CALLS = 5
+UNCOUNTED_NOTE = f"未录制 ({RECORD_ENV} 未设置): AEDT 调用未统计, 只有阶段计时"
+
+
+def calls_counted() -> bool:
+    """录制或回放时监听者才能收到 AEDT 调用"""
+    return bool(os.environ.get(RECORD_ENV)) or replay_active()
+
+
+class StageProfiler:
+    """按阶段累计墙钟/CPU 时间和 AEDT 调用"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.project_dir: Optional[str] = None
+        self.stages = []
+        self._current = None
+        self._origin = time.perf_counter()
+        self._spans = []  # Chrome trace 用的调用区间 (名称, 开始, 耗时)
+        add_listener(self._on_call)
+
+    # ------------------------------------------------------------------
+    # 阶段
+    # ------------------------------------------------------------------
+    def stage(self, label: str) -> None:
+        """结束当前阶段并开始新阶段"""
+        self._close()
+        self._current = {
+            "stage": label,
+            "start": time.perf_counter(),
+            "cpu_start": time.process_time(),
+            "aedt_calls": 0,
+            "aedt_errors": 0,
+            "aedt_s": 0.0,
+            "slowest": [],  # 小顶堆 (耗时, 序号, 名称)
+        }
+
+    def _close(self) -> None:
+        cur = self._current
+        if cur is None:
+            return
+        self._current = None
+        wall = time.perf_counter() - cur["start"]
+        self.stages.append({
+            "stage": cur["stage"],
+            "start_s": round(cur["start"] - self._origin, 4),
+            "wall_s": round(wall, 4),
+            "cpu_s": round(time.process_time() - cur["cpu_start"], 4),
+            "aedt_calls": cur["aedt_calls"],
+            "aedt_errors": cur["aedt_errors"],
+            "aedt_s": round(cur["aedt_s"], 4),
+            # 墙钟中不属于 AEDT 调用的部分 (Python 逻辑、sleep、文件 IO)
+            "other_s": round(max(0.0, wall - cur["aedt_s"]), 4),
+            "slowest_calls": [
+                {"call": name, "s": round(t, 4)}
+                for t, _, name in sorted(cur["slowest"], reverse=True)
+            ],
+        })
+
+    def _on_call(self, kind, label, elapsed, error) -> None:
+        cur = self._current
+        if cur is None:
+            self.stage("(未分阶段)")
+            cur = self._current
+        cur["aedt_calls"] += 1
+        cur["aedt_s"] += elapsed
+        if error is not None:
+            cur["aedt_errors"] += 1
+        item = (elapsed, cur["aedt_calls"], label)
+        if len(cur["slowest"]) < SLOWEST_CALLS:
+            heapq.heappush(cur["slowest"], item)
+        elif elapsed > cur["slowest"][0][0]:
+            heapq.heapreplace(cur["slowest"], item)
+        self._spans.append((label, time.perf_counter() - elapsed - self._origin, elapsed))
+
+    # ------------------------------------------------------------------
+    # 输出
+    # ------------------------------------------------------------------
+    def finish(self) -> dict:
+        self._close()
+        data = {
+            "script": self.name,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_s": round(time.perf_counter() - self._origin, 4),
+            "aedt_calls_counted": calls_counted(),
+            "aedt_calls": sum(s["aedt_calls"] for s in self.stages),
+            "aedt_s": round(sum(s["aedt_s"] for s in self.stages), 4),
+            "stages": self.stages,
+        }
+        if not data["aedt_calls_counted"]:
+            data["note"] = UNCOUNTED_NOTE
+        return data
+
+    def chrome_trace(self, data: dict) -> dict:
+        """阶段在线程 1，AEDT 调用在线程 2"""
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "阶段"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "AEDT 调用"}},
+        ]
+        for s in data["stages"]:
+            events.append({
+                "name": s["stage"], "cat": "stage", "ph": "X", "pid": pid, "tid": 1,
+                "ts": s["start_s"] * 1e6, "dur": s["wall_s"] * 1e6,
+                "args": {k: s[k] for k in ("aedt_calls", "aedt_s", "cpu_s")},
+            })
+        for label, start, elapsed in self._spans:
+            events.append({
+                "name": label, "cat": "aedt", "ph": "X", "pid": pid, "tid": 2,
+                "ts": start * 1e6, "dur": elapsed * 1e6,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, directory: Optional[str] = None, chrome: bool = False) -> Optional[str]:
+        """写入 <directory>/<脚本名>_profile.json (默认工程目录)，返回路径"""
+        data = self.finish()
+        directory = directory or self.project_dir
+        if directory:
+            path = os.path.join(directory, f"{self.name}_profile.json")
+        else:
+            path = cache_path("profiles", f"{self.name}_profile.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            if chrome:
+                trace = path[: -len("_profile.json")] + "_trace.json"
+                with open(trace, "w", encoding="utf-8") as f:
+                    json.dump(self.chrome_trace(data), f, ensure_ascii=False)
+                print(f"[INFO] Chrome trace: {trace}")
+        except OSError as e:
+            print(f"[WARN] 无法写入性能统计 {path}: {e}")
+            return None
+        self.print_summary(data)
+        print(f"[INFO] 性能统计: {path}")
+        return path
+
+    @staticmethod
+    def print_summary(data: dict) -> None:
+        counted = data.get("aedt_calls_counted", True)
+
+        def calls(n):
+            return n if counted else "-"
+
+        print("\n" + "-" * 78)
+        print(f"  {'阶段':<34}{'墙钟(s)':>9}{'CPU(s)':>8}{'AEDT调用':>9}{'AEDT(s)':>9}")
+        for s in data["stages"]:
+            print(
+                f"  {s['stage'][:34]:<34}{s['wall_s']:>9.2f}{s['cpu_s']:>8.2f}"
+                f"{calls(s['aedt_calls']):>9}{s['aedt_s']:>9.2f}"
+            )
+            if s["slowest_calls"]:
+                top = s["slowest_calls"][0]
+                print(f"      最慢: {top['call']} ({top['s']:.2f}s)")
+        print(
+            f"  {'合计':<34}{data['total_s']:>9.2f}{'':>8}"
+            f"{calls(data['aedt_calls']):>9}{data['aedt_s']:>9.2f}"
+        )
+        if not counted:
+            print(f"  注: {data.get('note', UNCOUNTED_NOTE)}")
+        print("-" * 78)
+
+
+_PROFILER: Optional[StageProfiler] = None
+
+
+def start_profiler(name: str) -> StageProfiler:
+    """创建进程内唯一的分析器 (之后 stage() 开始记录)"""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = StageProfiler(name)
+    return _PROFILER
+
+
+def get_profiler() -> Optional[StageProfiler]:
+    return _PROFILER
+
+
+def note_project(app) -> None:
+    """记录工程目录作为统计文件的输出位置 (首次调用生效)"""
+    if _PROFILER is None or _PROFILER.project_dir:
+        return
+    try:
+        path = app.project_path
+    except Exception:
+        return
+    # 回放轨迹中没有该属性时拿到的不是字符串
+    if isinstance(path, str) and path:
+        _PROFILER.project_dir = path
+
+
+def stage(message: str) -> None:
+    """打印阶段提示；已启用分析器时同时开始新阶段
+
+    阶段名取提示文字去掉首尾空白和省略号，如 "[3/7] 创建母线"。
+    """
+    print(message)
+    if _PROFILER is not None:
+        _PROFILER.stage(message.strip().rstrip(".").rstrip("。").strip())
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+recorder.py - Maxwell3d 调用录制 / 回放 (无 AEDT 许可时评估脚本开销)
+
+录制: RecordingProxy 包装 Maxwell3d 句柄，modeler / post / mesh / boundaries /
+setups 等子对象自动继续包装。每次方法调用、属性读写、下标访问都记录
+参数、返回值和真实耗时，写入 gzip 压缩的 JSON-lines 轨迹文件。
+
+回放: ReplayApp 读取轨迹，按 (对象句柄, 操作类型, 名称) 依次返回录制的
+结果，并按录制耗时 x 缩放系数 sleep，用来在任意 Linux 机器上测量
+create_simulation / get_results / VacuumInterrupter 生成器的调用次数和耗时。
+
+启用方式 (会话池自动识别，无需改脚本):
+    MAXWELL_AEDT_RECORD=trace.jsonl.gz python EddyCurrent/EddyCurrent_setup.py
+    MAXWELL_AEDT_REPLAY=trace.jsonl.gz MAXWELL_AEDT_REPLAY_SCALE=0 \\
+        python EddyCurrent/EddyCurrent_setup.py
+
+轨迹格式 (每行一个事件):
+    {"h": 句柄, "k": "call|get|set|getitem|setitem|iter|len|open",
+     "n": 名称, "a": 参数, "kw": 关键字参数, "r": 返回值, "e": 异常, "t": 耗时秒}
+对象以 {"$h": 句柄} 表示，元组以 {"$t": [...]} 表示。
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+from collections import defaultdict, deque
+from typing import Optional
+
+RECORD_ENV = "MAXWELL_AEDT_RECORD"
+REPLAY_ENV = "MAXWELL_AEDT_REPLAY"
+REPLAY_SCALE_ENV = "MAXWELL_AEDT_REPLAY_SCALE"
+REPLAY_STATS_ENV = "MAXWELL_AEDT_REPLAY_STATS"
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class ReplayError(RuntimeError):
+    """回放时找不到匹配的录制事件 (脚本调用序列与录制时不同)"""
+
+
+def _open_trace(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+# ======================================================================
+# 录制
+# ======================================================================
+class Recorder:
+    """轨迹写入器: 分配对象句柄并逐条写入事件
+
+    path 为 None 时不写文件，只把事件通知给监听者 (见 profiler.py)。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._file = _open_trace(path, "w") if path else None
+        self._handles = {}  # id(obj) -> 句柄
+        self._objects = []  # 保持引用，避免 id 被复用
+        self._labels = {}  # 句柄 -> 访问路径 (m3d.modeler ...)
+        self._listeners = []
+        self.events = 0
+        atexit.register(self.close)
+
+    def add_listener(self, listener) -> None:
+        """listener(kind, label, elapsed, error) 在每个事件后调用"""
+        self._listeners.append(listener)
+
+    def handle_of(self, obj, label: Optional[str] = None) -> int:
+        key = id(obj)
+        if key not in self._handles:
+            handle = len(self._objects)
+            self._handles[key] = handle
+            self._objects.append(obj)
+            self._labels[handle] = label or f"obj{handle}"
+        return self._handles[key]
+
+    def label_of(self, handle: Optional[int]) -> str:
+        return self._labels.get(handle, "m3d")
+
+    def encode(self, value):
+        """返回值/参数 -> 可 JSON 序列化的结构 (对象以句柄代替)"""
+        if isinstance(value, RecordingProxy):
+            return {"$h": object.__getattribute__(value, "_rp_handle")}
+        if isinstance(value, _PRIMITIVES):
+            return value
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        if isinstance(value, tuple):
+            return {"$t": [self.encode(v) for v in value]}
+        if isinstance(value, dict):
+            return {str(k): self.encode(v) for k, v in value.items()}
+        if hasattr(value, "tolist") and type(value).__module__.startswith("numpy"):
+            return value.tolist()
+        return {"$h": self.handle_of(value)}
+
+    def wrap(self, value, label: Optional[str] = None):
+        """真实返回值 -> 调用方拿到的值 (对象继续包装为代理)
+
+        dict/list 按引用返回: setup.props 等 (PyAEDT 的 SetupProps 为 dict
+        子类，赋值时同步到 AEDT) 上的修改必须作用在真实对象上。只有内容
+        含 PyAEDT 对象的普通容器 (对象列表/字典) 才重建为元素已包装的新容器。
+        """
+        if isinstance(value, _PRIMITIVES) or isinstance(value, RecordingProxy):
+            return value
+        if isinstance(value, (list, dict)) and (type(value) not in (list, dict) or _plain_data(value)):
+            return value
+        if isinstance(value, list):
+            return [self.wrap(v, f"{label}[]") for v in value]
+        if isinstance(value, tuple):
+            return tuple(self.wrap(v, f"{label}[]") for v in value)
+        if isinstance(value, dict):
+            return {k: self.wrap(v, f"{label}[]") for k, v in value.items()}
+        if hasattr(value, "tolist") and type(value).__module__.startswith("numpy"):
+            return value
+        return RecordingProxy(value, self, self.handle_of(value, label))
+
+    def write(self, handle, kind, name, args=(), kwargs=None, result=None,
+              error=None, elapsed=0.0) -> None:
+        self.events += 1
+        if self._listeners:
+            if handle is None:
+                label = f"{kind} {name}"
+            elif name:
+                label = f"{self.label_of(handle)}.{name}"
+            else:
+                label = f"{self.label_of(handle)}[{kind}]"
+            for listener in self._listeners:
+                listener(kind, label, elapsed, error)
+        if self._file is None:
+            return
+        event = {"h": handle, "k": kind, "n": name, "t": round(elapsed, 6)}
+        if args:
+            event["a"] = [self.encode(a) for a in args]
+        if kwargs:
+            event["kw"] = {k: self.encode(v) for k, v in kwargs.items()}
+        if error is not None:
+            event["e"] = f"{type(error).__name__}: {error}"
+        else:
+            event["r"] = self.encode(result)
+        self._file.write(json.dumps(event, ensure_ascii=False, default=repr) + "\n")
+
+    def record_open(self, app, project: str, design: str):
+        """登记一次 open_design，返回包装后的句柄"""
+        handle = self.handle_of(app, "m3d")
+        self.write(None, "open", f"{project}/{design}", result=app)
+        return RecordingProxy(app, self, handle)
+
+    def close(self) -> None:
+        if self._file and not self._file.closed:
+            self._file.close()
+            print(f"[INFO] 已录制 {self.events} 个 AEDT 调用: {self.path}")
+
+
+def _plain_data(value) -> bool:
+    """是否只含基本类型 / 容器 (不含需要包装的对象)"""
+    if isinstance(value, _PRIMITIVES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_plain_data(v) for v in value)
+    if isinstance(value, dict):
+        return all(_plain_data(v) for v in value.values())
+    return hasattr(value, "tolist") and type(value).__module__.startswith("numpy")
+
+
+def _unwrap(value):
+    if isinstance(value, RecordingProxy):
+        return object.__getattribute__(value, "_rp_target")
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+class RecordingProxy:
+    """透明代理: 转发到真实对象并记录每次访问"""
+
+    def __init__(self, target, recorder: Recorder, handle: int):
+        object.__setattr__(self, "_rp_target", target)
+        object.__setattr__(self, "_rp_recorder", recorder)
+        object.__setattr__(self, "_rp_handle", handle)
+
+    def _rp_run(self, kind, name, func, args=(), kwargs=None, wrap=True):
+        recorder = object.__getattribute__(self, "_rp_recorder")
+        handle = object.__getattribute__(self, "_rp_handle")
+        t0 = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            recorder.write(handle, kind, name, args, kwargs, error=e,
+                           elapsed=time.perf_counter() - t0)
+            raise
+        elapsed = time.perf_counter() - t0
+        recorder.write(handle, kind, name, args, kwargs, result=result, elapsed=elapsed)
+        if not wrap:
+            return result
+        return recorder.wrap(result, f"{recorder.label_of(handle)}.{name or kind}")
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, "_rp_target")
+        run = object.__getattribute__(self, "_rp_run")
+        t0 = time.perf_counter()
+        value = getattr(target, name)
+        if callable(value) and not isinstance(value, type):
+            # 方法: 推迟到真正调用时记录
+            def _call(*args, **kwargs):
+                return run(
+                    "call", name,
+                    lambda: value(*_unwrap(args), **_unwrap(kwargs)),
+                    args, kwargs,
+                )
+            return _call
+        # 属性读取本身可能是一次 RPC，耗时计入事件
+        recorder = object.__getattribute__(self, "_rp_recorder")
+        handle = object.__getattribute__(self, "_rp_handle")
+        recorder.write(handle, "get", name, result=value, elapsed=time.perf_counter() - t0)
+        return recorder.wrap(value, f"{recorder.label_of(handle)}.{name}")
+
+    def __setattr__(self, name, value):
+        target = object.__getattribute__(self, "_rp_target")
+        self._rp_run("set", name, lambda: setattr(target, name, _unwrap(value)), (value,))
+
+    def __getitem__(self, key):
+        target = object.__getattribute__(self, "_rp_target")
+        return self._rp_run("getitem", "", lambda: target[_unwrap(key)], (key,))
+
+    def __setitem__(self, key, value):
+        target = object.__getattribute__(self, "_rp_target")
+        self._rp_run("setitem", "", lambda: target.__setitem__(_unwrap(key), _unwrap(value)),
+                     (key, value))
+
+    def __iter__(self):
+        target = object.__getattribute__(self, "_rp_target")
+        return iter(self._rp_run("iter", "", lambda: list(target)))
+
+    def __len__(self):
+        target = object.__getattribute__(self, "_rp_target")
+        return self._rp_run("len", "", lambda: len(target), wrap=False)
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, "_rp_target"))
+
+    def __repr__(self):
+        return f"<recorded {object.__getattribute__(self, '_rp_target')!r}>"
+
+
+# ======================================================================
+# 回放
+# ======================================================================
+class ReplayPlayer:
+    """按 (句柄, 类型, 名称) 分队列保存事件，按录制顺序依次取出"""
+
+    def __init__(self, path: str, scale: float = 1.0):
+        self.path = path
+        self.scale = scale
+        self._queues = defaultdict(deque)
+        self._listeners = []
+        self.stats = {
+            "events": 0, "served": 0, "misses": 0,
+            "recorded_s": 0.0, "slept_s": 0.0, "by_name": defaultdict(int),
+        }
+        with _open_trace(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                self._queues[(event["h"], event["k"], event["n"])].append(event)
+                self.stats["events"] += 1
+
+    def has(self, handle, kind, name) -> bool:
+        return bool(self._queues.get((handle, kind, name)))
+
+    def take(self, handle, kind, name):
+        queue = self._queues.get((handle, kind, name))
+        if not queue:
+            self.stats["misses"] += 1
+            raise ReplayError(f"轨迹中没有更多的 {kind} {name!r} (句柄 {handle})")
+        event = queue.popleft()
+        self.stats["served"] += 1
+        self.stats["recorded_s"] += event.get("t", 0.0)
+        self.stats["by_name"][f"{kind}:{name}" if name else kind] += 1
+        delay = event.get("t", 0.0) * self.scale
+        if delay > 0:
+            time.sleep(delay)
+            self.stats["slept_s"] += delay
+        for listener in self._listeners:
+            listener(kind, name or kind, event.get("t", 0.0), event.get("e"))
+        if "e" in event:
+            raise RuntimeError(f"[replay] {event['e']}")
+        return self.decode(event.get("r"))
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        if isinstance(value, dict):
+            if "$h" in value:
+                return ReplayHandle(self, value["$h"])
+            if "$t" in value:
+                return tuple(self.decode(v) for v in value["$t"])
+            return {k: self.decode(v) for k, v in value.items()}
+        return value
+
+    def open(self, project: str, design: str):
+        return self.take(None, "open", f"{project}/{design}")
+
+    def summary(self) -> dict:
+        data = dict(self.stats)
+        data["by_name"] = dict(sorted(self.stats["by_name"].items(), key=lambda kv: -kv[1]))
+        data["calls"] = self.stats["served"]
+        return data
+
+
+class ReplayHandle:
+    """回放替身: 属性/方法/下标访问都从轨迹中取结果"""
+
+    def __init__(self, player: ReplayPlayer, handle: int):
+        object.__setattr__(self, "_rh_player", player)
+        object.__setattr__(self, "_rh_handle", handle)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        player = object.__getattribute__(self, "_rh_player")
+        handle = object.__getattribute__(self, "_rh_handle")
+        if player.has(handle, "get", name):
+            return player.take(handle, "get", name)
+
+        def _call(*args, **kwargs):
+            return player.take(handle, "call", name)
+        return _call
+
+    def __setattr__(self, name, value):
+        object.__getattribute__(self, "_rh_player").take(
+            object.__getattribute__(self, "_rh_handle"), "set", name
+        )
+
+    def __getitem__(self, key):
+        return self._rh_player.take(self._rh_handle, "getitem", "")
+
+    def __setitem__(self, key, value):
+        self._rh_player.take(self._rh_handle, "setitem", "")
+
+    def __iter__(self):
+        return iter(self._rh_player.take(self._rh_handle, "iter", ""))
+
+    def __len__(self):
+        return self._rh_player.take(self._rh_handle, "len", "")
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"<replay handle {object.__getattribute__(self, '_rh_handle')}>"
+
+
+# ======================================================================
+# 进程级入口 (会话池使用)
+# ======================================================================
+_RECORDER: Optional[Recorder] = None
+_PLAYER: Optional[ReplayPlayer] = None
+
+
+def replay_active() -> bool:
+    return bool(os.environ.get(REPLAY_ENV))
+
+
+_LISTENERS = []
+
+
+def get_recorder() -> Optional[Recorder]:
+    """设置了 MAXWELL_AEDT_RECORD 时返回进程内唯一的录制器"""
+    global _RECORDER
+    path = os.environ.get(RECORD_ENV)
+    if path and _RECORDER is None:
+        _RECORDER = Recorder(path)
+        for listener in _LISTENERS:
+            _RECORDER.add_listener(listener)
+    return _RECORDER
+
+
+def add_listener(listener) -> None:
+    """注册调用监听者 (录制或回放时收到每个 AEDT 调用)
+
+    只注册监听者不会包装应用句柄: 未录制轨迹时 AEDT 对象不经过代理，
+    监听者收不到调用事件。回放时监听者收到的是录制耗时，便于离线对比各阶段。
+    """
+    player = get_player()
+    if player is not None:
+        player._listeners.append(listener)
+        return
+    _LISTENERS.append(listener)
+    if _RECORDER is not None:
+        _RECORDER.add_listener(listener)
+
+
+def get_player() -> Optional[ReplayPlayer]:
+    """设置了 MAXWELL_AEDT_REPLAY 时返回进程内唯一的回放器"""
+    global _PLAYER
+    path = os.environ.get(REPLAY_ENV)
+    if path and _PLAYER is None:
+        scale = float(os.environ.get(REPLAY_SCALE_ENV, "1.0"))
+        _PLAYER = ReplayPlayer(path, scale=scale)
+        atexit.register(_report_replay)
+    return _PLAYER
+
+
+def _report_replay() -> None:
+    if _PLAYER is None:
+        return
+    data = _PLAYER.summary()
+    print(
+        f"[INFO] 回放 {data['calls']} 个 AEDT 调用 (录制耗时 {data['recorded_s']:.2f}s, "
+        f"实际等待 {data['slept_s']:.2f}s, 未命中 {data['misses']})"
+    )
+    stats_path = os.environ.get(REPLAY_STATS_ENV)
+    if stats_path:
+        with open(stats_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+report_build.py - Typst 报告增量构建 (依赖跟踪 + 并行编译 + 共享字体目录)
+
+各报告脚本的 generate_report() 每次都重写整个 .typ 并串行执行 typst compile，
+每个 typst 进程启动时还要扫描全部系统字体 (CJK 字体文件很大)。这里:
+
+  - 依赖: .typ 本身 (生成报告时数据就写在其中)、其中 image()/read()/csv()/
+    json() 引用的文件 (field_plots/、asset/ 下的图片等)、#import/#include
+    的 .typ (递归)，以及共享模板 chinese-tech-template.typ
+  - 指纹: 先比较 (修改时间, 大小)，变化时再算内容哈希; 只是重写了相同内容
+    (报告脚本每次重写 .typ) 不会触发重编译
+  - PDF 缺失、任一依赖变化或 typst 版本变化的报告才编译，多个报告并行编译
+  - 字体: 把报告用到的 CJK 字体 (宋体/微软雅黑/Noto CJK) 的字体文件汇总到
+    缓存目录 fonts/，编译时 --font-path 指向该目录并忽略系统字体; 有字体找
+    不到时退回系统字体扫描。字体族从报告及其 #import/#include 的 .typ
+    (如 chinese-tech-template.typ) 中收集，都没有指定字体的报告仍扫描系统字体
+
+构建状态保存在缓存目录 (MAXWELL_AEDT_CACHE) 下的 report_build.json。
+
+用法:
+    python -m aedt_common.report_build                  # 仓库中全部报告
+    python -m aedt_common.report_build EddyCurrent/EddyCurrent_Analysis_Report.typ
+    python -m aedt_common.report_build --force --jobs 4
+    python -m aedt_common.report_build --list           # 只列出依赖和状态
+
+    from aedt_common.report_build import build_reports
+    build_reports([typst_file])
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import argparse
+import platform
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aedt_common import CACHE_DIR, cache_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(REPO_ROOT, "chinese-tech-template.typ")
+STATE_FILE = cache_path("report_build.json")
+FONT_DIR = os.path.join(CACHE_DIR, "fonts")
+COMPILE_TIMEOUT = 60  # 秒 (每个报告)
+
+# 报告中引用文件的函数 / 导入语句
+_FILE_CALL = re.compile(r'\b(?:image|read|csv|json|yaml|toml|xml|cbor)\(\s*"([^"]+)"')
+_IMPORT = re.compile(r'#(?:import|include)\s+"([^"]+)"')
+_FONT_SET = re.compile(r'font:\s*(\([^)]*\)|"[^"]*")')
+
+# 字体族 -> 字体文件名模式 (不区分大小写)
+FONT_FILES = {
+    "SimSun": ["simsun.ttc", "simsun.ttf"],
+    "Microsoft YaHei": ["msyh.ttc", "msyhbd.ttc", "msyhl.ttc", "msyh.ttf", "msyhbd.ttf"],
+    "Noto Serif CJK SC": ["NotoSerifCJK*.ttc", "NotoSerifCJKsc-*.otf", "NotoSerifSC-*.otf"],
+    "Noto Sans CJK SC": ["NotoSansCJK*.ttc", "NotoSansCJKsc-*.otf", "NotoSansSC-*.otf"],
+}
+
+
+def _strip_comments(text: str) -> str:
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    return "\n".join(re.sub(r"(^|\s)//.*$", "", line) for line in text.splitlines())
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return _strip_comments(f.read())
+    except OSError:
+        return ""
+
+
+def _resolve(ref: str, base_dir: str, root: Optional[str]) -> str:
+    """Typst 路径: "/" 开头相对于 root，其余相对于所在文件"""
+    if ref.startswith("/") and root:
+        return os.path.normpath(os.path.join(root, ref.lstrip("/")))
+    return os.path.normpath(os.path.join(base_dir, ref))
+
+
+def scan_dependencies(typ_file: str, root: Optional[str] = None) -> List[str]:
+    """typ_file 引用的全部文件 (递归 #import/#include)，不含 typ_file 本身"""
+    typ_file = os.path.abspath(typ_file)
+    seen, deps, stack = {typ_file}, [], [typ_file]
+    while stack:
+        current = stack.pop()
+        text = _read(current)
+        base = os.path.dirname(current)
+        for ref in _FILE_CALL.findall(text):
+            path = _resolve(ref, base, root)
+            if path not in seen:
+                seen.add(path)
+                deps.append(path)
+        for ref in _IMPORT.findall(text):
+            if ref.startswith("@"):  # 包 (@preview/...)
+                continue
+            path = _resolve(ref, base, root)
+            if path not in seen:
+                seen.add(path)
+                deps.append(path)
+                stack.append(path)
+    return deps
+
+
+def project_root(typ_file: str, deps: Iterable[str]) -> str:
+    """--root: 报告及其依赖的公共上级目录 (报告用 ../field_plots 引用图片)"""
+    paths = [os.path.dirname(os.path.abspath(typ_file))] + [os.path.dirname(p) for p in deps]
+    try:
+        return os.path.commonpath(paths)
+    except ValueError:  # Windows 不同盘符
+        return os.path.dirname(os.path.abspath(typ_file))
+
+
+def font_families(typ_files: Iterable[str]) -> List[str]:
+    """typ_files 中 font: 设置的字体族 (按出现顺序去重)"""
+    families = []
+    for typ in typ_files:
+        for spec in _FONT_SET.findall(_read(typ)):
+            for name in re.findall(r'"([^"]+)"', spec):
+                if name not in families:
+                    families.append(name)
+    return families
+
+
+def discover_reports(root: str = REPO_ROOT) -> List[str]:
+    """仓库中的报告 .typ (不含共享模板)"""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(root, "**", "*.typ"), recursive=True)):
+        if os.path.abspath(path) == TEMPLATE:
+            continue
+        if any(part.startswith(".") for part in os.path.relpath(path, root).split(os.sep)):
+            continue
+        reports.append(os.path.abspath(path))
+    return reports
+
+
+# ----------------------------------------------------------------------
+# 字体目录
+# ----------------------------------------------------------------------
+def _system_font_dirs() -> List[str]:
+    system = platform.system()
+    if system == "Windows":
+        windir = os.environ.get("WINDIR", "C:\\Windows")
+        local = os.environ.get("LOCALAPPDATA", "")
+        return [os.path.join(windir, "Fonts"), os.path.join(local, "Microsoft", "Windows", "Fonts")]
+    if system == "Darwin":
+        return ["/System/Library/Fonts", "/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    return ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.local/share/fonts"),
+            os.path.expanduser("~/.fonts")]
+
+
+def _fc_list(family: str) -> List[str]:
+    if not shutil.which("fc-list"):
+        return []
+    try:
+        out = subprocess.run(
+            ["fc-list", f":family={family}", "file"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except Exception:
+        return []
+    return [line.split(":")[0].strip() for line in out.splitlines() if line.strip()]
+
+
+def _find_font_files(family: str, font_dirs: List[str]) -> List[str]:
+    patterns = [p.lower() for p in FONT_FILES.get(family, [])]
+    found = []
+    if patterns:
+        for font_dir in font_dirs:
+            for dirpath, _, filenames in os.walk(font_dir):
+                for name in filenames:
+                    lower = name.lower()
+                    if any(fnmatch.fnmatch(lower, p) for p in patterns):
+                        found.append(os.path.join(dirpath, name))
+    return found or _fc_list(family)
+
+
+def prepare_font_dir(families: Iterable[str], font_dir: str = FONT_DIR) -> Optional[str]:
+    """把 families 的字体文件链接/复制到 font_dir; 无法确定字体文件时返回 None
+
+    已存在且大小相同的文件不再复制，字体目录在各报告、各次构建间共享。
+    """
+    os.makedirs(font_dir, exist_ok=True)
+    font_dirs = [d for d in _system_font_dirs() if os.path.isdir(d)]
+    missing = []
+    for family in families:
+        files = _find_font_files(family, font_dirs)
+        if not files:
+            missing.append(family)
+            continue
+        for src in files:
+            dst = os.path.join(font_dir, os.path.basename(src))
+            if os.path.exists(dst) and os.path.getsize(dst) == os.path.getsize(src):
+                continue
+            try:
+                if os.path.exists(dst):
+                    os.remove(dst)
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+    # 已知字体族找不到说明系统中也没有 (扫描系统字体也一样找不到);
+    # 未知字体族找不到时无法确定, 退回系统字体扫描
+    unknown = [f for f in missing if f not in FONT_FILES]
+    if unknown:
+        print(f"  [WARN] 找不到字体 {', '.join(unknown)} 的字体文件，使用系统字体扫描")
+        return None
+    if not os.listdir(font_dir):
+        return None
+    if missing:
+        print(f"  [INFO] 系统中没有字体 {', '.join(missing)} (使用报告中的后备字体)")
+    return font_dir
+
+
+# ----------------------------------------------------------------------
+# 构建状态
+# ----------------------------------------------------------------------
+class BuildCache:
+    """每个报告的依赖指纹 {路径: [mtime_ns, size, sha256]}"""
+
+    def __init__(self, path: str = STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def fingerprint(self, path: str, previous: Optional[list] = None) -> list:
+        """文件指纹; 修改时间和大小与 previous 相同时沿用其内容哈希"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return [None, None, "missing"]
+        if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+            return list(previous)
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return [st.st_mtime_ns, st.st_size, digest.hexdigest()]
+
+    def inputs(self, report: str, files: List[str]) -> Dict[str, list]:
+        stored = self.state.get(report, {}).get("inputs", {})
+        return {p: self.fingerprint(p, stored.get(p)) for p in files}
+
+    def stale_reason(self, report: str, pdf: str, inputs: Dict[str, list], version: str) -> Optional[str]:
+        """需要重编译的原因; 最新时返回 None"""
+        entry = self.state.get(report)
+        if not os.path.exists(pdf):
+            return "PDF 不存在"
+        if not entry:
+            return "没有构建记录"
+        if entry.get("typst") != version:
+            return "typst 版本变化"
+        stored = entry.get("inputs", {})
+        for path, fp in inputs.items():
+            if path not in stored or stored[path][2] != fp[2]:
+                return f"{os.path.basename(path)} 已变化"
+        if set(stored) - set(inputs):
+            return "依赖减少"
+        return None
+
+    def record(self, report: str, inputs: Dict[str, list], version: str) -> None:
+        with self._lock:
+            self.state[report] = {"inputs": inputs, "typst": version, "built": time.time()}
+
+    def save(self) -> None:
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=1, ensure_ascii=False)
+
+
+# ----------------------------------------------------------------------
+# 编译
+# ----------------------------------------------------------------------
+def typst_version(typst: str = "typst") -> str:
+    try:
+        return subprocess.run([typst, "--version"], capture_output=True, text=True, timeout=10).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compile_report(
+    typ_file: str,
+    pdf_file: str,
+    root: str,
+    font_dir: Optional[str] = None,
+    typst: str = "typst",
+    timeout: int = COMPILE_TIMEOUT,
+) -> subprocess.CompletedProcess:
+    cmd = [typst, "compile", "--root", root]
+    if font_dir:
+        cmd += ["--font-path", font_dir, "--ignore-system-fonts"]
+    cmd += [typ_file, pdf_file]
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+
+def build_reports(
+    reports: Optional[Iterable[str]] = None,
+    force: bool = False,
+    jobs: Optional[int] = None,
+    font_cache: bool = True,
+    typst: str = "typst",
+    timeout: int = COMPILE_TIMEOUT,
+    dry_run: bool = False,
+) -> Dict[str, str]:
+    """编译过期的报告，返回 {报告: 状态}，状态为 built / up-to-date / failed / stale
+
+    PDF 与 .typ 同名同目录。dry_run=True 时只列出依赖和状态。
+    """
+    reports = [os.path.abspath(r) for r in (reports or discover_reports())]
+    cache = BuildCache()
+    status = {}
+    if not dry_run and not shutil.which(typst):
+        print(f"  ✗ 找不到 {typst}，无法编译 PDF")
+        return {r: "failed" for r in reports}
+    version = typst_version(typst) if not dry_run else cache.state.get("_typst", "")
+
+    t0 = time.perf_counter()
+    pending = []
+    fonts = {}
+    for report in reports:
+        deps = scan_dependencies(report)
+        # 字体多在导入的模板中设置
+        fonts[report] = font_families([report] + [d for d in deps if d.endswith(".typ")])
+        root = project_root(report, deps)
+        files = [report] + deps + ([TEMPLATE] if os.path.exists(TEMPLATE) else [])
+        inputs = cache.inputs(report, files)
+        pdf = os.path.splitext(report)[0] + ".pdf"
+        reason = "--force" if force else cache.stale_reason(report, pdf, inputs, version)
+        missing = [os.path.relpath(p, root) for p, fp in inputs.items() if fp[2] == "missing"]
+        name = os.path.relpath(report, REPO_ROOT) if report.startswith(REPO_ROOT) else report
+        if dry_run:
+            print(f"  {name}: {reason or '最新'} ({len(deps)} 个依赖, root={root})")
+            for path in missing:
+                print(f"      缺失: {path}")
+            status[report] = "stale" if reason else "up-to-date"
+            continue
+        if reason is None:
+            status[report] = "up-to-date"
+            continue
+        if missing:
+            print(f"  [WARN] {name} 缺少 {len(missing)} 个引用文件: {', '.join(missing[:3])}")
+        pending.append((report, name, pdf, root, inputs, reason))
+
+    if dry_run:
+        return status
+    if not pending:
+        print(f"  ✓ {len(reports)} 个报告均为最新 ({time.perf_counter() - t0:.2f}s)")
+        return status
+
+    font_dir = None
+    if font_cache:
+        families = []
+        for item in pending:
+            families += [f for f in fonts[item[0]] if f not in families]
+        if families:
+            font_dir = prepare_font_dir(families)
+
+    def run(item):
+        report, name, pdf, root, inputs, reason = item
+        start = time.perf_counter()
+        try:
+            # 没有指定字体的报告不能忽略系统字体
+            result = compile_report(
+                report, pdf, root, font_dir if fonts[report] else None, typst, timeout
+            )
+        except Exception as e:
+            return item, None, str(e), time.perf_counter() - start
+        return item, result.returncode, result.stderr, time.perf_counter() - start
+
+    workers = jobs or min(len(pending), os.cpu_count() or 1)
+    print(f"  编译 {len(pending)} 个报告 (并行 {workers}, 跳过 {len(reports) - len(pending)} 个最新报告)")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for item, code, stderr, elapsed in pool.map(run, pending):
+            report, name, pdf, root, inputs, reason = item
+            if code == 0:
+                cache.record(report, inputs, version)
+                status[report] = "built"
+                print(f"  ✓ PDF: {name} ({reason}, {elapsed:.1f}s)")
+            else:
+                status[report] = "failed"
+                print(f"  ✗ PDF 编译失败: {name}: {(stderr or '').strip()}")
+    cache.state["_typst"] = version
+    cache.save()
+    print(f"  报告构建完成: {time.perf_counter() - t0:.1f}s")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Typst 报告增量构建")
+    parser.add_argument("reports", nargs="*", help="报告 .typ (默认: 仓库中全部报告)")
+    parser.add_argument("--force", action="store_true", help="忽略构建记录, 全部重新编译")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="并行编译数 (默认: CPU 核数)")
+    parser.add_argument("--no-font-cache", action="store_true", help="不使用共享字体目录 (扫描系统字体)")
+    parser.add_argument("--typst", default="typst", help="typst 可执行文件")
+    parser.add_argument("--timeout", type=int, default=COMPILE_TIMEOUT, help="单个报告编译超时 (秒)")
+    parser.add_argument("--list", action="store_true", help="只列出依赖和状态, 不编译")
+    args = parser.parse_args()
+
+    status = build_reports(
+        args.reports or None,
+        force=args.force,
+        jobs=args.jobs,
+        font_cache=not args.no_font_cache,
+        typst=args.typst,
+        timeout=args.timeout,
+        dry_run=args.list,
+    )
+    return 1 if "failed" in status.values() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+results_cache.py - 仿真结果的本地 SQLite 缓存 (报告重建不连接 AEDT)
+
+报告脚本每次都要附着桌面、占用许可证，只为读取没有变化的损耗数值。
+get_results 读取一次后把结果 (JSON) 写入缓存，键为
+(工程, 设计, Setup, 变化)，同时记录工程文件路径和该设计求解结果目录
+(<工程>.aedtresults/<设计>.results) 的修改时间。之后的报告重建:
+
+  - 结果目录修改时间未变 -> 直接使用缓存 (hit)
+  - 结果目录已变化 (重新求解过) -> 缓存失效 (stale)，重新读取
+  - 写入缓存时没有结果目录、现在有了 -> 无法校验，同样视为失效 (stale)
+  - 找不到结果目录 (工程移动/另一台机器) -> 无法校验 (unverified)，
+    默认视为未命中并重新读取; 只有 --offline 时才使用并打印醒目警告
+
+variation 为空字符串表示名义变化 (报告读取的就是名义解)。
+数据库位于缓存目录 (MAXWELL_AEDT_CACHE) 下的 results.sqlite。
+
+用法:
+    from aedt_common.results_cache import ResultsCache
+
+    cache = ResultsCache()
+    payload, status = cache.lookup("KYN28_V19_Final", "EddyCurrent_Galvalume", "Setup1")
+    if status != "hit":
+        payload = read_from_aedt()
+        cache.store("KYN28_V19_Final", "EddyCurrent_Galvalume", "Setup1", payload, m3d.project_file)
+"""
+
+import os
+import json
+import time
+import sqlite3
+from typing import Iterable, Optional, Tuple
+
+from aedt_common import cache_path
+
+DB_FILE = cache_path("results.sqlite")
+MTIME_TOLERANCE = 1e-3  # 秒
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    project TEXT NOT NULL,
+    design TEXT NOT NULL,
+    setup TEXT NOT NULL,
+    variation TEXT NOT NULL,
+    project_file TEXT,
+    solution_mtime REAL,
+    stored REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (project, design, setup, variation)
+)
+"""
+
+
+def solution_mtime(project_file: Optional[str], design: str) -> Optional[float]:
+    """设计求解结果目录的最新修改时间; 找不到时返回 None
+
+    只看结果目录本身及其直接子项 (重新求解会重写这些文件)，不递归遍历场数据。
+    """
+    if not project_file:
+        return None
+    results_dir = os.path.splitext(project_file)[0] + ".aedtresults"
+    design_dir = os.path.join(results_dir, f"{design}.results")
+    if not os.path.isdir(design_dir):
+        return None
+    latest = os.path.getmtime(design_dir)
+    with os.scandir(design_dir) as entries:
+        for entry in entries:
+            try:
+                latest = max(latest, entry.stat().st_mtime)
+            except OSError:
+                pass
+    return latest
+
+
+class ResultsCache:
+    """(工程, 设计, Setup, 变化) -> 结果字典"""
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def lookup(
+        self, project: str, design: str, setup: str, variation: str = ""
+    ) -> Tuple[Optional[dict], str]:
+        """-> (结果, 状态)，状态为 hit / stale / unverified / miss"""
+        row = self._conn.execute(
+            "SELECT project_file, solution_mtime, payload FROM results "
+            "WHERE project=? AND design=? AND setup=? AND variation=?",
+            (project, design, setup, variation),
+        ).fetchone()
+        if row is None:
+            return None, "miss"
+        project_file, stored_mtime, payload = row
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return None, "miss"
+        current = solution_mtime(project_file, design)
+        if current is None:
+            return data, "unverified"
+        if stored_mtime is None:
+            # 写入时没有结果目录，无法证明缓存对应当前的求解结果
+            return data, "stale"
+        if abs(current - stored_mtime) > MTIME_TOLERANCE:
+            return data, "stale"
+        return data, "hit"
+
+    def store(
+        self,
+        project: str,
+        design: str,
+        setup: str,
+        payload: dict,
+        project_file: Optional[str] = None,
+        variation: str = "",
+    ) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                project, design, setup, variation, project_file,
+                solution_mtime(project_file, design), time.time(),
+                json.dumps(payload, ensure_ascii=False),
+            ),
+        )
+        self._conn.commit()
+
+    def invalidate(self, project: str, design: Optional[str] = None) -> int:
+        """删除工程 (或其中一个设计) 的缓存，返回删除的条数"""
+        if design is None:
+            cur = self._conn.execute("DELETE FROM results WHERE project=?", (project,))
+        else:
+            cur = self._conn.execute(
+                "DELETE FROM results WHERE project=? AND design=?", (project, design)
+            )
+        self._conn.commit()
+        return cur.rowcount
+
+
+_STATUS_TEXT = {
+    "hit": "结果目录未变化",
+    "unverified": "找不到结果目录, 未校验",
+    "stale": "结果目录已变化",
+}
+
+
+def load_cached(
+    cache: Optional[ResultsCache],
+    project: str,
+    design: str,
+    setup: str,
+    refresh: bool = False,
+    offline: bool = False,
+    require: Iterable[str] = (),
+) -> Optional[dict]:
+    """报告脚本的缓存读取: 可用时返回结果 (并打印来源)，否则返回 None
+
+    refresh=True 时忽略缓存; 失效 (stale) 和无法校验 (unverified) 的缓存
+    只在 offline=True 时使用 (不连接 AEDT)，否则视为未命中。
+    require 中的键在缓存结果里缺失 (或为空) 时视为不可用。
+    """
+    if cache is None or refresh:
+        return None
+    data, status = cache.lookup(project, design, setup)
+    if data is None:
+        return None
+    if status in ("stale", "unverified") and not offline:
+        print(f"  缓存不可用 ({_STATUS_TEXT[status]}), 从 AEDT 重新读取")
+        return None
+    missing = [key for key in require if not data.get(key)]
+    if missing:
+        print(f"  缓存中没有 {', '.join(missing)}, 需要从 AEDT 读取")
+        return None
+    if status == "unverified":
+        print(f"  ⚠ 使用未校验的结果缓存 ({_STATUS_TEXT[status]}), 结果可能已过期;"
+              f" 需要最新结果时去掉 --offline")
+    else:
+        print(f"  ✓ 使用结果缓存 ({_STATUS_TEXT[status]}), 不连接 AEDT")
+    return data
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+session_pool.py - 共享的 AEDT 桌面会话池
+
+所有 setup/report 脚本都通过本模块拿 Maxwell3d 设计句柄，而不是各自
+new_desktop_session=True 启动一个新桌面:
+
+  - 首次运行: 以固定 gRPC 端口启动桌面，并把端口/进程号写入状态文件
+  - 后续运行: 探测状态文件记录的桌面，存活则直接附着 (省去数十秒启动时间)
+  - 就绪判定: 轮询端口/进程 + 调用一次 GetVersion()，取代固定的 time.sleep
+
+用法:
+    from aedt_common.session_pool import get_pool
+
+    pool = get_pool(version="2024.2")
+    m3d = pool.open_design("KYN28_V19_Final", "EddyCurrent_Galvalume",
+                           solution_type="EddyCurrent")
+    ...
+    pool.release(m3d)   # 释放句柄，桌面保持运行供下次复用
+"""
+
+import os
+import json
+import time
+import socket
+import inspect
+import platform
+import subprocess
+from typing import Optional
+
+from aedt_common import CACHE_DIR
+from aedt_common.detection import cached_transport, record_transport
+from aedt_common.recorder import get_player, get_recorder
+
+DEFAULT_GRPC_PORT = int(os.environ.get("MAXWELL_AEDT_PORT", "50051"))
+STATE_FILE = os.path.join(CACHE_DIR, "session_pool.json")  # 首次写入时再创建目录
+
+# 脚本登记的 PyAEDT 全局设置，首次导入 PyAEDT 时统一应用
+_DEFERRED_SETTINGS = {}
+
+
+def defer_settings(**values) -> None:
+    """登记 PyAEDT settings (如 enable_error_handler=False)
+
+    脚本顶层不再 `from pyaedt import settings`，--help / 报告重建等
+    不连接桌面的路径因此不会加载 AEDT 栈。
+    """
+    _DEFERRED_SETTINGS.update(values)
+
+
+def _import_pyaedt():
+    """按需导入 PyAEDT (新包名优先，旧包名兜底)"""
+    try:
+        from ansys.aedt.core import settings, Maxwell3d  # type: ignore
+    except Exception:
+        from pyaedt import settings, Maxwell3d  # type: ignore
+    for name, value in _DEFERRED_SETTINGS.items():
+        try:
+            setattr(settings, name, value)
+        except Exception as e:
+            print(f"[WARN] 无法设置 PyAEDT settings.{name}: {e}")
+    return settings, Maxwell3d
+
+
+def _version_supports_grpc(version: Optional[str]) -> bool:
+    """2022.2 及以上版本支持 gRPC"""
+    if not version:
+        return True
+    try:
+        return tuple(map(int, version.split(".")[:2])) >= (2022, 2)
+    except ValueError:
+        return True
+
+
+def _port_open(port: int, host: str = "localhost", timeout: float = 0.5) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if platform.system() == "Windows":
+        try:
+            output = subprocess.check_output(
+                ["tasklist", "/FI", f"PID eq {pid}"], text=True, errors="ignore"
+            )
+            return str(pid) in output
+        except Exception:
+            return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _aedt_process_running() -> bool:
+    """是否有 ansysedt 进程在运行 (COM 附着时使用)"""
+    try:
+        if platform.system() == "Windows":
+            output = subprocess.check_output(["tasklist"], text=True, errors="ignore")
+        else:
+            output = subprocess.check_output(["ps", "-A"], text=True, errors="ignore")
+        return "ansysedt" in output.lower()
+    except Exception:
+        return False
+
+
+class SessionPool:
+    """单桌面会话池: 负责启动/附着桌面并分发设计句柄"""
+
+    def __init__(
+        self,
+        version: Optional[str] = None,
+        non_graphical: bool = False,
+        port: Optional[int] = None,
+        use_grpc: Optional[bool] = None,
+        state_file: str = STATE_FILE,
+    ):
+        self.version = version
+        self.non_graphical = non_graphical
+        self.port = port or DEFAULT_GRPC_PORT
+        if use_grpc is None:
+            # 调用方未指定时，已验证可用的传输方式优先于按版本推断的默认值
+            cached = cached_transport(version)
+            use_grpc = _version_supports_grpc(version) if cached is None else cached
+        self.use_grpc = use_grpc
+        self.state_file = state_file
+        self._pinned = True
+        self._apps = []
+
+    # ------------------------------------------------------------------
+    # 状态文件
+    # ------------------------------------------------------------------
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, app) -> None:
+        pid = None
+        try:
+            pid = int(app.odesktop.GetProcessID())
+        except Exception:
+            pass
+        state = {
+            "version": self.version,
+            "grpc": self.use_grpc,
+            "port": self.port if self.use_grpc else 0,
+            "pid": pid,
+            "updated": time.time(),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with open(self.state_file, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+        except OSError as e:
+            print(f"[WARN] 无法写入会话状态文件 {self.state_file}: {e}")
+
+    # ------------------------------------------------------------------
+    # 探测
+    # ------------------------------------------------------------------
+    def desktop_alive(self) -> bool:
+        """状态文件记录的桌面是否仍在运行"""
+        state = self._load_state()
+        if self.use_grpc:
+            port = state.get("port") or self.port
+            if _port_open(port):
+                self.port = port
+                return True
+            return False
+        pid = state.get("pid")
+        if pid:
+            return _pid_alive(pid)
+        return _aedt_process_running()
+
+    def wait_until_ready(self, timeout: float = 120.0, interval: float = 1.0) -> bool:
+        """轮询直到桌面可连接，超时返回 False"""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            if self.use_grpc and _port_open(self.port):
+                return True
+            if not self.use_grpc and _aedt_process_running():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    @staticmethod
+    def probe(app) -> bool:
+        """向桌面发一次轻量请求，确认句柄真正可用"""
+        try:
+            return bool(app.odesktop.GetVersion())
+        except Exception:
+            return False
+
+    def launch_from_bat(self, bat_path: str, timeout: float = 120.0) -> bool:
+        """运行 AEDT 启动脚本 (通常同时启动许可服务)，并等待桌面就绪"""
+        if not os.path.isfile(bat_path):
+            print(f"[WARN] 启动脚本不存在: {bat_path}")
+            return False
+
+        print(f"[INFO] 启动 AEDT: {bat_path}")
+        try:
+            comspec = os.environ.get("COMSPEC", r"C:\Windows\System32\cmd.exe")
+            subprocess.Popen([comspec, "/c", bat_path], close_fds=True)
+        except Exception as e:
+            print(f"[WARN] 启动 AEDT 失败: {e}")
+            return False
+
+        # 启动脚本拉起的桌面不监听 gRPC 端口，按 COM 进程探测
+        self.use_grpc = False
+        t0 = time.monotonic()
+        ready = self.wait_until_ready(timeout)
+        if ready:
+            print(f"[INFO] AEDT 进程已就绪 ({time.monotonic() - t0:.1f}s)")
+        else:
+            print(f"[WARN] 等待 AEDT 启动超时 ({timeout:.0f}s)")
+        return ready
+
+    # ------------------------------------------------------------------
+    # 设计句柄
+    # ------------------------------------------------------------------
+    def _build_kwargs(self, Maxwell3d, project, design, solution_type, new_desktop):
+        """兼容 PyAEDT 新旧两套构造参数名"""
+        sig = inspect.signature(Maxwell3d.__init__)
+        if "projectname" in sig.parameters:
+            kw = dict(
+                projectname=project,
+                designname=design,
+                specified_version=self.version,
+                new_desktop_session=new_desktop,
+            )
+        else:
+            kw = dict(
+                project=project,
+                design=design,
+                version=self.version,
+                new_desktop=new_desktop,
+            )
+        kw["non_graphical"] = self.non_graphical
+        if solution_type:
+            kw["solution_type"] = solution_type
+        if self.use_grpc and self._pinned and "port" in sig.parameters:
+            kw["port"] = self.port
+        return kw
+
+    def _open(self, project, design, solution_type, new_desktop):
+        settings, Maxwell3d = _import_pyaedt()
+        settings.use_grpc_api = self.use_grpc
+        app = Maxwell3d(
+            **self._build_kwargs(Maxwell3d, project, design, solution_type, new_desktop)
+        )
+        # 强制触发一次 modeler 初始化，避免后续出现 '_modeler' 这种延迟错误
+        _ = app.modeler.object_names
+        return app
+
+    @staticmethod
+    def _discard(app, close_desktop: bool = False) -> None:
+        """丢弃未通过探测的句柄 (重试前释放，避免句柄/桌面泄漏)"""
+        try:
+            app.release_desktop(close_projects=False, close_desktop=close_desktop)
+        except Exception as e:
+            print(f"[WARN] 释放未就绪的 AEDT 句柄失败: {e}")
+
+    def open_design(
+        self,
+        project: str,
+        design: str,
+        solution_type: Optional[str] = None,
+        launch: bool = True,
+        ready_timeout: float = 60.0,
+    ):
+        """打开 (或创建) 设计并返回 Maxwell3d 句柄
+
+        - 池中桌面存活: 直接附着
+        - 否则 launch=True 时启动新桌面并登记到状态文件
+        - 附着失败时在 ready_timeout 内重试 (桌面可能仍在初始化)
+        - 首选传输方式失败时回退到另一种 (gRPC <-> COM)
+        - 设置 MAXWELL_AEDT_REPLAY 时从录制轨迹回放，不连接桌面
+        """
+        player = get_player()
+        if player is not None:
+            app = player.open(project, design)
+            print(f"[INFO] 会话池回放设计: {project}/{design}")
+            self._apps.append(app)
+            return app
+
+        alive = self.desktop_alive()
+        # 池外手动打开的桌面: 不指定端口，交给 PyAEDT 自行查找
+        self._pinned = alive or launch
+        new_desktop = not alive and launch
+        t0 = time.monotonic()
+        deadline = t0 + ready_timeout
+        errors = []
+        while True:
+            try:
+                app = self._open(project, design, solution_type, new_desktop)
+                if self.probe(app):
+                    break
+                errors.append("桌面未响应 GetVersion()")
+                self._discard(app, close_desktop=new_desktop)
+            except Exception as e:
+                errors.append(str(e))
+            if new_desktop or time.monotonic() >= deadline:
+                app = None
+                break
+            time.sleep(1.0)
+
+        if app is None:
+            # 回退: 反向尝试另一种传输方式
+            self.use_grpc = not self.use_grpc
+            try:
+                app = self._open(project, design, solution_type, new_desktop)
+            except Exception as e:
+                self.use_grpc = not self.use_grpc
+                raise RuntimeError(
+                    "无法启动/连接 Maxwell(AEDT)。\n"
+                    f"- 首次尝试(UseGrpc={self.use_grpc})失败: {errors[-1] if errors else '未知'}\n"
+                    f"- 回退尝试(UseGrpc={not self.use_grpc})失败: {e}\n"
+                    "建议: 确认本机已安装 Ansys Electronics Desktop, 并传入正确的 --aedt-version 或设置安装路径环境变量。"
+                )
+
+        action = "启动" if new_desktop else "附着"
+        print(f"[INFO] 会话池{action}桌面: {project}/{design} ({time.monotonic() - t0:.1f}s)")
+        self._save_state(app)
+        record_transport(self.version, self.use_grpc)
+        recorder = get_recorder()
+        if recorder is not None:
+            app = recorder.record_open(app, project, design)
+        self._apps.append(app)
+        return app
+
+    def release(self, app, close_projects: bool = False) -> None:
+        """释放句柄但保持桌面运行，供后续脚本复用"""
+        try:
+            app.release_desktop(close_projects=close_projects, close_desktop=False)
+        except Exception as e:
+            print(f"[WARN] 释放 AEDT 句柄失败: {e}")
+        if app in self._apps:
+            self._apps.remove(app)
+
+    def shutdown(self) -> None:
+        """关闭池中桌面并清除状态文件"""
+        for app in list(self._apps):
+            try:
+                app.release_desktop(close_projects=True, close_desktop=True)
+            except Exception:
+                pass
+        self._apps.clear()
+        try:
+            os.remove(self.state_file)
+        except OSError:
+            pass
+
+
+_POOL: Optional[SessionPool] = None
+
+
+def get_pool(version: Optional[str] = None, **kwargs) -> SessionPool:
+    """返回进程内唯一的会话池 (首次调用时按参数创建)"""
+    global _POOL
+    if _POOL is None:
+        _POOL = SessionPool(version=version, **kwargs)
+    elif version and not _POOL.version:
+        _POOL.version = version
+    return _POOL
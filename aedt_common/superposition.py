@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+superposition.py - 静电场单位激励叠加 (三次求解, 任意电压/相位/试验电压)
+
+静电场是线性问题: 各导体网络电位给定时，空间任一点的电场
+
+    E(r) = Σ_k V_k · e_k(r)
+
+e_k 为第 k 个网络 (A/B/C 相母排) 施加 1V、其余网络及接地构架为 0V 时的
+电场。原设置脚本按 [V, 0, -V] 赋电压 (相当于相位 θ=30° 时刻、幅值为
+V/cos30° 的一个瞬间)，每换一个电压等级都要重新求解整个柜体。这里:
+
+  - 设置 (setup --superposition): 每相母排合并为一个网络，电压为设计变量
+    V_A/V_B/V_C = if(Unit_Case==k, 1V, 0V)，参数扫描 Unit_Case = 1..3
+    复用同一网格 (CopyMesh) 并保存场，一次 Analyze 得到三个单位解
+  - 导出: 三个单位解的 E 矢量在同一规则网格上导出，转存为 float32 .npy
+    (缓存目录 superposition/<项目>_<设计>/)，之后的研究不再连接 AEDT;
+    项目文件修改时间变化 (重新求解并保存) 后重新导出
+  - 组合 (NumPy，按点分块):
+      instant(V, θ)     三相瞬时值 V_k = V·cos(θ + φ_k), φ = 0, -120°, +120°
+      envelope(V)       每点一个工频周期内 |E| 的最大值及出现的相位
+      sweep(V, 角度)    0–360° 扫描，每个相位的最大 |E| 与位置
+      withstand(U)      工频耐压: 每相依次施加 √2·U，其余相接地
+
+相量形式: E(θ) = Re{Ẽ·e^{jθ}} = a·cosθ − b·sinθ，Ẽ = a + jb = Σ V·e^{jφ_k}·e_k，
+|E(θ)|² = (A+B)/2 + (A−B)/2·cos2θ − C·sin2θ (A=|a|², B=|b|², C=a·b)，
+周期内最大值 (A+B)/2 + √(((A−B)/2)² + C²)，无需逐角度计算。
+
+用法:
+    from aedt_common.superposition import (
+        UnitFields, add_unit_sweep, assign_unit_excitations, export_unit_fields, phase_nets,
+    )
+
+    # 设置脚本
+    nets = phase_nets(busbars_sorted)
+    assign_unit_excitations(m3d, nets)
+    add_unit_sweep(m3d, "Setup1", nets)
+
+    # 后处理
+    fields = UnitFields.load(export_unit_fields(m3d))
+    peak, angle = fields.envelope(16970)
+"""
+
+import os
+import json
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from aedt_common import cache_path
+from aedt_common.field_data import iter_field_file
+from aedt_common.part_classifier import PartTable
+
+PHASES = ("A", "B", "C")
+PHASE_SHIFT_DEG = {"A": 0.0, "B": -120.0, "C": 120.0}
+CASE_VARIABLE = "Unit_Case"
+SWEEP_NAME = "UnitCases"
+BREAKDOWN_E = 3.0e6     # V/m, 空气击穿场强 (3 kV/mm)
+GRID_STEP = 10.0        # mm, 导出网格步长
+MAX_GRID_POINTS = 5_000_000
+CHUNK_POINTS = 1_000_000
+
+
+def net_variable(net: str) -> str:
+    return f"V_{net}"
+
+
+def field_dir(project: str, design: str) -> str:
+    return os.path.dirname(cache_path("superposition", f"{project}_{design}", "meta.json"))
+
+
+def _load_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json(path: str, data: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# ----------------------------------------------------------------------
+# 设置阶段 (AEDT)
+# ----------------------------------------------------------------------
+def phase_nets(busbars: Sequence[str], phases: Sequence[str] = PHASES) -> Dict[str, List[str]]:
+    """按原脚本的轮换规则 (第 i 根母排属于 phases[i % 3]) 把母排分为相网络"""
+    nets = {p: [] for p in phases}
+    for i, name in enumerate(busbars):
+        nets[phases[i % len(phases)]].append(name)
+    return {p: names for p, names in nets.items() if names}
+
+
+def assign_unit_excitations(app, nets: Dict[str, List[str]], prefix: str = "Voltage_") -> bool:
+    """每个网络一个电压激励，取值为随 Unit_Case 切换的 1V/0V 设计变量"""
+    try:
+        app[CASE_VARIABLE] = "1"
+        for k, net in enumerate(nets, 1):
+            app[net_variable(net)] = f"if({CASE_VARIABLE}=={k},1V,0V)"
+    except Exception as e:
+        print(f"  ✗ 单位激励变量定义失败: {e}")
+        return False
+    ok = True
+    for net, names in nets.items():
+        try:
+            app.assign_voltage(names, net_variable(net), name=f"{prefix}{net}")
+            print(f"  {net} 相: {len(names)} 根母排 -> {net_variable(net)}")
+        except Exception as e:
+            print(f"  ✗ {net} 相电压激励失败: {e}")
+            ok = False
+    return ok
+
+
+def add_unit_sweep(app, setup_name: str, nets: Dict[str, List[str]]) -> Optional[str]:
+    """参数扫描 Unit_Case = 1..N (保存场, 复用网格)，返回扫描名
+
+    parametrics.add 新旧 PyAEDT 参数名不同，按位置传参
+    (变量, 起点, 终点, 步长, 扫描类型, Setup, 名称)。
+    """
+    try:
+        sweep = app.parametrics.add(CASE_VARIABLE, 1, len(nets), 1, "LinearStep", setup_name, SWEEP_NAME)
+        options = sweep.props.get("ProdOptiSetupDataV2", {})
+        options["SaveFields"] = True
+        options["CopyMesh"] = True
+        sweep.props["ProdOptiSetupDataV2"] = options
+        sweep.update()
+    except Exception as e:
+        print(f"  ✗ 单位激励参数扫描创建失败: {e}")
+        return None
+    _save_json(os.path.join(field_dir(app.project_name, app.design_name), "nets.json"), {
+        "variable": CASE_VARIABLE,
+        "setup": setup_name,
+        "sweep": SWEEP_NAME,
+        "nets": nets,
+    })
+    print(f"  ✓ 参数扫描 {SWEEP_NAME}: {CASE_VARIABLE} = 1..{len(nets)} (保存场, 复用网格)")
+    return SWEEP_NAME
+
+
+# ----------------------------------------------------------------------
+# 导出阶段 (AEDT -> .npy 缓存)
+# ----------------------------------------------------------------------
+def _project_stamp(project_file: str) -> Optional[int]:
+    try:
+        return os.stat(project_file).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def cached_fields(project: str, design: str, setup: str = "Setup1", step_mm: float = GRID_STEP) -> Optional[str]:
+    """缓存的单位解仍有效 (同一 Setup/步长, 项目文件未变) 时返回其目录"""
+    directory = field_dir(project, design)
+    meta = _load_json(os.path.join(directory, "meta.json"))
+    if not meta or meta.get("setup") != setup or meta.get("step_mm") != step_mm:
+        return None
+    if _project_stamp(meta.get("project_file")) != meta.get("project_mtime"):
+        return None
+    files = ["points.npy"] + [f"E_{net}.npy" for net in meta.get("nets", [])]
+    if not all(os.path.exists(os.path.join(directory, f)) for f in files):
+        return None
+    return directory
+
+
+def _model_bounds(app) -> List[float]:
+    """全部实体 (Region 除外) 的包围盒 (mm)，一次 RunScript 取回"""
+    objs = [n for n in app.modeler.solid_names if "Region" not in n]
+    return PartTable.query(app, objs, verbose=False).extent()
+
+
+def load_nets(project: str, design: str) -> Optional[Dict[str, List[str]]]:
+    """设置脚本 --superposition 记录的相网络 {A: [母排...], ...}"""
+    return _load_json(os.path.join(field_dir(project, design), "nets.json")).get("nets") or None
+
+
+def export_unit_fields(
+    app,
+    setup: str = "Setup1",
+    step_mm: float = GRID_STEP,
+    bounds: Optional[Sequence[float]] = None,
+    refresh: bool = False,
+) -> Optional[str]:
+    """导出各单位解的 E 矢量 (规则网格) 并转存为 .npy，返回缓存目录"""
+    if not refresh:
+        directory = cached_fields(app.project_name, app.design_name, setup, step_mm)
+        if directory:
+            print(f"  [叠加] 使用缓存的单位解: {directory}")
+            return directory
+    directory = field_dir(app.project_name, app.design_name)
+    info = _load_json(os.path.join(directory, "nets.json"))
+    nets = list(info.get("nets") or PHASES)
+
+    bounds = list(bounds) if bounds else _model_bounds(app)
+    start, stop = bounds[:3], bounds[3:]
+    step = [step_mm] * 3
+    center = [(a + b) / 2 for a, b in zip(start, stop)]
+    count = int(np.prod([math.floor((b - a) / step_mm) + 1 for a, b in zip(start, stop)]))
+    print(f"  [叠加] 导出网格 {count} 点 (步长 {step_mm:g}mm)")
+    if count > MAX_GRID_POINTS:
+        print(f"  [WARN] 网格点数超过 {MAX_GRID_POINTS}, 导出较慢, 可增大步长")
+
+    points = None
+    for k, net in enumerate(nets, 1):
+        t0 = time.perf_counter()
+        fld = os.path.join(directory, f"unit_{net}.fld")
+        # export_field_file_on_grid 新旧 PyAEDT 参数名不同，按位置传参
+        # (物理量, 解, 变化, 文件, 网格类型, 中心, 起点, 终点, 步长, 矢量)
+        app.post.export_field_file_on_grid(
+            "E", f"{setup} : LastAdaptive", {CASE_VARIABLE: str(k)}, fld,
+            "Cartesian", center, start, stop, step, True,
+        )
+        if not os.path.exists(fld):
+            print(f"  ✗ {net} 相单位解导出失败")
+            return None
+        # 分块读取, 每块即转为 float32 (坐标 3 列 + 场 3 列)
+        data = np.vstack([block[:, :6].astype(np.float32) for block in iter_field_file(fld)])
+        if points is None:
+            points = data[:, :3]
+            np.save(os.path.join(directory, "points.npy"), points)
+        elif len(data) != len(points) or not np.allclose(data[:, :3], points):
+            print(f"  ✗ {net} 相单位解的采样点与 {nets[0]} 相不一致")
+            return None
+        np.save(os.path.join(directory, f"E_{net}.npy"), np.nan_to_num(data[:, 3:6]))
+        os.remove(fld)
+        print(f"    ✓ {net} 相 ({CASE_VARIABLE}={k}): {len(data)} 点, {time.perf_counter() - t0:.1f}s")
+
+    project_file = getattr(app, "project_file", None)
+    _save_json(os.path.join(directory, "meta.json"), {
+        "project": app.project_name,
+        "design": app.design_name,
+        "setup": setup,
+        "step_mm": step_mm,
+        "bounds": bounds,
+        "nets": nets,
+        "points": int(len(points)),
+        "project_file": project_file,
+        "project_mtime": _project_stamp(project_file),
+        "created": time.time(),
+    })
+    return directory
+
+
+# ----------------------------------------------------------------------
+# 组合阶段 (纯 NumPy)
+# ----------------------------------------------------------------------
+class UnitFields:
+    """单位解: 采样点 (N, 3) m 与各网络 1V 时的电场 (K, N, 3) V/m"""
+
+    def __init__(self, points, fields, nets: Sequence[str], meta: Optional[dict] = None):
+        self.points = points
+        self.fields = fields
+        self.nets = list(nets)
+        self.meta = meta or {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @classmethod
+    def load(cls, directory: str) -> "UnitFields":
+        meta = _load_json(os.path.join(directory, "meta.json"))
+        nets = meta.get("nets") or list(PHASES)
+        points = np.load(os.path.join(directory, "points.npy"), mmap_mode="r")
+        fields = [np.load(os.path.join(directory, f"E_{net}.npy"), mmap_mode="r") for net in nets]
+        return cls(points, fields, nets, meta)
+
+    @property
+    def cell_volume(self) -> float:
+        """每个采样点代表的体积 (mm³)"""
+        return float(self.meta.get("step_mm", GRID_STEP)) ** 3
+
+    def _chunks(self):
+        for start in range(0, len(self), CHUNK_POINTS):
+            yield slice(start, min(start + CHUNK_POINTS, len(self)))
+
+    def _combine(self, coeffs: Sequence[float], part: slice) -> np.ndarray:
+        total = np.zeros((part.stop - part.start, 3))
+        for c, e in zip(coeffs, self.fields):
+            if c:
+                total += c * np.asarray(e[part], dtype=float)
+        return total
+
+    def _coeffs(self, voltages) -> List[float]:
+        if isinstance(voltages, dict):
+            return [float(voltages.get(net, 0.0)) for net in self.nets]
+        return [float(v) for v in voltages]
+
+    def magnitude(self, voltages) -> np.ndarray:
+        """给定各网络电压 ({网络: V} 或按 nets 顺序的序列) 的 |E| (N,)"""
+        coeffs = self._coeffs(voltages)
+        out = np.empty(len(self), dtype=np.float32)
+        for part in self._chunks():
+            out[part] = np.linalg.norm(self._combine(coeffs, part), axis=1)
+        return out
+
+    def instant_voltages(self, amplitude: float, angle_deg: float) -> Dict[str, float]:
+        return {
+            net: amplitude * math.cos(math.radians(angle_deg + PHASE_SHIFT_DEG.get(net, 0.0)))
+            for net in self.nets
+        }
+
+    def instant(self, amplitude: float, angle_deg: float) -> np.ndarray:
+        """三相对称电压 (相电压峰值 amplitude) 在相位 angle_deg 时的 |E|"""
+        return self.magnitude(self.instant_voltages(amplitude, angle_deg))
+
+    def envelope(self, amplitude: float):
+        """每点一个周期内 |E| 的最大值 (N,) 与出现该值的相位 (N,, 度)"""
+        shifts = [math.radians(PHASE_SHIFT_DEG.get(net, 0.0)) for net in self.nets]
+        re = [amplitude * math.cos(s) for s in shifts]
+        im = [amplitude * math.sin(s) for s in shifts]
+        peak = np.empty(len(self), dtype=np.float32)
+        angle = np.empty(len(self), dtype=np.float32)
+        for part in self._chunks():
+            a = self._combine(re, part)
+            b = self._combine(im, part)
+            aa = np.einsum("ij,ij->i", a, a)
+            bb = np.einsum("ij,ij->i", b, b)
+            ab = np.einsum("ij,ij->i", a, b)
+            half = (aa - bb) / 2
+            peak[part] = np.sqrt((aa + bb) / 2 + np.sqrt(half ** 2 + ab ** 2))
+            angle[part] = np.degrees(np.arctan2(-ab, half) / 2) % 180
+        return peak, angle
+
+    def sweep(self, amplitude: float, angles: Iterable[float]) -> List[dict]:
+        """各相位时刻的最大 |E| 与位置"""
+        rows = []
+        for angle in angles:
+            rows.append(dict(angle=float(angle), **self.summary(self.instant(amplitude, angle))))
+        return rows
+
+    def withstand(self, test_rms: float) -> List[dict]:
+        """工频耐压 (有效值 test_rms): 每相依次施加峰值，其余相接地"""
+        peak = test_rms * math.sqrt(2)
+        return [
+            dict(net=net, **self.summary(self.magnitude({net: peak})))
+            for net in self.nets
+        ]
+
+    def summary(self, magnitude: np.ndarray, threshold: float = BREAKDOWN_E) -> dict:
+        """最大值、位置 (mm) 及超过阈值的点数/近似体积"""
+        index = int(np.nanargmax(magnitude))
+        above = int(np.count_nonzero(magnitude > threshold))
+        return {
+            "max": float(magnitude[index]),
+            "index": index,
+            "location_mm": [float(v) * 1000 for v in self.points[index]],
+            "above": above,
+            "above_mm3": above * self.cell_volume,
+        }
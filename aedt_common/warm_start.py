@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+warm_start.py - 用参考设计的自适应网格热启动其他材料变体 (Mesh Link)
+
+覆铝锌板 / 不锈钢等材料变体几何完全相同，每个设计都从初始网格开始自适应
+(最多 MaximumPasses 个 pass)。热启动时变体 Setup 通过 Mesh Link 导入参考
+设计 Setup1 的最终自适应网格作为初始网格，只再做少量 pass 校核/加密。
+
+参考设计必须先求解 (Mesh Link 默认 force_source_to_solve, 未求解时 AEDT 会
+先求解参考设计)；参考设计和变体须在同一工程中。
+
+用法:
+    from aedt_common.warm_start import link_adapted_mesh, print_warm_start_summary
+
+    link_adapted_mesh(m3d, setup, "EddyCurrent_Galvalume")
+    ...
+    print_warm_start_summary([
+        {"design": "EddyCurrent_Galvalume", "passes": 6, "elapsed": 310.0},
+        {"design": "EddyCurrent_Stainless", "passes": 2, "elapsed": 95.0, "warm": True},
+    ])
+"""
+
+from typing import List
+
+WARM_START_PASSES = 2  # 导入参考网格后最多再做的 adaptive pass 数
+SOURCE_SOLUTION = "Setup1 : LastAdaptive"
+
+
+def link_adapted_mesh(app, setup, source_design: str, solution: str = SOURCE_SOLUTION):
+    """Setup 通过 Mesh Link 导入 source_design 的最终自适应网格
+
+    add_mesh_link 按位置传参: 新旧 PyAEDT 参数名不同，但顺序一致
+    (源设计, 源解, 变量映射)。变量映射用当前设计的名义变量 (同名变量一一对应)，
+    几何变量相同时两设计的网格一致。
+    """
+    parameters = app.available_variations.nominal_w_values_dict
+    return setup.add_mesh_link(source_design, solution, parameters)
+
+
+def unlink_mesh(setup) -> bool:
+    """取消 Mesh Link (恢复从初始网格自适应)"""
+    link = setup.props.get("MeshLink")
+    if isinstance(link, dict) and link.get("ImportMesh"):
+        link["ImportMesh"] = False
+        return setup.update()
+    return True
+
+
+def print_warm_start_summary(records: List[dict]) -> None:
+    """冷启动参考设计 vs 热启动变体: pass 数 / 墙钟时间及节省量
+
+    records 中每项: design, passes, elapsed (秒), warm (是否热启动)。
+    变体的节省量以参考设计的冷启动 pass 数 / 耗时为基准
+    (同几何的变体冷启动时 pass 数和耗时与参考相当)。
+    """
+    ref = next((r for r in records if not r.get("warm")), None)
+    warm = [r for r in records if r.get("warm")]
+    if ref is None or not warm:
+        return
+    print("\n" + "-" * 70)
+    print("网格热启动 (Mesh Link) 统计, 基准为参考设计冷启动")
+    print(f"  {'设计':<30}{'Pass':>6}{'耗时(s)':>10}{'节省Pass':>10}{'节省(s)':>10}{'节省':>8}")
+    print(f"  {ref['design']:<30}{ref['passes']:>6}{ref['elapsed']:>10.1f}{'(参考)':>10}")
+    saved_passes = saved_time = 0.0
+    for r in warm:
+        dp = ref["passes"] - r["passes"]
+        dt = ref["elapsed"] - r["elapsed"]
+        pct = dt / ref["elapsed"] * 100 if ref["elapsed"] else 0.0
+        saved_passes += dp
+        saved_time += dt
+        print(
+            f"  {r['design']:<30}{r['passes']:>6}{r['elapsed']:>10.1f}"
+            f"{dp:>10}{dt:>10.1f}{pct:>7.0f}%"
+        )
+    print(
+        f"  合计: {len(warm)} 个热启动变体节省 {saved_passes:g} 个 pass, "
+        f"{saved_time:.1f}s (冷启动估计 {ref['elapsed'] * len(warm):.1f}s)"
+    )
+    print("-" * 70)
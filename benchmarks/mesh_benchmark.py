@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+mesh_benchmark.py - 网格设置 / 隔板模型的精度与耗时对比 (需要 AEDT)
+
+对同一材料依次用每种 网格模式 (--mesh skin / fixed) × 隔板模型
+(--plate-model solid / impedance) × 对称 (整模型 / --half-model) 重建
+EddyCurrent_setup 的设计并求解，记录:
+  - adaptive pass 数和收敛误差
+  - 初始 / 最终四面体数
+  - 求解墙钟时间及相对第一个组合的加速比
+  - 隔板损耗 (实体: SolidLoss(Plate_Frame); 阻抗边界: SurfaceLoss_Plate_Frame;
+    半模型 ×2) 及相对第一个组合 (参考) 的偏差
+
+用法:
+  python benchmarks/mesh_benchmark.py --material galvalume
+  python benchmarks/mesh_benchmark.py --modes skin --plate-models solid,impedance
+  python benchmarks/mesh_benchmark.py --modes skin --symmetry full,half
+  python benchmarks/mesh_benchmark.py --material stainless --save mesh_bench.json
+  python benchmarks/mesh_benchmark.py --dry-run          # 只打印各组合的网格计划
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "EddyCurrent"))
+
+import EddyCurrent_setup as setup
+from aedt_common.convergence import read_convergence
+from aedt_common.detection import resolve_aedt
+from aedt_common.impedance import PLATE_MODELS
+from aedt_common.loss_table import query_losses
+from aedt_common.mesh_planner import print_mesh_plan
+from aedt_common.session_pool import get_pool
+
+
+def _plate_loss(m3d):
+    """隔板损耗: 实体为 SolidLoss(Plate_Frame), 阻抗边界自动改用 SurfaceLoss_Plate_Frame"""
+    try:
+        return query_losses(m3d, ["Plate_Frame"], convergence=False).get("Plate_Frame")
+    except Exception as e:
+        print(f"  [WARN] 读取隔板损耗失败: {e}")
+    return None
+
+
+def run_mode(material: str, mode: str, plate_model: str, symmetry: str, attach: bool) -> dict:
+    label = f"{mode}/{plate_model}/{symmetry}"
+    half = symmetry == "half"
+    print("\n" + "#" * 70)
+    print(f"# 网格模式: {mode}, 隔板模型: {plate_model}, 对称: {symmetry}")
+    print("#" * 70)
+    design = setup.create_simulation(
+        material, new_desktop_session=not attach, mesh_mode=mode,
+        plate_model=plate_model, half=half,
+    )
+    if not design:
+        return {"label": label, "error": "设计创建失败"}
+
+    m3d = get_pool(setup.AEDT_VERSION).open_design(setup.PROJECT_NAME, design)
+    t0 = time.perf_counter()
+    ok = m3d.analyze_setup("Setup1")
+    solve_s = time.perf_counter() - t0
+    passes = read_convergence(m3d, "Setup1")
+    loss = _plate_loss(m3d)
+    if loss is not None and half:
+        loss *= 2  # 半模型还原为整模型
+    result = {
+        "label": label,
+        "mode": mode,
+        # 不满足阻抗边界条件的材料会回退为实体, 以实际设计名为准
+        "plate_model": "impedance" if setup.IMPEDANCE_SUFFIX in design else "solid",
+        "symmetry": symmetry,
+        "design": design,
+        "solved": bool(ok),
+        "solve_s": round(solve_s, 2),
+        "passes": len(passes),
+        "tetra_initial": passes[0]["tetrahedra"] if passes else None,
+        "tetra_final": passes[-1]["tetrahedra"] if passes else None,
+        "energy_error": passes[-1]["energy_error"] if passes else None,
+        "plate_loss_W": loss,
+        "convergence": passes,
+    }
+    m3d.save_project()
+    get_pool().release(m3d)
+    return result
+
+
+def add_reference_deltas(results: list) -> None:
+    """以第一个成功的组合为参考，计算损耗偏差 (%) 和求解加速比"""
+    ref = next((r for r in results if "error" not in r), None)
+    for r in results:
+        if "error" in r or ref is None:
+            continue
+        if r["plate_loss_W"] is not None and ref["plate_loss_W"]:
+            delta = r["plate_loss_W"] - ref["plate_loss_W"]
+            r["loss_delta_pct"] = delta / ref["plate_loss_W"] * 100
+        else:
+            r["loss_delta_pct"] = None
+        r["speedup"] = ref["solve_s"] / r["solve_s"] if r["solve_s"] else None
+
+
+def print_table(results: list) -> None:
+    print("\n" + "-" * 106)
+    print(
+        f"  {'组合':<24}{'Pass':>6}{'初始四面体':>12}{'最终四面体':>12}"
+        f"{'误差(%)':>10}{'求解(s)':>10}{'加速比':>8}{'隔板损耗(W)':>14}{'偏差(%)':>10}"
+    )
+
+    def _fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    for r in results:
+        if "error" in r:
+            print(f"  {r['label']:<24}{r['error']}")
+            continue
+        print(
+            f"  {r['label']:<24}{r['passes']:>6}{_fmt(r['tetra_initial'], '>12')}"
+            f"{_fmt(r['tetra_final'], '>12')}{_fmt(r['energy_error'], '>10.3g')}"
+            f"{r['solve_s']:>10.1f}{_fmt(r.get('speedup'), '>8.2f')}"
+            f"{_fmt(r['plate_loss_W'], '>14.4g')}{_fmt(r.get('loss_delta_pct'), '>10.2f')}"
+        )
+    print("-" * 106)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网格设置 / 隔板模型的精度与耗时对比")
+    parser.add_argument(
+        "--material", "-m", choices=list(setup.PLATE_MATERIALS), default="galvalume"
+    )
+    parser.add_argument(
+        "--modes", default=",".join(setup.MESH_MODES), help="对比的网格模式 (默认 skin,fixed)"
+    )
+    parser.add_argument(
+        "--plate-models", default="solid",
+        help="对比的隔板模型 (默认 solid; 阻抗边界对比用 solid,impedance)",
+    )
+    parser.add_argument(
+        "--symmetry", default="full", help="对比的对称方式 (默认 full; 半模型对比用 full,half)"
+    )
+    parser.add_argument("--aedt-version", default=None)
+    parser.add_argument("--attach", action="store_true", help="附着到已打开的 AEDT 会话")
+    parser.add_argument("--save", default=None, help="结果写入 JSON")
+    parser.add_argument("--dry-run", action="store_true", help="只打印网格计划, 不连接 AEDT")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    plate_models = [m.strip() for m in args.plate_models.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in setup.MESH_MODES]
+    symmetries = [m.strip() for m in args.symmetry.split(",") if m.strip()]
+    unknown += [m for m in plate_models if m not in PLATE_MODELS]
+    unknown += [m for m in symmetries if m not in ("full", "half")]
+    if unknown:
+        parser.error(f"未知网格模式/隔板模型/对称方式: {unknown}")
+    combos = [
+        (mode, plate, sym) for sym in symmetries for plate in plate_models for mode in modes
+    ]
+
+    mat = setup.PLATE_MATERIALS[args.material]
+    print(f"材料: {mat['description']} (σ={mat['conductivity']} S/m, μr={mat['permeability']})")
+    for mode, plate, sym in combos:
+        print(f"[{mode}/{plate}/{sym}]")
+        impedance = plate == "impedance" and setup._impedance_ok([mat], [setup.frame_th])
+        print_mesh_plan(setup._mesh_plan(mode, [mat], [setup.frame_th], impedance))
+    if args.dry_run:
+        return
+
+    setup.AEDT_VERSION = args.aedt_version or resolve_aedt(
+        default_version=setup.DEFAULT_AEDT_VERSION, verbose=False
+    )[0]
+    results = [
+        run_mode(args.material, mode, plate, sym, args.attach) for mode, plate, sym in combos
+    ]
+    add_reference_deltas(results)
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"material": args.material, "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"[INFO] 结果已保存: {args.save}")
+
+
+if __name__ == "__main__":
+    main()
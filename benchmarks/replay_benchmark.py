@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+replay_benchmark.py - 基于录制轨迹的脚本开销基准 (无需 AEDT 许可)
+
+1. 在有 AEDT 的机器上录制轨迹:
+     python benchmarks/replay_benchmark.py record create_simulation
+2. 在任意机器 (CI) 上回放并统计 AEDT 调用次数与 Python 侧耗时:
+     python benchmarks/replay_benchmark.py replay --scale 0
+     python benchmarks/replay_benchmark.py replay --save benchmarks/traces/baseline.json
+     python benchmarks/replay_benchmark.py replay --baseline benchmarks/traces/baseline.json
+
+--scale 控制回放时按录制耗时等待的比例 (0 = 不等待，只测 Python 开销；
+1 = 还原真实 AEDT 延迟)。与基线相比调用次数或 Python 耗时增长超过
+--tolerance 时返回非 0。
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_DIR = os.path.join(REPO_ROOT, "benchmarks", "traces")
+
+_REPORT_IMPORT = (
+    "import sys; sys.path.insert(0, 'EddyCurrent'); "
+    "import EddyCurrent_Report as report; "
+)
+
+# 场景名 -> 命令行参数 (在仓库根目录下以当前解释器运行)
+SCENARIOS = {
+    "create_simulation": ["EddyCurrent/EddyCurrent_setup.py", "--material", "stainless"],
+    "get_results": ["-c", _REPORT_IMPORT + "report.get_results('Stainless')"],
+    "export_field_plots": [
+        "-c",
+        _REPORT_IMPORT
+        + "from aedt_common.session_pool import get_pool; "
+        "m3d = get_pool().open_design(report.PROJECT_NAME, 'EddyCurrent_Stainless'); "
+        "report.export_field_plots(m3d, 'Stainless', {}); get_pool().release(m3d)",
+    ],
+    "vi_generator": ["VacuumInterrupter/VacuumInterrupter_Generator.py"],
+}
+
+
+def trace_path(name: str, trace_dir: str) -> str:
+    return os.path.join(trace_dir, f"{name}.jsonl.gz")
+
+
+def _run(args: list, env: dict) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", **env)
+    return subprocess.run(
+        [sys.executable] + args, cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, encoding="utf-8", errors="ignore",
+    )
+
+
+def record(names: list, trace_dir: str) -> int:
+    os.makedirs(trace_dir, exist_ok=True)
+    status = 0
+    for name in names:
+        path = trace_path(name, trace_dir)
+        print(f"录制 {name} -> {path}")
+        t0 = time.perf_counter()
+        proc = _run(SCENARIOS[name], {"MAXWELL_AEDT_RECORD": path})
+        print(f"  退出码 {proc.returncode}, {time.perf_counter() - t0:.1f}s")
+        if proc.returncode != 0:
+            print("\n".join(proc.stdout.splitlines()[-10:]))
+            status = 1
+    return status
+
+
+def replay(names: list, trace_dir: str, scale: float) -> dict:
+    results = {}
+    for name in names:
+        path = trace_path(name, trace_dir)
+        if not os.path.exists(path):
+            print(f"  跳过 {name}: 无轨迹 {path}")
+            continue
+        fd, stats_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        t0 = time.perf_counter()
+        proc = _run(SCENARIOS[name], {
+            "MAXWELL_AEDT_REPLAY": path,
+            "MAXWELL_AEDT_REPLAY_SCALE": str(scale),
+            "MAXWELL_AEDT_REPLAY_STATS": stats_path,
+        })
+        wall = time.perf_counter() - t0
+        try:
+            with open(stats_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {"calls": 0, "misses": 0, "recorded_s": 0.0, "slept_s": 0.0, "by_name": {}}
+        finally:
+            os.remove(stats_path)
+        results[name] = {
+            "returncode": proc.returncode,
+            "calls": stats["calls"],
+            "misses": stats["misses"],
+            "aedt_s": stats["recorded_s"],
+            "wall_s": wall,
+            # 回放等待之外的时间 = 脚本自身 (Python) 开销
+            "python_s": wall - stats["slept_s"],
+            "top_calls": list(stats["by_name"].items())[:5],
+        }
+        if proc.returncode != 0:
+            print(f"  [WARN] {name} 退出码 {proc.returncode}")
+            print("\n".join("    " + l for l in proc.stdout.splitlines()[-5:]))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """与基线比较，返回回归项描述"""
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if cur["calls"] > base["calls"] * (1 + tolerance):
+            regressions.append(f"{name}: AEDT 调用 {base['calls']} -> {cur['calls']}")
+        if cur["python_s"] > base["python_s"] * (1 + tolerance) + 0.05:
+            regressions.append(
+                f"{name}: Python 耗时 {base['python_s']:.2f}s -> {cur['python_s']:.2f}s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制/回放 AEDT 调用，测量脚本开销")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_rec = sub.add_parser("record", help="录制轨迹 (需要 AEDT)")
+    p_rec.add_argument("scenarios", nargs="*", help=f"场景 (默认全部): {', '.join(SCENARIOS)}")
+    p_rec.add_argument("--trace-dir", default=TRACE_DIR)
+
+    p_rep = sub.add_parser("replay", help="回放轨迹 (无需 AEDT)")
+    p_rep.add_argument("scenarios", nargs="*", help=f"场景 (默认全部): {', '.join(SCENARIOS)}")
+    p_rep.add_argument("--trace-dir", default=TRACE_DIR)
+    p_rep.add_argument("--scale", type=float, default=0.0, help="录制延迟缩放系数 (默认 0)")
+    p_rep.add_argument("--baseline", default=None, help="基线 JSON，超出容差时返回非 0")
+    p_rep.add_argument("--save", default=None, help="把本次结果保存为基线 JSON")
+    p_rep.add_argument("--tolerance", type=float, default=0.10, help="允许的增长比例 (默认 10%%)")
+
+    args = parser.parse_args()
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景: {unknown}")
+
+    if args.command == "record":
+        sys.exit(record(names, args.trace_dir))
+
+    print("=" * 78)
+    print(f"回放基准 (延迟缩放 {args.scale})")
+    print("=" * 78)
+    results = replay(names, args.trace_dir, args.scale)
+    print(f"  {'场景':<20}{'AEDT调用':>10}{'未命中':>8}{'录制AEDT(s)':>13}{'墙钟(s)':>10}{'Python(s)':>11}")
+    for name, r in results.items():
+        print(
+            f"  {name:<20}{r['calls']:>10}{r['misses']:>8}{r['aedt_s']:>13.2f}"
+            f"{r['wall_s']:>10.2f}{r['python_s']:>11.2f}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"基线已保存: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("✗ 发现回归:")
+            for item in regressions:
+                print(f"  - {item}")
+            sys.exit(1)
+        print("✓ 与基线一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+standin_batchsolve.py - ansysedt -batchsolve 的本地替身 (无需 AEDT 许可)
+
+接受与 ansysedt 相同的命令行 (-ng -distributed -machinelist ... -batchsolve
+<设计>:<Nominal|Optimetrics>:<Setup> <工程.aedt>)，按环境变量
+MAXWELL_STANDIN_SOLVE_S (默认 2 秒) 占用一个核模拟求解，然后在
+<工程>.aedtresults/<设计>.results/ 下写出结果标记文件。
+
+    python EddyCurrent/EddyCurrent_setup.py --analyze --all \\
+        --solve-mode batch --solver-exe benchmarks/standin_batchsolve.py
+"""
+
+import os
+import sys
+import json
+import time
+
+
+def main(argv):
+    i = argv.index("-batchsolve") if "-batchsolve" in argv else len(argv)
+    if i + 2 >= len(argv):
+        print("用法: standin_batchsolve.py ... -batchsolve <设计>:<类型>:<Setup> <工程.aedt>")
+        return 2
+    target, project = argv[i + 1], argv[i + 2]
+    design, kind, setup = target.split(":", 2)
+    machines = argv[argv.index("-machinelist") + 1] if "-machinelist" in argv else ""
+
+    seconds = float(os.environ.get("MAXWELL_STANDIN_SOLVE_S", "2"))
+    print(f"[standin] {design}:{kind}:{setup} ({machines}) {seconds:.1f}s")
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass  # 忙等，和真实求解一样占用 CPU
+
+    results = os.path.join(os.path.splitext(project)[0] + ".aedtresults", f"{design}.results")
+    os.makedirs(results, exist_ok=True)
+    with open(os.path.join(results, f"{setup}.standin.json"), "w", encoding="utf-8") as f:
+        json.dump({"design": design, "type": kind, "setup": setup,
+                   "machinelist": machines, "solve_s": seconds}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
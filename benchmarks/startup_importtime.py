@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+startup_importtime.py - 脚本启动时间基准 (python -X importtime)
+
+对每个入口脚本运行不连接 AEDT 的命令 (--help / --dry-run)，解析
+-X importtime 输出，检查 AEDT 栈 (pyaedt / ansys.aedt.core) 没有被导入，
+并打印启动耗时。任一入口导入了 AEDT 栈或超出时间预算时返回非 0，
+可直接放进 CI。
+
+用法:
+  python benchmarks/startup_importtime.py
+  python benchmarks/startup_importtime.py --budget 1.5 --top 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (脚本, 参数): 这些路径都不应加载 AEDT 栈
+ENTRY_POINTS = [
+    ("EddyCurrent/EddyCurrent_setup.py", ["--help"]),
+    ("EddyCurrent/EddyCurrent_setup.py", ["--dry-run", "--all"]),
+    ("EddyCurrent/EddyCurrent_Report.py", ["--help"]),
+    ("EddyCurrent/EddyCurrent_Prescreen.py", ["--help"]),
+    ("SeismicAnalysis/SeismicAnalysis_Report.py", ["--help"]),
+    ("ElectrostaticField/ElectrostaticField_Setup.py", ["--help"]),
+    ("ElectrostaticField/KYN28_ElectrostaticField_Setup.py", ["--help"]),
+    ("ThermalAirflow/KYN28_EddyCurrent_Conversion.py", ["--help"]),
+    ("VacuumInterrupter/VacuumInterrupter_Generator.py", ["--help"]),
+    ("VacuumInterrupter/VacuumInterrupter_Generator.py", ["--dry-run"]),
+]
+
+FORBIDDEN_PREFIXES = ("pyaedt", "ansys.aedt")
+
+
+def parse_importtime(stderr: str):
+    """解析 -X importtime 输出 -> [(模块名, 自身耗时us, 累计耗时us)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # 表头行
+        # 保留前导空格: 缩进表示嵌套导入
+        rows.append((parts[2][1:].rstrip(), self_us, cumulative_us))
+    return rows
+
+
+def run_entry(script: str, args: list) -> dict:
+    cmd = [sys.executable, "-X", "importtime", os.path.join(REPO_ROOT, script)] + args
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        cmd, cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+        encoding="utf-8", errors="ignore",
+    )
+    wall = time.perf_counter() - t0
+    rows = parse_importtime(proc.stderr)
+    forbidden = sorted({
+        name.strip() for name, _, _ in rows
+        if name.strip().startswith(FORBIDDEN_PREFIXES)
+    })
+    # 顶层模块 (缩进为 0) 的累计耗时之和即总导入时间
+    import_us = sum(cum for name, _, cum in rows if not name.startswith(" "))
+    return {
+        "entry": f"{script} {' '.join(args)}",
+        "returncode": proc.returncode,
+        "wall": wall,
+        "import_s": import_us / 1e6,
+        "forbidden": forbidden,
+        "rows": rows,
+        "stderr": proc.stderr,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="脚本启动时间基准 / AEDT 懒加载检查")
+    parser.add_argument(
+        "--budget", type=float, default=2.0,
+        help="单个入口允许的最长启动时间(秒, 默认 2.0)",
+    )
+    parser.add_argument("--top", type=int, default=0, help="打印每个入口最慢的 N 个导入")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("启动时间基准 (python -X importtime)")
+    print("=" * 70)
+
+    failures = []
+    for script, entry_args in ENTRY_POINTS:
+        result = run_entry(script, entry_args)
+        status = "OK"
+        if result["returncode"] != 0:
+            status = "FAIL(退出码)"
+        elif result["forbidden"]:
+            status = "FAIL(导入 AEDT)"
+        elif result["wall"] > args.budget:
+            status = "FAIL(超时)"
+        print(
+            f"  {status:<16} {result['wall']:6.3f}s  导入 {result['import_s']:6.3f}s  "
+            f"{result['entry']}"
+        )
+        if result["forbidden"]:
+            print(f"      导入了: {', '.join(result['forbidden'][:5])}")
+        if result["returncode"] != 0:
+            tail = [l for l in result["stderr"].splitlines() if not l.startswith("import time:")]
+            for line in tail[-5:]:
+                print(f"      {line}")
+        if args.top:
+            slowest = sorted(result["rows"], key=lambda r: r[1], reverse=True)[: args.top]
+            for name, self_us, _ in slowest:
+                print(f"      {self_us / 1000:8.1f}ms  {name.strip()}")
+        if status != "OK":
+            failures.append(result["entry"])
+
+    print("=" * 70)
+    if failures:
+        print(f"✗ {len(failures)} 个入口未通过: {failures}")
+        sys.exit(1)
+    print("✓ 所有入口均未加载 AEDT 栈")
+
+
+if __name__ == "__main__":
+    main()
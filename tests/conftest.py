@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""测试共用设置: 与各脚本相同，把仓库根目录加入 sys.path; 缓存目录指向临时目录"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# aedt_common 在导入时读取 MAXWELL_AEDT_CACHE，须在导入前设置
+os.environ.setdefault("MAXWELL_AEDT_CACHE", tempfile.mkdtemp(prefix="maxwell_aedt_test_"))
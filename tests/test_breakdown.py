@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""breakdown: 连通域标号与击穿/奇异点分类 (合成场文件)"""
+
+from collections import deque
+
+import numpy as np
+
+from aedt_common.breakdown import analyze_field_file, connected_components, grid_header
+from aedt_common.field_data import write_field_file
+
+
+def _bfs_components(voxels):
+    """逐点 BFS 的 26 邻域连通域 (对照实现)"""
+    index = {tuple(v): i for i, v in enumerate(voxels)}
+    labels = [-1] * len(voxels)
+    current = 0
+    for start in range(len(voxels)):
+        if labels[start] >= 0:
+            continue
+        labels[start] = current
+        queue = deque([start])
+        while queue:
+            x, y, z = voxels[queue.popleft()]
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for dz in (-1, 0, 1):
+                        j = index.get((x + dx, y + dy, z + dz))
+                        if j is not None and labels[j] < 0:
+                            labels[j] = current
+                            queue.append(j)
+        current += 1
+    return labels
+
+
+def _same_partition(a, b):
+    pairs = set(zip(a, b))
+    return len(pairs) == len(set(a)) == len(set(b))
+
+
+def test_connected_components_matches_bfs():
+    rng = np.random.default_rng(0)
+    for density in (0.05, 0.2, 0.4):
+        grid = rng.random((12, 10, 8)) < density
+        voxels = np.argwhere(grid) - 5  # 含负坐标
+        labels = connected_components(voxels)
+        assert _same_partition(labels.tolist(), _bfs_components([tuple(v) for v in voxels]))
+        assert labels.min() == 0 and labels.max() == len(set(labels.tolist())) - 1
+
+
+def test_connected_components_diagonal_and_empty():
+    assert connected_components(np.empty((0, 3))).size == 0
+    labels = connected_components([[0, 0, 0], [1, 1, 1], [3, 3, 3]])
+    assert labels[0] == labels[1] != labels[2]
+
+
+def test_bridge_is_breakdown_and_hot_spot_is_singularity(tmp_path):
+    # 1 mm 规则网格, x 0..40 mm; A 相母排 x ≤ 5, 接地构架 x ≥ 35
+    xs, ys, zs = np.meshgrid(np.arange(41.0), np.arange(11.0), np.arange(11.0), indexing="ij")
+    points_mm = np.stack([xs.ravel(), ys.ravel(), zs.ravel()], axis=1)
+    values = np.full(len(points_mm), 1e5)
+    x, y, z = points_mm.T
+    values[(y == 5) & (z == 5) & (x >= 6) & (x <= 34)] = 4e6   # 母排 -> 构架 的通道
+    values[(x == 20) & (y == 10) & (z == 10)] = 8e6            # 孤立奇异点
+    path = str(tmp_path / "Mag_E.fld")
+    header = [grid_header([0, 0, 0, 40, 10, 10], 1.0), 'Scalar data "Mag_E"']
+    write_field_file(path, points_mm / 1000, values, header=header)
+
+    parts = {"Bus_A": [0, 0, 0, 5, 10, 10], "Frame": [35, 0, 0, 40, 10, 10]}
+    result = analyze_field_file(path, threshold=3e6, parts=parts, nets={"A": ["Bus_A"]})
+
+    assert result["grid"] and result["points"] == len(points_mm)
+    assert result["above_cells"] == 30 and result["above_mm3"] == 30.0
+    assert result["breakdown"] == 1 and result["singularity"] == 1
+    channel, spot = result["components"]
+    assert channel["kind"] == "breakdown" and channel["bridges"]
+    assert channel["cells"] == 29 and channel["extent_mm"] == 29.0
+    assert spot["kind"] == "singularity" and not spot["bridges"]
+    assert spot["max_E"] == 8e6 and spot["peak_mm"] == [20.0, 10.0, 10.0]
+
+
+def test_channel_between_same_net_parts_is_not_a_bridge(tmp_path):
+    points_mm = np.array([[x, 0.0, 0.0] for x in range(0, 9)])
+    values = np.where((points_mm[:, 0] >= 3) & (points_mm[:, 0] <= 5), 5e6, 0.0)
+    path = str(tmp_path / "short.fld")
+    write_field_file(path, points_mm / 1000, values, header=[grid_header([0, 0, 0, 8, 0, 0], 1.0)])
+
+    parts = {"Bus_A1": [0, 0, 0, 2, 1, 1], "Bus_A2": [6, 0, 0, 8, 1, 1]}
+    result = analyze_field_file(path, parts=parts, nets={"A": ["Bus_A1", "Bus_A2"]})
+    (comp,) = result["components"]
+    assert not comp["bridges"] and comp["kind"] == "singularity"
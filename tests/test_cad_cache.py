@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""cad_cache: 源文件哈希记忆、缓存键与 LRU 淘汰"""
+
+import json
+import os
+
+import pytest
+
+from aedt_common import cad_cache
+
+
+@pytest.fixture
+def cad_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cad_cache, "CAD_DIR", str(tmp_path / "cad"))
+    monkeypatch.setattr(cad_cache, "INDEX_FILE", str(tmp_path / "cad" / "index.json"))
+    os.makedirs(tmp_path / "cad")
+    return tmp_path / "cad"
+
+
+def _entry(cad_dir, key, size, last_used):
+    entry = cad_dir / key
+    entry.mkdir()
+    (entry / "model.sab").write_bytes(b"x" * size)
+    (entry / "meta.json").write_text(json.dumps({"last_used": last_used, "source": f"{key}.igs"}))
+    return entry
+
+
+def test_evict_removes_least_recently_used_first(cad_dir):
+    old = _entry(cad_dir, "old", 1000, last_used=1.0)
+    mid = _entry(cad_dir, "mid", 1000, last_used=2.0)
+    new = _entry(cad_dir, "new", 1000, last_used=3.0)
+    meta = len((old / "meta.json").read_bytes())
+    assert cad_cache.evict(max_bytes=2 * (1000 + meta)) == 1
+    assert not old.exists() and mid.exists() and new.exists()
+    assert cad_cache.evict(max_bytes=10 ** 9) == 0
+
+
+def test_evict_skips_the_entry_in_use(cad_dir):
+    old = _entry(cad_dir, "old", 1000, last_used=1.0)
+    new = _entry(cad_dir, "new", 1000, last_used=2.0)
+    assert cad_cache.evict(max_bytes=1500, keep="old") == 1
+    assert old.exists() and not new.exists()
+
+
+def test_cache_key_depends_on_content_and_options(cad_dir, tmp_path):
+    model = tmp_path / "KYN28.igs"
+    model.write_bytes(b"geometry v1")
+    key = cad_cache.cache_key(str(model), {"healing": True}, "2024.2")
+    assert key == cad_cache.cache_key(str(model), {"healing": True}, "2024.2")
+    assert key != cad_cache.cache_key(str(model), {"healing": False}, "2024.2")
+    assert key != cad_cache.cache_key(str(model), {"healing": True}, "2025.1")
+
+    model.write_bytes(b"geometry v2 (longer)")
+    assert key != cad_cache.cache_key(str(model), {"healing": True}, "2024.2")
+    # 每个源文件只保留一条哈希记录
+    assert len(json.loads((cad_dir / "index.json").read_text())) == 1
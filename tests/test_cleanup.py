@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""cleanup: 网格索引查询与小零件筛选 (不连接 AEDT)"""
+
+import numpy as np
+
+from aedt_common.cleanup import GridIndex, exclude, find_small_parts
+from aedt_common.part_classifier import PartTable
+
+
+def _random_boxes(rng, n, span=500.0, size=40.0):
+    lo = rng.random((n, 3)) * span
+    return np.hstack([lo, lo + rng.random((n, 3)) * size + 0.5])
+
+
+def test_grid_index_matches_brute_force():
+    rng = np.random.default_rng(2)
+    boxes = _random_boxes(rng, 200)
+    index = GridIndex(boxes)
+    for query in _random_boxes(rng, 100, size=20.0):
+        for margin in (0.0, 5.0):
+            lo, hi = query[:3] - margin, query[3:] + margin
+            expected = np.flatnonzero(
+                np.all(boxes[:, :3] <= hi, axis=1) & np.all(boxes[:, 3:] >= lo, axis=1)
+            ).tolist()
+            assert index.overlaps(query, margin) == expected
+
+
+def test_find_small_parts_keeps_parts_touching_protected():
+    table = PartTable(
+        ["Bus_A", "Bolt_on_bus", "Bolt_loose", "Frame", "Washer_far", "Unknown"],
+        [
+            [0, 0, 0, 10, 10, 600],
+            [10.5, 2, 100, 20, 8, 110],     # 距母排 0.5 mm
+            [100, 100, 100, 110, 110, 110],
+            [0, 200, 0, 500, 210, 600],
+            [300, 300, 300, 305, 305, 302],
+            [np.nan] * 6,
+        ],
+        [np.nan] * 6,
+    )
+    found = find_small_parts(table, protected=["Bus_A"], max_size=None)
+    assert found == {"remove": ["Bolt_loose", "Washer_far"], "kept": ["Bolt_on_bus"]}
+    classes = exclude({"small": ["Bolt_loose", "Bolt_on_bus"], "busbar": ["Bus_A"]}, found["remove"])
+    assert classes == {"small": ["Bolt_on_bus"], "busbar": ["Bus_A"]}
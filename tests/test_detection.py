@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""detection: 版本号与版本代码互转"""
+
+from aedt_common.detection import code_to_version, version_from_path, version_to_code
+
+
+def test_version_to_code_round_trip():
+    assert version_to_code("2024.2") == "242"
+    assert version_to_code("2022.1") == "221"
+    assert code_to_version("251") == "2025.1"
+    for version in ("2021.2", "2023.1", "2024.2"):
+        assert code_to_version(version_to_code(version)) == version
+
+
+def test_version_from_path():
+    assert version_from_path("/opt/AnsysEM/v242/Linux64") == "2024.2"
+    assert version_from_path("/opt/AnsysEM/v231") == "2023.1"
+    assert version_from_path("/opt/AnsysEM/current") is None
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""distributed: -batchsolve 命令行、任务规划和结果合并"""
+
+import os
+import sys
+
+from aedt_common.distributed import (
+    batchsolve_command,
+    merge_results,
+    plan_jobs,
+    run_jobs,
+    verify_merged,
+)
+
+STANDIN = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "standin_batchsolve.py")
+
+
+def _project(tmp_path):
+    project_file = str(tmp_path / "Eddy.aedt")
+    with open(project_file, "w") as f:
+        f.write("$begin 'AnsoftProject'\n")
+    return project_file
+
+
+def test_batchsolve_command():
+    cmd = batchsolve_command("ansysedt", "P.aedt", "D1", "Setup1", cores=8, tasks=4, parametric=True)
+    assert cmd[-3:] == ["-batchsolve", "D1:Optimetrics:Setup1", "P.aedt"]
+    assert cmd[cmd.index("-machinelist") + 1] == "list=localhost:4:8:90%:1"
+    assert "-distributed" in cmd
+
+    cmd = batchsolve_command("standin.py", "P.aedt", "D1", "Setup1", cores=2, tasks=1)
+    assert cmd[:2] == [sys.executable, "standin.py"]
+    assert cmd[cmd.index("-machinelist") + 1] == "num=2"
+    assert "-distributed" not in cmd and "D1:Nominal:Setup1" in cmd
+
+
+def test_plan_jobs_copies_project_per_design(tmp_path):
+    project_file = _project(tmp_path)
+    jobs = plan_jobs(project_file, [("D1", "S1", False), ("D2", "S2", True)])
+    assert [j["design"] for j in jobs] == ["D1", "D2"]
+    assert len({j["project"] for j in jobs}) == 2
+    for job in jobs:
+        assert os.path.isfile(job["project"])
+        assert os.path.dirname(job["project"]).endswith(os.path.join("Eddy_jobs", job["design"]))
+
+
+def test_merge_copies_only_own_design_results(tmp_path):
+    project_file = _project(tmp_path)
+    jobs = plan_jobs(project_file, [("D1", "S1", False), ("D2", "S2", False)])
+    for job in jobs:
+        src = os.path.splitext(job["project"])[0] + ".aedtresults"
+        for design in ("D1", "D2"):
+            os.makedirs(os.path.join(src, f"{design}.results"))
+            open(os.path.join(src, f"{design}.results", f"{job['design']}.dat"), "w").close()
+        open(os.path.join(src, "Eddy.aedt.lock"), "w").close()
+        open(os.path.join(src, f"{job['design']}.results", "solve.lock"), "w").close()
+        os.makedirs(os.path.join(src, "scratch"))
+    jobs[0]["returncode"] = 0
+    jobs[1]["returncode"] = 1
+
+    assert merge_results(project_file, jobs) == 1
+    results_dir = tmp_path / "Eddy.aedtresults"
+    assert sorted(os.listdir(results_dir)) == ["D1.results"]
+    assert os.listdir(results_dir / "D1.results") == ["D1.dat"]
+    assert jobs[0]["merged_files"] == 1 and "merged_files" not in jobs[1]
+
+
+def test_standin_run_then_merge(tmp_path, monkeypatch):
+    monkeypatch.setenv("MAXWELL_STANDIN_SOLVE_S", "0")
+    project_file = _project(tmp_path)
+    jobs = plan_jobs(project_file, [("D1", "S1", False), ("D2", "S2", True)])
+    run_jobs(jobs, os.path.abspath(STANDIN), cores=1, max_parallel=2, poll=0.05)
+    assert [j["returncode"] for j in jobs] == [0, 0]
+    assert merge_results(project_file, jobs) == 2
+    for design, setup in (("D1", "S1"), ("D2", "S2")):
+        assert os.path.isfile(tmp_path / "Eddy.aedtresults" / f"{design}.results" / f"{setup}.standin.json")
+
+
+class FakeDesign:
+    def __init__(self, variations):
+        self.variations = variations
+
+    def ListVariations(self, sweep):
+        return self.variations.get(sweep, [])
+
+
+class FakeApp:
+    def __init__(self, variations):
+        self.odesign = FakeDesign(variations)
+
+
+def test_verify_merged_reports_missing_solutions():
+    jobs = [
+        {"design": "D1", "setup": "S1", "project": "a", "merged_files": 3},
+        {"design": "D2", "setup": "S2", "project": "b", "merged_files": 3},
+        {"design": "D3", "setup": "S3", "project": "c"},
+    ]
+    apps = {
+        "D1": FakeApp({"S1 : LastAdaptive": ["Gap='5mm'", "Gap='6mm'"]}),
+        "D2": FakeApp({}),
+    }
+    assert verify_merged(apps.__getitem__, jobs) == ["D2"]
+    assert jobs[0]["solved_variations"] == 2
+    assert jobs[1]["solved_variations"] == 0
+    assert "solved_variations" not in jobs[2]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""eddy_screen: 名义几何的估算值回归 (误差带见模块说明)"""
+
+import numpy as np
+import pytest
+
+from aedt_common.eddy_screen import BusbarFrameGeometry, screen_grid, skin_depth, slab_factor
+
+# EddyCurrent_setup.py 的名义几何与 PLATE_MATERIALS
+GEO = BusbarFrameGeometry(bus_w=120, bus_d=10, bus_h=600, flange=50, margin=30)
+SIGMA = [4.032e6, 1.137e6]   # 覆铝锌板, 不锈钢
+MU_R = [4000, 1]
+
+
+def test_nominal_estimates_are_pinned():
+    loss = screen_grid(GEO, SIGMA, MU_R, [160], [20], [3], [4000]).ravel()
+    # Maxwell 参考: 覆铝锌板 ~163 W, 不锈钢 ~0.1 W
+    assert loss[0] == pytest.approx(685.5, rel=1e-3)
+    assert loss[1] == pytest.approx(0.06553, rel=1e-3)
+
+
+def test_loss_scales_with_current_squared():
+    loss = screen_grid(GEO, SIGMA, MU_R, [160], [20], [3], [1000, 2000]).reshape(2, 2)
+    assert np.allclose(loss[:, 1] / loss[:, 0], 4.0)
+
+
+def test_skin_depth_and_slab_limits():
+    assert skin_depth(50, 4.032e6, 4000) * 1e3 == pytest.approx(0.560, rel=1e-2)
+    assert slab_factor(100.0) == pytest.approx(1.0)
+    # 薄板: Φ(ν) ≈ ν³/6
+    assert slab_factor(0.01) == pytest.approx(0.01 ** 3 / 6, rel=1e-3)
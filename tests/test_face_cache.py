@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""FaceGeometry: 面选择只做数组运算，不需要 AEDT"""
+
+import math
+
+from aedt_common.face_cache import FaceGeometry
+
+NAN = math.nan
+
+# 行格式: 对象, 面 ID, 中心 xyz, 面积, 法向 xyz
+ROWS = [
+    ["Bus", 10, 0, 0, 0, 100, 0, 0, 1],         # 底面
+    ["Bus", 11, 0, 0, 600, 100, 0, 0, -1],      # 顶面
+    ["Bus", 12, 5, 0, 700, 6000, 1, 0, 0],      # 侧面, 中心更高但法向不对齐
+    ["Bus", 13, 0, 0, 300, 50, NAN, NAN, NAN],  # 曲面, 无法向
+    ["Region", 20, -50, 0, 0, 1e4, 1, 0, 0],
+    ["Region", 21, 50, 0, 0, 1e4, 1, 0, 0],
+    ["Other", 30, 0, 0, 0, 1, 0, 0, 1],         # 不在查询对象中, 丢弃
+]
+
+
+def _geo():
+    return FaceGeometry(["Bus", "Region"], ROWS)
+
+
+def test_rows_outside_objects_are_dropped():
+    geo = _geo()
+    assert len(geo) == 6
+    assert list(geo.faces("Bus")) == [10, 11, 12, 13]
+    assert list(geo.faces("Missing")) == []
+    assert list(geo.center(12)) == [5, 0, 700]
+    assert geo.center(99) is None
+
+
+def test_end_faces_prefer_aligned_normals():
+    geo = _geo()
+    assert geo.end_faces("Bus", axis="z") == (10, 11)
+    # 不要求法向对齐时取中心最高的面
+    assert geo.extreme("Bus", "z", "max") == 12
+    # 没有对齐面时退回全部面
+    assert geo.extreme("Region", 2, "max", aligned=0.9) in (20, 21)
+
+
+def test_nearest_with_tolerance():
+    geo = _geo()
+    assert geo.nearest("Region", axis="x", value=40) == 21
+    assert geo.nearest("Region", axis="x", value=0, tol=10) is None
+    assert geo.nearest("Missing", axis="x", value=0) is None
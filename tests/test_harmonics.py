@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""harmonics: 频谱加权与谐波次数/相序"""
+
+import pytest
+
+from aedt_common.harmonics import combine_losses, parse_orders, sequence
+
+
+def test_combine_losses_weights_by_amplitude_squared():
+    losses = {50.0: 685.0, 250.0: 90.0, 350.0: 120.0}
+    spectrum = {1: 4000.0, 5: 800.0, 7: 400.0, 11: 200.0}
+    rows, total = combine_losses(losses, spectrum, 50.0, 4000.0)
+
+    by_order = {r["order"]: r for r in rows}
+    assert by_order[1]["loss_W"] == pytest.approx(685.0)
+    assert by_order[5]["loss_W"] == pytest.approx(90.0 * 0.2 ** 2)
+    assert by_order[7]["loss_W"] == pytest.approx(120.0 * 0.1 ** 2)
+    # 没有 550 Hz 的解: 不计入总损耗
+    assert by_order[11]["loss_W"] is None and by_order[11]["share_pct"] is None
+    assert total == pytest.approx(685.0 + 3.6 + 1.2)
+    assert sum(r["share_pct"] for r in rows if r["share_pct"]) == pytest.approx(100.0)
+    assert [by_order[h]["sequence"] for h in (1, 5, 7)] == ["+", "-", "+"]
+
+
+def test_combine_losses_matches_frequency_within_tolerance():
+    rows, total = combine_losses({250.1: 10.0}, {5: 4000.0}, 50.0, 4000.0)
+    assert rows[0]["loss_at_sim_W"] == 10.0 and total == pytest.approx(10.0)
+
+
+def test_parse_orders_and_sequence():
+    assert parse_orders("7,5, 13,5") == [1, 5, 7, 13]
+    with pytest.raises(ValueError):
+        parse_orders("0,5")
+    assert sequence(3) == "0" and sequence(11) == "-" and sequence(13) == "+"
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""incremental.BuildState: 分段哈希记录在设计之外 (不产生新的变化)"""
+
+from aedt_common.incremental import BuildState, parameter_hash
+
+
+class FakeDesign(dict):
+    """模拟设计: 任何变量写入都会记录下来 (哈希不应写入设计变量)"""
+
+    project_file = "/work/KYN28.aedt"
+    design_name = "EddyCurrent_Galvalume"
+
+
+def test_first_run_rebuilds_everything_then_reuses(tmp_path):
+    path = str(tmp_path / "build_state.json")
+    design = FakeDesign()
+    sections = {"geometry": {"gap": 20, "th": 3}, "setup": {"passes": 10}}
+    build = BuildState(design, sections, path=path)
+    assert build.changed() == ["geometry", "setup"]
+    build.commit()
+    assert design == {}
+
+    again = BuildState(design, {"geometry": {"th": 3, "gap": 20}, "setup": {"passes": 12}}, path=path)
+    assert again.unchanged("geometry")
+    assert again.changed() == ["setup"]
+    assert again.stored["geometry"] == parameter_hash(sections["geometry"])
+
+
+def test_state_is_keyed_by_project_and_design(tmp_path):
+    path = str(tmp_path / "build_state.json")
+    BuildState(FakeDesign(), {"geometry": [1, 2]}, path=path).commit()
+
+    other = FakeDesign()
+    other.design_name = "EddyCurrent_Stainless"
+    assert not BuildState(other, {"geometry": [1, 2]}, path=path).unchanged("geometry")
+    assert BuildState(FakeDesign(), {"geometry": [1, 2]}, path=path).unchanged("geometry")
+
+
+def test_disabled_state_never_reuses(tmp_path):
+    path = str(tmp_path / "build_state.json")
+    BuildState(FakeDesign(), {"geometry": [1, 2]}, path=path).commit()
+    build = BuildState(FakeDesign(), {"geometry": [1, 2]}, enabled=False, path=path)
+    assert not build.unchanged("geometry")
+
+
+def test_parameter_hash_is_stable():
+    assert parameter_hash({"a": 1, "b": [1.0, "x"]}) == parameter_hash({"b": [1.0, "x"], "a": 1})
+    assert parameter_hash({"a": 1}) != parameter_hash({"a": 2})
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""loss_table: 一次查询的结果解析与表面损耗补充 (假 post 对象)"""
+
+import pytest
+
+from aedt_common.impedance import surface_loss_name
+from aedt_common.loss_table import LossTable, query_losses
+
+
+class FakeData:
+    def __init__(self, values):
+        self.values = values
+
+    def data_real(self, expr):
+        return self.values[expr]  # 未知表达式抛 KeyError, 解析为 NaN
+
+
+class FakePost:
+    def __init__(self, values):
+        self.values = values
+        self.queries = []
+
+    def get_solution_data(self, expressions, setup_sweep_name, report_category):
+        self.queries.append((report_category, list(expressions)))
+        return FakeData(self.values)
+
+
+class FakeModeler:
+    solid_names = ["Busbar_A", "Busbar_B", "Plate", "Region"]
+
+
+class FakeApp:
+    def __init__(self, values):
+        self.post = FakePost(values)
+        self.modeler = FakeModeler()
+
+
+def test_one_query_for_all_solid_losses():
+    app = FakeApp({
+        "SolidLoss": [12.0, 99.0],
+        "SolidLoss(Busbar_A)": [5.0, 99.0],
+        "SolidLoss(Busbar_B)": [3.0],
+        "SolidLoss(Plate)": [4.0],
+    })
+    table = query_losses(app, convergence=False)
+    assert app.post.queries == [("EddyCurrent", [
+        "SolidLoss", "SolidLoss(Busbar_A)", "SolidLoss(Busbar_B)", "SolidLoss(Plate)",
+    ])]
+    assert table.total == 12.0
+    assert table["Busbar_A"] == 5.0  # 只取第一个扫描点
+    assert table.sum("Busbar_") == 8.0
+    assert "Region" not in table and not table.surface.any()
+
+
+def test_zero_loss_objects_read_surface_loss():
+    app = FakeApp({
+        "SolidLoss": [8.0],
+        "SolidLoss(Busbar_A)": [5.0],
+        "SolidLoss(Busbar_B)": [],
+        "SolidLoss(Plate)": [0.0],
+        surface_loss_name("Plate"): [2.5],
+    })
+    table = query_losses(app, convergence=False)
+    assert app.post.queries[-1] == (
+        "Fields", [surface_loss_name("Busbar_B"), surface_loss_name("Plate")],
+    )
+    assert table["Plate"] == 2.5 and table.surface.tolist() == [False, False, True]
+    assert table["Busbar_B"] == 0.0  # 无结果, 也没有表面损耗表达式
+    assert table.total == pytest.approx(10.5)
+
+
+def test_missing_total_raises():
+    app = FakeApp({"SolidLoss(Plate)": [1.0]})
+    with pytest.raises(RuntimeError):
+        query_losses(app, objects=["Plate"], convergence=False)
+
+
+def test_table_accessors():
+    table = LossTable(["A", "B"], [1.0, 3.0], total=4.0)
+    assert table.get("C", -1.0) == -1.0
+    assert table.as_dict() == {"A": 1.0, "B": 3.0}
+    assert table.passes == 0 and table.energy_error is None
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""mesh_planner: 按趋肤深度选择趋肤层网格或长度网格"""
+
+import pytest
+
+from aedt_common.mesh_planner import fixed_plan, parse_frequency, plan_mesh, skin_depth_mm
+
+STEEL = {"name": "Mesh_Frame", "objects": ["Plate_Frame"], "conductivity": 4.032e6,
+         "permeability": 4000, "thickness": 3.0, "fixed_length": 30.0}
+COPPER = {"name": "Mesh_Bus", "objects": ["Busbar_A"], "conductivity": 5.8e7,
+          "permeability": 1.0, "thickness": 10.0, "fixed_length": 20.0}
+
+
+def test_parse_frequency_and_skin_depth():
+    assert parse_frequency("1kHz") == 1000.0
+    assert parse_frequency(" 50Hz ") == 50.0
+    assert parse_frequency(60) == 60.0
+    assert skin_depth_mm("50Hz", 5.8e7, 1.0) == pytest.approx(9.35, abs=0.01)
+
+
+def test_thick_steel_gets_skin_layers():
+    plan = plan_mesh([STEEL], "50Hz", max_elements=5000)[0]
+    delta = skin_depth_mm(50, STEEL["conductivity"], STEEL["permeability"])
+    assert plan["kind"] == "skin"
+    assert plan["skin_depth_mm"] == pytest.approx(2 * delta, abs=1e-3)
+    assert plan["layers"] == 4
+    assert plan["triangle_mm"] == pytest.approx(3.0)  # 4δ < 厚度, 取厚度
+    assert plan["max_elements"] == 5000
+
+
+def test_penetrated_conductor_gets_length_mesh():
+    plan = plan_mesh([COPPER], "50Hz")[0]
+    assert plan["kind"] == "length"
+    # δ≈9.35mm 小于固定长度, 但不小于导体厚度
+    assert plan["max_length_mm"] == pytest.approx(10.0)
+    assert plan_mesh([dict(COPPER, thickness=2.0)], "50Hz")[0]["max_length_mm"] == pytest.approx(9.35, abs=0.01)
+
+
+def test_fixed_plan_keeps_original_lengths():
+    plans = fixed_plan([STEEL, COPPER])
+    assert [(p["kind"], p["max_length_mm"]) for p in plans] == [("length", 30.0), ("length", 20.0)]
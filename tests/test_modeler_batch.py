@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""ModelerBatch 只记录命令，不需要 AEDT"""
+
+import pytest
+
+from aedt_common.modeler_batch import ModelerBatch
+
+
+def test_add_material_maps_pyaedt_names_to_native_keys():
+    batch = ModelerBatch(app=None)
+    batch.add_material("Steel", permeability=1000, conductivity=1.1e6, dielectric_permittivity=1)
+    name, definition = batch._ops[0].args
+    assert name == "Steel"
+    assert definition[definition.index("permittivity:=") + 1] == "1"
+    assert "dielectric_permittivity:=" not in definition
+    assert definition[definition.index("permeability:=") + 1] == "1000"
+
+
+def test_add_material_rejects_unknown_keys():
+    batch = ModelerBatch(app=None)
+    with pytest.raises(ValueError):
+        batch.add_material("Steel", permitivity=1)
+    assert len(batch) == 0
+
+
+def test_native_calls_count_as_round_trips():
+    batch = ModelerBatch(app=None, verbose=False)
+    batch.note_native(0)
+    assert batch.stats["round_trips"] == 0
+    batch.note_native(7, "螺旋槽")
+    assert batch.stats["calls"] == 7 and batch.stats["round_trips"] == 7
+    assert "7 次往返" in batch.summary()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""part_classifier: 按包围盒向量化分类"""
+
+import numpy as np
+
+from aedt_common.part_classifier import PartTable, classify
+
+NAMES = ["Bus_A", "Bus_short", "Frame", "Bolt", "Missing"]
+BBOX = [
+    [0, 0, 0, 10, 100, 800],      # 长宽比 80, 最长边 800
+    [0, 0, 0, 5, 5, 80],          # 细长但短于 100 mm
+    [0, 0, 0, 600, 600, 2000],
+    [0, 0, 0, 12, 12, 30],
+    [np.nan] * 6,
+]
+
+
+def test_classify_busbar_frame_small():
+    table = PartTable(NAMES, BBOX, [np.nan] * len(NAMES))
+    classes = classify(table, busbar_aspect=6)
+    assert classes["busbar"] == ["Bus_A"]
+    assert classes["frame"] == ["Bus_short", "Frame", "Bolt"]
+    assert classes["small"] == []
+
+    classes = classify(table, busbar_aspect=6, frame_volume=1e6)
+    assert classes["frame"] == ["Frame"]
+    assert classes["small"] == ["Bus_short", "Bolt"]
+    # 包围盒未知的对象不参与分类
+    assert "Missing" not in sum(classes.values(), [])
+
+
+def test_part_table_geometry_helpers():
+    table = PartTable(NAMES[:4], BBOX[:4], [1.0, 2.0, np.nan, 4.0])
+    assert table.longest.tolist() == [800, 80, 2000, 30]
+    assert table.get_dims("Bolt") == [12, 12, 30]
+    assert table.extent() == [0, 0, 0, 600, 600, 2000]
+    assert table.sort_by(["Frame", "Bus_A", "Bolt"], axis=2) == ["Bolt", "Bus_A", "Frame"]
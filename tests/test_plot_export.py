@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""plot_export: 导出方式的记忆与失败过期"""
+
+import os
+
+from aedt_common.plot_export import FAILURE_TTL, METHODS, FieldPlotExporter
+
+
+class FakePlot:
+    name = "Plot1"
+
+    def delete(self):
+        pass
+
+
+class FakePost:
+    def __init__(self):
+        self.fail_fast = True
+        self.calls = []
+
+    def create_fieldplot_surface(self, **kwargs):
+        return FakePlot()
+
+    def plot_field_from_fieldplot(self, plot_name, project_path, **kwargs):
+        self.calls.append("plot_field_from_fieldplot")
+        if self.fail_fast:
+            raise RuntimeError("transient")
+        open(os.path.join(project_path, f"{plot_name}.png"), "w").close()
+
+    def export_field_plot(self, plot_name, output_file):
+        self.calls.append("export_field_plot")
+        open(output_file, "w").close()
+        return True
+
+
+class FakeApp:
+    aedt_version_id = "2024.2"
+    nominal_adaptive = "Setup1 : LastAdaptive"
+
+    def __init__(self):
+        self.post = FakePost()
+
+
+def _exporter(tmp_path, app):
+    return FieldPlotExporter(app, str(tmp_path / "plots"), memo_file=str(tmp_path / "memo.json"))
+
+
+def test_transient_failure_does_not_blacklist_fast_method(tmp_path):
+    app = FakeApp()
+    with _exporter(tmp_path, app) as exporter:
+        assert exporter.export("Mag_B", ["Frame"], "Mag_B", "a")
+    # 一次失败: 仍然优先尝试最快的方式
+    assert app.post.calls == ["plot_field_from_fieldplot", "export_field_plot"]
+
+    app.post.fail_fast = False
+    app.post.calls.clear()
+    with _exporter(tmp_path, app) as exporter:
+        assert exporter._order("Mag_B")[0] == "export_field_plot"
+        assert "plot_field_from_fieldplot" in exporter._order("Mag_B")
+        exporter._remember("Mag_B", "plot_field_from_fieldplot", [])
+        entry = exporter.memo["2024.2"]["Mag_B"]
+        assert "plot_field_from_fieldplot" not in entry["failed"]
+        assert exporter._order("Mag_B")[0] == "plot_field_from_fieldplot"
+
+
+def test_repeated_failures_skip_method_until_expired(tmp_path):
+    exporter = _exporter(tmp_path, FakeApp())
+    exporter._remember("Mag_E", "export_field_plot", ["plot_field_from_fieldplot"], now=1000.0)
+    exporter._remember("Mag_E", "export_field_plot", ["plot_field_from_fieldplot"], now=1001.0)
+    assert "plot_field_from_fieldplot" not in exporter._order("Mag_E", now=1002.0)
+    assert exporter._order("Mag_E", now=1001.0 + FAILURE_TTL + 1)[1] == "plot_field_from_fieldplot"
+    # 过期后再失败一次重新计数, 不立即跳过
+    exporter._remember("Mag_E", "export_field_plot", ["plot_field_from_fieldplot"], now=1001.0 + FAILURE_TTL + 2)
+    assert "plot_field_from_fieldplot" in exporter._order("Mag_E", now=1001.0 + FAILURE_TTL + 3)
+    exporter.close()
+
+
+def test_legacy_failed_list_is_retried(tmp_path):
+    exporter = _exporter(tmp_path, FakeApp())
+    # 旧格式 (失败方式列表) 没有时间戳, 视为已过期
+    exporter.memo = {"2024.2": {"Mag_J": {"failed": ["plot_field_from_fieldplot"]}}}
+    assert exporter._order("Mag_J") == list(METHODS)
+    exporter.close()
+
+
+def test_all_methods_skipped_retries_all(tmp_path):
+    exporter = _exporter(tmp_path, FakeApp())
+    for now in (1.0, 2.0):
+        exporter._remember("Mag_H", None, list(METHODS), now=now)
+    assert exporter._order("Mag_H", now=3.0) == list(METHODS)
+    exporter.close()
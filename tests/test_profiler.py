@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""profiler: 开启分析器不得让会话池包装应用句柄 (只在录制轨迹时包装)"""
+
+from aedt_common import recorder
+from aedt_common.profiler import StageProfiler
+
+
+def test_profiler_does_not_create_recorder(monkeypatch):
+    monkeypatch.delenv(recorder.RECORD_ENV, raising=False)
+    monkeypatch.delenv(recorder.REPLAY_ENV, raising=False)
+    monkeypatch.setattr(recorder, "_RECORDER", None)
+    monkeypatch.setattr(recorder, "_LISTENERS", [])
+    profiler = StageProfiler("test")
+    profiler.stage("阶段 1")
+    assert recorder.get_recorder() is None
+    data = profiler.finish()
+    assert [s["stage"] for s in data["stages"]] == ["阶段 1"]
+
+
+def test_listener_attached_when_recording(monkeypatch, tmp_path):
+    monkeypatch.setenv(recorder.RECORD_ENV, str(tmp_path / "trace.jsonl"))
+    monkeypatch.delenv(recorder.REPLAY_ENV, raising=False)
+    monkeypatch.setattr(recorder, "_RECORDER", None)
+    monkeypatch.setattr(recorder, "_LISTENERS", [])
+    profiler = StageProfiler("test")
+    profiler.stage("阶段 1")
+    rec = recorder.get_recorder()
+    rec.write(0, "call", "analyze", elapsed=0.5)
+    rec.close()
+    assert profiler.finish()["aedt_calls"] == 1
+
+
+def test_uncounted_calls_are_flagged(monkeypatch, capsys):
+    monkeypatch.delenv(recorder.RECORD_ENV, raising=False)
+    monkeypatch.delenv(recorder.REPLAY_ENV, raising=False)
+    monkeypatch.setattr(recorder, "_RECORDER", None)
+    monkeypatch.setattr(recorder, "_LISTENERS", [])
+    profiler = StageProfiler("test")
+    profiler.stage("阶段 1")
+    data = profiler.finish()
+    assert data["aedt_calls_counted"] is False
+    assert recorder.RECORD_ENV in data["note"]
+    StageProfiler.print_summary(data)
+    assert recorder.RECORD_ENV in capsys.readouterr().out
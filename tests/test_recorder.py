@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""recorder.RecordingProxy: 通过代理修改 Setup props 必须作用在真实对象上"""
+
+from aedt_common.recorder import Recorder
+
+
+class SetupProps(dict):
+    """模拟 PyAEDT 的 SetupProps: dict 子类，赋值时同步到 AEDT"""
+
+    def __init__(self, owner, data):
+        super().__init__(data)
+        self.owner = owner
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.owner.synced[key] = value
+
+
+class FakeSetup:
+    def __init__(self):
+        self.synced = {}
+        self.props = SetupProps(self, {"MaximumPasses": 10, "SweepRanges": {"Subrange": []}})
+
+
+class FakeApp:
+    def __init__(self):
+        self.setup = FakeSetup()
+        self.objects = {1: FakeSetup()}
+
+    def get_setup(self, name):
+        return self.setup
+
+
+def _proxy():
+    app = FakeApp()
+    return app, Recorder().record_open(app, "P", "D")
+
+
+def test_setup_props_assignment_reaches_real_object():
+    app, proxy = _proxy()
+    proxy.get_setup("Setup1").props["MaximumPasses"] = 2
+    assert app.setup.props["MaximumPasses"] == 2
+    assert app.setup.synced == {"MaximumPasses": 2}
+
+
+def test_nested_plain_containers_returned_by_reference():
+    app, proxy = _proxy()
+    proxy.get_setup("Setup1").props["SweepRanges"]["Subrange"].append({"RangeType": "SinglePoints"})
+    assert app.setup.props["SweepRanges"]["Subrange"] == [{"RangeType": "SinglePoints"}]
+
+
+def test_object_containers_still_wrapped():
+    app, proxy = _proxy()
+    setup = proxy.objects[1]
+    assert type(setup).__name__ == "RecordingProxy"
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""report_build: 依赖扫描、字体收集与增量判定 (不调用 typst)"""
+
+import os
+
+from aedt_common import report_build
+from aedt_common.report_build import BuildCache, build_reports, font_families, scan_dependencies
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return str(path)
+
+
+def test_font_families_follow_imported_template(tmp_path):
+    _write(tmp_path / "template.typ", '#set text(font: ("Noto Serif CJK SC", "SimSun"))\n')
+    report = _write(tmp_path / "sub" / "report.typ", '#import "../template.typ": *\n= 标题\n')
+    deps = scan_dependencies(report)
+    assert deps == [os.path.normpath(str(tmp_path / "template.typ"))]
+    assert font_families([report] + deps) == ["Noto Serif CJK SC", "SimSun"]
+
+
+def test_report_without_font_spec_keeps_system_fonts(tmp_path, monkeypatch):
+    plain = _write(tmp_path / "plain.typ", "= Plain\n")
+    cjk = _write(tmp_path / "cjk.typ", '#set text(font: "SimSun")\n= 中文\n')
+    used = {}
+
+    def fake_compile(typ_file, pdf_file, root, font_dir=None, typst="typst", timeout=60):
+        used[typ_file] = font_dir
+        with open(pdf_file, "w") as f:
+            f.write("pdf")
+
+        class Result:
+            returncode, stderr = 0, ""
+        return Result()
+
+    monkeypatch.setattr(report_build.shutil, "which", lambda name: name)
+    monkeypatch.setattr(report_build, "typst_version", lambda typst="typst": "typst 0.0")
+    monkeypatch.setattr(report_build, "prepare_font_dir", lambda families: str(tmp_path / "fonts"))
+    monkeypatch.setattr(report_build, "compile_report", fake_compile)
+    monkeypatch.setattr(report_build, "BuildCache", lambda: BuildCache(str(tmp_path / "state.json")))
+
+    build_reports([plain, cjk], jobs=1)
+    assert used[os.path.abspath(plain)] is None
+    assert used[os.path.abspath(cjk)] == str(tmp_path / "fonts")
+
+
+def test_stale_reason_tracks_content_not_rewrites(tmp_path):
+    report = _write(tmp_path / "report.typ", '#image("plot.png")\n')
+    image = _write(tmp_path / "plot.png", "v1")
+    pdf = _write(tmp_path / "report.pdf", "pdf")
+    files = [report] + scan_dependencies(report)
+    assert files[1] == os.path.normpath(image)
+
+    cache = BuildCache(str(tmp_path / "state.json"))
+    inputs = cache.inputs(report, files)
+    assert cache.stale_reason(report, pdf, inputs, "typst 0.12") == "没有构建记录"
+    cache.record(report, inputs, "typst 0.12")
+    cache.save()
+
+    cache = BuildCache(str(tmp_path / "state.json"))
+    _write(tmp_path / "report.typ", '#image("plot.png")\n')  # 重写相同内容
+    assert cache.stale_reason(report, pdf, cache.inputs(report, files), "typst 0.12") is None
+    assert cache.stale_reason(report, pdf, cache.inputs(report, files), "typst 0.13") == "typst 版本变化"
+
+    _write(tmp_path / "plot.png", "v2, larger")
+    assert cache.stale_reason(report, pdf, cache.inputs(report, files), "typst 0.12") == "plot.png 已变化"
+    os.remove(pdf)
+    assert cache.stale_reason(report, pdf, cache.inputs(report, files), "typst 0.12") == "PDF 不存在"
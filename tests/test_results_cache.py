@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""results_cache: 按求解结果目录修改时间判定缓存状态"""
+
+import os
+
+from aedt_common.results_cache import ResultsCache, load_cached
+
+
+def _project(tmp_path, with_results=True):
+    project_file = str(tmp_path / "KYN28.aedt")
+    open(project_file, "w").close()
+    if with_results:
+        os.makedirs(tmp_path / "KYN28.aedtresults" / "Design1.results", exist_ok=True)
+    return project_file
+
+
+def test_hit_then_stale_after_resolve(tmp_path):
+    project_file = _project(tmp_path)
+    cache = ResultsCache(str(tmp_path / "results.sqlite"))
+    cache.store("KYN28", "Design1", "Setup1", {"loss": 1.0}, project_file)
+    assert cache.lookup("KYN28", "Design1", "Setup1") == ({"loss": 1.0}, "hit")
+
+    design_dir = tmp_path / "KYN28.aedtresults" / "Design1.results"
+    stamp = os.path.getmtime(design_dir) + 10
+    os.utime(design_dir, (stamp, stamp))
+    assert cache.lookup("KYN28", "Design1", "Setup1")[1] == "stale"
+    assert cache.lookup("KYN28", "Design1", "Other")[1] == "miss"
+    cache.close()
+
+
+def test_missing_stored_mtime_is_stale_once_results_exist(tmp_path):
+    project_file = _project(tmp_path, with_results=False)
+    cache = ResultsCache(str(tmp_path / "results.sqlite"))
+    cache.store("KYN28", "Design1", "Setup1", {"loss": 1.0}, project_file)
+    assert cache.lookup("KYN28", "Design1", "Setup1")[1] == "unverified"
+
+    os.makedirs(tmp_path / "KYN28.aedtresults" / "Design1.results")
+    assert cache.lookup("KYN28", "Design1", "Setup1")[1] == "stale"
+    assert load_cached(cache, "KYN28", "Design1", "Setup1") is None
+    assert load_cached(cache, "KYN28", "Design1", "Setup1", offline=True) == {"loss": 1.0}
+    cache.close()
+
+
+def test_unverified_cache_only_used_offline(tmp_path, capsys):
+    cache = ResultsCache(str(tmp_path / "results.sqlite"))
+    cache.store("KYN28", "Design1", "Setup1", {"loss": 1.0}, str(tmp_path / "moved.aedt"))
+    assert load_cached(cache, "KYN28", "Design1", "Setup1", require=["loss"]) is None
+    assert "重新读取" in capsys.readouterr().out
+    assert load_cached(cache, "KYN28", "Design1", "Setup1", offline=True, require=["loss"]) == {"loss": 1.0}
+    assert "未校验" in capsys.readouterr().out
+    cache.close()
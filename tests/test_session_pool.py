@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""SessionPool 传输方式选择与探测失败处理 (不连接 AEDT)"""
+
+import os
+
+from aedt_common import session_pool
+from aedt_common.session_pool import SessionPool
+
+
+def test_explicit_use_grpc_overrides_cached_transport(monkeypatch):
+    monkeypatch.setattr(session_pool, "cached_transport", lambda version: True)
+    assert SessionPool("2024.2", use_grpc=False).use_grpc is False
+    assert SessionPool("2024.2").use_grpc is True
+
+
+def test_failed_probe_releases_app_before_retry(monkeypatch, tmp_path):
+    opened = []
+
+    class App:
+        released = False
+
+        def release_desktop(self, close_projects=False, close_desktop=False):
+            self.released = True
+
+    def fake_open(self, project, design, solution_type, new_desktop):
+        opened.append(App())
+        return opened[-1]
+
+    monkeypatch.setattr(SessionPool, "_open", fake_open)
+    monkeypatch.setattr(SessionPool, "desktop_alive", lambda self: True)
+    monkeypatch.setattr(SessionPool, "probe", staticmethod(lambda app: len(opened) > 1))
+    monkeypatch.setattr(session_pool, "record_transport", lambda version, use_grpc: None)
+    monkeypatch.setattr(session_pool.time, "sleep", lambda s: None)
+
+    state_file = str(tmp_path / "pool" / "session_pool.json")
+    pool = SessionPool("2024.2", use_grpc=True, state_file=state_file)
+    app = pool.open_design("P", "D", launch=False)
+    assert app is opened[1]
+    assert opened[0].released and not opened[1].released
+    assert os.path.isfile(state_file)
+
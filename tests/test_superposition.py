@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""superposition.UnitFields: 解析包络与逐相位扫描一致"""
+
+import math
+
+import numpy as np
+import pytest
+
+from aedt_common import superposition
+from aedt_common.superposition import UnitFields
+
+
+@pytest.fixture
+def fields():
+    rng = np.random.default_rng(1)
+    points = rng.random((500, 3))
+    unit = [rng.normal(size=(500, 3)) * 1e3 for _ in range(3)]
+    return UnitFields(points, unit, ["A", "B", "C"], {"step_mm": 10})
+
+
+def test_envelope_matches_brute_force_sweep(fields, monkeypatch):
+    monkeypatch.setattr(superposition, "CHUNK_POINTS", 128)  # 跨块组合
+    amplitude = 16970.0
+    peak, angle = fields.envelope(amplitude)
+
+    angles = np.arange(0.0, 360.0, 0.05)
+    sweep = np.stack([fields.instant(amplitude, a) for a in angles])
+    assert np.allclose(peak, sweep.max(axis=0), rtol=1e-5)
+    # 包络出现的相位 (以 180° 为周期) 处的瞬时值即为包络
+    at_angle = np.array([fields.instant(amplitude, a)[i] for i, a in enumerate(angle[:20])])
+    assert np.allclose(at_angle, peak[:20], rtol=1e-4)
+
+
+def test_instant_is_linear_superposition(fields):
+    v = fields.instant_voltages(1000.0, 30.0)
+    assert v["A"] == pytest.approx(1000 * math.cos(math.radians(30)))
+    assert v["B"] == pytest.approx(1000 * math.cos(math.radians(-90)), abs=1e-9)
+    expected = np.linalg.norm(sum(v[n] * e for n, e in zip(fields.nets, fields.fields)), axis=1)
+    assert np.allclose(fields.instant(1000.0, 30.0), expected, rtol=1e-5)
+
+
+def test_withstand_applies_peak_to_one_phase(fields):
+    rows = fields.withstand(42000)
+    assert [r["net"] for r in rows] == ["A", "B", "C"]
+    peak = 42000 * math.sqrt(2)
+    expected = np.linalg.norm(fields.fields[1] * peak, axis=1).max()
+    assert rows[1]["max"] == pytest.approx(expected, rel=1e-5)
+    assert rows[1]["above_mm3"] == rows[1]["above"] * 1000.0